@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Batch Signal Labeling Script
+Labels all PENDING (or, with --all, every) signal from one continuous 1m
+candle series instead of one Binance request per signal.
+
+- Klines are kept in a local SQLite cache (kline_cache.db); only minutes not
+  already cached are downloaded, 1000 per request.
+- Each signal's outcome window (signal time -> +1 hour) is resolved with
+  numpy over the shared series: first bar touching the target vs first bar
+  touching the stop.
+- When target and stop are both touched inside the same minute, the 1s klines
+  of that minute decide which came first. Only if they tie again (or the 1s
+  data is unavailable) is the stop assumed first, as before.
+- All outcomes are written in one transaction.
+"""
+
+import sqlite3
+import requests
+import numpy as np
+from datetime import datetime, timedelta
+import time
+import logging
+import argparse
+import os
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+MINUTE_MS = 60_000
+SECOND_MS = 1_000
+WINDOW = timedelta(hours=1)
+
+
+class KlineCache:
+    """Binance klines cached in SQLite; fetches only what is missing"""
+
+    def __init__(self, cache_path='kline_cache.db', symbol='BTCUSDT',
+                 binance_api_base='https://api.binance.com'):
+        self.cache_path = cache_path
+        self.symbol = symbol
+        self.binance_api_base = binance_api_base
+        self.session = requests.Session()
+        self.rate_limit_delay = 0.1
+        self.requests_made = 0
+
+        conn = sqlite3.connect(self.cache_path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS klines (
+                symbol TEXT NOT NULL,
+                interval TEXT NOT NULL,
+                open_time INTEGER NOT NULL,
+                high REAL NOT NULL,
+                low REAL NOT NULL,
+                PRIMARY KEY (symbol, interval, open_time)
+            ) WITHOUT ROWID
+        ''')
+        conn.commit()
+        conn.close()
+
+    def _load(self, conn, interval, start_ms, end_ms):
+        rows = conn.execute('''
+            SELECT open_time, high, low FROM klines
+            WHERE symbol = ? AND interval = ? AND open_time BETWEEN ? AND ?
+            ORDER BY open_time
+        ''', (self.symbol, interval, start_ms, end_ms)).fetchall()
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty(0), np.empty(0)
+        arr = np.array(rows, dtype=float)
+        return arr[:, 0].astype(np.int64), arr[:, 1], arr[:, 2]
+
+    def _download(self, interval, start_ms, end_ms):
+        """Download [start_ms, end_ms] in pages of 1000; returns (open_time, high, low) rows"""
+        rows = []
+        cursor = start_ms
+        while cursor <= end_ms:
+            response = self.session.get(f"{self.binance_api_base}/api/v3/klines", params={
+                'symbol': self.symbol,
+                'interval': interval,
+                'startTime': cursor,
+                'endTime': end_ms,
+                'limit': 1000
+            }, timeout=10)
+            response.raise_for_status()
+            klines = response.json()
+            self.requests_made += 1
+            if not klines:
+                break
+            rows.extend((int(k[0]), float(k[2]), float(k[3]), int(k[6])) for k in klines)
+            cursor = int(klines[-1][0]) + 1
+            if len(klines) < 1000:
+                break
+            time.sleep(self.rate_limit_delay)
+        return rows
+
+    def get(self, interval, step_ms, start_ms, end_ms):
+        """
+        Closed klines with open_time in [start_ms, end_ms] as numpy arrays
+        (open_time, high, low). Missing stretches are downloaded and cached.
+        """
+        start_ms -= start_ms % step_ms
+        now_ms = int(time.time() * 1000)
+        conn = sqlite3.connect(self.cache_path)
+        try:
+            times, _, _ = self._load(conn, interval, start_ms, end_ms)
+
+            # Expected grid minus cached bars -> contiguous gaps to download
+            expected = np.arange(start_ms, end_ms + 1, step_ms, dtype=np.int64)
+            expected = expected[expected + step_ms <= now_ms]   # only closed bars
+            missing = np.setdiff1d(expected, times, assume_unique=True)
+
+            if len(missing):
+                breaks = np.flatnonzero(np.diff(missing) != step_ms) + 1
+                new_rows = []
+                for gap in np.split(missing, breaks):
+                    for open_time, high, low, close_time in self._download(interval, int(gap[0]), int(gap[-1])):
+                        if close_time < now_ms:
+                            new_rows.append((self.symbol, interval, open_time, high, low))
+                with conn:
+                    conn.executemany('INSERT OR REPLACE INTO klines VALUES (?, ?, ?, ?, ?)', new_rows)
+                times, highs, lows = self._load(conn, interval, start_ms, end_ms)
+            else:
+                _, highs, lows = self._load(conn, interval, start_ms, end_ms)
+            return times, highs, lows
+        finally:
+            conn.close()
+
+
+def first_touch(times, highs, lows, start_ms, end_ms, directions, targets, stops):
+    """
+    Vectorized first-touch search over a shared kline series.
+
+    For signal i the window is the bars with open_time in [start_ms[i], end_ms[i]].
+    Returns (target_idx, stop_idx, window_high, window_low); an index is -1
+    when that level is never touched in the window.
+    """
+    n = len(start_ms)
+    first = np.searchsorted(times, start_ms, side='left')
+    last = np.searchsorted(times, end_ms, side='right')          # exclusive
+    width = int((last - first).max()) if n else 0
+
+    if width <= 0 or len(times) == 0:
+        empty = np.full(n, -1)
+        return empty, empty.copy(), np.full(n, np.nan), np.full(n, np.nan)
+
+    offsets = np.arange(width)
+    idx = first[:, None] + offsets[None, :]
+    valid = idx < last[:, None]
+    idx = np.minimum(idx, len(times) - 1)
+
+    h = np.where(valid, highs[idx], -np.inf)
+    l = np.where(valid, lows[idx], np.inf)
+
+    is_long = (directions == 'LONG')[:, None]
+    target_hit = np.where(is_long, h >= targets[:, None], l <= targets[:, None])
+    stop_hit = np.where(is_long, l <= stops[:, None], h >= stops[:, None])
+
+    def first_true(hits):
+        pos = hits.argmax(axis=1)
+        return np.where(hits.any(axis=1), first + pos, -1)
+
+    has_bars = last > first
+    window_high = np.where(has_bars, h.max(axis=1), np.nan)
+    window_low = np.where(has_bars, l.min(axis=1), np.nan)
+    return first_true(target_hit), first_true(stop_hit), window_high, window_low
+
+
+class BatchSignalLabeler:
+    """Labels signals in bulk from a shared, cached kline series"""
+
+    def __init__(self, db_path='signals.db', cache_path=None, refine=True):
+        self.db_path = db_path
+        self.cache = KlineCache(cache_path or os.path.join(os.path.dirname(os.path.abspath(db_path)), 'kline_cache.db'))
+        self.refine = refine
+
+    def load_signals(self, relabel_all=False, max_signals=None, min_age_minutes=60):
+        conn = sqlite3.connect(self.db_path)
+        min_age_timestamp = (datetime.now() - timedelta(minutes=min_age_minutes)).isoformat()
+        where = "direction IN ('LONG', 'SHORT')" if relabel_all else 'outcome = "PENDING"'
+        query = f'''
+            SELECT id, timestamp, direction, entry_price, suggested_stop, suggested_target
+            FROM signals
+            WHERE {where}
+            AND timestamp < ?
+            ORDER BY timestamp ASC
+        '''
+        params = [min_age_timestamp]
+        if max_signals:
+            query += ' LIMIT ?'
+            params.append(max_signals)
+        rows = conn.execute(query, params).fetchall()
+        conn.close()
+        return rows
+
+    def _order_same_minute(self, minute_open_ms, direction, target, stop):
+        """Use 1s klines inside one minute to see whether target or stop came first"""
+        try:
+            times, highs, lows = self.cache.get('1s', SECOND_MS, minute_open_ms, minute_open_ms + MINUTE_MS - SECOND_MS)
+        except Exception as e:
+            logger.warning(f"1s klines unavailable for {minute_open_ms}: {e}")
+            return None
+        if len(times) == 0:
+            return None
+        t_idx, s_idx, _, _ = first_touch(times, highs, lows,
+                                         np.array([minute_open_ms]), np.array([minute_open_ms + MINUTE_MS - 1]),
+                                         np.array([direction]), np.array([target]), np.array([stop]))
+        t, s = int(t_idx[0]), int(s_idx[0])
+        if t >= 0 and (s < 0 or t < s):
+            return 'WIN'
+        if s >= 0 and (t < 0 or s < t):
+            return 'LOSS'
+        return None
+
+    def label(self, rows):
+        """Compute outcome rows for every signal; returns (updates, stats)"""
+        stats = {'processed': 0, 'wins': 0, 'losses': 0, 'timeouts': 0,
+                 'skipped': 0, 'same_minute': 0, 'resolved_by_1s': 0}
+        if not rows:
+            return [], stats
+
+        ids = np.array([r[0] for r in rows])
+        signal_times = [datetime.fromisoformat(r[1]) for r in rows]
+        directions = np.array([r[2] for r in rows])
+        entries = np.array([r[3] for r in rows], dtype=float)
+        stops = np.array([r[4] for r in rows], dtype=float)
+        targets = np.array([r[5] for r in rows], dtype=float)
+
+        now = datetime.now()
+        start_ms = np.array([int(t.timestamp() * 1000) for t in signal_times], dtype=np.int64)
+        end_ms = np.array([int(min(t + WINDOW, now).timestamp() * 1000) for t in signal_times], dtype=np.int64)
+        window_done = np.array([t + WINDOW <= now for t in signal_times])
+
+        # One continuous 1m series covering every window
+        times, highs, lows = self.cache.get('1m', MINUTE_MS, int(start_ms.min()), int(end_ms.max()))
+        logger.info(f"Kline series: {len(times)} x 1m bars ({self.cache.requests_made} API requests)")
+
+        t_idx, s_idx, w_high, w_low = first_touch(times, highs, lows, start_ms, end_ms, directions, targets, stops)
+
+        is_long = directions == 'LONG'
+        max_gain_pct = np.where(is_long, (w_high - entries) / entries, (entries - w_low) / entries) * 100
+        max_loss_pct = np.where(is_long, (w_low - entries) / entries, (entries - w_high) / entries) * 100
+        target_pct = np.abs(targets - entries) / entries * 100
+        stop_pct = np.abs(entries - stops) / entries * 100
+
+        checked_at = now.isoformat()
+        updates = []
+        for i in range(len(rows)):
+            if np.isnan(w_high[i]):
+                stats['skipped'] += 1
+                continue
+
+            t, s = int(t_idx[i]), int(s_idx[i])
+            outcome = None
+            if t >= 0 and (s < 0 or t < s):
+                outcome, exit_reason = 'WIN', 'Take profit target reached'
+            elif s >= 0 and (t < 0 or s < t):
+                outcome, exit_reason = 'LOSS', 'Stop loss triggered'
+            elif t >= 0 and t == s:
+                stats['same_minute'] += 1
+                ordered = self._order_same_minute(int(times[t]), directions[i], targets[i], stops[i]) if self.refine else None
+                if ordered == 'WIN':
+                    outcome, exit_reason = 'WIN', 'Take profit target reached (1s bars: target before stop)'
+                    stats['resolved_by_1s'] += 1
+                elif ordered == 'LOSS':
+                    outcome, exit_reason = 'LOSS', 'Stop loss triggered (1s bars: stop before target)'
+                    stats['resolved_by_1s'] += 1
+                else:
+                    outcome, exit_reason = 'LOSS', 'Stop loss hit (both in same bar, stop assumed first)'
+            elif window_done[i]:
+                outcome, exit_reason = 'TIMEOUT', 'Signal timeout (1 hour expired without hitting target/stop)'
+            else:
+                stats['skipped'] += 1   # still inside its window
+                continue
+
+            # Realized P&L of a bracket order: the level that was hit
+            strategy_profit = {'WIN': target_pct[i], 'LOSS': -stop_pct[i], 'TIMEOUT': 0.0}[outcome]
+
+            updates.append((
+                checked_at,
+                outcome,
+                float(w_high[i]),
+                float(w_low[i]),
+                1 if t >= 0 else 0,
+                1 if s >= 0 else 0,
+                float(max_gain_pct[i]),
+                float(max_loss_pct[i]),
+                outcome,
+                exit_reason,
+                float(strategy_profit),
+                int(ids[i])
+            ))
+            stats['processed'] += 1
+            stats[{'WIN': 'wins', 'LOSS': 'losses', 'TIMEOUT': 'timeouts'}[outcome]] += 1
+
+        return updates, stats
+
+    def write(self, updates):
+        """Write all outcomes in a single transaction"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                conn.executemany('''
+                    UPDATE signals
+                    SET checked_at = ?,
+                        outcome = ?,
+                        actual_high = ?,
+                        actual_low = ?,
+                        target_hit = ?,
+                        stop_hit = ?,
+                        max_gain_pct = ?,
+                        max_loss_pct = ?,
+                        final_result = ?,
+                        exit_reason = ?,
+                        strategy_profit = ?
+                    WHERE id = ?
+                ''', updates)
+        finally:
+            conn.close()
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Batch-label signal outcomes from cached klines')
+    parser.add_argument('--db', default='signals.db', help='Signals database (default: signals.db)')
+    parser.add_argument('--cache', default=None, help='Kline cache database (default: kline_cache.db next to --db)')
+    parser.add_argument('--all', action='store_true', help='Relabel every LONG/SHORT signal, not just PENDING')
+    parser.add_argument('--max', type=int, default=None, help='Maximum number of signals')
+    parser.add_argument('--min-age', type=int, default=60, help='Minimum signal age in minutes (default: 60)')
+    parser.add_argument('--no-refine', action='store_true', help='Skip 1s klines for same-minute touches')
+    parser.add_argument('--dry-run', action='store_true', help='Compute outcomes without writing them')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("📊 BATCH SIGNAL LABELING")
+    print("=" * 80)
+
+    start_time = time.time()
+    labeler = BatchSignalLabeler(db_path=args.db, cache_path=args.cache, refine=not args.no_refine)
+    rows = labeler.load_signals(relabel_all=args.all, max_signals=args.max, min_age_minutes=args.min_age)
+    logger.info(f"Found {len(rows)} signals to label")
+
+    updates, stats = labeler.label(rows)
+    if updates and not args.dry_run:
+        labeler.write(updates)
+    elapsed_time = time.time() - start_time
+
+    print()
+    print("=" * 80)
+    print("📊 LABELING COMPLETE" + (" (DRY RUN)" if args.dry_run else ""))
+    print("=" * 80)
+    print(f"✅ Processed: {stats['processed']} signals")
+    print(f"🏆 Wins: {stats['wins']}")
+    print(f"❌ Losses: {stats['losses']}")
+    print(f"⏱️  Timeouts: {stats['timeouts']}")
+    print(f"⏭️  Skipped: {stats['skipped']}")
+    print(f"🔍 Same-minute touches: {stats['same_minute']} ({stats['resolved_by_1s']} ordered by 1s bars)")
+    if stats['processed'] > 0:
+        print(f"📈 Win Rate: {stats['wins'] / stats['processed'] * 100:.1f}%")
+    print(f"🌐 API requests: {labeler.cache.requests_made}")
+    print(f"⏱️  Time elapsed: {elapsed_time:.1f} seconds")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Background task: keeps bot_events small.
+
+Rows older than BOT_EVENTS_RETENTION_DAYS are folded into bot_event_rollups
+(per config / UTC day / event type: count, pnl, notional) and moved to
+bot_events_archive, in id-ordered batches so each transaction holds its
+locks briefly. The newest event and the newest 'started' event of every
+config stay in the hot table — the status, admin and Telegram views read
+them no matter how old they are. event_history() reads both tables, so the
+history endpoints keep paging past the cutoff.
+
+bot_events keeps its FK to bot_configs, which rules out MariaDB native
+partitioning; the archive table has neither FK nor enum and only needs
+(config_id, ts) for history lookups.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam, desc, select, text, union_all
+
+from api.database import AsyncSessionLocal
+from api.models import BotEvent, BotEventArchive
+
+RETENTION_DAYS = int(os.getenv("BOT_EVENTS_RETENTION_DAYS", "90"))
+SWEEP_INTERVAL = 6 * 3600   # seconds between sweeps
+STARTUP_DELAY  = 300        # seconds after API boot before the first sweep
+BATCH_SIZE     = 5000
+
+# Newest row overall and newest 'started' row per config (loose index scans)
+_KEEP_SQL = text(
+    "SELECT MAX(id) FROM bot_events GROUP BY config_id "
+    "UNION SELECT MAX(id) FROM bot_events WHERE event_type = 'started' GROUP BY config_id"
+)
+
+_BATCH_SQL = text(
+    "SELECT MAX(id), COUNT(*) FROM ("
+    "  SELECT id FROM bot_events WHERE ts < :cutoff AND id NOT IN :keep ORDER BY id LIMIT :batch"
+    ") b"
+).bindparams(bindparam("keep", expanding=True))
+
+_WHERE = "WHERE id <= :hi AND ts < :cutoff AND id NOT IN :keep"
+
+_ROLLUP_SQL = text(
+    "INSERT INTO bot_event_rollups (config_id, day, event_type, events, pnl, notional) "
+    "SELECT config_id, DATE(ts), event_type, COUNT(*), COALESCE(SUM(pnl), 0), "
+    "       COALESCE(SUM(CAST(JSON_VALUE(details, '$.notional') AS DECIMAL(20,2))), 0) "
+    f"FROM bot_events {_WHERE} GROUP BY config_id, DATE(ts), event_type "
+    "ON DUPLICATE KEY UPDATE bot_event_rollups.events = bot_event_rollups.events + VALUES(events), "
+    "bot_event_rollups.pnl = bot_event_rollups.pnl + VALUES(pnl), "
+    "bot_event_rollups.notional = bot_event_rollups.notional + VALUES(notional)"
+).bindparams(bindparam("keep", expanding=True))
+
+_ARCHIVE_SQL = text(
+    "INSERT IGNORE INTO bot_events_archive "
+    "(id, config_id, event_type, price_at_event, pnl, details, ts, archived_at) "
+    "SELECT id, config_id, event_type, price_at_event, pnl, details, ts, UTC_TIMESTAMP() "
+    f"FROM bot_events {_WHERE}"
+).bindparams(bindparam("keep", expanding=True))
+
+_DELETE_SQL = text(f"DELETE FROM bot_events {_WHERE}").bindparams(bindparam("keep", expanding=True))
+
+# Last sweep, for logs and debugging
+stats = {"last_run": None, "archived": 0, "batches": 0, "seconds": 0.0}
+
+
+async def archive_old_events(retention_days: int = RETENTION_DAYS) -> int:
+    """Move every bot_events row past the window; returns the number of rows moved."""
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    async with AsyncSessionLocal() as db:
+        keep = [row[0] for row in (await db.execute(_KEEP_SQL)).fetchall() if row[0] is not None]
+
+    moved = batches = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            hi, n = (await db.execute(
+                _BATCH_SQL, {"cutoff": cutoff, "keep": keep, "batch": BATCH_SIZE}
+            )).one()
+            if not n:
+                break
+            params = {"hi": hi, "cutoff": cutoff, "keep": keep}
+            await db.execute(_ROLLUP_SQL, params)
+            await db.execute(_ARCHIVE_SQL, params)
+            result = await db.execute(_DELETE_SQL, params)
+            await db.commit()
+        moved   += result.rowcount
+        batches += 1
+        if n < BATCH_SIZE:
+            break
+        await asyncio.sleep(0.5)   # let bot writes through between batches
+    stats["batches"] = batches
+    return moved
+
+
+def _history_select(model, config_id, since, limit):
+    q = select(model.id, model.event_type, model.price_at_event, model.pnl, model.details, model.ts) \
+        .where(model.config_id == config_id)
+    if since is not None:
+        q = q.where(model.ts >= since)
+    return q.order_by(desc(model.ts)).limit(limit)
+
+
+async def event_history(db, config_id: int, limit: int, offset: int = 0, since=None) -> list[dict]:
+    """A config's events newest first, as dicts with the bot_events columns.
+
+    Archived rows are all older than the retention cutoff, so a full page from
+    bot_events whose oldest row is newer than the cutoff is final. Otherwise,
+    for example a page that reaches a kept old 'started' row, it is re-read
+    from bot_events ∪ bot_events_archive in timestamp order.
+    """
+    hot = await db.execute(_history_select(BotEvent, config_id, since, limit).offset(offset))
+    rows = hot.all()
+    cutoff = datetime.utcnow() - timedelta(days=RETENTION_DAYS) if RETENTION_DAYS > 0 else None
+    hot_only = cutoff is not None and (
+        (since is not None and since >= cutoff)
+        or (len(rows) == limit and rows[-1].ts is not None and rows[-1].ts >= cutoff)
+    )
+    if not hot_only:
+        # Each branch only needs its newest offset + limit rows ((config_id, ts) index on both)
+        merged = union_all(*(
+            select(_history_select(model, config_id, since, offset + limit).subquery())
+            for model in (BotEvent, BotEventArchive)
+        )).subquery()
+        rows = (await db.execute(
+            select(merged).order_by(desc(merged.c.ts)).limit(limit).offset(offset)
+        )).all()
+    return [dict(r._mapping) for r in rows]
+
+
+async def run_bot_events_retention() -> None:
+    if RETENTION_DAYS <= 0:
+        print("[Retention] BOT_EVENTS_RETENTION_DAYS <= 0 — bot_events retention disabled", flush=True)
+        return
+    await asyncio.sleep(STARTUP_DELAY)
+    while True:
+        try:
+            t0 = datetime.utcnow()
+            moved = await archive_old_events()
+            stats.update(last_run=t0.isoformat(), archived=moved,
+                         seconds=round((datetime.utcnow() - t0).total_seconds(), 1))
+            if moved > 0:
+                print(f"[Retention] Archived {moved} bot_events row(s) older than {RETENTION_DAYS}d "
+                      f"in {stats['batches']} batch(es)", flush=True)
+        except Exception as e:
+            print(f"[Retention] Error: {e}", flush=True)
+        await asyncio.sleep(SWEEP_INTERVAL)
@@ -4,6 +4,13 @@ BotManager — spawns/stops isolated live_hedge_bot.py subprocesses per user.
 Each subprocess receives its full config via environment variables.
 Stdout is tailed in an asyncio task; [EVENT] JSON lines are written to
 bot_events table and pushed to any connected WebSocket subscribers.
+
+WebSocket fan-out: every payload is serialized once and the same frame
+string is queued to each subscriber (per-bot viewers and admin streams
+that follow all bots). Plain stdout lines are batched per bot into one
+`logs` frame every LOG_BATCH_INTERVAL. A subscriber that falls
+WS_QUEUE_MAX frames behind loses its backlog and gets a `resync` frame
+(bot state + recent events) rather than a silent gap.
 """
 
 import asyncio
@@ -11,12 +18,14 @@ import json
 import os
 import subprocess
 import sys
+from collections import deque
 from datetime import datetime, timezone
 from subprocess import PIPE, STDOUT
 from typing import Optional
 
 from api.database import AsyncSessionLocal
 from api.models import BotConfig, BotEvent
+from src.reporting.latency import LatencyRecorder
 
 # Path to bot scripts and venv Python
 _BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -58,13 +67,52 @@ _EVENT_MAP = {
     "whale_event":          "whale_event",
 }
 
+WS_QUEUE_MAX       = 100    # frames buffered per WS subscriber before it is resynced
+LOG_BATCH_INTERVAL = 0.25   # seconds of stdout lines merged into one `logs` frame
+RECENT_EVENTS      = 20     # structured events kept per bot for resync snapshots
+
+
+class Subscriber:
+    """One WebSocket viewer: a bounded queue of pre-serialized frames.
+
+    config_ids=None follows every bot (admin stream). On overflow the backlog
+    is discarded and `lagged` set, so the socket is resynced instead of
+    silently missing frames.
+    """
+
+    def __init__(self, config_ids: set[int] | None = None, maxsize: int = WS_QUEUE_MAX):
+        self.config_ids = config_ids
+        self.maxsize    = maxsize
+        self.frames: deque[str] = deque()
+        self.lagged  = False
+        self.dropped = 0
+        self._wake   = asyncio.Event()
+
+    def follows(self, config_id: int) -> bool:
+        return self.config_ids is None or config_id in self.config_ids
+
+    def push(self, frame: str):
+        if len(self.frames) >= self.maxsize:
+            self.dropped += len(self.frames) + 1
+            self.frames.clear()
+            self.lagged = True
+        else:
+            self.frames.append(frame)
+        self._wake.set()
+
 
 class BotManager:
     def __init__(self):
         self._procs:  dict[int, subprocess.Popen]         = {}   # config_id → process
         self._tasks:  dict[int, asyncio.Task]              = {}   # config_id → tail task
-        self._subscribers: dict[int, list[asyncio.Queue]] = {}   # config_id → WS queues
+        self._subscribers: dict[int, list[Subscriber]]    = {}   # config_id → WS viewers
+        self._all_subscribers: list[Subscriber]           = []   # admin streams (every bot)
+        self._recent:      dict[int, deque]                = {}   # config_id → last broadcast events
+        self._log_buf:     dict[int, list[dict]]           = {}   # config_id → stdout lines awaiting flush
+        self.ws_stats = {"frames": 0, "log_lines": 0, "log_frames": 0, "resyncs": 0}
         self._last_seen:   dict[int, datetime]             = {}   # config_id → last stdout ts
+        self._latency:     dict[int, LatencyRecorder]      = {}   # config_id → merged latency events
+        self.db_latency = LatencyRecorder()                        # bot_events writes
         self._shutting_down: bool = False
 
     # ── Lifecycle ─────────────────────────────────────────────────────────
@@ -226,12 +274,8 @@ class BotManager:
                     except Exception as e:
                         print(f"[BotManager] Event parse error: {e}", flush=True)
                 else:
-                    # Forward raw stdout lines as live log messages
-                    await self._broadcast(config_id, {
-                        "type": "log",
-                        "msg":  line,
-                        "ts":   datetime.now(timezone.utc).isoformat(),
-                    })
+                    # Forward raw stdout lines as live log messages (batched)
+                    self._queue_log(config_id, line)
         except Exception as e:
             print(f"[BotManager] Tail error for config {config_id}: {e}", flush=True)
         finally:
@@ -252,6 +296,11 @@ class BotManager:
 
     async def _handle_event(self, config_id: int, record: dict):
         event_label = record.get("event", "")
+        if event_label == "latency":
+            # Periodic timing histograms — aggregated in memory, not stored as bot_events
+            spans = (record.get("details") or {}).get("spans", {})
+            self._latency.setdefault(config_id, LatencyRecorder()).merge(spans)
+            return
         event_type  = _EVENT_MAP.get(event_label, "error")
         price       = record.get("price")
         pnl         = record.get("pnl")
@@ -280,18 +329,28 @@ class BotManager:
     async def _write_event(self, config_id: int, event_type: str,
                            price, pnl, details):
         try:
-            async with AsyncSessionLocal() as db:
-                db.add(BotEvent(
-                    config_id      = config_id,
-                    event_type     = event_type,
-                    price_at_event = price,
-                    pnl            = pnl,
-                    details        = details,
-                ))
-                await db.commit()
+            with self.db_latency.span("db_write_event"):
+                async with AsyncSessionLocal() as db:
+                    db.add(BotEvent(
+                        config_id      = config_id,
+                        event_type     = event_type,
+                        price_at_event = price,
+                        pnl            = pnl,
+                        details        = details,
+                    ))
+                    await db.commit()
         except Exception as e:
             print(f"[BotManager] DB write error: {e}", flush=True)
 
+    def latency_summary(self) -> dict:
+        """Per-bot span percentiles: `total` since first seen, `recent` = last window."""
+        return {
+            config_id: {"running": config_id in self._procs,
+                        "total":   rec.summary(),
+                        "recent":  rec.summary(window=True)}
+            for config_id, rec in sorted(self._latency.items())
+        }
+
     async def _mark_inactive(self, config_id: int):
         try:
             from sqlalchemy import update
@@ -342,22 +401,89 @@ class BotManager:
 
     # ── WebSocket pub/sub ─────────────────────────────────────────────────
 
-    def subscribe(self, config_id: int) -> asyncio.Queue:
-        q: asyncio.Queue = asyncio.Queue(maxsize=100)
-        self._subscribers.setdefault(config_id, []).append(q)
-        return q
-
-    def unsubscribe(self, config_id: int, q: asyncio.Queue):
-        subs = self._subscribers.get(config_id, [])
-        if q in subs:
-            subs.remove(q)
+    def subscribe(self, config_id: int) -> Subscriber:
+        sub = Subscriber({config_id})
+        self._subscribers.setdefault(config_id, []).append(sub)
+        return sub
+
+    def subscribe_all(self, config_ids: set[int] | None = None) -> Subscriber:
+        """Multiplexed stream over many bots (None = all); frames carry config_id."""
+        sub = Subscriber(config_ids)
+        self._all_subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        if sub in self._all_subscribers:
+            self._all_subscribers.remove(sub)
+        for config_id in sub.config_ids or ():
+            subs = self._subscribers.get(config_id, [])
+            if sub in subs:
+                subs.remove(sub)
+            if not subs:
+                self._subscribers.pop(config_id, None)
+
+    def _has_viewers(self, config_id: int) -> bool:
+        return bool(self._subscribers.get(config_id)) or any(
+            s.follows(config_id) for s in self._all_subscribers)
+
+    def _fanout(self, config_id: int, frame: str):
+        for sub in self._subscribers.get(config_id, ()):
+            sub.push(frame)
+        for sub in self._all_subscribers:
+            if sub.follows(config_id):
+                sub.push(frame)
+        self.ws_stats["frames"] += 1
 
     async def _broadcast(self, config_id: int, payload: dict):
-        for q in list(self._subscribers.get(config_id, [])):
+        self._flush_logs(config_id)             # keep stdout ordered before the event
+        payload = {"config_id": config_id, **payload}
+        self._recent.setdefault(config_id, deque(maxlen=RECENT_EVENTS)).append(payload)
+        if self._has_viewers(config_id):
+            self._fanout(config_id, json.dumps(payload, default=str))
+
+    def _queue_log(self, config_id: int, line: str):
+        if not self._has_viewers(config_id):
+            return
+        buf = self._log_buf.get(config_id)
+        if buf is None:
+            buf = self._log_buf[config_id] = []
+            asyncio.get_running_loop().call_later(LOG_BATCH_INTERVAL, self._flush_logs, config_id)
+        buf.append({"msg": line, "ts": datetime.now(timezone.utc).isoformat()})
+
+    def _flush_logs(self, config_id: int):
+        lines = self._log_buf.pop(config_id, None)
+        if not lines:
+            return
+        self.ws_stats["log_lines"]  += len(lines)
+        self.ws_stats["log_frames"] += 1
+        self._fanout(config_id, json.dumps({"type": "logs", "config_id": config_id, "lines": lines}))
+
+    def snapshot_frame(self, sub: Subscriber, kind: str = "resync") -> str:
+        """State of every bot the subscriber follows: running, last_seen, recent events."""
+        ids = sub.config_ids if sub.config_ids is not None else set(self._procs) | set(self._recent)
+        bots = [{
+            "config_id": cid,
+            "running":   self.is_running(cid),
+            "last_seen": self._last_seen[cid].isoformat() if cid in self._last_seen else None,
+            "events":    list(self._recent.get(cid, ())),
+        } for cid in sorted(ids)]
+        return json.dumps({"type": kind, "dropped": sub.dropped, "bots": bots}, default=str)
+
+    async def next_frame(self, sub: Subscriber, timeout: float) -> str | None:
+        """Next frame for a WS loop: queued frame, a resync after overflow, or None on timeout."""
+        if not sub.frames and not sub.lagged:
+            sub._wake.clear()
             try:
-                q.put_nowait(payload)
-            except asyncio.QueueFull:
-                pass  # slow consumer — drop
+                await asyncio.wait_for(sub._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        if sub.lagged:
+            sub.lagged = False
+            self.ws_stats["resyncs"] += 1
+            frame = self.snapshot_frame(sub)
+            sub.dropped = 0
+            return frame
+        return sub.frames.popleft()
 
 
 # Singleton instance shared across the API
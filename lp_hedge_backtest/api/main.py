@@ -4,11 +4,9 @@ FastAPI app on port 8001.
 """
 
 import os
-import time
 import asyncio
 from contextlib import asynccontextmanager
 
-import httpx
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import select, text
@@ -22,6 +20,7 @@ from api.routers import admin as admin_router
 from api.routers import assistant as assistant_router
 from api.routers import telegram as telegram_router
 from api.routers import signal_lab as signal_lab_router
+from api.routers import backtests as backtests_router
 
 
 async def _run_column_migrations():
@@ -173,6 +172,18 @@ async def _run_column_migrations():
             "  UNIQUE KEY uq_sud_user_coin (user_address, coin)"
             ")"
         ),
+        # Signal history: latest filled execution per signal + newest-first closed signals
+        "CREATE INDEX IF NOT EXISTS idx_sexec_signal_outcome_time ON signal_executions (signal_id, outcome, executed_at)",
+        "CREATE INDEX IF NOT EXISTS idx_sevents_received ON signal_events (received_at)",
+        # Hot-query indexes: bot status/admin lookups, expiry sweep, open-execution scans
+        "CREATE INDEX IF NOT EXISTS idx_bevents_config_type_ts ON bot_events (config_id, event_type, ts)",
+        "CREATE INDEX IF NOT EXISTS idx_bevents_config_ts ON bot_events (config_id, ts)",
+        "CREATE INDEX IF NOT EXISTS idx_bevents_ts ON bot_events (ts)",
+        "CREATE INDEX IF NOT EXISTS idx_sevents_status_received ON signal_events (status, received_at)",
+        "CREATE INDEX IF NOT EXISTS idx_sevents_status_source ON signal_events (status, source_id)",
+        "CREATE INDEX IF NOT EXISTS idx_sexec_open ON signal_executions (outcome, close_price, hl_wallet_addr, signal_id)",
+        "CREATE INDEX IF NOT EXISTS idx_sexec_wallet_time ON signal_executions (hl_wallet_addr, executed_at)",
+        "CREATE INDEX IF NOT EXISTS idx_sexec_executed ON signal_executions (executed_at)",
     ]
     async with engine.begin() as conn:
         for sql in migrations:
@@ -257,12 +268,20 @@ async def lifespan(app: FastAPI):
     # Start signal reconciler — polls HL fills for orphaned open executions every 5 min
     from api.signal_reconciler import run_signal_reconciler
     rec_task = asyncio.create_task(run_signal_reconciler())
+    # Start live HL mid-price feed — one allMids WS shared by every price endpoint
+    from api.price_feed import run_price_feed
+    price_task = asyncio.create_task(run_price_feed())
+    # Start bot_events retention — moves rows past the window into archive + daily rollups
+    from api.bot_events_retention import run_bot_events_retention
+    retention_task = asyncio.create_task(run_bot_events_retention())
     yield
     # Graceful shutdown
     tg_task.cancel()
     lp_task.cancel()
     expiry_task.cancel()
     rec_task.cancel()
+    price_task.cancel()
+    retention_task.cancel()
     try:
         await tg_task
     except asyncio.CancelledError:
@@ -279,8 +298,19 @@ async def lifespan(app: FastAPI):
         await rec_task
     except asyncio.CancelledError:
         pass
+    try:
+        await price_task
+    except asyncio.CancelledError:
+        pass
+    try:
+        await retention_task
+    except asyncio.CancelledError:
+        pass
     from api.bot_manager import manager
     await manager.shutdown()
+    # Let queued Telegram alerts go out, then close the pooled client
+    from api.telegram_alerts import dispatcher
+    await dispatcher.aclose()
     await engine.dispose()
 
 
@@ -313,6 +343,7 @@ app.include_router(admin_router.router)
 app.include_router(assistant_router.router)
 app.include_router(telegram_router.router)
 app.include_router(signal_lab_router.router)
+app.include_router(backtests_router.router)
 
 
 @app.get("/health")
@@ -357,28 +388,10 @@ async def set_maintenance(
     return {"maintenance": enable, "message": message}
 
 
-# ── Price proxy (avoids CORS + rate-limit exposure on the client) ─────────
-_price_cache: dict = {"data": None, "ts": 0.0}
-_PRICE_TTL = 30  # seconds
-
-
+# ── Prices (served from the in-process HL allMids feed) ───────────────────
 @app.get("/prices")
 async def get_prices():
-    """Server-side proxy for CoinGecko prices — cached 30 s to avoid rate limits."""
-    now = time.monotonic()
-    if _price_cache["data"] and now - _price_cache["ts"] < _PRICE_TTL:
-        return _price_cache["data"]
-
-    url = "https://api.coingecko.com/api/v3/simple/price?ids=ethereum,bitcoin&vs_currencies=usd"
-    try:
-        async with httpx.AsyncClient(timeout=8) as client:
-            r = await client.get(url)
-            r.raise_for_status()
-            _price_cache["data"] = r.json()
-            _price_cache["ts"]   = now
-            return _price_cache["data"]
-    except Exception as e:
-        # Return last cached value if available, else empty
-        if _price_cache["data"]:
-            return _price_cache["data"]
-        return {"ethereum": {"usd": None}, "bitcoin": {"usd": None}}
+    """ETH/BTC USD for the dashboard ticker — HL mids from memory (null once older than MAX_QUOTE_AGE),
+    same shape as the old CoinGecko proxy."""
+    from api.price_feed import feed
+    return {"ethereum": {"usd": feed.get("ETH")}, "bitcoin": {"usd": feed.get("BTC")}}
@@ -4,8 +4,8 @@ SQLAlchemy ORM models — mirrors the MariaDB schema in SAAS_PLAN.md.
 
 from datetime import datetime
 from sqlalchemy import (
-    BigInteger, Boolean, Column, DateTime, Numeric,
-    Enum, ForeignKey, Integer, JSON, String, Text, UniqueConstraint,
+    BigInteger, Boolean, Column, Date, DateTime, Numeric,
+    Enum, ForeignKey, Index, Integer, JSON, String, Text, UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
 from api.database import Base
@@ -83,6 +83,11 @@ class BotConfig(Base):
 
 class BotEvent(Base):
     __tablename__ = "bot_events"
+    __table_args__ = (
+        Index("idx_bevents_config_type_ts", "config_id", "event_type", "ts"),
+        Index("idx_bevents_config_ts", "config_id", "ts"),
+        Index("idx_bevents_ts", "ts"),
+    )
 
     id            = Column(BigInteger, primary_key=True, autoincrement=True)
     config_id     = Column(Integer, ForeignKey("bot_configs.id", ondelete="CASCADE"), nullable=False)
@@ -112,6 +117,40 @@ class BotEvent(Base):
     config = relationship("BotConfig", back_populates="events")
 
 
+class BotEventArchive(Base):
+    """bot_events rows past the retention window, moved by api/bot_events_retention.py.
+
+    Same columns and ids as bot_events; event_type is a plain string so the
+    archive never needs the enum migrations, and there is no FK so rows
+    outlive the hot table's cascade.
+    """
+    __tablename__ = "bot_events_archive"
+    __table_args__ = (
+        Index("idx_bearchive_config_ts", "config_id", "ts"),
+    )
+
+    id             = Column(BigInteger, primary_key=True, autoincrement=False)
+    config_id      = Column(Integer,    nullable=False)
+    event_type     = Column(String(32), nullable=False)
+    price_at_event = Column(Numeric(20, 8), nullable=True)
+    pnl            = Column(Numeric(20, 8), nullable=True)
+    details        = Column(JSON,       nullable=True)
+    ts             = Column(DateTime,   nullable=True)
+    archived_at    = Column(DateTime,   default=datetime.utcnow)
+
+
+class BotEventRollup(Base):
+    """Per config / UTC day / event type totals of archived bot_events."""
+    __tablename__ = "bot_event_rollups"
+
+    config_id  = Column(Integer,    primary_key=True)
+    day        = Column(Date,       primary_key=True)
+    event_type = Column(String(32), primary_key=True)
+    events     = Column(Integer,    nullable=False, default=0)
+    pnl        = Column(Numeric(20, 8), nullable=False, default=0)
+    notional   = Column(Numeric(20, 2), nullable=False, default=0)   # sum of details.notional
+
+
 class TelegramLink(Base):
     """
     Maps wallet ↔ Telegram chat_id for push alerts.
@@ -163,6 +202,11 @@ class SignalSource(Base):
 class SignalEvent(Base):
     """Every parsed trading signal from a Telegram signal source."""
     __tablename__ = "signal_events"
+    __table_args__ = (
+        Index("idx_sevents_received", "received_at"),
+        Index("idx_sevents_status_received", "status", "received_at"),
+        Index("idx_sevents_status_source", "status", "source_id"),
+    )
 
     id          = Column(Integer,      primary_key=True, autoincrement=True)
     source_id   = Column(Integer,      ForeignKey("signal_sources.id"), nullable=False)
@@ -189,6 +233,12 @@ class SignalEvent(Base):
 class SignalExecution(Base):
     """Records when a user executes a signal."""
     __tablename__ = "signal_executions"
+    __table_args__ = (
+        Index("idx_sexec_signal_outcome_time", "signal_id", "outcome", "executed_at"),
+        Index("idx_sexec_open", "outcome", "close_price", "hl_wallet_addr", "signal_id"),
+        Index("idx_sexec_wallet_time", "hl_wallet_addr", "executed_at"),
+        Index("idx_sexec_executed", "executed_at"),
+    )
 
     id             = Column(Integer,     primary_key=True, autoincrement=True)
     signal_id      = Column(Integer,     ForeignKey("signal_events.id"), nullable=False)
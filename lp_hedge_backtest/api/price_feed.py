@@ -0,0 +1,184 @@
+"""
+Live Hyperliquid mid prices for the whole API process.
+
+One allMids WebSocket subscription (hyperliquid SDK) feeds an in-memory map
+coin → (mid, received_at). Every price read in the API is a dict lookup —
+no outbound request per call.
+
+  - WS callback runs on the SDK thread and swaps in a new dict (copy-on-write),
+    so readers never take a lock and never see a half-applied update
+  - If no WS update arrives for STALE_AFTER seconds, allMids is polled over REST
+    every REST_INTERVAL seconds until the socket delivers again
+  - If the socket stays silent for WS_RESTART_AFTER seconds it is recreated
+  - The latest mids are published to data_cache/hl_mids.json (atomic replace)
+    so bot subprocesses (WhaleTracker) read them instead of polling HL themselves
+"""
+
+import asyncio
+import json
+import os
+import time
+
+import httpx
+
+HL_INFO_URL      = "https://api.hyperliquid.xyz/info"
+STALE_AFTER      = 10    # seconds without a WS update before REST fallback kicks in
+REST_INTERVAL    = 5     # REST poll cadence while stale
+WS_RESTART_AFTER = 60    # recreate the socket after this long without a message
+MAX_QUOTE_AGE    = 6 * STALE_AFTER   # older mids are not served as prices (WS and REST both down)
+TICK             = 1.0   # supervisor loop cadence (also the publish cadence)
+
+_BASE_DIR     = os.path.join(os.path.dirname(__file__), "..")
+MIDS_SNAPSHOT = os.getenv("HL_MIDS_SNAPSHOT", os.path.join(_BASE_DIR, "data_cache", "hl_mids.json"))
+
+
+class PriceFeed:
+    """Process-wide HL mid-price cache fed by a single allMids subscription."""
+
+    def __init__(self, snapshot_path: str = MIDS_SNAPSHOT):
+        self.snapshot_path = snapshot_path
+        self._mids: dict[str, tuple[float, float]] = {}   # coin → (mid, received_at)
+        self._info = None
+        self._ws_last_msg  = 0.0
+        self._ws_started   = 0.0
+        self._last_update  = 0.0
+        self._last_publish = 0.0
+        self._last_rest    = 0.0
+        self.source: str | None = None
+        self.stats = {"ws_updates": 0, "rest_fetches": 0, "rest_errors": 0, "ws_restarts": 0}
+
+    # ── Reads (O(1), lock-free) ────────────────────────────────────────────
+
+    def get(self, coin: str, max_age: float | None = MAX_QUOTE_AGE) -> float | None:
+        """Latest mid, or None if unseen or older than max_age seconds (None = any age)."""
+        entry = self._mids.get(coin)
+        if not entry or (max_age is not None and time.time() - entry[1] > max_age):
+            return None
+        return entry[0]
+
+    def quote(self, coin: str) -> tuple[float, float] | None:
+        """(mid, age_seconds) or None if the coin has never been seen."""
+        entry = self._mids.get(coin)
+        if not entry:
+            return None
+        return entry[0], time.time() - entry[1]
+
+    def mids(self) -> dict[str, float]:
+        return {coin: px for coin, (px, _) in self._mids.items()}
+
+    def status(self) -> dict:
+        now = time.time()
+        return {
+            "coins":      len(self._mids),
+            "source":     self.source,
+            "age_s":      round(now - self._last_update, 1) if self._last_update else None,
+            "ws_age_s":   round(now - self._ws_last_msg, 1) if self._ws_last_msg else None,
+            **self.stats,
+        }
+
+    # ── Writers ────────────────────────────────────────────────────────────
+
+    def _apply(self, raw: dict, source: str):
+        now  = time.time()
+        mids = dict(self._mids)
+        for coin, px in raw.items():
+            try:
+                mids[coin] = (float(px), now)
+            except (TypeError, ValueError):
+                continue
+        self._mids        = mids          # single reference swap — readers see old or new, never partial
+        self._last_update = now
+        self.source       = source
+
+    def _on_ws_mids(self, msg: dict):
+        try:
+            self._apply(msg.get("data", {}).get("mids", {}), "ws")
+            self._ws_last_msg = time.time()
+            self.stats["ws_updates"] += 1
+        except Exception as e:
+            print(f"[PriceFeed] WS message error: {e}", flush=True)
+
+    def _start_ws(self):
+        """Blocking — SDK Info() fetches meta over REST before opening the socket."""
+        self._ws_started = time.time()              # also paces retries when startup fails
+        from hyperliquid.info import Info
+        from hyperliquid.utils import constants
+        if self._info is not None:
+            try:
+                self._info.disconnect_websocket()
+            except Exception:
+                pass
+            self._info = None
+            self.stats["ws_restarts"] += 1
+        info = Info(constants.MAINNET_API_URL, skip_ws=False)
+        info.subscribe({"type": "allMids"}, self._on_ws_mids)
+        self._info = info
+        print("[PriceFeed] allMids WS subscribed", flush=True)
+
+    async def _fetch_rest(self, client: httpx.AsyncClient):
+        self._last_rest = time.time()
+        try:
+            r = await client.post(HL_INFO_URL, json={"type": "allMids"})
+            r.raise_for_status()
+            self._apply(r.json(), "rest")
+            self.stats["rest_fetches"] += 1
+        except Exception as e:
+            self.stats["rest_errors"] += 1
+            print(f"[PriceFeed] REST allMids error: {e}", flush=True)
+
+    def _publish(self):
+        os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+        tmp = f"{self.snapshot_path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"saved_at": self._last_update, "source": self.source, "mids": self.mids()}, f)
+        os.replace(tmp, self.snapshot_path)
+        self._last_publish = self._last_update
+
+    # ── Supervisor loop ────────────────────────────────────────────────────
+
+    async def run(self):
+        async with httpx.AsyncClient(timeout=5, headers={"Content-Type": "application/json"}) as client:
+            await self._fetch_rest(client)               # serve prices before the socket is up
+            try:
+                await asyncio.to_thread(self._start_ws)
+            except Exception as e:
+                print(f"[PriceFeed] WS start failed, REST only for now: {e}", flush=True)
+
+            while True:
+                await asyncio.sleep(TICK)
+                now = time.time()
+
+                if now - self._ws_last_msg > STALE_AFTER and now - self._last_rest >= REST_INTERVAL:
+                    await self._fetch_rest(client)
+
+                if now - max(self._ws_last_msg, self._ws_started) > WS_RESTART_AFTER:
+                    print("[PriceFeed] WS silent — reconnecting", flush=True)
+                    try:
+                        await asyncio.to_thread(self._start_ws)
+                    except Exception as e:
+                        print(f"[PriceFeed] WS restart failed: {e}", flush=True)
+
+                if self._last_update > self._last_publish:
+                    try:
+                        self._publish()
+                    except OSError as e:
+                        print(f"[PriceFeed] snapshot write error: {e}", flush=True)
+
+    def stop(self):
+        if self._info is not None:
+            try:
+                self._info.disconnect_websocket()
+            except Exception:
+                pass
+            self._info = None
+
+
+feed = PriceFeed()
+
+
+async def run_price_feed():
+    """Lifespan task entry point."""
+    try:
+        await feed.run()
+    finally:
+        feed.stop()
@@ -13,9 +13,10 @@ from sqlalchemy import func, select, update
 from sqlalchemy.orm import selectinload
 
 from api.auth import get_current_admin
+from api.bot_events_retention import event_history
 from api.bot_manager import manager
 from api.database import AsyncSessionLocal
-from api.models import BotConfig, BotEvent, SignalEvent, SignalExecution, SignalUserDefault, SignalWallet, User
+from api.models import BotConfig, BotEvent, BotEventRollup, SignalEvent, SignalExecution, SignalUserDefault, SignalWallet, User
 
 _BASE_DIR    = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 _CACHE_DIR   = os.path.join(_BASE_DIR, "data_cache")
@@ -742,6 +743,32 @@ async def refresh_lp_range(admin: str = Depends(get_current_admin)):
             pass
 
 
+# ── Latency ────────────────────────────────────────────────────────────────
+
+@router.get("/latency")
+async def latency_metrics(admin: str = Depends(get_current_admin)):
+    """
+    Hot-path timing per bot, merged from the bots' periodic `latency` events
+    (tick pickup, trigger, market_open, fill confirm, native SL, positions()
+    RPC, ...), plus the API's own signal-order and bot_events write spans.
+    Each span reports n, mean/p50/p90/p99/max in ms.
+    """
+    from api.signal_executor import LATENCY as signal_latency
+    return {
+        "bots": manager.latency_summary(),
+        "api":  {**signal_latency.summary(), **manager.db_latency.summary()},
+    }
+
+
+# ── Telegram ───────────────────────────────────────────────────────────────
+
+@router.get("/telegram")
+async def telegram_dispatch_status(admin: str = Depends(get_current_admin)):
+    """Telegram alert dispatcher counters: sends, merged bursts, 429s, cache hit rate."""
+    from api.telegram_alerts import dispatcher
+    return dispatcher.status()
+
+
 # ── Overview ───────────────────────────────────────────────────────────────
 
 @router.get("/overview")
@@ -764,16 +791,7 @@ async def admin_overview(admin: str = Depends(get_current_admin)):
         whale_bots = 0
 
         for cfg in configs:
-            # Last event
-            evt_result = await db.execute(
-                select(BotEvent)
-                .where(BotEvent.config_id == cfg.id)
-                .order_by(BotEvent.id.desc())
-                .limit(1)
-            )
-            last_evt = evt_result.scalar_one_or_none()
-
-            # Recent events (last 5 with full details)
+            # Recent events (last 5 with full details); the first is the last event
             recent_result = await db.execute(
                 select(BotEvent)
                 .where(BotEvent.config_id == cfg.id)
@@ -781,6 +799,7 @@ async def admin_overview(admin: str = Depends(get_current_admin)):
                 .limit(5)
             )
             recent_evts = recent_result.scalars().all()
+            last_evt = recent_evts[0] if recent_evts else None
 
             # x_max_eth from last started event (used for pool value estimate)
             started_result = await db.execute(
@@ -793,17 +812,21 @@ async def admin_overview(admin: str = Depends(get_current_admin)):
             started_evt = started_result.scalar_one_or_none()
             x_max_eth = float(started_evt.details.get("x_max_eth", 0)) if started_evt and started_evt.details else None
 
-            # Volume: sum notionals from hedge_opened events
+            # Volume: sum notionals from hedge_opened events (hot table + archived rollups)
             vol_result = await db.execute(
-                select(BotEvent)
+                select(BotEvent.details)
                 .where(BotEvent.config_id == cfg.id)
                 .where(BotEvent.event_type == "hedge_opened")
             )
-            hedge_events = vol_result.scalars().all()
-            config_volume = sum(
-                float(e.details.get("notional", 0))
-                for e in hedge_events
-                if e.details
+            archived_volume = (await db.execute(
+                select(func.coalesce(func.sum(BotEventRollup.notional), 0))
+                .where(BotEventRollup.config_id == cfg.id)
+                .where(BotEventRollup.event_type == "hedge_opened")
+            )).scalar_one()
+            config_volume = float(archived_volume) + sum(
+                float(details.get("notional", 0))
+                for details in vol_result.scalars().all()
+                if details
             )
             total_volume += config_volume
 
@@ -951,23 +974,17 @@ async def pool_hl_detail(config_id: int, admin: str = Depends(get_current_admin)
         if not cfg:
             raise HTTPException(status_code=404, detail="Pool config not found")
 
-        # Full event history (last 20)
-        evt_result = await db.execute(
-            select(BotEvent)
-            .where(BotEvent.config_id == config_id)
-            .order_by(BotEvent.id.desc())
-            .limit(20)
-        )
-        events = evt_result.scalars().all()
+        # Full event history (last 20, archive included)
+        events = await event_history(db, config_id, 20)
 
     events_data = [
         {
-            "id":      e.id,
-            "type":    e.event_type,
-            "price":   float(e.price_at_event) if e.price_at_event else None,
-            "pnl":     float(e.pnl) if e.pnl else None,
-            "ts":      e.ts.isoformat() if e.ts else None,
-            "details": e.details,
+            "id":      e["id"],
+            "type":    e["event_type"],
+            "price":   float(e["price_at_event"]) if e["price_at_event"] else None,
+            "pnl":     float(e["pnl"]) if e["pnl"] else None,
+            "ts":      e["ts"].isoformat() if e["ts"] else None,
+            "details": e["details"],
         }
         for e in events
     ]
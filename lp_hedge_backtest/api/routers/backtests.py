@@ -0,0 +1,59 @@
+"""
+Backtests router — stored backtest runs for dashboard charts.
+
+  GET /backtests                         Stored runs (newest first)
+  GET /backtests/{key}/series            Chart-sized equity_curve columns for one strategy
+
+Series are decimated server-side (min/max per bucket), so a multi-year 1m run
+costs the same to chart as a one-week run. Full-range requests at a stored
+zoom level (500 / 2000 / 8000 points) read only precomputed rows.
+"""
+
+import asyncio
+import math
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from api.auth import get_current_address
+from src.reporting.results_store import ResultsStore
+
+router = APIRouter(prefix="/backtests", tags=["backtests"])
+
+_store = ResultsStore()
+
+
+@router.get("")
+async def list_backtests(address: str = Depends(get_current_address)):
+    return {"runs": await asyncio.to_thread(_store.list_runs)}
+
+
+@router.get("/{key}/series")
+async def backtest_series(
+    key:      str,
+    strategy: str                = Query("avaro"),
+    columns:  str                = Query("total_equity", description="Comma-separated equity_curve columns"),
+    points:   int                = Query(2000, ge=50, le=20000),
+    start:    Optional[datetime] = None,
+    end:      Optional[datetime] = None,
+    address:  str                = Depends(get_current_address),
+):
+    if "/" in key or key.startswith(".") or not _store.has(key):
+        raise HTTPException(status_code=404, detail="Run not found")
+    cols = [c.strip() for c in columns.split(",") if c.strip()]
+    try:
+        frame = await asyncio.to_thread(_store.load_series, key, strategy, cols, points, start, end)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Unknown strategy or column: {e}")
+
+    def _clean(values):
+        return [None if isinstance(v, float) and math.isnan(v) else v for v in values]
+
+    return {
+        "key":       key,
+        "strategy":  strategy,
+        "points":    len(frame),
+        "timestamp": [t.isoformat() + "Z" for t in frame["timestamp"]],
+        **{c: _clean(frame[c].tolist()) for c in cols},
+    }
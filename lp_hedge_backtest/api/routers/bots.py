@@ -10,13 +10,16 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, field_validator
-from sqlalchemy import select, desc
+from sqlalchemy import delete, select, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.auth import get_current_address
+from api.bot_events_retention import event_history
 from api.crypto import decrypt, encrypt
 from api.database import get_db
-from api.models import BotConfig, BotEvent, User
+from api.models import BotConfig, BotEvent, BotEventArchive, BotEventRollup, User
+from api.price_feed import STALE_AFTER, feed
+from api.telegram_alerts import dispatcher
 
 router = APIRouter(prefix="/bots", tags=["bots"])
 
@@ -331,6 +334,7 @@ async def update_bot(
 
     await db.commit()
     await db.refresh(cfg)
+    dispatcher.invalidate(config_id=config_id)
     return cfg
 
 
@@ -381,7 +385,11 @@ async def delete_bot(
     if cfg.active:
         raise HTTPException(status_code=409, detail="Stop the bot before deleting its config")
     await db.delete(cfg)
+    # Archived history has no FK cascade — drop it with the config
+    await db.execute(delete(BotEventArchive).where(BotEventArchive.config_id == config_id))
+    await db.execute(delete(BotEventRollup).where(BotEventRollup.config_id == config_id))
     await db.commit()
+    dispatcher.invalidate(config_id=config_id)
 
 
 @router.get("/hl-balance")
@@ -458,7 +466,8 @@ async def hl_position(
       side          — "SHORT" | "LONG" | null
       size          — absolute contract size (positive)
       entry_px      — average entry price
-      mark_px       — current mark price from all_mids()
+      mark_px       — current mid from the in-process price feed (REST all_mids()
+                      only when the feed's quote is older than STALE_AFTER)
       unrealized_pnl — USD P&L at mark price
       account_value — total wallet account value
     """
@@ -468,6 +477,7 @@ async def hl_position(
         pair_upper = cfg.pair.upper()
         if "BTC" in pair_upper:
             coin = "BTC"
+    feed_px = feed.get(coin, max_age=STALE_AFTER)
 
     def _sync():
         try:
@@ -475,8 +485,7 @@ async def hl_position(
             from hyperliquid.utils import constants
             info  = Info(constants.MAINNET_API_URL, skip_ws=True)
             state = info.user_state(cfg.hl_wallet_addr)
-            mids  = info.all_mids()
-            mark_px = float(mids.get(coin, 0))
+            mark_px = feed_px if feed_px is not None else float(info.all_mids().get(coin, 0))
 
             account_value = float(state.get("marginSummary", {}).get("accountValue", 0))
 
@@ -588,16 +597,11 @@ async def get_events(
     address: str = Depends(get_current_address),
     db: AsyncSession = Depends(get_db),
 ):
+    """Newest first; pages past the retention window come from bot_events_archive."""
     from datetime import timedelta
     await _get_own_config(config_id, address, db)  # ownership check
-    q = select(BotEvent).where(BotEvent.config_id == config_id)
-    if hours is not None:
-        since = datetime.utcnow() - timedelta(hours=hours)
-        q = q.where(BotEvent.ts >= since)
-    result = await db.execute(
-        q.order_by(desc(BotEvent.ts)).limit(limit).offset(offset)
-    )
-    return result.scalars().all()
+    since = datetime.utcnow() - timedelta(hours=hours) if hours is not None else None
+    return await event_history(db, config_id, limit, offset, since)
 
 
 @router.get("/{config_id}/status")
@@ -23,16 +23,16 @@ import time
 from datetime import datetime, timedelta
 from typing import Optional
 
-import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from sqlalchemy import desc, select, update
+from sqlalchemy import and_, case, desc, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.auth import get_current_address, get_current_admin
 from api.crypto import encrypt, decrypt
 from api.database import get_db
 from api.models import BotConfig, SignalEvent, SignalExecution, SignalSource, SignalUserDefault, SignalWallet
+from api.price_feed import MAX_QUOTE_AGE, feed
 from api.signal_executor import place_hl_order
 
 SIGNAL_EXPIRY_HOURS = 7
@@ -386,22 +386,15 @@ async def get_signal_price(
     symbol:  str,
     address: str = Depends(get_current_address),
 ):
-    sym = symbol.upper().strip()
-    try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            r = await client.post(
-                "https://api.hyperliquid.xyz/info",
-                json={"type": "allMids"},
-                headers={"Content-Type": "application/json"},
-            )
-            r.raise_for_status()
-            mids = r.json()
-        price = mids.get(sym)
-        if price is None:
-            return {"symbol": sym, "price": None, "available": False}
-        return {"symbol": sym, "price": float(price), "available": True}
-    except Exception as e:
-        return {"symbol": sym, "price": None, "available": False, "error": str(e)}
+    sym   = symbol.upper().strip()
+    quote = feed.quote(sym)
+    if quote is None:
+        return {"symbol": sym, "price": None, "available": False}
+    price, age = quote
+    if age > MAX_QUOTE_AGE:
+        # Feed is down (WS and REST fallback) — don't present a frozen mid as live
+        return {"symbol": sym, "price": None, "available": False, "age_s": round(age, 1)}
+    return {"symbol": sym, "price": price, "available": True, "age_s": round(age, 1)}
 
 
 def _calc_pnl(direction: str, leverage: int, fill_price: float,
@@ -427,27 +420,52 @@ async def signal_history(
     db:      AsyncSession = Depends(get_db),
     address: str          = Depends(get_current_address),
 ):
-    events_res = await db.execute(
-        select(SignalEvent)
+    # One round-trip: the page of closed signals, each joined to its most recent
+    # filled execution (ROW_NUMBER over idx_sexec_signal_outcome_time), with the
+    # TP/SL/expired counts for the page as window sums on every row.
+    page = (
+        select(SignalEvent.__table__)
         .where(SignalEvent.status.in_(["stopped", "tp_hit", "expired", "cancelled", "executed"]))
         .order_by(desc(SignalEvent.received_at))
         .limit(limit)
+        .cte("page")
+    )
+    latest = (
+        select(
+            SignalExecution.signal_id,
+            SignalExecution.fill_price,
+            SignalExecution.close_price,
+            func.row_number().over(
+                partition_by=SignalExecution.signal_id,
+                order_by=(desc(SignalExecution.executed_at), desc(SignalExecution.id)),
+            ).label("rn"),
+        )
+        .join(page, page.c.id == SignalExecution.signal_id)
+        .where(SignalExecution.outcome == "filled")
+        .subquery("latest")
     )
-    events = events_res.scalars().all()
+
+    def _count(cond):
+        return func.sum(case((cond, 1), else_=0)).over()
+
+    rows = (await db.execute(
+        select(
+            page,
+            latest.c.fill_price,
+            latest.c.close_price,
+            _count(page.c.status == "tp_hit").label("tp_n"),
+            _count(page.c.status == "stopped").label("sl_n"),
+            _count(page.c.status.in_(["expired", "cancelled"])).label("exp_n"),
+        )
+        .outerjoin(latest, and_(latest.c.signal_id == page.c.id, latest.c.rn == 1))
+        .order_by(desc(page.c.received_at))
+    )).all()
 
     history = []
-    for ev in events:
+    for ev in rows:
         d = _signal_to_dict(ev)
-        # Most recent filled execution for this signal
-        exc_res = await db.execute(
-            select(SignalExecution)
-            .where(SignalExecution.signal_id == ev.id, SignalExecution.outcome == "filled")
-            .order_by(desc(SignalExecution.executed_at))
-            .limit(1)
-        )
-        exc = exc_res.scalar_one_or_none()
-        fill  = float(exc.fill_price)  if exc and exc.fill_price  else None
-        close = float(exc.close_price) if exc and exc.close_price else None
+        fill  = float(ev.fill_price)  if ev.fill_price  else None
+        close = float(ev.close_price) if ev.close_price else None
         d["fill_price"]  = fill
         d["close_price"] = close
         d["pnl_pct"]     = _calc_pnl(
@@ -457,9 +475,9 @@ async def signal_history(
         d["estimated_pnl"] = close is None and d["pnl_pct"] is not None
         history.append(d)
 
-    tp_n      = sum(1 for s in history if s["status"] == "tp_hit")
-    sl_n      = sum(1 for s in history if s["status"] == "stopped")
-    exp_n     = sum(1 for s in history if s["status"] in ("expired", "cancelled"))
+    tp_n      = int(rows[0].tp_n)  if rows else 0
+    sl_n      = int(rows[0].sl_n)  if rows else 0
+    exp_n     = int(rows[0].exp_n) if rows else 0
     decided   = tp_n + sl_n
     win_rate  = round(tp_n / decided * 100) if decided else None
 
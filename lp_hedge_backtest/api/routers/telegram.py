@@ -22,7 +22,7 @@ from sqlalchemy import desc
 from api.auth import get_current_address
 from api.database import AsyncSessionLocal
 from api.models import BotConfig, BotEvent, TelegramLink
-from api.telegram_alerts import send_message
+from api.telegram_alerts import dispatcher, send_message
 
 router = APIRouter(prefix="/telegram", tags=["telegram"])
 
@@ -216,6 +216,7 @@ async def _handle_start(chat_id: int, wallet: str):
         if not already_linked:
             db.add(TelegramLink(user_address=wallet, telegram_chat_id=chat_id))
             await db.commit()
+            dispatcher.invalidate(address=wallet)
 
     short  = f"{wallet[:6]}...{wallet[-4:]}"
     prefix = "✅ *Wallet ya vinculada*" if already_linked else "✅ *Wallet vinculada!*"
@@ -251,6 +252,8 @@ async def _handle_unlink(chat_id: int, arg: str = ""):
                 delete(TelegramLink).where(TelegramLink.telegram_chat_id == chat_id)
             )
             await db.commit()
+            for l in links:
+                dispatcher.invalidate(address=l.user_address)
             await send_message(
                 chat_id,
                 f"🔕 *All wallets unlinked* ({len(links)} removed)\n\n"
@@ -271,6 +274,7 @@ async def _handle_unlink(chat_id: int, arg: str = ""):
                 )
             )
             await db.commit()
+            dispatcher.invalidate(address=arg)
             remaining = len(links) - 1
             msg = (
                 f"🔕 *Unlinked* `{arg[:6]}...{arg[-4:]}`\n\n"
@@ -288,6 +292,7 @@ async def _handle_unlink(chat_id: int, arg: str = ""):
                 delete(TelegramLink).where(TelegramLink.telegram_chat_id == chat_id)
             )
             await db.commit()
+            dispatcher.invalidate(address=wallet)
             await send_message(
                 chat_id,
                 f"🔕 *Unlinked* `{wallet[:6]}...{wallet[-4:]}`\n\nUse /start to re-link at any time.",
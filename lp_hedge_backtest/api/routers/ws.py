@@ -1,11 +1,19 @@
 """
-WebSocket endpoint — streams live bot events to the dashboard.
+WebSocket endpoints — stream live bot events to the dashboard.
 
 WS URL: /ws/{bot_id}?token=<jwt>
-Client receives JSON objects: { event, price, pnl, details, ts }
+Client receives JSON objects:
+  { config_id, event, price, pnl, details, ts }       structured event
+  { type: "logs", config_id, lines: [{msg, ts}] }     batched stdout lines
+  { type: "resync", dropped, bots: [...] }            sent instead of the
+      frames a slow client missed: per bot running / last_seen / recent events
+  { event: "ping" }                                   keepalive every 30 s
+
+Admin URL: /ws/admin?token=<admin jwt>[&config_ids=1,2,3]
+One socket multiplexing every bot (or the listed ones); opens with a
+{ type: "snapshot", bots: [...] } frame, then the same frames as above.
 """
 
-import asyncio
 import json
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
@@ -18,6 +26,52 @@ from api.models import BotConfig
 
 router = APIRouter(tags=["realtime"])
 
+_PING = json.dumps({"event": "ping"})
+
+
+async def _pump(websocket: WebSocket, sub):
+    """Send the subscriber's frames until the socket goes away."""
+    try:
+        while True:
+            frame = await manager.next_frame(sub, timeout=30.0)
+            await websocket.send_text(frame if frame is not None else _PING)
+    except (WebSocketDisconnect, Exception):
+        pass
+    finally:
+        manager.unsubscribe(sub)
+
+
+# Registered before /ws/{config_id} so "admin" is not parsed as a config id
+@router.websocket("/ws/admin")
+async def ws_admin_events(
+    websocket: WebSocket,
+    token: str = Query(...),
+    config_ids: str = Query(""),
+):
+    try:
+        payload = decode_token(token)
+    except Exception:
+        await websocket.close(code=4001)
+        return
+    if not payload.get("is_admin"):
+        await websocket.close(code=4003)
+        return
+
+    try:
+        ids = {int(x) for x in config_ids.split(",") if x.strip()} or None
+    except ValueError:
+        await websocket.close(code=4400)
+        return
+
+    await websocket.accept()
+    sub = manager.subscribe_all(ids)
+    try:
+        await websocket.send_text(manager.snapshot_frame(sub, kind="snapshot"))
+    except Exception:
+        manager.unsubscribe(sub)
+        return
+    await _pump(websocket, sub)
+
 
 @router.websocket("/ws/{config_id}")
 async def ws_bot_events(
@@ -41,17 +95,4 @@ async def ws_bot_events(
             return
 
     await websocket.accept()
-
-    q = manager.subscribe(config_id)
-    try:
-        while True:
-            try:
-                payload = await asyncio.wait_for(q.get(), timeout=30.0)
-                await websocket.send_text(json.dumps(payload))
-            except asyncio.TimeoutError:
-                # Send a keepalive ping
-                await websocket.send_text(json.dumps({"event": "ping"}))
-    except (WebSocketDisconnect, Exception):
-        pass
-    finally:
-        manager.unsubscribe(config_id, q)
+    await _pump(websocket, manager.subscribe(config_id))
@@ -3,6 +3,7 @@ HL order placement helper for signal copy trading.
 Synchronous — wrap with asyncio.to_thread() in async contexts.
 """
 import math
+import time
 from typing import Optional
 
 # Fixed $10 notional per trade (controlled live mode). Set to None for full size_pct sizing.
@@ -14,6 +15,10 @@ from hyperliquid.info import Info
 from hyperliquid.utils import constants
 
 from api.crypto import decrypt
+from src.reporting.latency import LatencyRecorder
+
+# Timing spans around the HL calls in place_hl_order — served by GET /admin/latency
+LATENCY = LatencyRecorder()
 
 
 def _extract_oid(resp) -> Optional[str]:
@@ -41,7 +46,8 @@ def place_hl_order(hl_wallet_addr: str, hl_secret_key_encrypted: str, signal,
         info       = Info(constants.MAINNET_API_URL, skip_ws=True)
 
         # ── Balance check (unified account: perp + spot USDC both usable as margin)
-        state   = info.user_state(hl_wallet_addr)
+        with LATENCY.span("hl_user_state"):
+            state = info.user_state(hl_wallet_addr)
         perp    = float(state["marginSummary"]["accountValue"])
         spot_usdc = 0.0
         try:
@@ -145,8 +151,11 @@ def place_hl_order(hl_wallet_addr: str, hl_secret_key_encrypted: str, signal,
 
         # ── Open market position ─────────────────────────────────────────────
         exchange = Exchange(account, constants.MAINNET_API_URL, account_address=hl_wallet_addr)
-        exchange.update_leverage(leverage, symbol)
-        order = exchange.market_open(symbol, is_buy, size, slippage=0.01)
+        with LATENCY.span("update_leverage"):
+            exchange.update_leverage(leverage, symbol)
+        t_open = time.perf_counter()
+        with LATENCY.span("market_open"):
+            order = exchange.market_open(symbol, is_buy, size, slippage=0.01)
 
         if not order or order.get("status") != "ok":
             return {"success": False, "dry_run": False, "error": f"Order failed: {order}"}
@@ -171,11 +180,13 @@ def place_hl_order(hl_wallet_addr: str, hl_secret_key_encrypted: str, signal,
         fill_price  = float(filled.get("avgPx", entry) or entry)
 
         # ── Native SL — full size, reduce_only (covers runner after TP1 partial fill)
-        sl_resp = exchange.order(
-            symbol, close_is_buy, size, sl_price,
-            {"trigger": {"triggerPx": sl_price, "isMarket": True, "tpsl": "sl"}},
-            reduce_only=True,
-        )
+        with LATENCY.span("place_native_sl"):
+            sl_resp = exchange.order(
+                symbol, close_is_buy, size, sl_price,
+                {"trigger": {"triggerPx": sl_price, "isMarket": True, "tpsl": "sl"}},
+                reduce_only=True,
+            )
+        LATENCY.record("order_to_sl", (time.perf_counter() - t_open) * 1000)
         sl_oid  = _extract_oid(sl_resp)
         tp1_oid = None
         tp2_oid = None
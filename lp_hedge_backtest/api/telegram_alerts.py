@@ -3,15 +3,41 @@ Telegram alert dispatcher for VIZNAGO bots.
 
 Sends formatted push notifications to users who have linked their wallet
 via @vizniago_bot. Fires as a background task — never blocks event handling.
+
+All sends go through one process-wide TelegramDispatcher:
+  - one pooled httpx.AsyncClient (HTTP/2 when the `h2` package is installed)
+  - config_id → (pair, mode, owner) and owner → chat_ids cached in memory;
+    the bots / telegram routers invalidate on change, entries expire after
+    CACHE_TTL as a backstop for writes from elsewhere
+  - a global token bucket (GLOBAL_RATE msg/s) plus one per chat (CHAT_RATE,
+    GROUP_RATE for group chats), matching Telegram's published limits
+  - alerts queue per chat; while a chat waits for its token, the pending
+    alerts are merged into one message (up to MAX_MESSAGE_LEN), so a burst
+    costs one send instead of twenty 429s
+  - 429s sleep for the server's retry_after and retry; network errors retry
+    with back-off. Only permanent 4xx (blocked bot, bad chat) drop a message
 """
 
 import asyncio
+import importlib.util
 import os
+import re
+import time
+from collections import deque
 
 import httpx
 
 _TOKEN    = os.getenv("TELEGRAM_BOT_TOKEN", "")
 _API_BASE = f"https://api.telegram.org/bot{_TOKEN}"
+_HTTP2    = importlib.util.find_spec("h2") is not None
+
+GLOBAL_RATE     = 25           # msg/s across all chats (Telegram: ~30)
+CHAT_RATE       = 1.0          # msg/s per private chat
+GROUP_RATE      = 20 / 60      # msg/s per group chat (Telegram: 20/min)
+CACHE_TTL       = 300          # seconds before a cached lookup is re-read
+MAX_MESSAGE_LEN = 4000         # Telegram caps text at 4096
+MAX_RETRIES     = 5            # transient failures per message before giving up
+_FOOTER         = "\n_VIZNAGO_"
 
 # Only these event types trigger a Telegram push (high-priority set)
 _ALERT_EVENTS = {
@@ -34,6 +60,9 @@ def _fmt_price(price) -> str:
     return f"${float(price):,.2f}"
 
 
+_MD_SPECIAL = re.compile(r"([_*`\[])")
+
+
 def _fmt_pnl(pnl) -> str:
     if pnl is None:
         return ""
@@ -42,9 +71,15 @@ def _fmt_pnl(pnl) -> str:
     return f"{sign}${v:.2f}"
 
 
+def _md(value):
+    """Escape legacy-Markdown entity characters in text that comes from bots or users."""
+    return _MD_SPECIAL.sub(r"\\\1", value) if isinstance(value, str) else value
+
+
 def _build_message(event_type: str, pair: str, mode: str, price, pnl, details) -> str:
-    d          = details or {}
-    mode_label = _MODE_LABELS.get(mode, mode.upper())
+    d          = {k: _md(v) for k, v in (details or {}).items()}
+    mode_label = _MODE_LABELS.get(mode) or _md(mode.upper())
+    pair       = _md(pair)
     p          = _fmt_price(price)
     lines: list[str] = []
 
@@ -103,10 +138,247 @@ def _build_message(event_type: str, pair: str, mode: str, price, pnl, details) -
                  msg if msg else "Check dashboard for details"]
 
     else:
-        lines = [f"ℹ️ *{event_type}* — {mode_label}"]
+        lines = [f"ℹ️ *{_md(event_type)}* — {mode_label}"]
+
+    return "\n".join(lines) + "\n" + _FOOTER
+
+
+class _TokenBucket:
+    """Refilling token bucket; acquire() sleeps until a token is free."""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate    = rate
+        self.burst   = burst
+        self._tokens = burst
+        self._stamp  = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp  = now
+
+    async def acquire(self):
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def _coalesce(queue: deque) -> tuple[str, int]:
+    """Pop as many queued texts as fit in one message → (text, count)."""
+    first = queue.popleft()
+    if not queue:
+        return first, 1
+    parts = [first.removesuffix(_FOOTER).rstrip()]
+    size  = len(parts[0]) + len(_FOOTER) + 1
+    while queue and size + len(queue[0]) + 2 <= MAX_MESSAGE_LEN:
+        part = queue.popleft().removesuffix(_FOOTER).rstrip()
+        parts.append(part)
+        size += len(part) + 2
+    return "\n\n".join(parts) + "\n" + _FOOTER, len(parts)
+
+
+class TelegramDispatcher:
+    """Process-wide Telegram sender: pooled client, cached targets, rate limits."""
+
+    def __init__(self):
+        self._client: httpx.AsyncClient | None = None
+        self._global  = _TokenBucket(GLOBAL_RATE, burst=GLOBAL_RATE)
+        self._buckets: dict[int, _TokenBucket] = {}
+        self._queues:  dict[int, deque]        = {}
+        self._workers: dict[int, asyncio.Task] = {}
+        self._bots:  dict[int, tuple]   = {}   # config_id → (pair, mode, user_address, cached_at)
+        self._chats: dict[str, tuple]   = {}   # user_address → (chat_ids, cached_at)
+        self.stats = {"sent": 0, "coalesced": 0, "rate_limited": 0, "retries": 0,
+                      "dropped": 0, "cache_hits": 0, "cache_misses": 0}
+
+    # ── HTTP ───────────────────────────────────────────────────────────────
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=_HTTP2, timeout=8,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._client
+
+    async def _post(self, chat_id: int, text: str) -> tuple[bool, float | None]:
+        """One sendMessage → (delivered, retry_after).
+
+        retry_after is the 429 wait, 0 for a transient error (caller backs off)
+        and None when the message can never be delivered.
+        """
+        await self._global.acquire()
+        try:
+            r = await self._http().post(
+                f"{_API_BASE}/sendMessage",
+                json={"chat_id": chat_id, "text": text, "parse_mode": "Markdown"},
+            )
+        except httpx.HTTPError as e:
+            print(f"[Telegram] Send error to {chat_id}: {e}", flush=True)
+            return False, 0
+        if r.status_code == 200:
+            self.stats["sent"] += 1
+            return True, 0.0
+        if r.status_code == 429:
+            self.stats["rate_limited"] += 1
+            try:
+                retry_after = float(r.json().get("parameters", {}).get("retry_after", 1))
+            except Exception:
+                retry_after = 1.0
+            return False, max(retry_after, 0.5)
+        if r.status_code >= 500:
+            return False, 0
+        if r.status_code == 400 and "parse entities" in r.text:
+            # Bad Markdown somewhere in a (possibly merged) message — deliver it as plain text
+            print(f"[Telegram] Markdown rejected for {chat_id} — resending as plain text", flush=True)
+            await self._global.acquire()
+            try:
+                r = await self._http().post(f"{_API_BASE}/sendMessage",
+                                            json={"chat_id": chat_id, "text": text})
+            except httpx.HTTPError as e:
+                print(f"[Telegram] Send error to {chat_id}: {e}", flush=True)
+                return False, 0
+            if r.status_code == 200:
+                self.stats["sent"] += 1
+                return True, 0.0
+            if r.status_code == 429 or r.status_code >= 500:
+                return False, 0
+        print(f"[Telegram] Send to {chat_id} rejected: HTTP {r.status_code} {r.text[:200]}", flush=True)
+        return False, None
+
+    def _bucket(self, chat_id: int) -> _TokenBucket:
+        bucket = self._buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._buckets[chat_id] = _TokenBucket(GROUP_RATE if chat_id < 0 else CHAT_RATE)
+        return bucket
+
+    async def send_now(self, chat_id: int, text: str) -> bool:
+        """Send one message immediately (command replies), honouring the rate limits."""
+        bucket = self._bucket(chat_id)
+        for attempt in range(MAX_RETRIES):
+            await bucket.acquire()
+            ok, retry_after = await self._post(chat_id, text)
+            if ok:
+                return True
+            if retry_after is None:
+                self.stats["dropped"] += 1
+                return False
+            self.stats["retries"] += 1
+            await asyncio.sleep(retry_after or min(2 ** attempt, 30))
+        self.stats["dropped"] += 1
+        return False
 
-    lines.append("\n_VIZNAGO_")
-    return "\n".join(lines)
+    # ── Alert queue ────────────────────────────────────────────────────────
+
+    def enqueue(self, chat_id: int, text: str):
+        """Queue an alert for chat_id; a per-chat worker drains (and merges) the queue."""
+        self._queues.setdefault(chat_id, deque()).append(text)
+        worker = self._workers.get(chat_id)
+        if worker is None or worker.done():
+            self._workers[chat_id] = asyncio.create_task(self._drain(chat_id))
+
+    async def _drain(self, chat_id: int):
+        queue  = self._queues[chat_id]
+        bucket = self._bucket(chat_id)
+        try:
+            while queue:
+                await bucket.acquire()          # alerts arriving meanwhile join this send
+                text, count = _coalesce(queue)
+                if count > 1:
+                    self.stats["coalesced"] += count - 1
+                for attempt in range(MAX_RETRIES):
+                    ok, retry_after = await self._post(chat_id, text)
+                    if ok:
+                        break
+                    if retry_after is None:
+                        break
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(retry_after or min(2 ** attempt, 30))
+                    await bucket.acquire()
+                if not ok:
+                    self.stats["dropped"] += count
+        finally:
+            if not queue:
+                self._queues.pop(chat_id, None)
+            if self._workers.get(chat_id) is asyncio.current_task():
+                self._workers.pop(chat_id, None)
+
+    # ── Target cache ───────────────────────────────────────────────────────
+
+    async def targets(self, config_id: int) -> tuple[tuple | None, tuple]:
+        """((pair, mode), chat_ids) for a config's owner — DB only on a cache miss."""
+        now = time.monotonic()
+        bot = self._bots.get(config_id)
+        if bot and now - bot[3] < CACHE_TTL:
+            chats = self._chats.get(bot[2])
+            if chats and now - chats[1] < CACHE_TTL:
+                self.stats["cache_hits"] += 1
+                return (bot[0], bot[1]), chats[0]
+        self.stats["cache_misses"] += 1
+
+        from sqlalchemy import select
+        from api.database import AsyncSessionLocal
+        from api.models import BotConfig, TelegramLink
+
+        async with AsyncSessionLocal() as db:
+            if not bot or now - bot[3] >= CACHE_TTL:
+                bot_res = await db.execute(
+                    select(BotConfig.pair, BotConfig.mode, BotConfig.user_address)
+                    .where(BotConfig.id == config_id)
+                )
+                row = bot_res.one_or_none()
+                if not row:
+                    return None, ()
+                bot = self._bots[config_id] = (row.pair, row.mode, row.user_address, now)
+
+            chats = self._chats.get(bot[2])
+            if not chats or now - chats[1] >= CACHE_TTL:
+                links_res = await db.execute(
+                    select(TelegramLink.telegram_chat_id).where(TelegramLink.user_address == bot[2])
+                )
+                chats = self._chats[bot[2]] = (tuple(links_res.scalars().all()), now)
+        return (bot[0], bot[1]), chats[0]
+
+    def invalidate(self, config_id: int | None = None, address: str | None = None):
+        """Drop cached lookups for one config / one wallet; no arguments clears everything."""
+        if config_id is None and address is None:
+            self._bots.clear()
+            self._chats.clear()
+            return
+        if config_id is not None:
+            self._bots.pop(config_id, None)
+        if address is not None:
+            self._chats.pop(address, None)
+
+    # ── Lifecycle ──────────────────────────────────────────────────────────
+
+    def status(self) -> dict:
+        return {
+            "http2":          _HTTP2,
+            "queued":         sum(len(q) for q in self._queues.values()),
+            "active_chats":   len(self._workers),
+            "cached_configs": len(self._bots),
+            "cached_wallets": len(self._chats),
+            **self.stats,
+        }
+
+    async def aclose(self, timeout: float = 5.0):
+        """Give queued alerts up to `timeout` seconds to go out, then close the client."""
+        workers = [t for t in self._workers.values() if not t.done()]
+        if workers:
+            _, pending = await asyncio.wait(workers, timeout=timeout)
+            for task in pending:
+                task.cancel()
+        self._workers.clear()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+dispatcher = TelegramDispatcher()
 
 
 async def send_message(chat_id: int, text: str) -> bool:
@@ -114,12 +386,7 @@ async def send_message(chat_id: int, text: str) -> bool:
     if not _TOKEN:
         return False
     try:
-        async with httpx.AsyncClient(timeout=8) as client:
-            r = await client.post(
-                f"{_API_BASE}/sendMessage",
-                json={"chat_id": chat_id, "text": text, "parse_mode": "Markdown"},
-            )
-            return r.status_code == 200
+        return await dispatcher.send_now(chat_id, text)
     except Exception as e:
         print(f"[Telegram] Send error to {chat_id}: {e}", flush=True)
         return False
@@ -127,7 +394,7 @@ async def send_message(chat_id: int, text: str) -> bool:
 
 async def send_alert(config_id: int, event_type: str, price, pnl, details):
     """
-    Look up the Telegram chat_id for this config's owner and send an alert.
+    Look up the Telegram chat_id for this config's owner and queue an alert.
     Only fires for events in _ALERT_EVENTS — silent for all others.
     """
     if event_type not in _ALERT_EVENTS:
@@ -136,28 +403,14 @@ async def send_alert(config_id: int, event_type: str, price, pnl, details):
         return
 
     try:
-        from sqlalchemy import select
-        from api.database import AsyncSessionLocal
-        from api.models import BotConfig, TelegramLink
-
-        async with AsyncSessionLocal() as db:
-            bot_res = await db.execute(
-                select(BotConfig).where(BotConfig.id == config_id)
-            )
-            bot = bot_res.scalar_one_or_none()
-            if not bot:
-                return
-
-            links_res = await db.execute(
-                select(TelegramLink).where(TelegramLink.user_address == bot.user_address)
-            )
-            links = links_res.scalars().all()
-            if not links:
-                return
-
-            msg = _build_message(event_type, bot.pair, bot.mode, price, pnl, details)
-            for link in links:
-                asyncio.create_task(send_message(link.telegram_chat_id, msg))
+        bot, chat_ids = await dispatcher.targets(config_id)
+        if not bot or not chat_ids:
+            return
+
+        pair, mode = bot
+        msg = _build_message(event_type, pair, mode, price, pnl, details)
+        for chat_id in chat_ids:
+            dispatcher.enqueue(chat_id, msg)
 
     except Exception as e:
         print(f"[Telegram] Alert error for config {config_id}: {e}", flush=True)
@@ -2259,13 +2259,25 @@ function connectBotWS(configId) {
       const data = JSON.parse(e.data);
       if (data.event === 'ping') return;
 
-      if (data.type === 'log') {
-        // Raw stdout line — append to log buffer, persist to cache, update terminal
+      if (data.type === 'logs') {
+        // Batched stdout lines — append to log buffer, persist to cache, update terminal
         if (!saas.logs[configId]) saas.logs[configId] = [];
-        saas.logs[configId].push(data.msg);
-        if (saas.logs[configId].length > LOG_MAX) saas.logs[configId].shift();
-        pushLogCache(configId, data.msg);
-        appendLogLine(configId, data.msg);
+        for (const line of data.lines || []) {
+          saas.logs[configId].push(line.msg);
+          if (saas.logs[configId].length > LOG_MAX) saas.logs[configId].shift();
+          pushLogCache(configId, line.msg);
+          appendLogLine(configId, line.msg);
+        }
+      } else if (data.type === 'resync') {
+        // Connection fell behind — server skipped the backlog, re-apply latest state
+        const snap = (data.bots || []).find(b => b.config_id === configId);
+        const last = snap?.events?.[snap.events.length - 1];
+        if (last) {
+          saas.statuses[configId] = last;
+          updateBotStatusDisplay(configId, last);
+          updateWalletDropdown();
+        }
+        appendLogLine(configId, `⟳ Resynced — ${data.dropped || 0} live updates skipped`);
       } else {
         // Structured event
         saas.statuses[configId] = data;
@@ -171,16 +171,22 @@ function connectBotWS(configId) {
   ws.onmessage = (e) => {
     try {
       const data = JSON.parse(e.data);
-      if (data.event === 'ping') return;
-      const evt = data.event || data.event_type || '';
-      if (evt.startsWith('whale_') && evt !== 'whale_snapshot') {
+      if (data.event === 'ping' || data.type === 'logs') return;
+      // Resync after a slow connection: replay the recent events it carries
+      const events = data.type === 'resync'
+        ? ((data.bots || []).find(b => b.config_id === configId)?.events || [])
+        : [data];
+      for (const ev of events) {
+        const evt = ev.event || ev.event_type || '';
+        if (!evt.startsWith('whale_') || evt === 'whale_snapshot') continue;
         if (!whale.signals[configId]) whale.signals[configId] = [];
-        whale.signals[configId].unshift(data);
+        if (whale.signals[configId].some(s => s.ts === ev.ts && s.event === ev.event)) continue;
+        whale.signals[configId].unshift(ev);
         if (whale.signals[configId].length > WHALE_SIGNAL_MAX)
           whale.signals[configId].pop();
-        prependSignalRow(data, configId);
-        updateStats();
+        prependSignalRow(ev, configId);
       }
+      updateStats();
     } catch (_) {}
   };
 
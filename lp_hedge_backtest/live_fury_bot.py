@@ -37,6 +37,7 @@ Optional env vars (defaults shown):
     FURY_MIN_GATES     — Minimum gates to open position    (default: 3)
     CANDLE_LIMIT       — How many 15m candles to fetch     (default: 100)
     CANDLE_LIMIT_1H    — How many 1h candles to fetch      (default: 50)
+    LATENCY_EMIT_SECS  — Seconds between latency events   (default: 60)
 
 Signal computation rule:
     RSI and all indicators are computed ONLY on confirmed closed candles.
@@ -62,6 +63,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from src.data.price_fetcher import PriceFetcher
 from src.indicators.technical import add_fury_indicators
 from src.hedge.standalone_perps_simulator import _ATR_FLOORS, _ATR_CEILINGS, _GATE_LEVERAGE
+from src.reporting.latency import LatencyRecorder
 
 # ── Paper trade mode ──────────────────────────────────────────────────────────
 PAPER_TRADE   = os.getenv("PAPER_TRADE", "0") == "1"
@@ -108,6 +110,9 @@ else:
 
 fetcher = PriceFetcher()
 
+# Hot-path timing spans → periodic `latency` events (p50/p99 served by the API)
+LATENCY = LatencyRecorder(emit_every=float(os.getenv("LATENCY_EMIT_SECS", "60")))
+
 
 def emit(event: str, price=None, pnl=None, details=None):
     """Emit a structured event line. BotManager parses [EVENT] prefix."""
@@ -140,6 +145,7 @@ _paper_balance = PAPER_BALANCE   # mutated by simulated closes
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
 
+@LATENCY.timed("balance_fetch")
 def get_balance() -> float:
     if PAPER_TRADE:
         return _paper_balance
@@ -147,6 +153,7 @@ def get_balance() -> float:
     return float(state["marginSummary"]["accountValue"])
 
 
+@LATENCY.timed("price_fetch")
 def get_price() -> float:
     return float(info.all_mids()[FURY_SYMBOL])
 
@@ -176,6 +183,7 @@ def check_funding_bias() -> str | None:
     return None
 
 
+@LATENCY.timed("decision")
 def evaluate_gates(row_15m: dict, row_1h: dict | None) -> tuple[dict, int, str | None]:
     """Evaluate all 6 gates. Returns (gates, score, side)."""
     ema_signal = row_15m.get("ema_signal", 0)
@@ -214,6 +222,7 @@ def evaluate_gates(row_15m: dict, row_1h: dict | None) -> tuple[dict, int, str |
     return gates, score, side
 
 
+@LATENCY.timed("candles_fetch")
 def fetch_prepared_candles():
     """Fetch and prepare 15m + 1h candles. Returns (df_15m, df_1h)."""
     symbol_pair = f"{FURY_SYMBOL}USDT"
@@ -261,9 +270,11 @@ def open_position(side: str, price: float, atr: float, gate_score: int, balance:
 
     try:
         if not PAPER_TRADE:
-            exchange.update_leverage(leverage, FURY_SYMBOL)
             is_buy = (side == "LONG")
-            order = exchange.market_open(FURY_SYMBOL, is_buy, size_contracts, slippage=0.01)
+            with LATENCY.span("update_leverage"):
+                exchange.update_leverage(leverage, FURY_SYMBOL)
+            with LATENCY.span("market_open"):
+                order = exchange.market_open(FURY_SYMBOL, is_buy, size_contracts, slippage=0.01)
 
             if order.get("status") != "ok":
                 log(f"⚠️  Order failed: {order}")
@@ -315,7 +326,8 @@ def close_position(price: float, reason: str):
         _paper_balance += pnl_usd
     else:
         try:
-            order = exchange.market_close(FURY_SYMBOL, position["size_contracts"])
+            with LATENCY.span("market_close"):
+                order = exchange.market_close(FURY_SYMBOL, position["size_contracts"])
             if order.get("status") != "ok":
                 log(f"⚠️  Close order failed: {order}")
                 emit("error", price=price, details={"msg": f"close failed: {order}"})
@@ -397,6 +409,7 @@ def main():
     log(f"Starting balance: ${daily_start_balance:.2f}")
 
     while True:
+        LATENCY.maybe_emit(emit)
         try:
             maybe_reset_circuit_breaker()
 
@@ -53,15 +53,16 @@ import os
 import sys
 import time
 import json
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from web3 import Web3
 from eth_account import Account
 from hyperliquid.exchange import Exchange
 from hyperliquid.info import Info
 from hyperliquid.utils import constants
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.notifications.outbox import EmailOutbox
+
 # ── Required ──────────────────────────────────────────────────────────────────
 # All config is injected via environment variables by BotManager (api/bot_manager.py).
 # This script must NOT be run directly — always launched by the API.
@@ -217,6 +218,9 @@ class LiveHedgeBot:
         self.last_lp_sync = 0.0            # epoch seconds of last LP / NFT check
 
         self.email_config = self._load_email_config()
+        # Mail goes through a background outbox — the trading loop never waits on SMTP
+        self.outbox = (EmailOutbox(self.email_config, RECIPIENTS, subject_prefix="🛡️ [VIZNIAGO Defensor Bajista] ")
+                       if self.email_config else None)
 
     # ── Email ──────────────────────────────────────────────────────────────────
 
@@ -229,22 +233,10 @@ class LiveHedgeBot:
             return None
 
     def send_email(self, subject, body):
-        if not self.email_config:
+        if self.outbox is None:
             return
-        try:
-            msg = MIMEMultipart()
-            msg["From"]    = self.email_config["sender_email"]
-            msg["To"]      = ", ".join(RECIPIENTS)
-            msg["Subject"] = f"🛡️ [VIZNIAGO Defensor Bajista] {subject}"
-            msg.attach(MIMEText(body, "plain"))
-            s = smtplib.SMTP(self.email_config["smtp_server"], self.email_config["smtp_port"])
-            s.starttls()
-            s.login(self.email_config["smtp_username"], self.email_config["smtp_password"])
-            s.send_message(msg)
-            s.quit()
-            print(f"📧 Email sent to {len(RECIPIENTS)} recipients", flush=True)
-        except Exception as e:
-            print(f"❌ Email failed: {e}", flush=True)
+        if not self.outbox.send(subject, body):
+            print(f"❌ Email dropped (outbox full): {subject}", flush=True)
 
     # ── On-chain ───────────────────────────────────────────────────────────────
 
@@ -12,6 +12,13 @@ V2 additions over V1:
     SL remains active and a warning event is logged.
   - LP→DB deactivation: emits lp_removed/lp_burned events that bot_manager
     picks up to set active=False and notify admin.
+  - Event-driven price loop (PRICE_FEED=ws, default): every HL WebSocket
+    allMids/trades tick runs the trigger/guard/manage pass immediately, with
+    REST polling as the fallback while the socket is down. PRICE_FEED=poll
+    keeps the V1 sleep(CHECK_INTERVAL) loop. Status lines are coalesced.
+  - Pre-armed entry: near a trigger, sizing/margin/funding/ATR are cached in
+    the background and leverage is set ahead, so a trigger is one market
+    order; native SL/TP go out as soon as the fill is confirmed.
 
 All V1 env var interface is preserved — V2 is a drop-in replacement.
 """
@@ -21,11 +28,9 @@ import os
 import sys
 import time
 import json
-import smtplib
+import threading
 from collections import deque
 from datetime import datetime, timezone
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from typing import Optional
 from web3 import Web3
 from eth_account import Account
@@ -33,6 +38,12 @@ from hyperliquid.exchange import Exchange
 from hyperliquid.info import Info
 from hyperliquid.utils import constants
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.data.price_stream import PriceStream
+from src.notifications.outbox import EmailOutbox
+from src.reporting.latency import LatencyRecorder
+
 # ── Required ──────────────────────────────────────────────────────────────────
 HL_SECRET_KEY = os.getenv("HYPERLIQUID_SECRET_KEY")
 HL_ADDRESS    = os.getenv("HYPERLIQUID_ACCOUNT_ADDRESS")
@@ -45,6 +56,12 @@ if not HL_SECRET_KEY or not HL_ADDRESS:
 RPC_URL          = os.getenv("ARBITRUM_RPC_URL",        "https://arb1.arbitrum.io/rpc")
 NFT_ID           = int(os.getenv("UNISWAP_NFT_ID",      "5364087"))
 CHECK_INTERVAL   = int(os.getenv("CHECK_INTERVAL",        "30"))
+# Price source: ws = HL WebSocket push (REST every CHECK_INTERVAL while the socket is down)
+#               poll = REST allMids every CHECK_INTERVAL (V1 behaviour)
+PRICE_FEED       = os.getenv("PRICE_FEED", "ws").strip().lower()
+WS_PRICE_CHANNEL = os.getenv("WS_PRICE_CHANNEL", "allMids")   # allMids | trades
+STATUS_INTERVAL  = float(os.getenv("STATUS_INTERVAL", "5"))    # min secs between unchanged status lines
+LATENCY_EMIT_SECS = float(os.getenv("LATENCY_EMIT_SECS", "60"))  # period of [EVENT] latency records
 CONFIG_ID        = os.getenv("CONFIG_ID")
 BOUNDS_REFRESH_H = int(os.getenv("BOUNDS_REFRESH_HOURS", "4"))
 
@@ -66,6 +83,19 @@ TRAIL_PCT      = float(os.getenv("TRAIL_PCT",       "1.5")) / 100.0
 # M2-49: ATR-adaptive breakeven — effective BE = max(BREAKEVEN_PCT, ATR_MULT_BE × ATR(ATR_PERIOD))
 ATR_PERIOD   = int(os.getenv("ATR_PERIOD",   "14"))
 ATR_MULT_BE  = float(os.getenv("ATR_MULT_BE", "1.5"))
+# Pre-arm: once price is within PREARM_DISTANCE_PCT above an armed trigger, size/margin/
+# funding/ATR are refreshed in the background every PREARM_REFRESH_SECS and leverage is set
+# ahead of time — the trigger itself only submits the market order (0 disables)
+PREARM_DISTANCE_PCT = float(os.getenv("PREARM_DISTANCE_PCT", "1.0"))
+PREARM_REFRESH_SECS = float(os.getenv("PREARM_REFRESH_SECS", "30"))
+FILL_CONFIRM_SECS   = float(os.getenv("FILL_CONFIRM_SECS",   "3"))   # max wait for a fill before SL/TP
+# WS ticks arrive several times a second: a failed or gated entry waits ENTRY_RETRY_SECS
+# before the same trigger tries again, and the trailed native SL is replaced at most every
+# SL_REPLACE_MIN_SECS and only for moves of SL_REPLACE_MIN_STEP_PCT (the code-evaluated SL
+# still follows every tick)
+ENTRY_RETRY_SECS       = float(os.getenv("ENTRY_RETRY_SECS",       "30"))
+SL_REPLACE_MIN_SECS    = float(os.getenv("SL_REPLACE_MIN_SECS",    "2"))
+SL_REPLACE_MIN_STEP    = float(os.getenv("SL_REPLACE_MIN_STEP_PCT", "0.05")) / 100.0
 # M2-47: from_above distance gate — skip entry if price is more than X% below upper_bound
 MAX_FROM_ABOVE_DIST_PCT = float(os.getenv("MAX_FROM_ABOVE_DIST_PCT", "5.0"))
 # M2-44: funding rate awareness — Phase 1 (log) + Phase 2 (optional gate)
@@ -159,6 +189,10 @@ def log_event(event_type: str, price: float = None, pnl: float = None, details:
     print(f"[EVENT] {json.dumps(record)}", flush=True)
 
 
+# Hot-path timing spans → periodic `latency` events (p50/p99 served by the API)
+LATENCY = LatencyRecorder(emit_every=LATENCY_EMIT_SECS)
+
+
 class LiveHedgeBotV2:
     def __init__(self):
         print(f"⚙️  [V2] Initializing VIZNIAGO Defensor Bajista V2 | NFT #{NFT_ID}", flush=True)
@@ -224,7 +258,26 @@ class LiveHedgeBotV2:
         self.last_hl_sync = 0.0
         self.last_lp_sync = 0.0
 
+        # ── Price feed ────────────────────────────────────────────────────────
+        self.price_stream: Optional[PriceStream] = None
+        self.price_source      = "rest"
+        self._tick_ts          = None   # when the price being acted on was received
+        self._last_status      = 0.0
+        self._last_status_key  = None
+        self._last_notice: dict = {}            # notice key → last print time (see _notice)
+        self._entry_retry_until: dict = {}      # trigger → earliest next entry attempt
+        self._native_sl_price: Optional[float] = None   # trigger of the resting native SL
+        self._last_sl_replace  = 0.0
+
+        # ── Pre-arm ───────────────────────────────────────────────────────────
+        self._prearm: Optional[dict] = None     # cached entry params, see _refresh_prearm
+        self._prearm_thread: Optional[threading.Thread] = None
+        self._order_lock = threading.Lock()     # serializes exchange actions across threads
+
         self.email_config = self._load_email_config()
+        # Mail goes through a background outbox — the trading loop never waits on SMTP
+        self.outbox = (EmailOutbox(self.email_config, RECIPIENTS, subject_prefix="🛡️ [VIZNIAGO V2 Defensor] ")
+                       if self.email_config else None)
 
     # ── Email ──────────────────────────────────────────────────────────────────
 
@@ -237,27 +290,17 @@ class LiveHedgeBotV2:
             return None
 
     def send_email(self, subject, body):
-        if not self.email_config:
+        if self.outbox is None:
             return
-        try:
-            msg = MIMEMultipart()
-            msg["From"]    = self.email_config["sender_email"]
-            msg["To"]      = ", ".join(RECIPIENTS)
-            msg["Subject"] = f"🛡️ [VIZNIAGO V2 Defensor] {subject}"
-            msg.attach(MIMEText(body, "plain"))
-            s = smtplib.SMTP(self.email_config["smtp_server"], self.email_config["smtp_port"])
-            s.starttls()
-            s.login(self.email_config["smtp_username"], self.email_config["smtp_password"])
-            s.send_message(msg)
-            s.quit()
-        except Exception as e:
-            print(f"❌ Email failed: {e}", flush=True)
+        if not self.outbox.send(subject, body):
+            print(f"❌ Email dropped (outbox full): {subject}", flush=True)
 
     # ── On-chain ───────────────────────────────────────────────────────────────
 
     def fetch_position_bounds(self):
         try:
-            pos = self.contract.functions.positions(NFT_ID).call()
+            with LATENCY.span("rpc_positions"):
+                pos = self.contract.functions.positions(NFT_ID).call()
             self.tick_lower        = pos[5]
             self.tick_upper        = pos[6]
             self.liquidity         = pos[7]
@@ -271,6 +314,7 @@ class LiveHedgeBotV2:
             print(f"❌ Error fetching position: {e}", flush=True)
             sys.exit(1)
 
+    @LATENCY.timed("price_fetch")
     def get_eth_price(self):
         try:
             return float(self.info.all_mids()["ETH"])
@@ -300,6 +344,7 @@ class LiveHedgeBotV2:
 
     # ── V2: Native SL order management ────────────────────────────────────────
 
+    @LATENCY.timed("place_native_sl")
     def _place_native_sl(self, sl_price: float, size: float) -> Optional[int]:
         """
         Place a native HL stop-market trigger order as SL.
@@ -346,6 +391,7 @@ class LiveHedgeBotV2:
             if "resting" in s0:
                 oid = s0["resting"]["oid"]
                 print(f"🛡️  [V2] Native SL placed | OID {oid} | trigger ${sl_price:.2f} | limit ${limit_px:.2f}", flush=True)
+                self._native_sl_price = sl_price
                 return oid
             if "filled" in s0:
                 # Triggered immediately — position likely already closed
@@ -361,6 +407,7 @@ class LiveHedgeBotV2:
             print(f"⚠️  [V2] Native SL placement exception: {e}", flush=True)
             return None
 
+    @LATENCY.timed("cancel_native_sl")
     def _cancel_native_sl(self) -> bool:
         """
         Cancel the current native SL order.
@@ -387,6 +434,7 @@ class LiveHedgeBotV2:
             print(f"⚠️  [V2] Native SL cancel exception: {e}", flush=True)
             return False
 
+    @LATENCY.timed("place_native_tp")
     def _place_native_tp(self, tp_price: float, size: float) -> Optional[int]:
         """
         Place a native HL take-profit trigger order.
@@ -463,6 +511,7 @@ class LiveHedgeBotV2:
             print(f"⚠️  [V2] Native TP cancel exception: {e}", flush=True)
             return False
 
+    @LATENCY.timed("replace_native_sl")
     def _replace_native_sl(self, new_sl_price: float) -> bool:
         """
         Cancel existing SL and place a new one at new_sl_price.
@@ -483,11 +532,37 @@ class LiveHedgeBotV2:
             return True
 
         # Placement failed after successful cancel — code-evaluated SL only now
+        self._native_sl_price = None
         log_event("error", details={
             "warning": f"[V2] Native SL replacement failed at ${new_sl_price:.2f} — code-evaluated only",
         })
         return False
 
+    def _trail_native_sl(self, force: bool = False):
+        """
+        Move the native SL down to current_sl_price, throttled: at most every
+        SL_REPLACE_MIN_SECS and only once the move is ≥ SL_REPLACE_MIN_STEP.
+        Called every tick while trailing, so a deferred move goes out as soon
+        as the throttle allows. force=True (breakeven) skips both checks.
+        """
+        native = self._native_sl_price
+        if not force:
+            if native is not None and native - self.current_sl_price < native * SL_REPLACE_MIN_STEP:
+                return
+            # No native SL (placement failed): retry on the slower entry cadence
+            wait = SL_REPLACE_MIN_SECS if native is not None else max(SL_REPLACE_MIN_SECS, ENTRY_RETRY_SECS)
+            if time.time() - self._last_sl_replace < wait:
+                return
+        self._last_sl_replace = time.time()
+        self._replace_native_sl(self.current_sl_price)
+
+    def _notice(self, key, msg: str):
+        """Print a repeating per-tick notice at most once per STATUS_INTERVAL per key."""
+        now = time.time()
+        if now - self._last_notice.get(key, 0.0) >= STATUS_INTERVAL:
+            self._last_notice[key] = now
+            print(msg, flush=True)
+
     # ── Position sizing ────────────────────────────────────────────────────────
 
     _MAX_MARGIN_FAILURES  = 5
@@ -509,32 +584,38 @@ class LiveHedgeBotV2:
     # M2-40: cooldown after native SL fires between polls (external_close)
     _EXT_COOLDOWN_SECS    = 300   # 5 minutes
 
-    def _calc_order_params(self, price):
+    def _calc_order_params(self, price, margin=None, notify=True):
+        """(size, leverage, notional, required_margin, x_max) or None to skip.
+        notify=False (pre-arm refresh) suppresses prints, events and emails."""
         x_max = calc_x_max_eth(self.liquidity, self.tick_lower, self.tick_upper)
         if x_max < MIN_HEDGE_ETH:
-            print(f"⚠️  X_max {x_max:.4f} ETH below minimum — skipping", flush=True)
+            if notify:
+                print(f"⚠️  X_max {x_max:.4f} ETH below minimum — skipping", flush=True)
             return None
 
         size     = round(x_max * HEDGE_RATIO / 100.0, 4)
         size     = max(size, MIN_HEDGE_ETH)
         size     = round(min(size, x_max), 4)
-        margin   = self.get_hl_margin_balance()
+        if margin is None:
+            margin = self.get_hl_margin_balance()
         notional = size * price
 
         if notional < MIN_NOTIONAL_USD:
-            print(f"⚠️  Notional ${notional:.2f} below HL min ${MIN_NOTIONAL_USD:.0f} — skipping", flush=True)
-            self.send_email(
-                "⚠️ Short SKIPPED — LP Too Small",
-                f"NFT #{NFT_ID}: hedge notional ${notional:.2f} < HL minimum ${MIN_NOTIONAL_USD:.0f}.\n"
-                f"x_max={x_max:.4f} ETH | ratio={HEDGE_RATIO}% | price=${price:,.2f}\n"
-                f"Add more liquidity to enable protection.",
-            )
+            if notify:
+                print(f"⚠️  Notional ${notional:.2f} below HL min ${MIN_NOTIONAL_USD:.0f} — skipping", flush=True)
+                self.send_email(
+                    "⚠️ Short SKIPPED — LP Too Small",
+                    f"NFT #{NFT_ID}: hedge notional ${notional:.2f} < HL minimum ${MIN_NOTIONAL_USD:.0f}.\n"
+                    f"x_max={x_max:.4f} ETH | ratio={HEDGE_RATIO}% | price=${price:,.2f}\n"
+                    f"Add more liquidity to enable protection.",
+                )
             return None
 
         if margin <= 0:
-            print("❌ HL account has no margin", flush=True)
-            self.send_email("⚠️ Short SKIPPED — No Margin",
-                f"NFT #{NFT_ID}: HL wallet has no USDC balance.")
+            if notify:
+                print("❌ HL account has no margin", flush=True)
+                self.send_email("⚠️ Short SKIPPED — No Margin",
+                    f"NFT #{NFT_ID}: HL wallet has no USDC balance.")
             return None
 
         target_lev = min(TARGET_LEVERAGE, MAX_LEVERAGE)
@@ -546,34 +627,137 @@ class LiveHedgeBotV2:
             for lev in range(leverage + 1, MAX_LEVERAGE + 1):
                 req = notional / lev
                 if margin >= req * MARGIN_BUFFER:
-                    log_event("error", details={
-                        "warning": f"Leverage auto-increased {target_lev}x→{lev}x (margin ${margin:.2f})"
-                    })
+                    if notify:
+                        log_event("error", details={
+                            "warning": f"Leverage auto-increased {target_lev}x→{lev}x (margin ${margin:.2f})"
+                        })
                     leverage        = lev
                     required_margin = req
                     reduced         = True
                     break
             if not reduced:
-                print(f"❌ Insufficient margin at {MAX_LEVERAGE}x", flush=True)
-                self.send_email("⚠️ Short SKIPPED — Low Margin",
-                    f"NFT #{NFT_ID}: not enough USDC at {MAX_LEVERAGE}x.\n"
-                    f"Available: ${margin:.2f} | Notional: ${notional:.2f}")
+                if notify:
+                    print(f"❌ Insufficient margin at {MAX_LEVERAGE}x", flush=True)
+                    self.send_email("⚠️ Short SKIPPED — Low Margin",
+                        f"NFT #{NFT_ID}: not enough USDC at {MAX_LEVERAGE}x.\n"
+                        f"Available: ${margin:.2f} | Notional: ${notional:.2f}")
                 return None
 
         return size, leverage, notional, required_margin, x_max
 
+    # ── Pre-arm ────────────────────────────────────────────────────────────────
+
+    def _near_trigger(self, price) -> bool:
+        """True when price is within PREARM_DISTANCE_PCT above a trigger that can fire."""
+        band = 1 + PREARM_DISTANCE_PCT / 100
+        if FROM_ABOVE_ENABLED and self.price_was_above and price <= self.upper_trigger * band:
+            return True
+        return self.reentry_guard_price is None and price <= self.lower_trigger * band
+
+    def _maybe_prearm(self, price):
+        """Start a background pre-arm refresh when near a trigger and the cache is old."""
+        if PREARM_DISTANCE_PCT <= 0 or not self._near_trigger(price):
+            return
+        if self._prearm_thread is not None and self._prearm_thread.is_alive():
+            return
+        if self._prearm and time.time() - self._prearm["at"] < PREARM_REFRESH_SECS:
+            return
+        self._prearm_thread = threading.Thread(
+            target=self._refresh_prearm, args=(price,), name="prearm", daemon=True)
+        self._prearm_thread.start()
+
+    def _refresh_prearm(self, price):
+        """Background: cache size/leverage/margin/funding/ATR for an entry near
+        `price` and set leverage on HL, so open_hedge only submits the order."""
+        try:
+            margin = self.get_hl_margin_balance()
+            params = self._calc_order_params(price, margin=margin, notify=False)
+            if params is None:
+                # open_hedge takes the serial path and reports why
+                self._prearm = None
+                return
+            size, leverage, _, _, x_max = params
+            prev = self._prearm
+            leverage_set = bool(prev and prev["leverage_set"] and prev["leverage"] == leverage)
+            if not leverage_set:
+                with self._order_lock:
+                    resp = self.exchange.update_leverage(leverage, "ETH")
+                leverage_set = isinstance(resp, dict) and resp.get("status") == "ok"
+            funding_rate = self._fetch_funding_rate()
+            atr          = self._fetch_atr()
+            self._prearm = {
+                "at": time.time(), "price": price, "size": size, "leverage": leverage,
+                "leverage_set": leverage_set, "margin": margin, "x_max": x_max,
+                "funding_rate": funding_rate, "atr": atr,
+            }
+            if prev is None:
+                print(f"🎯 Pre-armed at ${price:.2f}: {size:.4f} ETH @ {leverage}x "
+                      f"(leverage {'set' if leverage_set else 'NOT set'}) | margin ${margin:.2f}"
+                      + (f" | ATR ${atr:.2f}" if atr is not None else ""), flush=True)
+        except Exception as e:
+            self._prearm = None
+            print(f"⚠️  Pre-arm refresh failed: {e}", flush=True)
+
+    def _take_prearm(self, price) -> Optional[dict]:
+        """Pop the pre-arm cache if it is fresh and its margin check still holds at `price`."""
+        pre, self._prearm = self._prearm, None
+        if not pre or time.time() - pre["at"] > 2 * PREARM_REFRESH_SECS:
+            return None
+        notional = pre["size"] * price
+        required = notional / pre["leverage"]
+        if notional < MIN_NOTIONAL_USD or pre["margin"] < required * MARGIN_BUFFER:
+            return None
+        return dict(pre, notional=notional, required_margin=required)
+
+    @LATENCY.timed("fill_confirm")
+    def _confirm_fill(self, order):
+        """(filled_size, avg_px, error) for an accepted market_open response.
+        IOC fills are reported inline; otherwise user_state is polled for the
+        SHORT for up to FILL_CONFIRM_SECS. (None, None, None) if unconfirmed."""
+        statuses = ((order.get("response") or {}).get("data") or {}).get("statuses", [])
+        for st in statuses:
+            if "filled" in st:
+                return float(st["filled"]["totalSz"]), float(st["filled"]["avgPx"]), None
+            if "error" in st:
+                return 0.0, None, st["error"]
+        deadline = time.time() + FILL_CONFIRM_SECS
+        while time.time() < deadline:
+            try:
+                state = self.info.user_state(HL_ADDRESS)
+                for p in (state or {}).get("assetPositions", []):
+                    pos = p["position"]
+                    if pos["coin"] == "ETH" and float(pos["szi"]) < 0:
+                        return abs(float(pos["szi"])), float(pos["entryPx"]), None
+            except Exception as e:
+                print(f"⚠️  Fill check failed: {e}", flush=True)
+            time.sleep(0.2)
+        return None, None, None
+
     # ── Short open ─────────────────────────────────────────────────────────────
 
     def open_hedge(self, price, trigger):
         if time.time() < self._margin_backoff_until:
             remaining = int(self._margin_backoff_until - time.time())
-            print(f"⏸️  Margin backoff active — {remaining}s remaining", flush=True)
+            self._notice("margin_backoff", f"⏸️  Margin backoff active — {remaining}s remaining")
+            return
+        retry_at = self._entry_retry_until.get(trigger, 0.0)
+        if time.time() < retry_at:
+            self._notice(("entry_retry", trigger),
+                         f"⏸️  {trigger} entry retry in {int(retry_at - time.time())}s "
+                         f"(last attempt failed or was gated)")
             return
+        # Cleared once the short is open; every failed/gated path below leaves it set
+        self._entry_retry_until[trigger] = time.time() + ENTRY_RETRY_SECS
 
+        if self._tick_ts:
+            LATENCY.record("tick_to_trigger", (time.time() - self._tick_ts) * 1000)
         label = "FROM ABOVE" if trigger == "from_above" else "BELOW RANGE"
         print(f"🚨 SHORT TRIGGERED ({label}): ETH ${price:.2f}", flush=True)
         try:
-            params = self._calc_order_params(price)
+            # Pre-armed: sizing, funding, ATR and leverage are already done
+            pre    = self._take_prearm(price)
+            params = ((pre["size"], pre["leverage"], pre["notional"], pre["required_margin"], pre["x_max"])
+                      if pre else self._calc_order_params(price))
             if params is None:
                 self._margin_fail_count += 1
                 log_event("error", price=price, details={
@@ -593,10 +777,11 @@ class LiveHedgeBotV2:
 
             size, leverage, notional, req_margin, x_max = params
             print(f"📐 Size: {size:.4f} ETH | Leverage: {leverage}x | "
-                  f"Notional: ${notional:.2f} | Margin: ${req_margin:.2f}", flush=True)
+                  f"Notional: ${notional:.2f} | Margin: ${req_margin:.2f}"
+                  + (" | pre-armed" if pre else ""), flush=True)
 
             # M2-44: fetch funding rate; Phase 2 gate blocks entry if rate is too negative
-            funding_rate = self._fetch_funding_rate()
+            funding_rate = pre["funding_rate"] if pre else self._fetch_funding_rate()
             if funding_rate is not None:
                 fr_pct = funding_rate * 100
                 marker = "✓ favorable" if funding_rate >= 0 else f"⚠ cost ({fr_pct:.4f}%/1h)"
@@ -612,8 +797,12 @@ class LiveHedgeBotV2:
                     })
                     return
 
-            self.exchange.update_leverage(leverage, "ETH")
-            order = self.exchange.market_open("ETH", False, size, slippage=0.01)
+            with self._order_lock:
+                if not (pre and pre["leverage_set"]):
+                    self.exchange.update_leverage(leverage, "ETH")
+                with LATENCY.span("market_open"):
+                    order = self.exchange.market_open("ETH", False, size, slippage=0.01)
+            tick_to_order_ms = (time.time() - self._tick_ts) * 1000 if self._tick_ts else None
 
             if order is None:
                 print(f"❌ market_open returned None", flush=True)
@@ -623,25 +812,36 @@ class LiveHedgeBotV2:
                 return
 
             if order["status"] == "ok":
+                filled_size, fill_px, reject = self._confirm_fill(order)
+                if reject:
+                    print(f"❌ Order rejected: {reject}", flush=True)
+                    log_event("error", price=price, details={"msg": f"market_open rejected: {reject}"})
+                    return
+                if filled_size is None:
+                    log_event("error", price=price, details={
+                        "warning": f"[V2] Fill not confirmed within {FILL_CONFIRM_SECS:.0f}s — placing SL anyway",
+                    })
                 self._margin_fail_count    = 0
                 self._margin_backoff_until = 0.0
+                self._entry_retry_until.pop(trigger, None)
                 self.entry_price              = price
-                self.hedge_size_eth           = size
+                self.hedge_size_eth           = filled_size or size
                 self.leverage_used            = leverage
                 self.hedge_active             = True
                 self.breakeven_reached        = False
                 self.short_min_price          = price
                 self.open_trigger             = trigger
                 self.current_sl_price         = price * (1 + DEFAULT_SL_PCT)
-                self._effective_breakeven_pct = self._compute_atr_breakeven(price)  # M2-49
                 self.open_time                = time.time()                          # M2-44
 
                 print(f"✅ SHORT OPENED | Entry: ${self.entry_price:.2f} | "
-                      f"SL: ${self.current_sl_price:.2f} | Trigger: {label}", flush=True)
+                      f"SL: ${self.current_sl_price:.2f} | Trigger: {label}"
+                      + (f" | fill ${fill_px:.2f}" if fill_px else "")
+                      + (f" | tick→order {tick_to_order_ms:.0f}ms" if tick_to_order_ms is not None else ""),
+                      flush=True)
 
-                # V2: place native SL — small delay lets HL settle the fill before SL request
-                time.sleep(1)
-                oid = self._place_native_sl(self.current_sl_price, size)
+                # V2: place native SL as soon as the fill is confirmed
+                oid = self._place_native_sl(self.current_sl_price, self.hedge_size_eth)
                 if oid:
                     self.hl_sl_order_id = oid
                 else:
@@ -659,7 +859,7 @@ class LiveHedgeBotV2:
                 # V2: place native TP if configured
                 if TP_PCT is not None:
                     tp_price = self.entry_price * (1 - TP_PCT)
-                    tp_oid = self._place_native_tp(tp_price, size)
+                    tp_oid = self._place_native_tp(tp_price, self.hedge_size_eth)
                     if tp_oid:
                         self.hl_tp_order_id = tp_oid
                     else:
@@ -667,6 +867,14 @@ class LiveHedgeBotV2:
                             "warning": "[V2] Native TP placement failed at open — code-evaluated TP active",
                             "tp": round(tp_price, 4),
                         })
+                tick_to_sl_ms = (time.time() - self._tick_ts) * 1000 if self._tick_ts else None
+                if tick_to_order_ms is not None:
+                    LATENCY.record("tick_to_order", tick_to_order_ms)
+                    LATENCY.record("tick_to_sl", tick_to_sl_ms)
+
+                # M2-49: ATR from the pre-arm cache, fetched now otherwise
+                self._effective_breakeven_pct = self._compute_atr_breakeven(
+                    price, atr=pre["atr"] if pre else None)
 
                 log_event("hedge_opened", price=price, details={
                     "trigger":      trigger,
@@ -674,7 +882,8 @@ class LiveHedgeBotV2:
                     "sl":           round(self.current_sl_price, 4),
                     "sl_oid":       self.hl_sl_order_id,
                     "tp_oid":       self.hl_tp_order_id,
-                    "size_eth":     size,
+                    "size_eth":     self.hedge_size_eth,
+                    "fill_px":      fill_px,
                     "x_max":        round(x_max, 4),
                     "ratio_pct":    HEDGE_RATIO,
                     "leverage":     leverage,
@@ -683,6 +892,10 @@ class LiveHedgeBotV2:
                     "engine":       "v2",
                     "breakeven_pct":    round(self._effective_breakeven_pct * 100, 2),  # M2-49
                     "funding_rate_1h":  round(funding_rate * 100, 5) if funding_rate is not None else None,  # M2-44
+                    "price_source":     self.price_source,
+                    "tick_to_order_ms": round(tick_to_order_ms, 1) if tick_to_order_ms is not None else None,
+                    "tick_to_sl_ms":    round(tick_to_sl_ms, 1) if tick_to_sl_ms is not None else None,
+                    "prearmed":         pre is not None,
                 })
                 tp_line = (
                     f"Native TP:    ${self.entry_price * (1 - TP_PCT):.2f} (OID: {self.hl_tp_order_id or 'FAILED'})\n"
@@ -694,7 +907,7 @@ class LiveHedgeBotV2:
                     f"Trigger:      {label}\n"
                     f"NFT:          #{NFT_ID}\n"
                     f"Entry:        ${self.entry_price:.2f}\n"
-                    f"Size:         {size:.4f} ETH\n"
+                    f"Size:         {self.hedge_size_eth:.4f} ETH\n"
                     f"Leverage:     {leverage}x\n"
                     f"Notional:     ${notional:.2f}\n"
                     f"Native SL:    ${self.current_sl_price:.2f} (OID: {self.hl_sl_order_id or 'FAILED'})\n"
@@ -723,10 +936,13 @@ class LiveHedgeBotV2:
                 new_sl   = min(self.entry_price, trail_sl)
                 if new_sl < self.current_sl_price:
                     self.current_sl_price = new_sl
-                    print(f"📉 Trail SL → ${self.current_sl_price:.2f} "
-                          f"(min ${self.short_min_price:.2f} + {TRAIL_PCT*100:.1f}%)", flush=True)
-                    # V2: cancel + replace native SL
-                    self._replace_native_sl(self.current_sl_price)
+                    self._notice("trail_sl", f"📉 Trail SL → ${self.current_sl_price:.2f} "
+                                 f"(min ${self.short_min_price:.2f} + {TRAIL_PCT*100:.1f}%)")
+
+        # V2: cancel + replace native SL (throttled; catches up on deferred moves)
+        if self.breakeven_reached and (self._native_sl_price is None
+                                       or self.current_sl_price < self._native_sl_price):
+            self._trail_native_sl()
 
         # ── 2. Fixed TP check ──────────────────────────────────────────────
         if TP_PCT is not None:
@@ -756,7 +972,7 @@ class LiveHedgeBotV2:
                   f"Trail SL: ${self.current_sl_price:.2f}", flush=True)
 
             # V2: replace native SL at the new trail level
-            self._replace_native_sl(self.current_sl_price)
+            self._trail_native_sl(force=True)
 
             log_event("breakeven", price=price, pnl=pnl_est, details={
                 "sl":        round(self.current_sl_price, 4),
@@ -781,7 +997,9 @@ class LiveHedgeBotV2:
             self._cancel_native_sl()
             self._cancel_native_tp()
 
-            result = self.exchange.market_close("ETH")
+            with LATENCY.span("market_close"):
+                result = self.exchange.market_close("ETH")
+            tick_to_order_ms = (time.time() - self._tick_ts) * 1000 if self._tick_ts else None
             if result is None:
                 # M2-40: native SL fired between polls — set cooldown
                 self._ext_close_cooldown_until = time.time() + self._EXT_COOLDOWN_SECS
@@ -837,6 +1055,7 @@ class LiveHedgeBotV2:
                 log_event(reason, price=price, pnl=pnl_est, details={
                     "reentry_guard":      round(self.reentry_guard_price, 4),
                     "consecutive_stops":  self._consecutive_stops,
+                    "tick_to_order_ms":   round(tick_to_order_ms, 1) if tick_to_order_ms is not None else None,
                     **il_attr,
                     **fund_attr,
                 })
@@ -945,17 +1164,17 @@ class LiveHedgeBotV2:
         self.open_trigger        = None
         self.hl_sl_order_id      = None
         self.hl_tp_order_id      = None
+        self._native_sl_price    = None
         self.open_time           = None
         self.reentry_guard_price = close_price * (1 + REENTRY_BUFFER)
         self.sl_close_price      = close_price
         self.price_was_above     = False
+        self._prearm             = None   # margin moved with the close — re-arm fresh
 
     # ── M2-49: ATR-adaptive breakeven ────────────────────────────────────────
 
-    def _compute_atr_breakeven(self, entry_price: float) -> float:
-        """Return max(BREAKEVEN_PCT, ATR_MULT_BE × ATR(ATR_PERIOD)) as a fraction.
-        Fetches the last ATR_PERIOD+2 hourly candles from HL.
-        Falls back to the static BREAKEVEN_PCT on any failure."""
+    def _fetch_atr(self) -> Optional[float]:
+        """ATR(ATR_PERIOD) in USD from the last ATR_PERIOD+2 hourly HL candles, or None."""
         try:
             now_ms   = int(time.time() * 1000)
             start_ms = now_ms - (ATR_PERIOD + 2) * 3_600_000
@@ -963,7 +1182,7 @@ class LiveHedgeBotV2:
             if not candles or len(candles) < ATR_PERIOD + 1:
                 print(f"⚠️  [M2-49] ATR: only {len(candles) if candles else 0} candles — "
                       f"using static BE {BREAKEVEN_PCT*100:.1f}%", flush=True)
-                return BREAKEVEN_PCT
+                return None
             candles = sorted(candles, key=lambda c: c["t"])[-ATR_PERIOD - 1:]
             true_ranges = []
             for i in range(1, len(candles)):
@@ -971,17 +1190,26 @@ class LiveHedgeBotV2:
                 lo     = float(candles[i]["l"])
                 prev_c = float(candles[i - 1]["c"])
                 true_ranges.append(max(h - lo, abs(h - prev_c), abs(lo - prev_c)))
-            atr     = sum(true_ranges[-ATR_PERIOD:]) / ATR_PERIOD
-            atr_pct = atr / entry_price
-            effective = max(BREAKEVEN_PCT, ATR_MULT_BE * atr_pct)
-            marker = "↑ ATR adaptive" if effective > BREAKEVEN_PCT else "= static floor"
-            print(f"📊 [M2-49] ATR({ATR_PERIOD})=${atr:.2f} ({atr_pct*100:.2f}%) → "
-                  f"BE={effective*100:.2f}% {marker}", flush=True)
-            return effective
+            return sum(true_ranges[-ATR_PERIOD:]) / ATR_PERIOD
         except Exception as exc:
             print(f"⚠️  [M2-49] ATR fetch failed ({exc}) — using static BE {BREAKEVEN_PCT*100:.1f}%",
                   flush=True)
+            return None
+
+    def _compute_atr_breakeven(self, entry_price: float, atr: Optional[float] = None) -> float:
+        """Return max(BREAKEVEN_PCT, ATR_MULT_BE × ATR(ATR_PERIOD)) as a fraction.
+        Uses `atr` when given (pre-arm cache), otherwise fetches it from HL.
+        Falls back to the static BREAKEVEN_PCT on any failure."""
+        if atr is None:
+            atr = self._fetch_atr()
+        if atr is None:
             return BREAKEVEN_PCT
+        atr_pct   = atr / entry_price
+        effective = max(BREAKEVEN_PCT, ATR_MULT_BE * atr_pct)
+        marker = "↑ ATR adaptive" if effective > BREAKEVEN_PCT else "= static floor"
+        print(f"📊 [M2-49] ATR({ATR_PERIOD})=${atr:.2f} ({atr_pct*100:.2f}%) → "
+              f"BE={effective*100:.2f}% {marker}", flush=True)
+        return effective
 
     # ── M2-43: IL attribution ─────────────────────────────────────────────────
 
@@ -1050,6 +1278,7 @@ class LiveHedgeBotV2:
 
     # ── HL position sync ──────────────────────────────────────────────────────
 
+    @LATENCY.timed("hl_sync")
     def _sync_hl_position(self, price):
         try:
             address = self.exchange.account_address or self.exchange.wallet.address
@@ -1089,7 +1318,8 @@ class LiveHedgeBotV2:
 
     def _sync_lp_position(self, price):
         try:
-            pos       = self.contract.functions.positions(NFT_ID).call()
+            with LATENCY.span("rpc_positions"):
+                pos = self.contract.functions.positions(NFT_ID).call()
             liquidity = pos[7]
 
             if liquidity == 0:
@@ -1199,6 +1429,7 @@ class LiveHedgeBotV2:
 
                 if existing_sl:
                     self.hl_sl_order_id = existing_sl["oid"]
+                    self._native_sl_price = float(existing_sl.get("triggerPx") or self.current_sl_price)
                     print(
                         f"✅ [V2] Existing SL order found | OID {self.hl_sl_order_id} "
                         f"| trigger ${existing_sl.get('triggerPx', '?')}",
@@ -1274,14 +1505,14 @@ class LiveHedgeBotV2:
         # V2: reconcile before entering the main loop
         self._reconcile_on_startup()
 
-        lower_trigger = self.lower_bound * (1 - TRIGGER_OFFSET)
-        upper_trigger = self.upper_bound * (1 - UPPER_BUFFER)
+        self.lower_trigger = self.lower_bound * (1 - TRIGGER_OFFSET)
+        self.upper_trigger = self.upper_bound * (1 - UPPER_BUFFER)
         x_max         = calc_x_max_eth(self.liquidity, self.tick_lower, self.tick_upper)
 
         trigger_desc = (
-            f"BELOW ${lower_trigger:.2f} | FROM ABOVE @ ${upper_trigger:.2f}"
+            f"BELOW ${self.lower_trigger:.2f} | FROM ABOVE @ ${self.upper_trigger:.2f}"
             if FROM_ABOVE_ENABLED else
-            f"BELOW ${lower_trigger:.2f} only (mode=aragan/Bajista)"
+            f"BELOW ${self.lower_trigger:.2f} only (mode=aragan/Bajista)"
         )
         print(f"📐 Range:         ${self.lower_bound:.2f} — ${self.upper_bound:.2f}", flush=True)
         print(f"📐 Short triggers: {trigger_desc}", flush=True)
@@ -1305,8 +1536,8 @@ class LiveHedgeBotV2:
                 "nft_id":          NFT_ID,
                 "lower":           self.lower_bound,
                 "upper":           self.upper_bound,
-                "lower_trigger":   lower_trigger,
-                "upper_trigger":   upper_trigger,
+                "lower_trigger":   self.lower_trigger,
+                "upper_trigger":   self.upper_trigger,
                 "x_max_eth":       round(x_max, 4),
                 "hedge_ratio":     HEDGE_RATIO,
                 "target_leverage": TARGET_LEVERAGE,
@@ -1325,149 +1556,183 @@ class LiveHedgeBotV2:
                 f"NFT #{NFT_ID}\n"
                 f"Range:          ${self.lower_bound:.2f} — ${self.upper_bound:.2f}\n"
                 f"Short triggers:\n"
-                f"  1. FROM ABOVE @ ${upper_trigger:.2f}\n"
-                f"  2. BELOW RANGE @ ${lower_trigger:.2f}\n"
+                f"  1. FROM ABOVE @ ${self.upper_trigger:.2f}\n"
+                f"  2. BELOW RANGE @ ${self.lower_trigger:.2f}\n"
                 f"Init SL:        {DEFAULT_SL_PCT*100:.1f}% above entry (native HL order)\n"
                 f"Breakeven:      at {BREAKEVEN_PCT*100:.1f}% profit → trail activates\n"
                 f"Trail:          {TRAIL_PCT*100:.1f}% above min price (cancel+replace on each move)",
             )
 
+        if PRICE_FEED == "ws":
+            self.price_stream = PriceStream("ETH", channel=WS_PRICE_CHANNEL, rest_interval=CHECK_INTERVAL).start()
+            print(f"📡 Price feed: HL WebSocket {WS_PRICE_CHANNEL} (REST fallback every {CHECK_INTERVAL}s)", flush=True)
+        else:
+            print(f"📡 Price feed: REST poll every {CHECK_INTERVAL}s", flush=True)
+
         while True:
-            now   = time.time()
-            price = self.get_eth_price()
-
-            # ── Periodic safety syncs ────────────────────────────────────────
-            if self.hedge_active and now - self.last_lp_sync > HL_SYNC_INTERVAL:
-                self.last_lp_sync = now
-                self._sync_lp_position(price or 0)
-
-            if self.hedge_active and now - self.last_hl_sync > HL_SYNC_INTERVAL:
-                self.last_hl_sync = now
-                self._sync_hl_position(price or 0)
-
-            # ── Periodic bounds refresh (idle only) ──────────────────────────
-            if (not self.hedge_active and
-                    now - self.last_bounds_fetch > BOUNDS_REFRESH_H * 3600):
-                old_lower, old_upper = self.lower_bound, self.upper_bound
-                self.fetch_position_bounds()
-                lower_trigger = self.lower_bound * (1 - TRIGGER_OFFSET)
-                upper_trigger = self.upper_bound * (1 - UPPER_BUFFER)
-                if self.lower_bound != old_lower or self.upper_bound != old_upper:
-                    print(f"🔄 Range updated: ${old_lower:.2f}–${old_upper:.2f} → "
-                          f"${self.lower_bound:.2f}–${self.upper_bound:.2f}", flush=True)
-                    log_event("bounds_refreshed", details={
-                        "old_lower": old_lower, "old_upper": old_upper,
-                        "new_lower": self.lower_bound, "new_upper": self.upper_bound,
-                    })
+            if self.price_stream:
+                # Wakes on every WS tick; ticks that pile up while we act collapse into the latest
+                tick = self.price_stream.next_price(timeout=CHECK_INTERVAL)
+                price, self._tick_ts, self.price_source = tick if tick else (None, None, None)
+            else:
+                self._tick_ts = time.time()
+                price = self.get_eth_price()
+            if self.price_stream and price:
+                LATENCY.record("tick_pickup", (time.time() - self._tick_ts) * 1000)
+            with LATENCY.span("tick"):
+                self._tick(price)
+            LATENCY.maybe_emit(log_event)
+            if not self.price_stream:
+                time.sleep(CHECK_INTERVAL)
+
+    def _tick(self, price):
+        """One pass of syncs + trigger/guard/manage logic for the latest price."""
+        now = time.time()
 
-            if price:
-                # ── Direction tracking ───────────────────────────────────────
-                # M2-13: from_above only tracked/fired when mode allows it (avaro)
-                if FROM_ABOVE_ENABLED and price > self.upper_bound:
-                    if not self.price_was_above:
-                        print(f"⬆️  Price above range (${price:.2f}) — from-above trigger armed", flush=True)
-                    self.price_was_above = True
-                elif price < self.lower_bound and self.price_was_above and not self.hedge_active:
-                    self.price_was_above = False
-
-                # ── Re-entry guard check ─────────────────────────────────────
-                if self.reentry_guard_price and price >= self.reentry_guard_price:
-                    print(f"🔓 Re-entry guard cleared at ${price:.2f}", flush=True)
-                    log_event("reentry_guard_cleared", price=price)
-                    self.reentry_guard_price = None
-                    self.sl_close_price      = None
-                elif (self.reentry_guard_price and self.sl_close_price
-                        and price < self.sl_close_price):
-                    # M2-23: price continued below where SL closed — whipsaw risk
-                    # gone, re-arm immediately without waiting for guard level
-                    print(f"🔓 [V2] Re-entry guard cleared — price ${price:.2f} below "
-                          f"SL-close ${self.sl_close_price:.2f} (continued downside)",
-                          flush=True)
-                    log_event("reentry_guard_cleared", price=price)
-                    self.reentry_guard_price = None
-                    self.sl_close_price      = None
-                    self.price_was_above     = True
-
-                # ── Entry logic ──────────────────────────────────────────────
-                if not self.hedge_active:
-                    # M2-39: circuit breaker check
-                    if now < self._circuit_breaker_until:
-                        remaining = int(self._circuit_breaker_until - now)
+        # ── Periodic safety syncs ────────────────────────────────────────
+        if self.hedge_active and now - self.last_lp_sync > HL_SYNC_INTERVAL:
+            self.last_lp_sync = now
+            self._sync_lp_position(price or 0)
+
+        if self.hedge_active and now - self.last_hl_sync > HL_SYNC_INTERVAL:
+            self.last_hl_sync = now
+            self._sync_hl_position(price or 0)
+
+        # ── Periodic bounds refresh (idle only) ──────────────────────────
+        if (not self.hedge_active and
+                now - self.last_bounds_fetch > BOUNDS_REFRESH_H * 3600):
+            old_lower, old_upper = self.lower_bound, self.upper_bound
+            self.fetch_position_bounds()
+            self.lower_trigger = self.lower_bound * (1 - TRIGGER_OFFSET)
+            self.upper_trigger = self.upper_bound * (1 - UPPER_BUFFER)
+            if self.lower_bound != old_lower or self.upper_bound != old_upper:
+                print(f"🔄 Range updated: ${old_lower:.2f}–${old_upper:.2f} → "
+                      f"${self.lower_bound:.2f}–${self.upper_bound:.2f}", flush=True)
+                log_event("bounds_refreshed", details={
+                    "old_lower": old_lower, "old_upper": old_upper,
+                    "new_lower": self.lower_bound, "new_upper": self.upper_bound,
+                })
+
+        if price:
+            # ── Direction tracking ───────────────────────────────────────
+            # M2-13: from_above only tracked/fired when mode allows it (avaro)
+            if FROM_ABOVE_ENABLED and price > self.upper_bound:
+                if not self.price_was_above:
+                    print(f"⬆️  Price above range (${price:.2f}) — from-above trigger armed", flush=True)
+                self.price_was_above = True
+            elif price < self.lower_bound and self.price_was_above and not self.hedge_active:
+                self.price_was_above = False
+
+            # ── Re-entry guard check ─────────────────────────────────────
+            if self.reentry_guard_price and price >= self.reentry_guard_price:
+                print(f"🔓 Re-entry guard cleared at ${price:.2f}", flush=True)
+                log_event("reentry_guard_cleared", price=price)
+                self.reentry_guard_price = None
+                self.sl_close_price      = None
+            elif (self.reentry_guard_price and self.sl_close_price
+                    and price < self.sl_close_price):
+                # M2-23: price continued below where SL closed — whipsaw risk
+                # gone, re-arm immediately without waiting for guard level
+                print(f"🔓 [V2] Re-entry guard cleared — price ${price:.2f} below "
+                      f"SL-close ${self.sl_close_price:.2f} (continued downside)",
+                      flush=True)
+                log_event("reentry_guard_cleared", price=price)
+                self.reentry_guard_price = None
+                self.sl_close_price      = None
+                self.price_was_above     = True
+
+            # ── Entry logic ──────────────────────────────────────────────
+            if not self.hedge_active:
+                status_due = now - self._last_status >= STATUS_INTERVAL
+                # M2-39: circuit breaker check
+                if now < self._circuit_breaker_until:
+                    remaining = int(self._circuit_breaker_until - now)
+                    if status_due:
                         print(f"🔴 [M2-39] Circuit breaker active — {remaining}s remaining",
                               end="\r", flush=True)
-                    # M2-40: post-external_close cooldown check
-                    elif now < self._ext_close_cooldown_until:
-                        remaining = int(self._ext_close_cooldown_until - now)
+                # M2-40: post-external_close cooldown check
+                elif now < self._ext_close_cooldown_until:
+                    remaining = int(self._ext_close_cooldown_until - now)
+                    if status_due:
                         print(f"⏸️  [M2-40] Ext-close cooldown — {remaining}s remaining",
                               end="\r", flush=True)
-                    else:
-                        opened = False
-
-                        if FROM_ABOVE_ENABLED and self.price_was_above and price <= upper_trigger:
-                            # M2-47: skip if price is too far below upper_bound (stale arm)
-                            fa_min_px = self.upper_bound * (1 - MAX_FROM_ABOVE_DIST_PCT / 100)
-                            if price >= fa_min_px:
-                                self.open_hedge(price, trigger="from_above")
-                                self.price_was_above = False
-                                opened = True
-                            else:
-                                dist_pct = (self.upper_bound - price) / self.upper_bound * 100
-                                print(
-                                    f"⏭️  [M2-47] from_above skipped — price ${price:.2f} is "
-                                    f"{dist_pct:.1f}% below upper_bound "
-                                    f"(gate: {MAX_FROM_ABOVE_DIST_PCT:.1f}%)",
-                                    flush=True,
-                                )
-
-                        if not opened and price <= lower_trigger:
-                            if self.reentry_guard_price is None:
-                                self.open_hedge(price, trigger="below_range")
-                            else:
-                                print(f"⏸️  Below trigger but re-entry guard active "
-                                      f"(need ${self.reentry_guard_price:.2f})", flush=True)
-
-                # ── Manage open short ────────────────────────────────────────
-                elif self.hedge_active:
-                    self.manage_active_hedge(price)
-
-                # ── Status line ──────────────────────────────────────────────
-                if price < self.lower_bound:
-                    zone = "🔴 BELOW"
-                elif price > self.upper_bound:
-                    zone = "🟡 ABOVE"
                 else:
-                    zone = "🟢 IN   "
-
-                if self.hedge_active:
-                    be  = "BE✓" if self.breakeven_reached else "BE✗"
-                    sl_src = f"OID:{self.hl_sl_order_id}" if self.hl_sl_order_id else "code"
-                    short_status = (
-                        f"🛡️ SHORT {self.open_trigger} | "
-                        f"min ${self.short_min_price:.2f} | "
-                        f"SL ${self.current_sl_price:.2f} [{sl_src}] | {be}"
-                    )
+                    opened = False
+
+                    if FROM_ABOVE_ENABLED and self.price_was_above and price <= self.upper_trigger:
+                        # M2-47: skip if price is too far below upper_bound (stale arm)
+                        fa_min_px = self.upper_bound * (1 - MAX_FROM_ABOVE_DIST_PCT / 100)
+                        if price >= fa_min_px:
+                            self.open_hedge(price, trigger="from_above")
+                            self.price_was_above = False
+                            opened = True
+                        else:
+                            dist_pct = (self.upper_bound - price) / self.upper_bound * 100
+                            self._notice(
+                                "from_above_skipped",
+                                f"⏭️  [M2-47] from_above skipped — price ${price:.2f} is "
+                                f"{dist_pct:.1f}% below upper_bound "
+                                f"(gate: {MAX_FROM_ABOVE_DIST_PCT:.1f}%)",
+                            )
+
+                    if not opened and price <= self.lower_trigger:
+                        if self.reentry_guard_price is None:
+                            self.open_hedge(price, trigger="below_range")
+                        else:
+                            self._notice("guard_blocked",
+                                         f"⏸️  Below trigger but re-entry guard active "
+                                         f"(need ${self.reentry_guard_price:.2f})")
+
+                    if not self.hedge_active:
+                        self._maybe_prearm(price)
+
+            # ── Manage open short ────────────────────────────────────────
+            elif self.hedge_active:
+                self.manage_active_hedge(price)
+
+            # ── Status line ──────────────────────────────────────────────
+            if price < self.lower_bound:
+                zone = "🔴 BELOW"
+            elif price > self.upper_bound:
+                zone = "🟡 ABOVE"
+            else:
+                zone = "🟢 IN   "
+
+            if self.hedge_active:
+                be  = "BE✓" if self.breakeven_reached else "BE✗"
+                sl_src = f"OID:{self.hl_sl_order_id}" if self.hl_sl_order_id else "code"
+                short_status = (
+                    f"🛡️ SHORT {self.open_trigger} | "
+                    f"min ${self.short_min_price:.2f} | "
+                    f"SL ${self.current_sl_price:.2f} [{sl_src}] | {be}"
+                )
+            else:
+                if now < self._circuit_breaker_until:
+                    # show escalation level in status
+                    lvl = min(len(self._cb_fire_times), len(self._CB_PAUSE_STEPS))
+                    short_status = (f"🔴 CIRCUIT BREAKER L{lvl} "
+                                    f"({int(self._circuit_breaker_until - now)}s"
+                                    f" | loss≈${self._session_loss_usd:.2f})")
+                elif now < self._ext_close_cooldown_until:
+                    short_status = f"⏸️  EXT COOLDOWN ({int(self._ext_close_cooldown_until - now)}s)"
                 else:
-                    if now < self._circuit_breaker_until:
-                        # show escalation level in status
-                        lvl = min(len(self._cb_fire_times), len(self._CB_PAUSE_STEPS))
-                        short_status = (f"🔴 CIRCUIT BREAKER L{lvl} "
-                                        f"({int(self._circuit_breaker_until - now)}s"
-                                        f" | loss≈${self._session_loss_usd:.2f})")
-                    elif now < self._ext_close_cooldown_until:
-                        short_status = f"⏸️  EXT COOLDOWN ({int(self._ext_close_cooldown_until - now)}s)"
-                    else:
-                        guard = f"guard ${self.reentry_guard_price:.2f}" if self.reentry_guard_price else "ready"
-                        armed = " | ↓armed" if self.price_was_above else ""
-                        short_status = f"⚪ IDLE ({guard}{armed})"
-
+                    guard = f"guard ${self.reentry_guard_price:.2f}" if self.reentry_guard_price else "ready"
+                    armed = " | ↓armed" if self.price_was_above else ""
+                    short_status = f"⚪ IDLE ({guard}{armed})"
+
+            # Coalesced: print on a zone/state change, otherwise every STATUS_INTERVAL
+            status_key = (zone, self.hedge_active, self.breakeven_reached, self.hl_sl_order_id,
+                          self.reentry_guard_price, self.price_was_above,
+                          now < self._circuit_breaker_until, now < self._ext_close_cooldown_until)
+            if status_key != self._last_status_key or now - self._last_status >= STATUS_INTERVAL:
+                self._last_status_key = status_key
+                self._last_status     = now
                 print(
                     f"[{time.strftime('%H:%M:%S')}] ETH ${price:.2f} | "
-                    f"{zone} | {short_status} [V2]",
+                    f"{zone} | {short_status} [V2 {self.price_source or 'rest'}]",
                     end="\r", flush=True,
                 )
 
-            time.sleep(CHECK_INTERVAL)
-
 
 if __name__ == "__main__":
     bot = LiveHedgeBotV2()
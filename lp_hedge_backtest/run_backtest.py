@@ -24,7 +24,8 @@ import argparse
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.data.price_fetcher import PriceFetcher
+from src.data.price_fetcher import PriceFetcher, CACHE_DIR
+from src.engine.intrabar import load_minute_bars
 from src.engine.strategy_comparator import StrategyComparator
 from src.reporting.report_generator import (
     print_comparison_report,
@@ -32,6 +33,7 @@ from src.reporting.report_generator import (
     plot_equity_curves,
 )
 from src.reporting.metrics import calculate_metrics
+from src.reporting.results_store import ResultsStore, run_key
 
 
 def setup_logging(level=logging.INFO):
@@ -46,6 +48,8 @@ def main():
     parser = argparse.ArgumentParser(description="LP + Hedge Strategy Backtester")
     parser.add_argument("--config", default="config.json", help="Config file path")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    parser.add_argument("--recompute", action="store_true",
+                        help="Ignore a stored run with the same config + data and simulate again")
     args = parser.parse_args()
 
     setup_logging(logging.DEBUG if args.debug else logging.INFO)
@@ -66,28 +70,42 @@ def main():
     logger.info(f"Price data: {len(df)} candles from {df.iloc[0]['timestamp']} to {df.iloc[-1]['timestamp']}")
     logger.info(f"Price range in data: ${df['close'].min():,.0f} - ${df['close'].max():,.0f}")
 
-    # Step 2: Run all strategies
-    comparator = StrategyComparator(config)
-    results = comparator.run_all(df)
+    output_dir = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        config["output"]["results_dir"]
+    )
+
+    # Step 2: Run all strategies (or reuse a stored run of the same config on the same data)
+    store = ResultsStore(os.path.join(output_dir, "store"))
+    key = run_key(config, df)
+    if store.has(key) and not args.recompute:
+        logger.info(f"Identical run found in store ({key}) — skipping simulation")
+        results = store.load_results(key)
+        cached = True
+    else:
+        minute_bars = None
+        if bt_cfg.get("intrabar") == "minute":
+            minute_bars = load_minute_bars(bt_cfg, CACHE_DIR)
+            logger.info(f"Intrabar: {len(minute_bars):,} 1m bars for trigger drill-down")
+        comparator = StrategyComparator(config, minute_bars)
+        results = comparator.run_all(df)
+        cached = False
 
     # Step 3: Calculate metrics
     all_metrics = {}
-    for key, result in results.items():
+    for name, result in results.items():
         eq_df = result["equity_curve"]
         total_hours = result.get("total_hours", len(eq_df))
-        all_metrics[key] = calculate_metrics(eq_df, result["initial_capital"], total_hours)
+        all_metrics[name] = calculate_metrics(eq_df, result["initial_capital"], total_hours)
 
     # Step 4: Print report
     print_comparison_report(results, config)
 
     # Step 5: Save results
-    output_dir = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)),
-        config["output"]["results_dir"]
-    )
-
     if config["output"]["save_results"]:
-        save_results(results, all_metrics, config, output_dir)
+        if not cached:
+            store.save(key, results, all_metrics, config)
+        save_results(results, all_metrics, config, output_dir, run_key=key)
 
     if config["output"]["plot_equity_curves"]:
         plot_equity_curves(results, config, output_dir)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Offline Benchmark Suite
+=======================
+Times indicators, every backtest engine, StrategyComparator.run_all and
+calculate_metrics on deterministic synthetic candles (no network), reports
+bars/sec and peak memory, stores the run under results/benchmarks/ and
+compares it with the previous stored run to flag regressions.
+
+Usage:
+  python run_benchmarks.py                          # 10k + 100k bars, GBM
+  python run_benchmarks.py --full                   # 10k/100k/1M, all scenarios
+  python run_benchmarks.py --cases engine --sizes 10000
+  python run_benchmarks.py --baseline results/benchmarks/bench_....json --fail-on-regression
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.benchmark import synthetic
+from src.benchmark.suite import (
+    CASES, SIZES, REGRESSION_THRESHOLD,
+    compare, latest_report, run_suite, save_report,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline backtest/indicator benchmarks")
+    parser.add_argument("--config", default="config.json", help="Config file path")
+    parser.add_argument("--cases", default="", help="Comma-separated substrings to select cases")
+    parser.add_argument("--scenarios", default="gbm",
+                        help=f"Comma-separated scenarios or 'all' ({', '.join(synthetic.SCENARIOS)})")
+    parser.add_argument("--sizes", default="10000,100000", help="Comma-separated bar counts")
+    parser.add_argument("--full", action="store_true", help="All scenarios at 10k/100k/1M bars")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data seed")
+    parser.add_argument("--timeout", type=int, default=600, help="Per-case time limit (seconds)")
+    parser.add_argument("--baseline", default=None, help="Report to compare against (default: previous run)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if any case regressed")
+    parser.add_argument("--no-save", action="store_true", help="Do not store this run")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)   # engines log per-trade warnings
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(base_dir, args.config)) as f:
+        config = json.load(f)
+    config["hedge"]["fetch_funding_rates"] = False   # offline: default funding rate only
+
+    filters = [c.strip() for c in args.cases.split(",") if c.strip()]
+    cases = [c for c in CASES if not filters or any(f in c for f in filters)]
+    if args.full:
+        scenarios, sizes = list(synthetic.SCENARIOS), list(SIZES)
+    else:
+        scenarios = list(synthetic.SCENARIOS) if args.scenarios == "all" else args.scenarios.split(",")
+        sizes = [int(s) for s in args.sizes.split(",")]
+
+    print(f"\n{'=' * 80}")
+    print(f"  BENCHMARKS | {len(cases)} cases x {len(scenarios)} scenarios x {len(sizes)} sizes")
+    print(f"{'=' * 80}")
+    rows = run_suite(config, cases=cases, scenarios=scenarios, sizes=sizes,
+                     seed=args.seed, timeout=args.timeout)
+
+    output_dir = os.path.join(base_dir, config["output"]["results_dir"], "benchmarks")
+    path = None if args.no_save else save_report(rows, output_dir, seed=args.seed)
+    if path:
+        print(f"\n  Results saved to: {path}")
+
+    baseline_path = args.baseline or latest_report(output_dir, exclude=path)
+    if not baseline_path:
+        return 0
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    diffs = compare(rows, baseline["results"])
+
+    print(f"\n{'=' * 80}")
+    print(f"  vs {os.path.basename(baseline_path)} (commit {baseline.get('git_commit')})")
+    print(f"{'=' * 80}")
+    for d in diffs:
+        flag = "  << REGRESSION" if d["regression"] else ""
+        print(f"  {d['case']:<34} {d['scenario']:<7} {d['bars']:>9,}  "
+              f"speed x{d['ratio']:.2f}  mem x{d['mem_ratio'] or 0:.2f}{flag}")
+
+    regressions = [d for d in diffs if d["regression"]]
+    if regressions:
+        print(f"\n  {len(regressions)} case(s) more than {REGRESSION_THRESHOLD:.0%} slower than baseline")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
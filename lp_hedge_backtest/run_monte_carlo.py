@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+LP + Hedge Monte Carlo Stress Test
+==================================
+Runs the LP + Hedge rules over thousands of simulated price paths calibrated
+on the configured historical data, and reports outcome distributions:
+return quantiles, VaR/CVaR, max-drawdown CDF, hedge activations.
+
+Path methods:
+  bootstrap   circular block bootstrap of historical returns (default)
+  gbm         geometric Brownian motion with the historical drift/volatility
+  student_t   fat-tailed (nu=4) returns with the historical drift/volatility
+
+Usage:
+  python run_monte_carlo.py
+  python run_monte_carlo.py --paths 20000 --horizon-days 90 --method student_t
+  python run_monte_carlo.py --lower 2800 --upper 3400 --start-price 3100 --workers 0
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+from datetime import datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.data.price_fetcher import PriceFetcher
+from src.engine.monte_carlo import METHODS, MonteCarloEngine
+
+
+def print_summary(summary):
+    r = summary["return_pct"]
+    dd = summary["max_drawdown_pct"]
+    acts = summary["hedge_activations"]
+    print(f"\n{'=' * 70}")
+    print(f"  MONTE CARLO | {summary['paths']:,} paths x {summary['bars']:,} bars "
+          f"({summary['horizon_hours'] / 24:.0f} days) | {summary['method']}")
+    print(f"  Range [{summary['range'][0]}, {summary['range'][1]}] | start ${summary['start_price']:,.0f} "
+          f"| {summary['seconds']:.1f}s")
+    print(f"{'=' * 70}")
+    print(f"  Return %      mean {r['mean']:+.2f}  p1 {r['p1']:+.2f}  p5 {r['p5']:+.2f}  "
+          f"p50 {r['p50']:+.2f}  p95 {r['p95']:+.2f}  p99 {r['p99']:+.2f}")
+    print(f"  VaR 95%       {summary['var_95_pct']:.2f}%   CVaR 95% {summary['cvar_95_pct']:.2f}%   "
+          f"P(loss) {summary['prob_loss']:.1%}")
+    print(f"  Max DD %      p50 {dd['p50']:.2f}  p95 {dd['p95']:.2f}  p99 {dd['p99']:.2f}")
+    print("  Max DD CDF    " + "  ".join(f"<={k} {v:.1%}" for k, v in summary["max_drawdown_cdf"].items()))
+    print(f"  Hedges        mean {acts['mean']:.2f}  max {acts['max']}  "
+          f"paths hedged {acts['pct_paths_hedged']:.1f}%  liquidated {summary['pct_paths_liquidated']:.2f}%")
+    print(f"  In range %    p5 {summary['pct_time_in_range']['p5']:.1f}  p50 {summary['pct_time_in_range']['p50']:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LP + Hedge Monte Carlo stress test")
+    parser.add_argument("--config", default="config.json", help="Config file path")
+    parser.add_argument("--paths", type=int, default=None, help="Number of simulated paths")
+    parser.add_argument("--horizon-days", type=float, default=None, help="Length of each path in days")
+    parser.add_argument("--method", choices=METHODS, default=None, help="Path generator")
+    parser.add_argument("--block-hours", type=float, default=None, help="Bootstrap block length")
+    parser.add_argument("--start-price", type=float, default=None, help="Path start (default: last close)")
+    parser.add_argument("--lower", type=float, default=None, help="Override LP lower bound")
+    parser.add_argument("--upper", type=float, default=None, help="Override LP upper bound")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (0 = all cores)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument("--save-paths", action="store_true", help="Also write per-path outcomes (CSV)")
+    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.INFO,
+        format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(base_dir, args.config)) as f:
+        config = json.load(f)
+    if args.lower:
+        config["lp_position"]["lower_bound"] = args.lower
+    if args.upper:
+        config["lp_position"]["upper_bound"] = args.upper
+    mc_cfg = config.setdefault("monte_carlo", {})
+    if args.block_hours:
+        mc_cfg["block_hours"] = args.block_hours
+
+    bt_cfg = config["backtest"]
+    df = PriceFetcher(symbol=bt_cfg["symbol"], interval=bt_cfg["interval"]).fetch(
+        bt_cfg["start_date"], bt_cfg["end_date"])
+
+    engine = MonteCarloEngine(config)
+    result = engine.run(
+        df,
+        n_paths=args.paths,
+        horizon_hours=args.horizon_days * 24 if args.horizon_days else None,
+        method=args.method,
+        start_price=args.start_price,
+        workers=args.workers,
+        seed=args.seed,
+    )
+    summary = result["summary"]
+    print_summary(summary)
+
+    output_dir = os.path.join(base_dir, config["output"]["results_dir"], "monte_carlo")
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(output_dir, f"mc_{stamp}.json")
+    with open(path, "w") as f:
+        json.dump({"config": config, "history": [bt_cfg["start_date"], bt_cfg["end_date"]],
+                   "summary": summary}, f, indent=2)
+    print(f"\n  Summary saved to: {path}")
+    if args.save_paths:
+        paths_file = os.path.join(output_dir, f"mc_{stamp}_paths.csv.gz")
+        result["outcomes"].to_csv(paths_file, index=False)
+        print(f"  Per-path outcomes: {paths_file}")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
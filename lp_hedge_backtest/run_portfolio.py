@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Multi-Pool Portfolio Backtest
+=============================
+Steps many LP positions (aragan / avaro, across symbols and ranges) together
+over one aligned timeline, with a shared perps margin pool and funding on the
+net position per coin. Reports portfolio equity, correlation-aware drawdown
+and the size of the aggregate hedge book.
+
+Positions come from config["portfolio"]["positions"], a JSON file
+(--positions), or a random book around the first close (--random N).
+
+Usage:
+  python run_portfolio.py --positions book.json
+  python run_portfolio.py --random 300 --symbols ETHUSDT,BTCUSDT --margin 250000
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+from datetime import datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.data.price_fetcher import PriceFetcher
+from src.engine.portfolio import PortfolioBacktestEngine, make_positions
+
+
+def print_summary(result):
+    book = result["hedge_book"]
+    pos = result["positions"]
+    print(f"\n{'=' * 70}")
+    print(f"  PORTFOLIO | {result['positions_count']} positions | "
+          f"{result['total_hours'] / 24:.0f} days | {result['seconds']:.1f}s")
+    print(f"{'=' * 70}")
+    print(f"  Capital        ${result['initial_capital']:>14,.2f}  ->  ${result['final_equity']:,.2f} "
+          f"({result['total_return_pct']:+.2f}%)")
+    print(f"  Max drawdown   {result['max_drawdown_pct']:.2f}%  (${result['max_drawdown_usd']:,.0f}; "
+          f"sum of position drawdowns ${result['sum_position_drawdowns_usd']:,.0f})")
+    print(f"  Fees ${result['lp_fees_earned']:,.0f} | hedge ${result['hedge_pnl']:,.0f} | "
+          f"long ${result['long_pnl']:,.0f} | funding ${result['funding_paid']:,.0f}")
+    print(f"  Hedge book     peak margin ${book['peak_margin_used']:,.0f} | "
+          f"peak open hedges {book['peak_hedges_open']} | blocked by margin {book['margin_skips']}")
+    for symbol, notional in book["peak_net_short_notional"].items():
+        print(f"                 {symbol}: peak net short ${notional:,.0f}")
+    print(f"\n  By symbol/mode:")
+    grouped = pos.groupby(["symbol", "mode"]).agg(
+        n=("id", "size"), capital=("initial_capital", "sum"), equity=("final_equity", "sum"),
+        hedges=("hedge_activations", "sum"), liquidations=("liquidations", "sum"))
+    for (symbol, mode), g in grouped.iterrows():
+        print(f"    {symbol:<10} {mode:<7} {int(g.n):>4} pos  ${g.capital:>12,.0f} -> ${g.equity:>12,.0f}  "
+              f"hedges {int(g.hedges):>5}  liq {int(g.liquidations)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-pool LP portfolio backtest")
+    parser.add_argument("--config", default="config.json", help="Config file path")
+    parser.add_argument("--positions", default=None, help="JSON file with a list of positions")
+    parser.add_argument("--random", type=int, default=0, help="Generate a random book of N positions")
+    parser.add_argument("--symbols", default=None, help="Symbols for --random (default: backtest symbol)")
+    parser.add_argument("--margin", type=float, default=None, help="Shared margin pool in USD")
+    parser.add_argument("--gross-funding", action="store_true", help="Charge funding per leg, not per net coin")
+    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.INFO,
+        format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(base_dir, args.config)) as f:
+        config = json.load(f)
+    pf_cfg = config.setdefault("portfolio", {})
+    if args.margin is not None:
+        pf_cfg["margin_capital_usd"] = args.margin
+    if args.gross_funding:
+        pf_cfg["net_funding"] = False
+
+    bt_cfg = config["backtest"]
+    if args.positions:
+        with open(args.positions) as f:
+            pf_cfg["positions"] = json.load(f)
+    symbols = (args.symbols.split(",") if args.symbols else
+               sorted({p["symbol"] for p in pf_cfg.get("positions", [])}) or [bt_cfg["symbol"]])
+
+    data = {
+        s: PriceFetcher(symbol=s, interval=bt_cfg["interval"]).fetch(bt_cfg["start_date"], bt_cfg["end_date"])
+        for s in symbols
+    }
+    if args.random:
+        pf_cfg["positions"] = make_positions({s: float(df["close"].iloc[0]) for s, df in data.items()},
+                                             args.random, capital=config["lp_position"]["initial_capital_usd"])
+
+    result = PortfolioBacktestEngine(config).run(data)
+    print_summary(result)
+
+    output_dir = os.path.join(base_dir, config["output"]["results_dir"], "portfolio")
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    summary = {k: v for k, v in result.items() if k not in ("equity_curve", "positions")}
+    with open(os.path.join(output_dir, f"portfolio_{stamp}.json"), "w") as f:
+        json.dump({"config": config, "summary": summary}, f, indent=2, default=str)
+    result["positions"].to_csv(os.path.join(output_dir, f"portfolio_{stamp}_positions.csv"), index=False)
+    result["equity_curve"].to_csv(os.path.join(output_dir, f"portfolio_{stamp}_equity.csv.gz"), index=False)
+    print(f"\n  Results saved to: {output_dir}/portfolio_{stamp}*")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+V2 Trailing-SL Sweep
+====================
+Grid-searches LiveHedgeBotV2's BREAKEVEN_PCT / TRAIL_PCT (plus any other
+V2 env setting) with the tick-level engine in src/engine/hedge_v2_tick.py.
+Tick arrays are written once as .npy and memory-mapped by every worker.
+
+Usage:
+  python run_v2_trail_sweep.py --days 365                          # synthetic 1y of 1m bars
+  python run_v2_trail_sweep.py --ticks data_cache/eth_ticks.csv --range 2800 3200
+  python run_v2_trail_sweep.py --minute-data data_cache/ETHUSDT_1m_2025-01-01_2025-12-31 \\
+      --trail 0.5 1 1.5 2 --breakeven 0.5 1 1.5 --env ATR_MULT_BE=0 --workers 4
+  python run_v2_trail_sweep.py --ticks-dir data_cache/eth_1s_ticks  # ts.npy / price.npy
+
+Settings use the bot's env names (--env KEY=VALUE, repeatable).
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.engine.hedge_v2_tick import DEFAULTS, TickArrays, sweep
+from src.engine.intrabar import MinuteBars
+
+
+def _env_value(key, raw):
+    if key not in DEFAULTS:
+        raise SystemExit(f"Unknown V2 setting: {key} (known: {', '.join(DEFAULTS)})")
+    default = DEFAULTS[key]
+    if isinstance(default, bool):
+        return raw.strip() not in ("0", "false", "False")
+    if isinstance(default, str):
+        return raw.strip().lower()
+    if raw.strip() == "":
+        return None
+    return type(default)(raw) if default is not None else float(raw)
+
+
+def _load_ticks(args, workdir):
+    """Directory of ts.npy / price.npy for the chosen source, plus a label."""
+    if args.ticks_dir:
+        return args.ticks_dir, args.ticks_dir
+    if args.minute_data:
+        ticks = TickArrays.from_minute_bars(MinuteBars.load(args.minute_data))
+        source = args.minute_data
+    else:
+        from src.replay import harness
+        if args.ticks:
+            t, p = harness.load_ticks(args.ticks)[:2]
+            source = args.ticks
+        else:
+            t, p = harness.synthetic_ticks(args.scenario, days=args.days, interval="1m", seed=args.seed)[:2]
+            source = f"synthetic {args.scenario} {args.days:g}d 1m seed={args.seed}"
+        ticks = TickArrays(np.asarray(t, dtype=float), np.asarray(p, dtype=float))
+    ticks.save(workdir)
+    return workdir, source
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BREAKEVEN_PCT / TRAIL_PCT sweep for LiveHedgeBotV2")
+    src = parser.add_mutually_exclusive_group()
+    src.add_argument("--ticks-dir", default=None, help="Directory with ts.npy / price.npy (memory-mapped)")
+    src.add_argument("--ticks", default=None, help="CSV/parquet of (timestamp, price) ticks or OHLCV candles")
+    src.add_argument("--minute-data", default=None, help="MinuteBars .npy directory (4 ticks per bar)")
+    parser.add_argument("--scenario", default="gbm", help="Synthetic scenario when no data is given")
+    parser.add_argument("--days", type=float, default=365, help="Synthetic span in days")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data seed")
+    parser.add_argument("--range", nargs=2, type=float, default=None, metavar=("LOWER", "UPPER"),
+                        help="LP range (default ±--range-pct around the first tick)")
+    parser.add_argument("--range-pct", type=float, default=10.0, help="Half-width of the default range (%%)")
+    parser.add_argument("--trail", nargs="+", type=float, default=[0.5, 1.0, 1.5, 2.0, 3.0], help="TRAIL_PCT values")
+    parser.add_argument("--breakeven", nargs="+", type=float, default=[0.5, 1.0, 1.5, 2.0], help="BREAKEVEN_PCT values")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="Fixed V2 setting")
+    parser.add_argument("--size-eth", type=float, default=1.0, help="Short size per entry (ETH)")
+    parser.add_argument("--slippage", type=float, default=0.0, help="Slippage per fill (%%)")
+    parser.add_argument("--funding", type=float, default=0.0, help="Funding paid to shorts per hour (fraction)")
+    parser.add_argument("--no-circuit-breaker", action="store_true", help="Ignore the M2-39 pauses")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parallel processes")
+    parser.add_argument("--top", type=int, default=20, help="Rows to print")
+    parser.add_argument("--no-save", action="store_true", help="Do not store results under results/v2_sweep/")
+    args = parser.parse_args()
+
+    base = {k: _env_value(k, v) for k, v in (kv.split("=", 1) for kv in args.env)}
+    grid = [{"TRAIL_PCT": t, "BREAKEVEN_PCT": b} for t, b in itertools.product(args.trail, args.breakeven)]
+
+    with tempfile.TemporaryDirectory(prefix="v2_ticks_") as workdir:
+        ticks_dir, source = _load_ticks(args, workdir)
+        ticks = TickArrays.load(ticks_dir)
+        if args.range:
+            lower, upper = args.range
+        else:
+            p0 = float(ticks.price[0])
+            lower, upper = p0 * (1 - args.range_pct / 100), p0 * (1 + args.range_pct / 100)
+
+        print(f"\n{'=' * 80}")
+        print(f"  V2 TRAIL SWEEP | {source} | {len(ticks):,} ticks | range {lower:,.2f} – {upper:,.2f}")
+        print(f"  {len(grid)} combinations × {args.workers} workers | fixed: {base or 'defaults'}")
+        print(f"{'=' * 80}")
+
+        t0 = time.perf_counter()
+        results = sweep(ticks_dir, lower, upper, grid, base_params=base, workers=args.workers,
+                        hedge_size_eth=args.size_eth, slippage_pct=args.slippage,
+                        funding_rate_1h=args.funding, circuit_breaker=not args.no_circuit_breaker)
+        elapsed = time.perf_counter() - t0
+
+    results.sort(key=lambda r: -r["hedge_pnl_usd"])
+    print(f"\n  {'TRAIL':>6} {'BE':>6} {'Trades':>7} {'Win%':>6} {'PnL $':>10} {'Fees $':>8} "
+          f"{'BE hit':>7} {'SL repl/d':>10} {'CB':>4}")
+    print(f"  {'-' * 72}")
+    for r in results[:args.top]:
+        print(f"  {r['params']['TRAIL_PCT']:>6.2f} {r['params']['BREAKEVEN_PCT']:>6.2f} {r['n_trades']:>7} "
+              f"{r['win_rate_pct']:>6.1f} {r['hedge_pnl_usd']:>10.2f} {r['fees_usd']:>8.2f} "
+              f"{r['breakeven_trades']:>7} {r['sl_replaces_per_day']:>10.2f} {r['circuit_breaker_fires']:>4}")
+    print(f"\n  {len(grid)} runs in {elapsed:.1f}s "
+          f"({sum(r['ticks'] for r in results) / elapsed / 1e6:,.1f}M ticks/s overall)")
+
+    if args.no_save:
+        return 0
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    output_dir = os.path.join(base_dir, "results", "v2_sweep")
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"v2_sweep_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(path, "w") as f:
+        json.dump({"source": source, "lower_bound": lower, "upper_bound": upper, "fixed": base,
+                   "results": results}, f, indent=1, default=str)
+    print(f"\n  Sweep saved to: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+hl_ws_standin.py — local stand-in for the Hyperliquid WebSocket price feed.
+
+Serves allMids (and trades) messages in HL's wire format for a scripted ETH
+path: a random walk, optionally with a flash move to a given price. Point a
+bot or PriceStream at it to exercise the event-driven loop offline:
+
+Usage:
+    python3 scripts/hl_ws_standin.py --start 3000 --flash-at 30 --flash-to 2650
+    HL_WS_URL=ws://127.0.0.1:8765/ws PRICE_FEED=ws python3 live_hedge_bot_v2.py
+
+Requires the `websockets` package (server side only).
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import websockets
+
+
+def price_path(start, vol, flash_at, flash_to, flash_len):
+    """Yields one mid per tick: random walk, then a straight move to flash_to."""
+    px, n = start, 0
+    while True:
+        n += 1
+        if flash_at and flash_at <= n < flash_at + flash_len:
+            px += (flash_to - px) / (flash_at + flash_len - n)
+        else:
+            px *= 1 + random.gauss(0, vol)
+        yield px
+
+
+async def serve(args):
+    clients = {}   # websocket → subscribed channels
+
+    async def handler(ws):
+        clients[ws] = set()
+        try:
+            async for raw in ws:
+                msg = json.loads(raw)
+                if msg.get("method") == "subscribe":
+                    sub = msg["subscription"]
+                    clients[ws].add(sub["type"])
+                    await ws.send(json.dumps({"channel": "subscriptionResponse", "data": msg}))
+                elif msg.get("method") == "ping":
+                    await ws.send(json.dumps({"channel": "pong"}))
+        finally:
+            clients.pop(ws, None)
+
+    async with websockets.serve(handler, args.host, args.port):
+        print(f"HL WS stand-in on ws://{args.host}:{args.port}/ws — tick every {args.interval}s", flush=True)
+        for px in price_path(args.start, args.vol, args.flash_at, args.flash_to, args.flash_len):
+            await asyncio.sleep(args.interval)
+            mids = json.dumps({"channel": "allMids", "data": {"mids": {"ETH": f"{px:.2f}", "BTC": "60000.0"}}})
+            trades = json.dumps({"channel": "trades", "data": [
+                {"coin": "ETH", "side": "A", "px": f"{px:.2f}", "sz": "0.1", "time": int(time.time() * 1000)}]})
+            for ws, channels in list(clients.items()):
+                try:
+                    if "allMids" in channels:
+                        await ws.send(mids)
+                    if "trades" in channels:
+                        await ws.send(trades)
+                except websockets.ConnectionClosed:
+                    pass
+            if args.verbose:
+                print(f"{time.time():.3f} ETH {px:.2f}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Hyperliquid WS price stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--start", type=float, default=3000.0, help="Starting ETH mid")
+    parser.add_argument("--vol", type=float, default=0.0005, help="Per-tick random walk volatility")
+    parser.add_argument("--interval", type=float, default=0.5, help="Seconds between ticks")
+    parser.add_argument("--flash-at", type=int, default=0, help="Tick number where the flash move starts")
+    parser.add_argument("--flash-to", type=float, default=0.0, help="Price the flash move ends at")
+    parser.add_argument("--flash-len", type=int, default=3, help="Ticks the flash move takes")
+    parser.add_argument("--verbose", action="store_true", help="Print every tick sent")
+    asyncio.run(serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
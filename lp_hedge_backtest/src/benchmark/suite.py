@@ -0,0 +1,254 @@
+"""Benchmark cases, runner and regression comparison.
+
+Every case runs in its own forked process: the candles are generated there,
+peak RSS is reset (/proc/self/clear_refs) right before the timed call, and
+VmHWM afterwards is the case's own peak. A case that exceeds the time limit
+is killed and recorded as a timeout instead of stalling the suite.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import platform
+import resource
+import subprocess
+import contextlib
+import multiprocessing as mp
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.benchmark import synthetic
+
+SIZES = (10_000, 100_000, 1_000_000)
+REGRESSION_THRESHOLD = 0.15   # >15% fewer bars/sec than baseline → regression
+
+
+# ── Cases ──────────────────────────────────────────────────────────────────────
+# Each case: setup(df, config) → args (untimed), run(*args) (timed)
+
+def _lp_setup(df, config):
+    return (df,)
+
+
+def _fury_setup(df, config):
+    df_15m = df.assign(timestamp=pd.date_range(synthetic.START, periods=len(df), freq="15min"))
+    return df_15m, synthetic.resample(df_15m, "1h")
+
+
+def _metrics_setup(df, config):
+    equity = pd.DataFrame({"total_equity": df["close"].to_numpy() / df["close"].iloc[0] * 10_000})
+    return equity, 10_000, len(equity)
+
+
+def _engine(name, intrabar=None):
+    def run(config, df):
+        from src.engine import backtest_engine
+        if intrabar:
+            config = {**config, "backtest": {**config.get("backtest", {}), "intrabar": intrabar}}
+        return getattr(backtest_engine, name)(config).run(df)
+    return run
+
+
+def _case_add_indicators(config, df):
+    from src.indicators.technical import add_indicators
+    return add_indicators(df)
+
+
+def _case_add_fury_indicators(config, df):
+    from src.indicators.technical import add_fury_indicators
+    return add_fury_indicators(df)
+
+
+def _case_fury_engine(config, df_15m, df_1h):
+    from src.engine.backtest_engine import FuryBacktestEngine
+    return FuryBacktestEngine({"symbol": "ETH", "initial_capital": 1000.0}).run(df_15m, df_1h)
+
+
+def _case_run_all(config, df):
+    from src.engine.strategy_comparator import StrategyComparator
+    return StrategyComparator(config).run_all(df)
+
+
+def _case_calculate_metrics(config, equity, capital, hours):
+    from src.reporting.metrics import calculate_metrics
+    return calculate_metrics(equity, capital, hours)
+
+
+CASES = {
+    "indicators.add_indicators":      (_lp_setup, _case_add_indicators),
+    "indicators.add_fury_indicators": (_lp_setup, _case_add_fury_indicators),
+    "engine.HodlEngine":              (_lp_setup, _engine("HodlEngine")),
+    "engine.LPOnlyEngine":            (_lp_setup, _engine("LPOnlyEngine")),
+    "engine.LPHedgeBacktestEngine":   (_lp_setup, _engine("LPHedgeBacktestEngine")),
+    "engine.LPHedgeBacktestEngine[ohlc]": (_lp_setup, _engine("LPHedgeBacktestEngine", "ohlc")),
+    "engine.BotAvaroEngine":          (_lp_setup, _engine("BotAvaroEngine")),
+    "engine.FuryBacktestEngine":      (_fury_setup, _case_fury_engine),
+    "comparator.run_all":             (_lp_setup, _case_run_all),
+    "metrics.calculate_metrics":      (_metrics_setup, _case_calculate_metrics),
+}
+
+
+# ── Measurement ────────────────────────────────────────────────────────────────
+
+def _proc_status_kb(field):
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _child(case, scenario, bars, seed, repeats, config, conn):
+    try:
+        setup, fn = CASES[case]
+        interval = "15m" if case == "engine.FuryBacktestEngine" else "1h"
+        df = synthetic.generate(scenario, bars, interval=interval, seed=seed)
+        args = setup(df, config)
+        del df
+
+        rss_before = _proc_status_kb("VmRSS")
+        exact_peak = _reset_peak_rss()
+        times = []
+        sink = io.StringIO()
+        for _ in range(repeats):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(sink):      # engines print per-trade lines
+                fn(config, *args)
+            times.append(time.perf_counter() - start)
+            sink.seek(0)
+            sink.truncate()
+
+        peak_kb = _proc_status_kb("VmHWM") if exact_peak else None
+        if peak_kb is None:
+            peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        best = min(times)
+        conn.send({
+            "status": "ok",
+            "seconds": round(best, 6),
+            "bars_per_sec": round(bars / best, 1) if best > 0 else None,
+            "peak_rss_mb": round(peak_kb / 1024, 1),
+            "delta_rss_mb": round((peak_kb - rss_before) / 1024, 1) if rss_before and exact_peak else None,
+            "repeats": repeats,
+        })
+    except Exception as e:
+        conn.send({"status": "error", "error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def run_case(case, scenario, bars, config, seed=0, repeats=None, timeout=600):
+    """Time one case in a fresh process; returns a result row."""
+    repeats = repeats or (3 if bars <= 10_000 else 1)
+    ctx = mp.get_context("fork")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_child, args=(case, scenario, bars, seed, repeats, config, child))
+    proc.start()
+    child.close()
+
+    row = {"case": case, "scenario": scenario, "bars": bars}
+    if parent.poll(timeout):
+        try:
+            row.update(parent.recv())
+        except EOFError:
+            row.update(status="error", error=f"worker exited with code {proc.exitcode}")
+    else:
+        proc.kill()
+        row.update(status="timeout", error=f"exceeded {timeout}s")
+    proc.join()
+    return row
+
+
+def run_suite(config, cases=None, scenarios=("gbm",), sizes=SIZES[:2], seed=0, timeout=600, progress=print):
+    """Run every (case, scenario, size) combination; returns the list of rows."""
+    rows = []
+    for bars in sizes:
+        for scenario in scenarios:
+            for case in cases or CASES:
+                row = run_case(case, scenario, bars, config, seed=seed, timeout=timeout)
+                rows.append(row)
+                if progress:
+                    progress(format_row(row))
+    return rows
+
+
+# ── Storage + comparison ───────────────────────────────────────────────────────
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_report(rows, output_dir, seed=0):
+    os.makedirs(output_dir, exist_ok=True)
+    commit = _git_commit()
+    created = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report = {
+        "created_at": created,
+        "git_commit": commit,
+        "seed": seed,
+        "host": platform.node(),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "results": rows,
+    }
+    path = os.path.join(output_dir, f"bench_{created}_{commit or 'nogit'}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def latest_report(output_dir, exclude=None):
+    if not os.path.isdir(output_dir):
+        return None
+    files = sorted(f for f in os.listdir(output_dir) if f.startswith("bench_") and f.endswith(".json"))
+    files = [os.path.join(output_dir, f) for f in files]
+    files = [f for f in files if not exclude or os.path.abspath(f) != os.path.abspath(exclude)]
+    return files[-1] if files else None
+
+
+def compare(rows, baseline_rows, threshold=REGRESSION_THRESHOLD):
+    """Pair rows with the baseline by (case, scenario, bars); returns comparison rows."""
+    base = {(r["case"], r["scenario"], r["bars"]): r for r in baseline_rows if r.get("status") == "ok"}
+    out = []
+    for r in rows:
+        b = base.get((r["case"], r["scenario"], r["bars"]))
+        if r.get("status") != "ok" or not b:
+            continue
+        ratio = r["bars_per_sec"] / b["bars_per_sec"] if b["bars_per_sec"] else None
+        out.append({
+            "case": r["case"], "scenario": r["scenario"], "bars": r["bars"],
+            "ratio": round(ratio, 3) if ratio else None,
+            "regression": bool(ratio and ratio < 1 - threshold),
+            "mem_ratio": round(r["peak_rss_mb"] / b["peak_rss_mb"], 3) if b.get("peak_rss_mb") else None,
+        })
+    return out
+
+
+def format_row(row):
+    label = f"{row['case']:<34} {row['scenario']:<7} {row['bars']:>9,}"
+    if row.get("status") != "ok":
+        return f"  {label}  {row.get('status', '?').upper()}: {row.get('error', '')}"
+    return (f"  {label}  {row['seconds']:>9.3f}s  {row['bars_per_sec']:>13,.0f} bars/s  "
+            f"peak {row['peak_rss_mb']:>7.1f} MB")
@@ -0,0 +1,107 @@
+"""Deterministic synthetic OHLCV for offline benchmarks.
+
+Same (scenario, bars, seed) → bit-identical candles on every machine, so
+timings are comparable between commits and nothing touches the network.
+
+  gbm     — geometric Brownian motion, constant volatility
+  regime  — alternating lateral (low vol, range-bound) and trending (higher
+            vol, directional drift) stretches with geometric durations
+  gaps    — GBM plus occasional open gaps of 3–15% (weekend/news gaps,
+            liquidation cascades) between one close and the next open
+"""
+
+import numpy as np
+import pandas as pd
+
+MINUTES = {"1m": 1, "5m": 5, "15m": 15, "1h": 60, "4h": 240, "1d": 1440}
+START = "2020-01-01"
+
+
+def _per_bar(annual_vol, interval):
+    return annual_vol * np.sqrt(MINUTES[interval] / 525_600)
+
+
+def _candles(rng, bar_ret, gap_ret, interval, s0):
+    """Build OHLCV from per-bar log returns (open→close) and open gaps (close→open)."""
+    n = len(bar_ret)
+    log_open = np.log(s0) + np.concatenate([[0.0], np.cumsum(bar_ret + gap_ret)[:-1]]) + gap_ret
+    log_open[0] = np.log(s0)
+    open_ = np.exp(log_open)
+    close = np.exp(log_open + bar_ret)
+
+    wick = np.abs(rng.normal(0, np.std(bar_ret) * 0.6 + 1e-9, (2, n)))
+    high = np.maximum(open_, close) * np.exp(wick[0])
+    low = np.minimum(open_, close) * np.exp(-wick[1])
+    volume = rng.lognormal(np.log(1_000), 0.5, n) * (1 + 50 * np.abs(bar_ret))
+
+    return pd.DataFrame({
+        "timestamp": pd.date_range(START, periods=n, freq=f"{MINUTES[interval]}min"),
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": volume,
+        "quote_volume": volume * close,
+    })
+
+
+def gbm(bars, interval="1h", seed=0, s0=3000.0, annual_vol=0.6):
+    rng = np.random.default_rng(seed)
+    sigma = _per_bar(annual_vol, interval)
+    bar_ret = rng.normal(-0.5 * sigma ** 2, sigma, bars)
+    return _candles(rng, bar_ret, np.zeros(bars), interval, s0)
+
+
+def regime(bars, interval="1h", seed=0, s0=3000.0, mean_duration=500):
+    rng = np.random.default_rng(seed)
+    durations = np.minimum(rng.geometric(1 / mean_duration, bars // 10 + 2), 3 * mean_duration)
+    ends = np.minimum(np.cumsum(durations), bars)
+    starts = np.concatenate([[0], ends[:-1]])
+    sig_lateral, sig_trend = _per_bar(0.3, interval), _per_bar(0.9, interval)
+
+    bar_ret = np.zeros(bars)
+    log_dev = 0.0                                   # log(price / s0)
+    for k, (lo, hi) in enumerate(zip(starts, ends)):
+        if lo >= hi:
+            break
+        if k % 2 == 0:
+            # Lateral: Brownian bridge — wanders, ends where it started
+            r = rng.normal(0, sig_lateral, hi - lo)
+            r -= r.mean()
+        else:
+            # Trend: random direction, but back toward s0 once price is >2x away
+            direction = -np.sign(log_dev) if abs(log_dev) > 0.7 else rng.choice([-1.0, 1.0])
+            r = rng.normal(direction * sig_trend * 0.1, sig_trend, hi - lo)
+        bar_ret[lo:hi] = r
+        log_dev += r.sum()
+    return _candles(rng, bar_ret, np.zeros(bars), interval, s0)
+
+
+def gaps(bars, interval="1h", seed=0, s0=3000.0, gap_every=2_000):
+    rng = np.random.default_rng(seed)
+    sigma = _per_bar(0.6, interval)
+    bar_ret = rng.normal(-0.5 * sigma ** 2, sigma, bars)
+    gap_ret = np.zeros(bars)
+    where = rng.random(bars) < 1 / gap_every
+    where[0] = False
+    gap_ret[where] = rng.choice([-1.0, 1.0], where.sum()) * rng.uniform(0.03, 0.15, where.sum())
+    return _candles(rng, bar_ret, gap_ret, interval, s0)
+
+
+SCENARIOS = {"gbm": gbm, "regime": regime, "gaps": gaps}
+
+
+def generate(scenario, bars, interval="1h", seed=0):
+    return SCENARIOS[scenario](bars, interval=interval, seed=seed)
+
+
+def resample(df, interval):
+    """Aggregate candles to a coarser interval (e.g. 15m → 1h for FURY MTF)."""
+    return (
+        df.set_index("timestamp")
+        .resample(f"{MINUTES[interval]}min")
+        .agg({"open": "first", "high": "max", "low": "min", "close": "last",
+              "volume": "sum", "quote_volume": "sum"})
+        .dropna()
+        .reset_index()
+    )
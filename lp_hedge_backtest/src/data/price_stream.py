@@ -0,0 +1,193 @@
+"""Push-based Hyperliquid price stream for the live bots.
+
+A daemon thread holds one WebSocket subscription (allMids, or trades for a
+single coin) and drops every new price into a one-slot mailbox. The bot's
+main thread blocks on next_price(): it wakes within milliseconds of a tick
+instead of on a fixed sleep, and a burst of ticks that arrives while it is
+busy (placing an order) collapses into the latest one.
+
+  - REST allMids is the fallback: when the socket has been silent for
+    STALE_AFTER seconds, next_price() polls REST at most every rest_interval
+  - a socket that stays silent for RESTART_AFTER seconds is closed and
+    reopened; connection errors retry with backoff (1s → 30s)
+  - HL_WS_URL / HL_INFO_URL point the stream at a local stand-in for testing
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+HL_WS_URL     = os.getenv("HL_WS_URL",   "wss://api.hyperliquid.xyz/ws")
+HL_INFO_URL   = os.getenv("HL_INFO_URL", "https://api.hyperliquid.xyz/info")
+STALE_AFTER   = 10    # seconds without a WS tick before REST takes over
+RESTART_AFTER = 60    # reopen a socket that has been silent this long
+PING_INTERVAL = 20    # HL closes idle connections after 60s without traffic
+CHANNELS      = ("allMids", "trades")
+
+
+class PriceStream:
+    """Latest price for one coin, pushed over WebSocket with REST fallback."""
+
+    def __init__(self, coin="ETH", channel="allMids", ws_url=HL_WS_URL, info_url=HL_INFO_URL,
+                 rest_interval=30, stale_after=STALE_AFTER, restart_after=RESTART_AFTER):
+        if channel not in CHANNELS:
+            raise ValueError(f"Unknown price channel '{channel}' (expected one of {CHANNELS})")
+        self.coin          = coin
+        self.channel       = channel
+        self.ws_url        = ws_url
+        self.info_url      = info_url
+        self.rest_interval = rest_interval
+        self.stale_after   = stale_after
+        self.restart_after = restart_after
+
+        self._cond      = threading.Condition()
+        self._price     = None      # (price, received_at, source)
+        self._seq       = 0         # bumps on every published price
+        self._seen      = 0         # last seq handed out by next_price()
+        self._ws        = None
+        self._thread    = None
+        self._stopped   = threading.Event()
+        self._last_ws   = 0.0
+        self._last_rest = 0.0
+        self._connected_at = 0.0
+        self.stats = {"ws_ticks": 0, "ws_connects": 0, "ws_errors": 0,
+                      "rest_polls": 0, "rest_errors": 0, "coalesced": 0}
+
+    # ── Publishing ─────────────────────────────────────────────────────────
+
+    def _publish(self, price, source):
+        now = time.time()
+        with self._cond:
+            if self._seq > self._seen:
+                self.stats["coalesced"] += 1     # previous tick never consumed — superseded
+            self._price = (price, now, source)
+            self._seq  += 1
+            self._cond.notify_all()
+
+    def _on_message(self, ws, message):
+        try:
+            msg = json.loads(message)
+        except ValueError:
+            return
+        data = msg.get("data")
+        price = None
+        if msg.get("channel") == "allMids":
+            px = (data or {}).get("mids", {}).get(self.coin)
+            price = float(px) if px is not None else None
+        elif msg.get("channel") == "trades":
+            trades = [t for t in (data or []) if t.get("coin") == self.coin]
+            price = float(trades[-1]["px"]) if trades else None
+        if price:
+            self._last_ws = time.time()
+            self.stats["ws_ticks"] += 1
+            self._publish(price, "ws")
+
+    def _on_open(self, ws):
+        self._connected_at = time.time()
+        self.stats["ws_connects"] += 1
+        sub = {"type": "allMids"} if self.channel == "allMids" else {"type": "trades", "coin": self.coin}
+        ws.send(json.dumps({"method": "subscribe", "subscription": sub}))
+        logger.info(f"PriceStream: subscribed {self.channel} ({self.coin}) on {self.ws_url}")
+
+    def _on_error(self, ws, error):
+        self.stats["ws_errors"] += 1
+        logger.warning(f"PriceStream: WS error: {error}")
+
+    def _ws_loop(self):
+        import websocket   # websocket-client (hyperliquid-python-sdk dependency)
+
+        backoff = 1
+        while not self._stopped.is_set():
+            started = time.time()
+            self._ws = websocket.WebSocketApp(
+                self.ws_url, on_open=self._on_open, on_message=self._on_message, on_error=self._on_error,
+            )
+            try:
+                self._ws.run_forever(ping_interval=PING_INTERVAL, ping_timeout=10)
+            except Exception as e:
+                self._on_error(self._ws, e)
+            if self._stopped.is_set():
+                break
+            backoff = 1 if time.time() - started > 60 else min(backoff * 2, 30)
+            self._stopped.wait(backoff)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._ws_loop, name="price-stream", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._ws is not None:
+            self._ws.close()
+        with self._cond:
+            self._cond.notify_all()
+
+    # ── REST fallback ──────────────────────────────────────────────────────
+
+    def rest_price(self):
+        self._last_rest = time.time()
+        try:
+            resp = requests.post(self.info_url, json={"type": "allMids"}, timeout=5)
+            resp.raise_for_status()
+            self.stats["rest_polls"] += 1
+            return float(resp.json()[self.coin])
+        except Exception as e:
+            self.stats["rest_errors"] += 1
+            logger.warning(f"PriceStream: REST allMids failed: {e}")
+            return None
+
+    # ── Consumer ───────────────────────────────────────────────────────────
+
+    def ws_age(self):
+        return time.time() - self._last_ws if self._last_ws else None
+
+    def latest(self):
+        """(price, received_at, source) of the newest tick, or None."""
+        return self._price
+
+    def next_price(self, timeout):
+        """Block until a new price arrives (or `timeout` seconds pass).
+
+        Returns (price, received_at, source). On timeout the latest WS price is
+        returned while it is still fresh, otherwise a REST poll (rate-limited
+        to rest_interval) — or None if neither is available.
+        """
+        deadline = time.time() + timeout
+        while True:
+            now = time.time()
+            ws_stale = now - self._last_ws > self.stale_after
+            if ws_stale and now - self._last_rest >= self.rest_interval:
+                price = self.rest_price()
+                if price:
+                    self._publish(price, "rest")
+            # Silent since the last tick or (re)connect — also covers a socket that never ticked
+            last_seen = max(self._last_ws, self._connected_at)
+            if last_seen and now - last_seen > self.restart_after and self._ws:
+                logger.warning(f"PriceStream: no {self.channel} tick for {now - last_seen:.0f}s — reconnecting")
+                self._connected_at = now
+                self._ws.close()
+
+            with self._cond:
+                # While stale, wake up in time for the next REST poll
+                wait = deadline - now
+                if ws_stale:
+                    wait = min(wait, max(self._last_rest + self.rest_interval - now, 0.05))
+                self._cond.wait_for(lambda: self._seq != self._seen or self._stopped.is_set(),
+                                    timeout=max(wait, 0))
+                if self._seq != self._seen:
+                    self._seen = self._seq
+                    return self._price
+            if self._stopped.is_set() or time.time() >= deadline:
+                latest = self._price
+                if latest and time.time() - latest[1] <= self.stale_after:
+                    return latest
+                return None
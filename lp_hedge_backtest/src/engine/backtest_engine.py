@@ -15,6 +15,7 @@ from src.hedge.funding_rate import FundingRateModel
 from src.costs.cost_model import CostModel
 from src.indicators.technical import add_indicators, add_fury_indicators
 from src.hedge.standalone_perps_simulator import StandalonePerpsSimulator
+from src.engine.intrabar import IntrabarPaths, in_range_fraction
 
 logger = logging.getLogger(__name__)
 
@@ -29,9 +30,13 @@ class LPHedgeBacktestEngine:
     - Take Profit: close hedge at lower_bound price
     - Dynamic range rebalancing when price exits range for extended period
     - EMA 10 + MA 25 crossover for trend confirmation
+
+    Triggers, TP and liquidation are checked along the bar's intrabar path
+    (config["backtest"]["intrabar"], see src/engine/intrabar.py) before the
+    close; the default "close" mode evaluates the close only.
     """
 
-    def __init__(self, config):
+    def __init__(self, config, minute_bars=None):
         lp_cfg = config["lp_position"]
         hedge_cfg = config["hedge"]
         regime_cfg = config.get("regime", {})
@@ -74,9 +79,10 @@ class LPHedgeBacktestEngine:
         )
         self.funding = FundingRateModel(
             default_rate=hedge_cfg["default_funding_rate"],
-            fetch_real=True
+            fetch_real=hedge_cfg.get("fetch_funding_rates", True)
         )
         self.cost_model = CostModel(gas_cost_per_tx=lp_cfg["gas_cost_per_tx"])
+        self.intrabar = IntrabarPaths.from_config(config, minute_bars)
 
         # STOP LIMIT trigger: lower_bound - offset
         self.hedge_trigger_price = self.price_lower * (1 - self.trigger_offset)
@@ -141,7 +147,43 @@ class LPHedgeBacktestEngine:
                      f"Range: [{current_lower}, {current_upper}] | "
                      f"Hedge trigger: ${self.hedge_trigger_price:.0f} | "
                      f"Hedge TP: ${self.hedge_tp_price:.0f} | "
-                     f"ADX lateral threshold: {self.adx_lateral}")
+                     f"ADX lateral threshold: {self.adx_lateral} | "
+                     f"Intrabar: {self.intrabar.mode}")
+
+        def hedge_step(px, lp, hedge_trigger, hedge_tp, adx_val):
+            """Open on the STOP LIMIT trigger / close at TP for one price."""
+            nonlocal cumulative_hedge_pnl, hedge_activations
+            if px <= hedge_trigger and not self.perps.is_open:
+                # Hedge size = 50% of volatile (ETH) capital in the LP
+                volatile_exposure_usd = lp.get_btc_exposure_usd(px)
+                hedge_size = volatile_exposure_usd * self.hedge_coverage
+
+                # Cap at max position
+                max_size = self.initial_capital * self.max_position_pct * self.perps.leverage
+                hedge_size = min(hedge_size, max_size)
+
+                if hedge_size > 0:
+                    fee = self.perps.open_short(px, hedge_size)
+                    self.cost_model.add_trading_fee(fee)
+                    hedge_activations += 1
+                    adx_str = f"{adx_val:.1f}" if not pd.isna(adx_val) else "N/A"
+                    logger.debug(f"HEDGE OPENED at ${px:.0f} (trigger ${hedge_trigger:.0f}) | "
+                                f"Size: ${hedge_size:.0f} | ADX: {adx_str}")
+
+            # Close hedge: TP at lower_bound (price recovered back to range)
+            elif px >= hedge_tp and self.perps.is_open:
+                net_pnl = self.perps.close_short(px)
+                cumulative_hedge_pnl += net_pnl
+                logger.debug(f"HEDGE CLOSED (TP) at ${px:.0f} | PnL: ${net_pnl:.2f}")
+
+        def liquidate_if_hit(px):
+            nonlocal cumulative_hedge_pnl
+            if self.perps.is_open and self.perps.is_liquidated(px):
+                logger.warning(f"LIQUIDATED at ${px:.0f}!")
+                loss = self.perps.margin_used * 0.9
+                cumulative_hedge_pnl -= loss
+                self.perps.is_open = False
+                self.perps.total_pnl -= loss
 
         for idx in range(len(df)):
             row = df.iloc[idx]
@@ -152,7 +194,16 @@ class LPHedgeBacktestEngine:
             volume_usd = row.get("quote_volume", row.get("volume", 0) * price)
             total_hours += candle_hours
 
+            # STOP LIMIT trigger below lower_bound - offset, TP back at lower_bound
+            hedge_trigger = current_lower * (1 - self.trigger_offset)
+            hedge_tp = current_lower
+            path = self.intrabar.path(
+                row, (hedge_trigger, hedge_tp, current_upper, self.perps.liquidation_price()),
+                bar_seconds=candle_hours * 3600,
+            )
+
             in_range = current_lower <= price <= current_upper
+            in_range_frac = in_range_fraction(path, current_lower, current_upper)
 
             # --- ADX Regime Check ---
             regime_ok = self._should_open_lp(adx_val, trend)
@@ -163,44 +214,23 @@ class LPHedgeBacktestEngine:
                 regime_pauses += 1
                 logger.debug(f"ADX={adx_val:.1f} > {self.adx_trend} — regime warning at ${price:.0f}")
 
-            # --- Track in-range time ---
-            if in_range and lp_active:
-                hours_in_range += candle_hours
+            # --- Track in-range time (share of the intrabar path inside the range) ---
+            if in_range_frac and lp_active:
+                hours_in_range += candle_hours * in_range_frac
 
             # --- LP Fees (only earned when in range and LP is active) ---
             lp_value = lp.get_position_value(price)
             fee_income = 0.0
-            if lp_active and in_range:
-                fee_income = self.fee_estimator.estimate_fees(volume_usd, lp_value, True)
+            if lp_active and in_range_frac:
+                fee_income = self.fee_estimator.estimate_fees(volume_usd, lp_value, True) * in_range_frac
                 cumulative_fees += fee_income
 
             # --- Hedge Logic (STOP LIMIT style from Clase 2) ---
-            # Trigger: price drops below lower_bound - offset (STOP LIMIT)
-            hedge_trigger = current_lower * (1 - self.trigger_offset)
-            hedge_tp = current_lower  # TP at lower bound
-
-            if price <= hedge_trigger and not self.perps.is_open:
-                # Hedge size = 50% of volatile (ETH) capital in the LP
-                volatile_exposure_usd = lp.get_btc_exposure_usd(price)
-                hedge_size = volatile_exposure_usd * self.hedge_coverage
-
-                # Cap at max position
-                max_size = self.initial_capital * self.max_position_pct * self.perps.leverage
-                hedge_size = min(hedge_size, max_size)
-
-                if hedge_size > 0:
-                    fee = self.perps.open_short(price, hedge_size)
-                    self.cost_model.add_trading_fee(fee)
-                    hedge_activations += 1
-                    adx_str = f"{adx_val:.1f}" if not pd.isna(adx_val) else "N/A"
-                    logger.debug(f"HEDGE OPENED at ${price:.0f} (trigger ${hedge_trigger:.0f}) | "
-                                f"Size: ${hedge_size:.0f} | ADX: {adx_str}")
-
-            # Close hedge: TP at lower_bound (price recovered back to range)
-            elif price >= hedge_tp and self.perps.is_open:
-                net_pnl = self.perps.close_short(price)
-                cumulative_hedge_pnl += net_pnl
-                logger.debug(f"HEDGE CLOSED (TP) at ${price:.0f} | PnL: ${net_pnl:.2f}")
+            # Intrabar prices first (none in close mode), then the close
+            for px in path[:-1]:
+                hedge_step(px, lp, hedge_trigger, hedge_tp, adx_val)
+                liquidate_if_hit(px)
+            hedge_step(price, lp, hedge_trigger, hedge_tp, adx_val)
 
             # --- Funding Rate ---
             if self.perps.is_open:
@@ -213,12 +243,7 @@ class LPHedgeBacktestEngine:
                 cumulative_funding += funding_cost
 
                 # Check liquidation
-                if self.perps.is_liquidated(price):
-                    logger.warning(f"LIQUIDATED at ${price:.0f}!")
-                    loss = self.perps.margin_used * 0.9
-                    cumulative_hedge_pnl -= loss
-                    self.perps.is_open = False
-                    self.perps.total_pnl -= loss
+                liquidate_if_hit(price)
 
             # --- Dynamic Range Rebalancing ---
             if self.rebalance_enabled:
@@ -314,6 +339,8 @@ class LPHedgeBacktestEngine:
             "pct_time_hedged": (hours_hedged / total_hours * 100) if total_hours > 0 else 0,
             "rebalance_count": rebalance_count,
             "regime_pauses": regime_pauses,
+            "intrabar_mode": self.intrabar.mode,
+            "intrabar_drilldowns": self.intrabar.drilldowns,
             "perps_summary": self.perps.get_summary(),
             "cost_summary": self.cost_model.get_summary(),
         }
@@ -322,7 +349,7 @@ class LPHedgeBacktestEngine:
 class LPOnlyEngine:
     """Simulates LP-only strategy (no hedge) for comparison."""
 
-    def __init__(self, config):
+    def __init__(self, config, minute_bars=None):
         lp_cfg = config["lp_position"]
         rebalance_cfg = config.get("rebalance", {})
 
@@ -342,6 +369,7 @@ class LPOnlyEngine:
         self.gas_rebalance = rebalance_cfg.get("gas_cost_rebalance", 0.20)
         self.min_rebalance_dist = rebalance_cfg.get("min_rebalance_distance_percent", 3) / 100.0
         self.cost_model = CostModel(gas_cost_per_tx=lp_cfg["gas_cost_per_tx"])
+        self.intrabar = IntrabarPaths.from_config(config, minute_bars)
 
     def run(self, df):
         entry_price = df.iloc[0]["close"]
@@ -369,14 +397,16 @@ class LPOnlyEngine:
             volume_usd = row.get("quote_volume", row.get("volume", 0) * price)
             total_hours += candle_hours
             in_range = current_lower <= price <= current_upper
+            path = self.intrabar.path(row, (current_lower, current_upper), bar_seconds=candle_hours * 3600)
+            in_range_frac = in_range_fraction(path, current_lower, current_upper)
+            hours_in_range += candle_hours * in_range_frac
             if in_range:
-                hours_in_range += candle_hours
                 consecutive_oor_hours = 0
             else:
                 consecutive_oor_hours += candle_hours
 
             lp_value = lp.get_position_value(price)
-            fee_income = self.fee_estimator.estimate_fees(volume_usd, lp_value, in_range)
+            fee_income = self.fee_estimator.estimate_fees(volume_usd, lp_value, in_range_frac > 0) * in_range_frac
             cumulative_fees += fee_income
 
             # Dynamic rebalance
@@ -462,9 +492,12 @@ class BotAvaroEngine:
     - SHORT when price drops below lower_bound (like Aragan/hedge engine)
     - LONG when price breaks above upper_bound (with trailing stop)
     - Trailing stop: -0.5% initial, then -2% from max price seen
+
+    Triggers, stops and liquidation follow the intrabar path like
+    LPHedgeBacktestEngine.
     """
 
-    def __init__(self, config):
+    def __init__(self, config, minute_bars=None):
         lp_cfg = config["lp_position"]
         hedge_cfg = config["hedge"]
         regime_cfg = config.get("regime", {})
@@ -517,9 +550,10 @@ class BotAvaroEngine:
         )
         self.funding = FundingRateModel(
             default_rate=hedge_cfg["default_funding_rate"],
-            fetch_real=True
+            fetch_real=hedge_cfg.get("fetch_funding_rates", True)
         )
         self.cost_model = CostModel(gas_cost_per_tx=lp_cfg["gas_cost_per_tx"])
+        self.intrabar = IntrabarPaths.from_config(config, minute_bars)
 
     def run(self, df):
         df = add_indicators(df, self.adx_period, self.ema_fast, self.ma_slow)
@@ -551,64 +585,92 @@ class BotAvaroEngine:
         consecutive_oor_hours = 0
 
         logger.info(f"Starting Bot Avaro | Entry: ${entry_price:.0f} | "
-                     f"Range: [{current_lower}, {current_upper}]")
-
-        for idx in range(len(df)):
-            row = df.iloc[idx]
-            price = row["close"]
-            timestamp = row["timestamp"]
-            volume_usd = row.get("quote_volume", row.get("volume", 0) * price)
-            total_hours += candle_hours
-
-            in_range = current_lower <= price <= current_upper
-            if in_range:
-                hours_in_range += candle_hours
-
-            # --- LP Fees ---
-            lp_value = lp.get_position_value(price)
-            if in_range:
-                fee_income = self.fee_estimator.estimate_fees(volume_usd, lp_value, True)
-                cumulative_fees += fee_income
-
-            # --- SHORT hedge (below range) ---
-            hedge_trigger = current_lower * (1 - self.trigger_offset)
-            hedge_tp = current_lower
+                     f"Range: [{current_lower}, {current_upper}] | "
+                     f"Intrabar: {self.intrabar.mode}")
 
-            if price <= hedge_trigger and not self.perps.is_open:
-                volatile_exposure = lp.get_btc_exposure_usd(price)
+        def short_step(px, lp, hedge_trigger, hedge_tp):
+            nonlocal cumulative_hedge_pnl, hedge_activations
+            if px <= hedge_trigger and not self.perps.is_open:
+                volatile_exposure = lp.get_btc_exposure_usd(px)
                 hedge_size = volatile_exposure * self.hedge_coverage
                 max_size = self.initial_capital * self.max_position_pct * self.perps.leverage
                 hedge_size = min(hedge_size, max_size)
                 if hedge_size > 0:
-                    fee = self.perps.open_short(price, hedge_size)
+                    fee = self.perps.open_short(px, hedge_size)
                     self.cost_model.add_trading_fee(fee)
                     hedge_activations += 1
 
-            elif price >= hedge_tp and self.perps.is_open:
-                net_pnl = self.perps.close_short(price)
+            elif px >= hedge_tp and self.perps.is_open:
+                net_pnl = self.perps.close_short(px)
                 cumulative_hedge_pnl += net_pnl
 
-            # --- LONG trading (above range) ---
-            long_trigger = current_upper * (1 + self.long_trigger_offset)
-
-            if price >= long_trigger and not self.long_trader.is_open and not self.perps.is_open:
+        def long_step(px, lp_value, long_trigger):
+            nonlocal cumulative_long_pnl, long_activations
+            if px >= long_trigger and not self.long_trader.is_open and not self.perps.is_open:
                 long_size = lp_value * self.long_size_pct
                 if long_size > 0:
-                    fee = self.long_trader.open_long(price, long_size)
+                    fee = self.long_trader.open_long(px, long_size)
                     self.cost_model.add_trading_fee(fee)
                     long_activations += 1
 
             if self.long_trader.is_open:
-                stop_hit = self.long_trader.update_trailing_stop(price)
+                stop_hit = self.long_trader.update_trailing_stop(px)
                 if stop_hit:
-                    net_pnl = self.long_trader.close_long(price)
+                    net_pnl = self.long_trader.close_long(px)
                     cumulative_long_pnl += net_pnl
 
-                if self.long_trader.is_liquidated(price):
+                if self.long_trader.is_liquidated(px):
                     loss = self.long_trader.margin_used * 0.9
                     cumulative_long_pnl -= loss
                     self.long_trader.is_open = False
 
+        def liquidate_short_if_hit(px):
+            nonlocal cumulative_hedge_pnl
+            if self.perps.is_open and self.perps.is_liquidated(px):
+                loss = self.perps.margin_used * 0.9
+                cumulative_hedge_pnl -= loss
+                self.perps.is_open = False
+                self.perps.total_pnl -= loss
+
+        for idx in range(len(df)):
+            row = df.iloc[idx]
+            price = row["close"]
+            timestamp = row["timestamp"]
+            volume_usd = row.get("quote_volume", row.get("volume", 0) * price)
+            total_hours += candle_hours
+
+            hedge_trigger = current_lower * (1 - self.trigger_offset)
+            hedge_tp = current_lower
+            long_trigger = current_upper * (1 + self.long_trigger_offset)
+            long_stop = self.long_trader.stop_price if self.long_trader.is_open else None
+            path = self.intrabar.path(
+                row, (hedge_trigger, hedge_tp, long_trigger, long_stop,
+                      self.perps.liquidation_price(), self.long_trader.liquidation_price()),
+                bar_seconds=candle_hours * 3600,
+            )
+
+            in_range = current_lower <= price <= current_upper
+            in_range_frac = in_range_fraction(path, current_lower, current_upper)
+            hours_in_range += candle_hours * in_range_frac
+
+            # --- LP Fees ---
+            lp_value = lp.get_position_value(price)
+            if in_range_frac:
+                fee_income = self.fee_estimator.estimate_fees(volume_usd, lp_value, True) * in_range_frac
+                cumulative_fees += fee_income
+
+            # --- Intrabar prices (none in close mode), then the close ---
+            for px in path[:-1]:
+                short_step(px, lp, hedge_trigger, hedge_tp)
+                long_step(px, lp_value, long_trigger)
+                liquidate_short_if_hit(px)
+
+            # --- SHORT hedge (below range) ---
+            short_step(price, lp, hedge_trigger, hedge_tp)
+
+            # --- LONG trading (above range) ---
+            long_step(price, lp_value, long_trigger)
+
             # --- Funding ---
             if self.perps.is_open:
                 hours_hedged += candle_hours
@@ -619,11 +681,7 @@ class BotAvaroEngine:
                 self.cost_model.add_funding_cost(funding_cost)
                 cumulative_funding += funding_cost
 
-                if self.perps.is_liquidated(price):
-                    loss = self.perps.margin_used * 0.9
-                    cumulative_hedge_pnl -= loss
-                    self.perps.is_open = False
-                    self.perps.total_pnl -= loss
+                liquidate_short_if_hit(price)
 
             if self.long_trader.is_open:
                 funding_cost = self.funding.calculate_funding_cost(
@@ -711,6 +769,8 @@ class BotAvaroEngine:
             "pct_time_in_range": (hours_in_range / total_hours * 100) if total_hours > 0 else 0,
             "pct_time_hedged": (hours_hedged / total_hours * 100) if total_hours > 0 else 0,
             "rebalance_count": rebalance_count,
+            "intrabar_mode": self.intrabar.mode,
+            "intrabar_drilldowns": self.intrabar.drilldowns,
             "perps_summary": self.perps.get_summary(),
             "long_summary": self.long_trader.get_summary(),
             "cost_summary": self.cost_model.get_summary(),
@@ -0,0 +1,493 @@
+"""Tick-level backtest of LiveHedgeBotV2's short lifecycle.
+
+Replays (timestamp, price) arrays — 1s trades/mids, or 1m bars expanded to
+four ticks — through the same rules live_hedge_bot_v2.py applies per tick:
+
+  - entry: below_range (price <= lower * (1 - TRIGGER_OFFSET)) unless the
+    re-entry guard is up, and from_above (avaro mode) once price has been
+    above the range and falls back under upper * (1 - TRIGGER_OFFSET),
+    skipped past MAX_FROM_ABOVE_DIST_PCT
+  - SL at entry * (1 + SL_PCT); optional fixed TP
+  - breakeven at max(BREAKEVEN_PCT, ATR_MULT_BE x ATR(ATR_PERIOD) of hourly
+    candles) → SL = min(entry, min_price * (1 + TRAIL_PCT)), then trailed on
+    every new minimum; the native SL follows with a cancel+replace (counted)
+    at most every SL_REPLACE_MIN_SECS and only for moves of
+    SL_REPLACE_MIN_STEP_PCT, like _trail_native_sl (exits use the trailed SL)
+  - re-entry guard close * (1 + REENTRY_BUFFER_PCT), cleared early when
+    price keeps falling below the close (M2-23)
+  - circuit breaker: consecutive stops, stop rate and daily loss cap (M2-39)
+
+Parameters use the bot's env names and units, so a tuned set maps 1:1 onto
+a deployment. Orders fill at the tick price (± slippage_pct) like the bot's
+market_open / market_close; HL latency, margin checks, pre-arming and
+funding gates are outside the model.
+
+Speed: instead of visiting every tick, the engine computes the next price
+that can change state (trigger, SL, BE, TP, guard, range edge) and finds it
+with chunked numpy scans over the (memory-mapped) arrays; the trailing
+phase scans a running minimum per chunk. Only those ticks go through the
+scalar per-tick logic, so a year of 1s ticks takes seconds per parameter set.
+"""
+
+import os
+import time
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# LiveHedgeBotV2 env defaults — same names and units as live_hedge_bot_v2.py
+DEFAULTS = {
+    "TRIGGER_OFFSET_PCT":      0.5,
+    "SL_PCT":                  0.5,
+    "BREAKEVEN_PCT":           1.0,
+    "TRAIL_PCT":               1.5,
+    "ATR_PERIOD":              14,
+    "ATR_MULT_BE":             1.5,
+    "TP_PCT":                  None,
+    "TRAILING_STOP":           True,
+    "AUTO_REARM":              True,
+    "BOT_MODE":                "avaro",
+    "MAX_FROM_ABOVE_DIST_PCT": 5.0,
+    "REENTRY_BUFFER_PCT":      0.5,
+    "SL_REPLACE_MIN_SECS":     2.0,
+    "SL_REPLACE_MIN_STEP_PCT": 0.05,
+}
+
+# LiveHedgeBotV2 circuit breaker (M2-39 / 39B / 39C)
+CB_STOP_THRESHOLD    = 3
+CB_PAUSE_STEPS       = (1200, 3600, 14400)
+CB_ESCALATION_WINDOW = 14400
+CB_RATE_THRESHOLD    = 5
+CB_RATE_WINDOW_SECS  = 1800
+CB_RATE_PAUSE_SECS   = 3600
+DAILY_LOSS_CAP_USD   = -5.00
+
+TAKER_FEE = 0.00045
+_SCAN_MIN = 1 << 10    # first chunk of a scan; grows ×4 up to the engine's chunk size
+
+
+class TickArrays:
+    """(ts epoch seconds, price) arrays, usually memory-mapped .npy files."""
+
+    FIELDS = ("ts", "price")
+
+    def __init__(self, ts, price):
+        self.ts, self.price = ts, price
+        self._atr = {}
+
+    @classmethod
+    def from_minute_bars(cls, bars, step=60):
+        """Four ticks per 1m bar: open → low → high → close (high first on down bars)."""
+        o, h, l, c = (np.asarray(a, dtype=float) for a in (bars.open, bars.high, bars.low, bars.close))
+        up = c >= o
+        ts = np.asarray(bars.ts, dtype=float)
+        t = np.column_stack([ts, ts + step * 0.25, ts + step * 0.5, ts + step * 0.75]).ravel()
+        p = np.column_stack([o, np.where(up, l, h), np.where(up, h, l), c]).ravel()
+        return cls(t, p)
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name in self.FIELDS:
+            np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(getattr(self, name), dtype=float))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        mode = "r" if mmap else None
+        return cls(*(np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode) for name in cls.FIELDS))
+
+    def __len__(self):
+        return len(self.ts)
+
+    def hourly_atr(self, period):
+        """(hour_ids, atr) — ATR over the `period` hourly candles completed before each hour."""
+        if period not in self._atr:
+            hours = (np.asarray(self.ts) // 3600).astype(np.int64)
+            starts = np.concatenate([[0], np.flatnonzero(np.diff(hours)) + 1])
+            price = np.asarray(self.price)
+            hi = np.maximum.reduceat(price, starts)
+            lo = np.minimum.reduceat(price, starts)
+            close = price[np.concatenate([starts[1:], [len(price)]]) - 1]
+            prev = np.concatenate([[close[0]], close[:-1]])
+            tr = np.maximum(hi - lo, np.maximum(np.abs(hi - prev), np.abs(lo - prev)))
+            tr[0] = np.nan                                   # no previous close
+            csum = np.concatenate([[0.0], np.cumsum(np.nan_to_num(tr))])
+            atr = np.full(len(starts), np.nan)
+            g = np.arange(period + 1, len(starts))          # hours g-period .. g-1, all with a prev close
+            atr[g] = (csum[g] - csum[g - period]) / period
+            self._atr[period] = (hours[starts], atr)
+        return self._atr[period]
+
+
+class HedgeV2TickEngine:
+    """LiveHedgeBotV2 short lifecycle on tick arrays; see the module docstring."""
+
+    def __init__(self, lower_bound, upper_bound, params=None, hedge_size_eth=1.0,
+                 taker_fee=TAKER_FEE, slippage_pct=0.0, funding_rate_1h=0.0,
+                 circuit_breaker=True, chunk=1 << 16):
+        unknown = set(params or {}) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown V2 parameter(s): {', '.join(sorted(unknown))}")
+        self.params = {**DEFAULTS, **(params or {})}
+        self.lower_bound     = float(lower_bound)
+        self.upper_bound     = float(upper_bound)
+        self.hedge_size_eth  = hedge_size_eth
+        self.taker_fee       = taker_fee
+        self.slippage_pct    = slippage_pct / 100.0
+        self.funding_rate_1h = funding_rate_1h
+        self.circuit_breaker = circuit_breaker
+        self.chunk           = chunk
+
+    # ── Scans ──────────────────────────────────────────────────────────────
+
+    def _scan(self, p, start, end, hi, lo, band=None):
+        """First k in [start, end) with p >= hi, p <= lo or band[0] <= p <= band[1]."""
+        i, size = start, _SCAN_MIN
+        while i < end:
+            j = min(i + size, end)
+            seg = p[i:j]
+            mask = (seg >= hi) | (seg <= lo)
+            if band is not None:
+                mask |= (seg >= band[0]) & (seg <= band[1])
+            hit = np.flatnonzero(mask)
+            if hit.size:
+                return i + int(hit[0])
+            i, size = j, min(size * 4, self.chunk)
+        return end
+
+    @staticmethod
+    def _native_replaces(t, trail_sl, native, last, step, min_secs):
+        """Throttled native-SL replaces over ticks t with (non-increasing) trailed SL.
+
+        A replace goes out on the first tick with sl < native, native - sl >=
+        native * step and t - last >= min_secs (all monotone, so found by
+        bisection). Returns (replaces, native, last).
+        """
+        n, q, replaces = len(t), 0, 0
+        neg_sl = -trail_sl
+        while q < n:
+            guess = max(int(np.searchsorted(neg_sl, -native * (1 - step), side="left")),
+                        int(np.searchsorted(neg_sl, -native, side="right")))
+            j = max(_first(lambda x: trail_sl[x] < native and native - trail_sl[x] >= native * step,
+                           q, n, guess),
+                    _first(lambda x: t[x] - last >= min_secs, q, n,
+                           int(np.searchsorted(t, last + min_secs, side="left"))))
+            if j >= n:
+                break
+            native, last = float(trail_sl[j]), float(t[j])
+            replaces += 1
+            q = j + 1
+        return replaces, native, last
+
+    def _scan_trail(self, p, ts, start, end, short_min, sl, trail, hi, lo, native, last, step, min_secs):
+        """Trailing phase: first k where p >= trailed SL (or hi / lo).
+
+        Returns (k, short_min, sl, native, last, replaces) with the state as of
+        tick k-1; `replaces` counts native-SL cancel+replaces before k.
+        """
+        i, size, replaces = start, _SCAN_MIN, 0
+        while i < end:
+            j = min(i + size, end)
+            seg = np.asarray(p[i:j])
+            run_min = np.minimum(np.minimum.accumulate(seg), short_min)
+            trail_sl = np.minimum(run_min * (1 + trail), sl)
+            hit = np.flatnonzero((seg >= trail_sl) | (seg >= hi) | (seg <= lo))
+            k = int(hit[0]) if hit.size else len(seg)
+            if k:
+                moved, native, last = self._native_replaces(
+                    np.asarray(ts[i:i + k]), trail_sl[:k], native, last, step, min_secs)
+                replaces += moved
+                short_min, sl = float(run_min[k - 1]), float(trail_sl[k - 1])
+            if hit.size:
+                return i + k, short_min, sl, native, last, replaces
+            i, size = j, min(size * 4, self.chunk)
+        return end, short_min, sl, native, last, replaces
+
+    # ── Run ────────────────────────────────────────────────────────────────
+
+    def run(self, ticks):
+        t0 = time.perf_counter()
+        P = self.params
+        ts, p = ticks.ts, ticks.price
+        n = len(ticks)
+        inf = float("inf")
+
+        lower, upper   = self.lower_bound, self.upper_bound
+        offset         = P["TRIGGER_OFFSET_PCT"] / 100.0
+        lower_trigger  = lower * (1 - offset)
+        upper_trigger  = upper * (1 - offset)
+        fa_min         = upper * (1 - P["MAX_FROM_ABOVE_DIST_PCT"] / 100)
+        from_above     = P["BOT_MODE"] != "aragan"
+        sl_pct         = P["SL_PCT"] / 100.0
+        be_pct         = P["BREAKEVEN_PCT"] / 100.0
+        trail          = P["TRAIL_PCT"] / 100.0
+        tp_pct         = P["TP_PCT"] / 100.0 if P["TP_PCT"] is not None else None
+        trailing_stop  = bool(P["TRAILING_STOP"])
+        reentry_buffer = P["REENTRY_BUFFER_PCT"] / 100.0
+        sl_min_secs    = float(P["SL_REPLACE_MIN_SECS"])
+        sl_min_step    = P["SL_REPLACE_MIN_STEP_PCT"] / 100.0
+        atr_hours, atr = ticks.hourly_atr(int(P["ATR_PERIOD"])) if P["ATR_MULT_BE"] else (None, None)
+        size, fee, slip = self.hedge_size_eth, self.taker_fee, self.slippage_pct
+
+        # Bot state (names follow LiveHedgeBotV2)
+        hedge_active = breakeven_reached = price_was_above = False
+        entry_price = entry_fill = short_min_price = current_sl_price = open_time = None
+        tp_price = be_price = None
+        effective_be = be_pct
+        open_trigger = None
+        reentry_guard_price = sl_close_price = None
+        sl_replaces = trade_replaces = 0
+        native_sl_price, last_sl_replace = None, -inf
+
+        # Circuit breaker state
+        consecutive_stops, stop_times, cb_fire_times = 0, [], []
+        session_loss, session_day, cb_until, cb_fires = 0.0, None, -inf, 0
+
+        trades = []
+        scalar_ticks = 0
+
+        def close(px, now, reason):
+            nonlocal hedge_active, breakeven_reached, short_min_price, open_trigger
+            nonlocal reentry_guard_price, sl_close_price, price_was_above
+            nonlocal consecutive_stops, session_loss, session_day, cb_until, cb_fires, trade_replaces
+            fill = px * (1 + slip)
+            gross = (entry_fill - fill) * size
+            fees = (entry_fill + fill) * size * fee
+            funding = entry_price * size * self.funding_rate_1h * (now - open_time) / 3600
+            trades.append({
+                "open_ts": open_time, "close_ts": now, "trigger": open_trigger, "reason": reason,
+                "entry": entry_price, "exit": px, "breakeven_pct": effective_be * 100,
+                "breakeven": breakeven_reached, "min_price": short_min_price,
+                "sl_replaces": trade_replaces,
+                "pnl_pct": (entry_price - px) / entry_price * 100,
+                "pnl_usd": gross - fees + funding, "fees_usd": fees, "funding_usd": funding,
+            })
+            trade_replaces = 0
+
+            # _reset_short_state
+            hedge_active = breakeven_reached = False
+            short_min_price = open_trigger = None
+            reentry_guard_price = px * (1 + reentry_buffer)
+            sl_close_price = px
+            price_was_above = False
+
+            # _on_stop_event
+            if not self.circuit_breaker:
+                return
+            if reason in ("tp_hit", "trailing_stop"):
+                consecutive_stops = 0
+                return
+            consecutive_stops += 1
+            stop_times.append(now)
+            while stop_times and stop_times[0] < now - CB_RATE_WINDOW_SECS:
+                stop_times.pop(0)
+            notional = entry_price * size
+            day = int(now // 86400)
+            if day != session_day:
+                session_loss, session_day = 0.0, day
+            session_loss += -(notional * sl_pct) - (notional * 0.00045 * 2)
+
+            streak_fire = consecutive_stops >= CB_STOP_THRESHOLD
+            rate_fire = len(stop_times) >= CB_RATE_THRESHOLD
+            cap_fire = session_loss <= DAILY_LOSS_CAP_USD
+            if not (streak_fire or rate_fire or cap_fire):
+                return
+            if cap_fire:
+                pause = max(int((day + 1) * 86400 - 1 - now), 1800)
+                session_loss = 0.0
+            else:
+                cb_fire_times.append(now)
+                while cb_fire_times and cb_fire_times[0] < now - CB_ESCALATION_WINDOW:
+                    cb_fire_times.pop(0)
+                step = min(len(cb_fire_times) - 1, len(CB_PAUSE_STEPS) - 1)
+                if rate_fire:
+                    pause = CB_RATE_PAUSE_SECS
+                    stop_times.clear()
+                else:
+                    pause = CB_PAUSE_STEPS[step]
+                consecutive_stops = 0
+            cb_until = max(cb_until, now + pause)
+            cb_fires += 1
+
+        def trail_native_sl(now, force=False):
+            # LiveHedgeBotV2._trail_native_sl (placement always succeeds here)
+            nonlocal native_sl_price, last_sl_replace, sl_replaces, trade_replaces
+            if not force:
+                if native_sl_price - current_sl_price < native_sl_price * sl_min_step:
+                    return
+                if now - last_sl_replace < sl_min_secs:
+                    return
+            native_sl_price, last_sl_replace = current_sl_price, now
+            sl_replaces += 1
+            trade_replaces += 1
+
+        def open_short(px, now, trigger):
+            nonlocal hedge_active, breakeven_reached, short_min_price, current_sl_price, open_time
+            nonlocal entry_price, entry_fill, open_trigger, effective_be, tp_price, be_price
+            nonlocal native_sl_price
+            entry_price, entry_fill = px, px * (1 - slip)
+            hedge_active, breakeven_reached = True, False
+            short_min_price = px
+            open_trigger = trigger
+            current_sl_price = native_sl_price = px * (1 + sl_pct)
+            open_time = now
+            tp_price = px * (1 - tp_pct) if tp_pct is not None else None
+            effective_be = be_pct
+            if atr is not None:
+                h = int(np.searchsorted(atr_hours, now // 3600, side="right")) - 1
+                if h >= 0 and not np.isnan(atr[h]):
+                    effective_be = max(be_pct, P["ATR_MULT_BE"] * atr[h] / px)
+            be_price = px * (1 - effective_be)
+
+        i = 0
+        while i < n:
+            # ── Next tick that can change state ──────────────────────────
+            hi, lo, band = inf, -inf, None
+            if from_above and not price_was_above:
+                hi = upper                                   # arms from_above (p > upper)
+            if reentry_guard_price is not None:
+                hi = min(hi, reentry_guard_price)
+                if sl_close_price is not None:
+                    lo = sl_close_price                      # M2-23 early clear (p < close)
+            end = n
+            if not hedge_active:
+                if price_was_above:
+                    lo = max(lo, lower)                      # disarms (p < lower)
+                if ts[i] < cb_until:
+                    end = int(np.searchsorted(ts, cb_until, side="left"))
+                else:
+                    if reentry_guard_price is None:
+                        lo = max(lo, lower_trigger)
+                    if from_above and price_was_above:
+                        band = (fa_min, upper_trigger)
+                k = self._scan(p, i, end, hi, lo, band)
+            elif not breakeven_reached:
+                hi = min(hi, current_sl_price)
+                if trailing_stop:
+                    lo = max(lo, be_price)
+                if tp_price is not None:
+                    lo = max(lo, tp_price)
+                k = self._scan(p, i, end, hi, lo)
+                if k > i:
+                    short_min_price = min(short_min_price, float(np.min(p[i:k])))
+            else:
+                if tp_price is not None:
+                    lo = max(lo, tp_price)
+                k, short_min_price, current_sl_price, native_sl_price, last_sl_replace, moved = self._scan_trail(
+                    p, ts, i, end, short_min_price, current_sl_price, trail, hi, lo,
+                    native_sl_price, last_sl_replace, sl_min_step, sl_min_secs)
+                sl_replaces += moved
+                trade_replaces += moved
+            if k >= end:
+                i = end
+                continue
+
+            # ── LiveHedgeBotV2._tick for this price ──────────────────────
+            scalar_ticks += 1
+            px, now = float(p[k]), float(ts[k])
+            if from_above and px > upper:
+                price_was_above = True
+            elif px < lower and price_was_above and not hedge_active:
+                price_was_above = False
+
+            if reentry_guard_price is not None and px >= reentry_guard_price:
+                reentry_guard_price = sl_close_price = None
+            elif reentry_guard_price is not None and sl_close_price is not None and px < sl_close_price:
+                reentry_guard_price = sl_close_price = None
+                price_was_above = True
+
+            if not hedge_active:
+                if now >= cb_until:
+                    opened = False
+                    if from_above and price_was_above and px <= upper_trigger and px >= fa_min:
+                        open_short(px, now, "from_above")
+                        price_was_above = False
+                        opened = True
+                    if not opened and px <= lower_trigger and reentry_guard_price is None:
+                        open_short(px, now, "below_range")
+            else:
+                # manage_active_hedge
+                if px < short_min_price:
+                    short_min_price = px
+                    if breakeven_reached:
+                        new_sl = min(entry_price, short_min_price * (1 + trail))
+                        if new_sl < current_sl_price:
+                            current_sl_price = new_sl
+                if breakeven_reached and current_sl_price < native_sl_price:
+                    trail_native_sl(now)
+                if tp_price is not None and px <= tp_price:
+                    close(px, now, "tp_hit")
+                elif px >= current_sl_price:
+                    close(px, now, "trailing_stop" if breakeven_reached else "sl_hit")
+                elif trailing_stop and not breakeven_reached and px <= be_price:
+                    breakeven_reached = True
+                    current_sl_price = min(entry_price, short_min_price * (1 + trail))
+                    trail_native_sl(now, force=True)
+                if not hedge_active and not P["AUTO_REARM"]:
+                    break                                    # bot exits after the close
+            i = k + 1
+
+        if hedge_active:
+            close(float(p[n - 1]), float(ts[n - 1]), "end_of_data")
+
+        return self._summary(ticks, trades, sl_replaces, cb_fires, scalar_ticks, time.perf_counter() - t0)
+
+    def _summary(self, ticks, trades, sl_replaces, cb_fires, scalar_ticks, seconds):
+        trades_df = pd.DataFrame(trades)
+        n = len(ticks)
+        days = (float(ticks.ts[n - 1]) - float(ticks.ts[0])) / 86400 if n > 1 else 0.0
+        closed = trades_df[trades_df["reason"] != "end_of_data"] if len(trades_df) else trades_df
+        reasons = closed["reason"].value_counts().to_dict() if len(closed) else {}
+        return {
+            "strategy":          "LiveHedgeBotV2 (tick)",
+            "params":            dict(self.params),
+            "trades":            trades_df,
+            "n_trades":          len(trades_df),
+            "reasons":           reasons,
+            "win_rate_pct":      float((closed["pnl_usd"] > 0).mean() * 100) if len(closed) else 0.0,
+            "hedge_pnl_usd":     float(trades_df["pnl_usd"].sum()) if len(trades_df) else 0.0,
+            "fees_usd":          float(trades_df["fees_usd"].sum()) if len(trades_df) else 0.0,
+            "funding_usd":       float(trades_df["funding_usd"].sum()) if len(trades_df) else 0.0,
+            "avg_pnl_pct":       float(trades_df["pnl_pct"].mean()) if len(trades_df) else 0.0,
+            "breakeven_trades":  int(trades_df["breakeven"].sum()) if len(trades_df) else 0,
+            "sl_replaces":       sl_replaces,
+            "sl_replaces_per_day": sl_replaces / days if days else 0.0,
+            "circuit_breaker_fires": cb_fires,
+            "days":              days,
+            "ticks":             n,
+            "scalar_ticks":      scalar_ticks,
+            "seconds":           seconds,
+            "ticks_per_sec":     n / seconds if seconds else 0.0,
+        }
+
+
+def _first(cond, lo, hi, guess):
+    """First x in [lo, hi) with cond(x) for a monotone cond, starting from a close guess."""
+    x = min(max(guess, lo), hi)
+    while x > lo and cond(x - 1):
+        x -= 1
+    while x < hi and not cond(x):
+        x += 1
+    return x
+
+
+def _run_one(args):
+    ticks_dir, lower, upper, params, kwargs = args
+    result = HedgeV2TickEngine(lower, upper, params, **kwargs).run(TickArrays.load(ticks_dir))
+    result.pop("trades")
+    return result
+
+
+def sweep(ticks_dir, lower_bound, upper_bound, grid, base_params=None, workers=1, **kwargs):
+    """Run every parameter set in `grid` (list of dicts) on the arrays saved in ticks_dir.
+
+    Workers memory-map the same .npy files, so the page cache holds one copy.
+    """
+    jobs = [(ticks_dir, lower_bound, upper_bound, {**(base_params or {}), **g}, kwargs) for g in grid]
+    if workers <= 1:
+        return [_run_one(job) for job in jobs]
+    import multiprocessing as mp
+    with mp.get_context("fork").Pool(workers) as pool:
+        return pool.map(_run_one, jobs)
@@ -0,0 +1,149 @@
+"""Intrabar price paths for trigger evaluation in the LP engines.
+
+The bar engines decide hedge open/TP, trailing stops and liquidation on one
+price per candle. IntrabarPaths gives them the sequence of prices a bar
+went through instead, selected by config["backtest"]["intrabar"]:
+
+  close   — [close] only: the original close-to-close behaviour (default)
+  ohlc    — open → low → high → close for up bars (close ≥ open),
+            open → high → low → close for down bars, with every live level
+            the path crosses inserted at the crossing, so a stop fills at
+            its level rather than at the wick extreme
+  minute  — like ohlc, but a bar whose high/low straddles a live level is
+            replaced by the ohlc paths of its 1m bars (MinuteBars, usually
+            memory-mapped .npy files); other bars stay at four points
+
+Only straddling bars ever touch the 1m arrays, so a year of hourly bars
+costs a few hundred small slices rather than 500k minute rows.
+"""
+
+import os
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MODES = ("close", "ohlc", "minute")
+
+
+def bar_path(o, h, l, c, levels=()):
+    """OHLC ordering heuristic for one bar, with crossed levels inserted in order."""
+    pts = (o, l, h, c) if c >= o else (o, h, l, c)
+    if not levels:
+        return list(pts)
+    out = [o]
+    for a, b in zip(pts, pts[1:]):
+        lo, hi = (a, b) if a < b else (b, a)
+        inner = [x for x in levels if lo < x < hi]
+        if inner:
+            inner.sort(reverse=a > b)
+            out.extend(inner)
+        out.append(b)
+    return out
+
+
+def in_range_fraction(path, lower, upper):
+    """Share of the path's travelled distance inside [lower, upper].
+
+    With a single point (close mode) this is 1.0 / 0.0, i.e. the old
+    in-range test on the close.
+    """
+    total = inside = 0.0
+    for a, b in zip(path, path[1:]):
+        lo, hi = (a, b) if a < b else (b, a)
+        total  += hi - lo
+        inside += max(0.0, min(hi, upper) - max(lo, lower))
+    if total <= 0:
+        return 1.0 if lower <= path[-1] <= upper else 0.0
+    return inside / total
+
+
+class MinuteBars:
+    """1m OHLC arrays (epoch-second timestamps) sliced by time window."""
+
+    FIELDS = ("ts", "open", "high", "low", "close")
+
+    def __init__(self, ts, open, high, low, close):
+        self.ts, self.open, self.high, self.low, self.close = ts, open, high, low, close
+
+    @classmethod
+    def from_frame(cls, df):
+        ts = pd.to_datetime(df["timestamp"], utc=True).dt.tz_convert(None).to_numpy()
+        ts = ts.astype("datetime64[s]").astype("int64")
+        return cls(ts, *(df[k].to_numpy(dtype=float) for k in cls.FIELDS[1:]))
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name in self.FIELDS:
+            np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(getattr(self, name)))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Open arrays written by save(); mmap=True pages them in on demand."""
+        mode = "r" if mmap else None
+        return cls(*(np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode) for name in cls.FIELDS))
+
+    def __len__(self):
+        return len(self.ts)
+
+    def window(self, start_s, end_s):
+        """Index range of the 1m bars with start_s <= ts < end_s."""
+        return (int(np.searchsorted(self.ts, start_s, side="left")),
+                int(np.searchsorted(self.ts, end_s, side="left")))
+
+
+class IntrabarPaths:
+    """Per-bar price path generator for one engine run."""
+
+    def __init__(self, mode="close", minute_bars=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown intrabar mode '{mode}' (expected one of {MODES})")
+        if mode == "minute" and minute_bars is None:
+            raise ValueError("intrabar='minute' needs 1m bars (MinuteBars)")
+        self.mode        = mode
+        self.minute_bars = minute_bars
+        self.drilldowns  = 0     # bars expanded to 1m
+
+    @classmethod
+    def from_config(cls, config, minute_bars=None):
+        return cls(config.get("backtest", {}).get("intrabar", "close"), minute_bars)
+
+    def path(self, row, levels=(), bar_seconds=3600):
+        """Prices to evaluate for this bar, ending at its close.
+
+        `levels` are the trigger/stop/liquidation prices live at the start of
+        the bar; they decide 1m drill-down and are inserted where crossed.
+        """
+        c = float(row["close"])
+        if self.mode == "close":
+            return [c]
+        o, h, l = float(row["open"]), float(row["high"]), float(row["low"])
+        levels = [x for x in levels if x is not None and x > 0]
+        if self.mode == "minute" and any(l <= x <= h for x in levels):
+            ts = pd.Timestamp(row["timestamp"])
+            start = int((ts.tz_convert(None) if ts.tzinfo else ts).timestamp())
+            i, j = self.minute_bars.window(start, start + bar_seconds)
+            if j > i:
+                self.drilldowns += 1
+                m = self.minute_bars
+                mo, mh, ml, mc = (np.asarray(a[i:j], dtype=float).tolist() for a in (m.open, m.high, m.low, m.close))
+                out = []
+                for k in range(j - i):
+                    out.extend(bar_path(mo[k], mh[k], ml[k], mc[k], levels))
+                out[-1] = c
+                return out
+        return bar_path(o, h, l, c, levels)
+
+
+def load_minute_bars(bt_cfg, cache_dir):
+    """MinuteBars for the backtest window: memory-mapped from cache_dir, fetched once if missing."""
+    directory = bt_cfg.get("minute_data") or os.path.join(
+        cache_dir, f"{bt_cfg['symbol']}_1m_{bt_cfg['start_date']}_{bt_cfg['end_date']}")
+    if not os.path.exists(os.path.join(directory, "ts.npy")):
+        from src.data.price_fetcher import PriceFetcher
+        df = PriceFetcher(symbol=bt_cfg["symbol"], interval="1m").fetch(bt_cfg["start_date"], bt_cfg["end_date"])
+        MinuteBars.from_frame(df).save(directory)
+        logger.info(f"Saved {len(df)} 1m bars to {directory}")
+    return MinuteBars.load(directory)
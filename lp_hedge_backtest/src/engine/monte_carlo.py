@@ -0,0 +1,349 @@
+"""Monte Carlo stress test for the LP + hedge strategy.
+
+Generates thousands of price paths at once (block bootstrap of historical
+returns, or GBM / Student-t calibrated to them) and runs the
+LPHedgeBacktestEngine rules on all of them together: prices and state are
+(n_paths,) arrays stepped bar by bar, so one NumPy op advances every path.
+
+Reference semantics are LPHedgeBacktestEngine.run — same range math, fee
+model, STOP LIMIT trigger, TP at lower bound, funding, liquidation and
+out-of-range rebalancing. Differences:
+  - funding uses the constant default rate (no historical lookup per path)
+  - the ADX regime check is skipped; in the reference it only counts
+    regime_pauses and never changes equity
+
+Paths are simulated in chunks (optionally in a process pool); each chunk
+draws its own paths from a spawned seed, so results do not depend on the
+number of workers.
+"""
+
+import math
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.lp.concentrated_liquidity import liquidity_for_capital, token_amounts
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("bootstrap", "gbm", "student_t")
+QUANTILES = (1, 5, 10, 25, 50, 75, 90, 95, 99)
+DRAWDOWN_THRESHOLDS = (1, 2, 5, 10, 15, 20, 30, 50)
+
+
+# ── Paths ──────────────────────────────────────────────────────────────────────
+
+def log_returns(df):
+    close = df["close"].to_numpy(dtype=float)
+    return np.diff(np.log(close))
+
+
+def bootstrap_returns(returns, n_paths, steps, rng, block=24):
+    """Circular block bootstrap: keeps intraday/volatility clustering up to `block` bars."""
+    block = max(1, min(block, len(returns)))
+    n_blocks = math.ceil(steps / block)
+    starts = rng.integers(0, len(returns), (n_paths, n_blocks, 1))
+    idx = (starts + np.arange(block)) % len(returns)
+    return returns[idx.reshape(n_paths, -1)[:, :steps]]
+
+
+def gbm_returns(mu, sigma, n_paths, steps, rng):
+    return rng.normal(mu - 0.5 * sigma ** 2, sigma, (n_paths, steps))
+
+
+def student_t_returns(mu, sigma, n_paths, steps, rng, nu=4):
+    """Fat-tailed returns, scaled so the per-bar std equals sigma."""
+    scale = sigma * math.sqrt((nu - 2) / nu)
+    return mu - 0.5 * sigma ** 2 + scale * rng.standard_t(nu, (n_paths, steps))
+
+
+def generate_paths(returns, method, n_paths, n_bars, start_price, rng, block=24):
+    """(n_paths, n_bars) price matrix starting at start_price."""
+    steps = n_bars - 1
+    if method == "bootstrap":
+        r = bootstrap_returns(returns, n_paths, steps, rng, block)
+    elif method == "gbm":
+        r = gbm_returns(returns.mean(), returns.std(), n_paths, steps, rng)
+    elif method == "student_t":
+        r = student_t_returns(returns.mean(), returns.std(), n_paths, steps, rng)
+    else:
+        raise ValueError(f"Unknown path method '{method}' (expected one of {METHODS})")
+    log_p = np.zeros((n_paths, n_bars))
+    np.cumsum(r, axis=1, out=log_p[:, 1:])
+    return start_price * np.exp(log_p)
+
+
+# ── Vectorized LP + hedge rules ────────────────────────────────────────────────
+
+def rule_params(config):
+    """LPHedgeBacktestEngine config → flat dict of the numbers its rules use."""
+    lp_cfg = config["lp_position"]
+    hedge_cfg = config["hedge"]
+    rebalance_cfg = config.get("rebalance", {})
+    daily_volume = lp_cfg.get("daily_pool_volume", 8_500_000)
+    return {
+        "capital": lp_cfg["initial_capital_usd"],
+        "lower": lp_cfg["lower_bound"],
+        "upper": lp_cfg["upper_bound"],
+        # FeeEstimator: daily volume / 24 per candle, 70% through the active tick, 40% of TVL active
+        "fee_per_candle": daily_volume / 24 * 0.70 * lp_cfg["fee_tier"],
+        "active_tvl": lp_cfg["assumed_pool_tvl"] * 0.40,
+        "trigger_offset": hedge_cfg.get("trigger_offset_percent", 0.5) / 100.0,
+        "coverage": hedge_cfg["hedge_coverage_percent"] / 100.0,
+        "max_size": (lp_cfg["initial_capital_usd"] * hedge_cfg["max_position_percent"] / 100.0
+                     * hedge_cfg["leverage"]),
+        "leverage": hedge_cfg["leverage"],
+        "commission": hedge_cfg["commission_rate_taker"],
+        "slippage": hedge_cfg["slippage_percent"] / 100.0,
+        "funding_rate": hedge_cfg["default_funding_rate"],
+        "rebalance": rebalance_cfg.get("enabled", True),
+        "oor_hours": rebalance_cfg.get("out_of_range_hours_trigger", 24),
+        "range_width": rebalance_cfg.get("range_width_percent", 10) / 100.0,
+        # The reference passes gas_cost_rebalance to CostModel.add_gas_cost as a tx count
+        "gas_rebalance": rebalance_cfg.get("gas_cost_rebalance", 0.20) * lp_cfg["gas_cost_per_tx"],
+        "min_rebalance_dist": rebalance_cfg.get("min_rebalance_distance_percent", 3) / 100.0,
+    }
+
+
+def simulate_paths(prices, params, candle_hours=1.0):
+    """Run the LP + hedge rules over a (n_paths, n_bars) price matrix.
+
+    Returns a DataFrame with one row per path (final equity, return,
+    max drawdown, fees, hedge PnL, funding, activations, liquidations,
+    rebalances, time in range / hedged).
+    """
+    n, n_bars = prices.shape
+    p0 = prices[:, 0]
+    capital = params["capital"]
+
+    lower = np.full(n, float(params["lower"]))
+    upper = np.full(n, float(params["upper"]))
+    liquidity = liquidity_for_capital(np.full(n, float(capital)), lower, upper, p0)
+
+    cum_fees = np.zeros(n)
+    hedge_pnl = np.zeros(n)
+    funding = np.zeros(n)
+    trading_fees = np.zeros(n)
+    gas = np.zeros(n)
+    h_open = np.zeros(n, dtype=bool)
+    h_entry = np.ones(n)
+    h_size = np.zeros(n)
+    h_margin = np.zeros(n)
+    activations = np.zeros(n, dtype=np.int32)
+    liquidations = np.zeros(n, dtype=np.int32)
+    rebalances = np.zeros(n, dtype=np.int32)
+    oor_hours = np.zeros(n)
+    bars_in_range = np.zeros(n, dtype=np.int32)
+    bars_hedged = np.zeros(n, dtype=np.int32)
+    peak = np.full(n, -np.inf)
+    max_dd = np.zeros(n)
+    equity = np.zeros(n)
+
+    slip, comm = params["slippage"], params["commission"]
+    funding_per_bar = params["funding_rate"] * candle_hours / 8.0
+
+    def close_hedge(mask, price):
+        fill = price * (1 + slip)
+        pnl = h_size * (h_entry - fill) / h_entry - h_size * comm
+        hedge_pnl[mask] += pnl[mask]
+        h_open[mask] = False
+
+    for t in range(n_bars):
+        p = prices[:, t]
+        in_range = (lower <= p) & (p <= upper)
+        bars_in_range += in_range
+
+        # LP value + fees
+        token_x, token_y = token_amounts(liquidity, lower, upper, p)
+        lp_value = token_x * p + token_y
+        earning = in_range & (lp_value > 0)
+        cum_fees[earning] += (params["fee_per_candle"] * lp_value[earning]
+                              / (params["active_tvl"] + lp_value[earning]))
+
+        # Hedge: STOP LIMIT below lower bound, TP back at lower bound
+        opening = (p <= lower * (1 - params["trigger_offset"])) & ~h_open
+        closing = (p >= lower) & h_open
+        if opening.any():
+            size = np.minimum(token_x * p * params["coverage"], params["max_size"])
+            opening &= size > 0
+            h_entry[opening] = p[opening] * (1 - slip)
+            h_size[opening] = size[opening]
+            h_margin[opening] = size[opening] / params["leverage"]
+            h_open |= opening
+            trading_fees[opening] += size[opening] * comm
+            activations += opening
+        if closing.any():
+            close_hedge(closing, p)
+
+        # Funding + liquidation
+        funding[h_open] += h_size[h_open] * funding_per_bar
+        bars_hedged += h_open
+        unrealized = h_size * (h_entry - p) / h_entry
+        liquidated = h_open & (unrealized <= -0.9 * h_margin)
+        if liquidated.any():
+            hedge_pnl[liquidated] -= 0.9 * h_margin[liquidated]
+            h_open &= ~liquidated
+            liquidations += liquidated
+
+        # Rebalance after too long out of range
+        if params["rebalance"]:
+            oor_hours = np.where(in_range, 0.0, oor_hours + candle_hours)
+            due = oor_hours >= params["oor_hours"]
+            if due.any():
+                distance = np.where(p < lower, (lower - p) / lower, (p - upper) / upper)
+                moving = due & (distance >= params["min_rebalance_dist"])
+                if moving.any():
+                    close_hedge(moving & h_open, p)
+                    half_width = p * params["range_width"] / 2
+                    lower = np.where(moving, np.round(p - half_width, 2), lower)
+                    upper = np.where(moving, np.round(p + half_width, 2), upper)
+                    liquidity = np.where(moving, liquidity_for_capital(lp_value + cum_fees, lower, upper, p), liquidity)
+                    oor_hours[moving] = 0.0
+                    rebalances += moving
+                    gas[moving] += params["gas_rebalance"]
+
+        equity = lp_value + cum_fees + hedge_pnl + np.where(h_open, unrealized, 0.0) - funding
+        np.maximum(peak, equity, out=peak)
+        np.maximum(max_dd, (peak - equity) / peak, out=max_dd)
+
+    # Close any remaining hedge at the last price (realized PnL, as in the reference)
+    close_hedge(h_open.copy(), prices[:, -1])
+
+    return pd.DataFrame({
+        "final_equity": equity,
+        "return_pct": (equity / capital - 1) * 100,
+        "max_drawdown_pct": max_dd * 100,
+        "lp_fees_earned": cum_fees,
+        "hedge_pnl": hedge_pnl,
+        "funding_paid": funding,
+        "total_costs": trading_fees + funding + gas,
+        "hedge_activations": activations,
+        "liquidations": liquidations,
+        "rebalance_count": rebalances,
+        "pct_time_in_range": bars_in_range / n_bars * 100,
+        "pct_time_hedged": bars_hedged / n_bars * 100,
+        "final_price": prices[:, -1],
+        "min_price": prices.min(axis=1),
+        "max_price": prices.max(axis=1),
+    })
+
+
+def _run_chunk(returns, params, method, n_paths, n_bars, start_price, seed, block, candle_hours):
+    rng = np.random.default_rng(seed)
+    prices = generate_paths(returns, method, n_paths, n_bars, start_price, rng, block)
+    return simulate_paths(prices, params, candle_hours)
+
+
+# ── Engine + summary ───────────────────────────────────────────────────────────
+
+def summarize(outcomes):
+    """Outcome distributions over all paths."""
+    ret = outcomes["return_pct"].to_numpy()
+    dd = outcomes["max_drawdown_pct"].to_numpy()
+    acts = outcomes["hedge_activations"]
+    tail = ret[ret <= np.percentile(ret, 5)]
+
+    def quantiles(values):
+        return {f"p{q}": round(float(v), 3) for q, v in zip(QUANTILES, np.percentile(values, QUANTILES))}
+
+    return {
+        "paths": len(outcomes),
+        "return_pct": {
+            "mean": round(float(ret.mean()), 3),
+            "std": round(float(ret.std()), 3),
+            **quantiles(ret),
+        },
+        "var_95_pct": round(float(-np.percentile(ret, 5)), 3),
+        "cvar_95_pct": round(float(-tail.mean()), 3) if len(tail) else None,
+        "prob_loss": round(float((ret < 0).mean()), 4),
+        "max_drawdown_pct": quantiles(dd),
+        "max_drawdown_cdf": {f"{t}%": round(float((dd <= t).mean()), 4) for t in DRAWDOWN_THRESHOLDS},
+        "hedge_activations": {
+            "mean": round(float(acts.mean()), 3),
+            "max": int(acts.max()),
+            "pct_paths_hedged": round(float((acts > 0).mean() * 100), 2),
+            "counts": {int(k): int(v) for k, v in acts.value_counts().sort_index().items()},
+        },
+        "pct_paths_liquidated": round(float((outcomes["liquidations"] > 0).mean() * 100), 2),
+        "rebalance_count": quantiles(outcomes["rebalance_count"]),
+        "pct_time_in_range": quantiles(outcomes["pct_time_in_range"]),
+        "lp_fees_earned": quantiles(outcomes["lp_fees_earned"]),
+        "hedge_pnl": quantiles(outcomes["hedge_pnl"]),
+        "funding_paid": quantiles(outcomes["funding_paid"]),
+    }
+
+
+class MonteCarloEngine:
+    """Stress-tests an LP + hedge config over many simulated price paths.
+
+    Config: the usual lp_position / hedge / rebalance sections, plus an
+    optional "monte_carlo" section with defaults for the run() arguments.
+    """
+
+    def __init__(self, config):
+        mc_cfg = config.get("monte_carlo", {})
+        self.params = rule_params(config)
+        self.n_paths = mc_cfg.get("paths", 5_000)
+        self.horizon_hours = mc_cfg.get("horizon_hours", 24 * 30)
+        self.method = mc_cfg.get("method", "bootstrap")
+        self.block_hours = mc_cfg.get("block_hours", 24)
+        self.chunk_size = mc_cfg.get("chunk_size", 1_000)
+        self.workers = mc_cfg.get("workers", 1)
+        self.seed = mc_cfg.get("seed", 0)
+
+    def run(self, df, n_paths=None, horizon_hours=None, method=None, start_price=None,
+            workers=None, seed=None):
+        """Simulate paths calibrated on df's closes; returns summary + per-path outcomes."""
+        n_paths = n_paths or self.n_paths
+        horizon_hours = horizon_hours or self.horizon_hours
+        method = method or self.method
+        workers = self.workers if workers is None else workers
+        seed = self.seed if seed is None else seed
+        if method not in METHODS:
+            raise ValueError(f"Unknown path method '{method}' (expected one of {METHODS})")
+
+        if len(df) > 1:
+            candle_hours = (df.iloc[1]["timestamp"] - df.iloc[0]["timestamp"]).total_seconds() / 3600
+        else:
+            candle_hours = 1.0
+        n_bars = max(2, int(round(horizon_hours / candle_hours)))
+        block = max(1, int(round(self.block_hours / candle_hours)))
+        returns = log_returns(df)
+        start_price = start_price or float(df["close"].iloc[-1])
+        if not self.params["lower"] <= start_price <= self.params["upper"]:
+            logger.warning(f"Start price ${start_price:,.0f} is outside the range "
+                           f"[{self.params['lower']}, {self.params['upper']}]")
+
+        sizes = [min(self.chunk_size, n_paths - i) for i in range(0, n_paths, self.chunk_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        jobs = [(returns, self.params, method, size, n_bars, start_price, s, block, candle_hours)
+                for size, s in zip(sizes, seeds)]
+
+        logger.info(f"Monte Carlo | {n_paths} paths x {n_bars} bars | method={method} | "
+                    f"start ${start_price:,.0f} | {len(jobs)} chunks on {workers or 'all'} workers")
+        started = time.perf_counter()
+        if workers == 1 or len(jobs) == 1:
+            frames = [_run_chunk(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers or None) as pool:
+                frames = list(pool.map(_run_chunk, *zip(*jobs)))
+        outcomes = pd.concat(frames, ignore_index=True)
+        elapsed = time.perf_counter() - started
+
+        summary = summarize(outcomes)
+        summary.update({
+            "method": method,
+            "bars": n_bars,
+            "candle_hours": candle_hours,
+            "horizon_hours": n_bars * candle_hours,
+            "start_price": start_price,
+            "range": [self.params["lower"], self.params["upper"]],
+            "seed": seed,
+            "seconds": round(elapsed, 2),
+        })
+        logger.info(f"Monte Carlo done in {elapsed:.1f}s | median return "
+                    f"{summary['return_pct']['p50']:+.2f}% | 5% VaR {summary['var_95_pct']:.2f}%")
+        return {"summary": summary, "outcomes": outcomes}
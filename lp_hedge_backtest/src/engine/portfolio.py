@@ -0,0 +1,387 @@
+"""Multi-pool portfolio backtest: many LP positions on a shared timeline.
+
+All OHLCV series are aligned once into a (bars, symbols) close matrix, and
+every position is one element of a set of state arrays (struct of arrays),
+so a portfolio of hundreds of NFTs steps forward with a handful of NumPy ops
+per bar.
+
+Per-position rules are the single-pool engines':
+  aragan — LPHedgeBacktestEngine (short hedge below the range)
+  avaro  — BotAvaroEngine (short below + trailing-stop long above the range)
+FURY is a standalone perps strategy on 15m/1h candles, not an LP position;
+backtest it with FuryBacktestEngine.
+
+Portfolio-level additions:
+  - one shared margin pool (portfolio.margin_capital_usd): a new hedge/long
+    only opens if its margin fits in what is free; positions earlier in the
+    list get priority. Unset = unconstrained, and the peak margin used is
+    reported so the pool can be sized.
+  - funding on the net perps position per coin (shorts and avaro longs on the
+    same coin offset, as on one exchange account), charged back to positions
+    pro rata to their notional. portfolio.net_funding=false charges each leg
+    separately, as the single-pool engines do.
+  - drawdown of the summed equity (correlation-aware) next to the sum of the
+    positions' own drawdowns, plus the return correlation per symbol/mode group.
+"""
+
+import copy
+import time
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.lp.concentrated_liquidity import liquidity_for_capital, token_amounts
+from src.engine.monte_carlo import rule_params
+
+logger = logging.getLogger(__name__)
+
+MODES = ("aragan", "avaro")
+
+
+def align_series(data):
+    """{symbol: OHLCV df} → (timestamps, closes[bars, symbols], symbols).
+
+    Outer join on timestamp, forward-fill gaps, drop bars before every
+    symbol has started trading.
+    """
+    symbols = list(data)
+    closes = pd.concat(
+        {s: data[s].set_index("timestamp")["close"] for s in symbols}, axis=1
+    ).sort_index().ffill().dropna()
+    return closes.index, closes[symbols].to_numpy(dtype=float), symbols
+
+
+def make_positions(start_prices, n, capital=10_000, widths=(0.05, 0.10, 0.20), modes=MODES, seed=0):
+    """Random book of n positions around each symbol's start price (for sizing runs)."""
+    rng = np.random.default_rng(seed)
+    symbols = list(start_prices)
+    positions = []
+    for i in range(n):
+        symbol = symbols[rng.integers(len(symbols))]
+        price = start_prices[symbol] * rng.uniform(0.95, 1.05)
+        width = widths[rng.integers(len(widths))]
+        positions.append({
+            "id": f"{symbol}-{i}",
+            "symbol": symbol,
+            "mode": modes[rng.integers(len(modes))],
+            "capital": round(capital * rng.uniform(0.5, 2.0), 2),
+            "lower": round(price * (1 - width / 2), 2),
+            "upper": round(price * (1 + width / 2), 2),
+        })
+    return positions
+
+
+def _position_config(config, pos):
+    """Base config with the position's capital/range and any section overrides."""
+    cfg = copy.deepcopy(config)
+    for section in ("lp_position", "hedge", "rebalance", "avaro"):
+        cfg.setdefault(section, {}).update(pos.get(section, {}))
+    lp = cfg["lp_position"]
+    lp["initial_capital_usd"] = pos.get("capital", lp["initial_capital_usd"])
+    lp["lower_bound"] = pos.get("lower", lp["lower_bound"])
+    lp["upper_bound"] = pos.get("upper", lp["upper_bound"])
+    return cfg
+
+
+def _stack_params(config, positions):
+    """Per-position rule params as arrays (one element per position)."""
+    rows = []
+    for pos in positions:
+        cfg = _position_config(config, pos)
+        avaro_cfg = cfg.get("avaro", {})
+        params = rule_params(cfg)
+        params.update({
+            "long_trigger_offset": avaro_cfg.get("long_trigger_offset_percent", 0.5) / 100.0,
+            "long_size": avaro_cfg.get("long_size_percent", 30) / 100.0,
+            "initial_stop": avaro_cfg.get("initial_stop_loss_percent", 0.5) / 100.0,
+            "trailing_stop": avaro_cfg.get("trailing_stop_percent", 2.0) / 100.0,
+        })
+        rows.append(params)
+    return {k: np.array([r[k] for r in rows]) for k in rows[0]}
+
+
+class PortfolioBacktestEngine:
+    """Steps every LP position of a portfolio together over aligned price data.
+
+    Config: the usual sections (defaults for every position) plus
+        "portfolio": {
+            "positions": [{"id", "symbol", "mode", "capital", "lower", "upper",
+                           optional "hedge"/"rebalance"/"avaro"/"lp_position" overrides}],
+            "margin_capital_usd": null,
+            "net_funding": true,
+            "funding_rates": {"ETHUSDT": 0.0001}
+        }
+    """
+
+    def __init__(self, config, positions=None):
+        pf_cfg = config.get("portfolio", {})
+        self.positions = positions if positions is not None else pf_cfg.get("positions", [])
+        if not self.positions:
+            raise ValueError("Portfolio has no positions")
+        bad = {p.get("mode", "aragan") for p in self.positions} - set(MODES)
+        if bad:
+            raise ValueError(f"Unsupported position mode(s) {sorted(bad)}; expected one of {MODES} "
+                             f"(backtest FURY with FuryBacktestEngine)")
+        self.params = _stack_params(config, self.positions)
+        self.margin_capital = pf_cfg.get("margin_capital_usd")
+        self.net_funding = pf_cfg.get("net_funding", True)
+        self.funding_rates = pf_cfg.get("funding_rates", {})
+
+    def run(self, data):
+        """data: {symbol: OHLCV df}. Returns portfolio + per-position results."""
+        started = time.perf_counter()
+        timestamps, closes, symbols = align_series(data)
+        missing = {p["symbol"] for p in self.positions} - set(symbols)
+        if missing:
+            raise ValueError(f"No price data for {sorted(missing)}")
+
+        P = self.params
+        n, n_bars = len(self.positions), len(closes)
+        sym = np.array([symbols.index(p["symbol"]) for p in self.positions])
+        is_avaro = np.array([p.get("mode", "aragan") == "avaro" for p in self.positions])
+        groups = sorted({(p["symbol"], p.get("mode", "aragan")) for p in self.positions})
+        group = np.array([groups.index((p["symbol"], p.get("mode", "aragan"))) for p in self.positions])
+        rate = np.array([self.funding_rates.get(s, np.nan) for s in symbols])
+        coin_rate = np.where(np.isnan(rate), np.bincount(sym, P["funding_rate"], len(symbols))
+                             / np.maximum(np.bincount(sym, minlength=len(symbols)), 1), rate)
+
+        if len(timestamps) > 1:
+            candle_hours = (timestamps[1] - timestamps[0]).total_seconds() / 3600
+        else:
+            candle_hours = 1.0
+        funding_factor = candle_hours / 8.0
+
+        logger.info(f"Portfolio backtest | {n} positions on {len(symbols)} symbols | {n_bars} bars | "
+                    f"margin pool {'unlimited' if self.margin_capital is None else f'${self.margin_capital:,.0f}'}")
+
+        # ── State (one element per position) ──
+        capital = P["capital"].astype(float)
+        lower, upper = P["lower"].astype(float), P["upper"].astype(float)
+        liquidity = liquidity_for_capital(capital, lower, upper, closes[0, sym])
+        cum_fees, funding = np.zeros(n), np.zeros(n)
+        hedge_pnl, long_pnl = np.zeros(n), np.zeros(n)
+        trading_fees, gas = np.zeros(n), np.zeros(n)
+        h_open = np.zeros(n, dtype=bool)
+        h_entry, h_size, h_margin = np.ones(n), np.zeros(n), np.zeros(n)
+        l_open = np.zeros(n, dtype=bool)
+        l_entry, l_size, l_margin = np.ones(n), np.zeros(n), np.zeros(n)
+        l_max, l_stop = np.zeros(n), np.zeros(n)
+        hedge_acts, long_acts = np.zeros(n, dtype=np.int32), np.zeros(n, dtype=np.int32)
+        liquidations, rebalances = np.zeros(n, dtype=np.int32), np.zeros(n, dtype=np.int32)
+        margin_skips = np.zeros(n, dtype=np.int32)
+        oor_hours = np.zeros(n)
+        bars_in_range, bars_hedged = np.zeros(n, dtype=np.int32), np.zeros(n, dtype=np.int32)
+        peak, max_dd_usd = np.full(n, -np.inf), np.zeros(n)
+        equity = np.zeros(n)
+
+        rec = {k: np.zeros(n_bars) for k in (
+            "total_equity", "lp_value", "fees_earned", "hedge_pnl", "long_pnl",
+            "funding_cost", "margin_used", "hedges_open", "longs_open")}
+        net_notional = np.zeros((n_bars, len(symbols)))
+        group_equity = np.zeros((n_bars, len(groups)))
+
+        def close_short(mask, price):
+            pnl = h_size * (h_entry - price * (1 + P["slippage"])) / h_entry - h_size * P["commission"]
+            hedge_pnl[mask] += pnl[mask]
+            h_open[mask] = False
+
+        def close_long(mask, price):
+            pnl = l_size * (price * (1 - P["slippage"]) - l_entry) / l_entry - l_size * P["commission"]
+            long_pnl[mask] += pnl[mask]
+            l_open[mask] = False
+
+        def fits_margin(wanted, margin_needed, price):
+            """Admit new legs in position order while the shared pool has room."""
+            if self.margin_capital is None or not wanted.any():
+                return wanted
+            unrealized = (np.where(h_open, h_size * (h_entry - price) / h_entry, 0.0)
+                          + np.where(l_open, l_size * (price - l_entry) / l_entry, 0.0)).sum()
+            pool = self.margin_capital + hedge_pnl.sum() + long_pnl.sum() - funding.sum() + min(unrealized, 0.0)
+            free = pool - (h_margin * h_open).sum() - (l_margin * l_open).sum()
+            admitted = wanted & (np.cumsum(np.where(wanted, margin_needed, 0.0)) <= free)
+            margin_skips[wanted & ~admitted] += 1
+            return admitted
+
+        for t in range(n_bars):
+            p = closes[t, sym]
+            in_range = (lower <= p) & (p <= upper)
+            bars_in_range += in_range
+
+            # LP value + fees
+            token_x, token_y = token_amounts(liquidity, lower, upper, p)
+            lp_value = token_x * p + token_y
+            earning = in_range & (lp_value > 0)
+            cum_fees[earning] += (P["fee_per_candle"][earning] * lp_value[earning]
+                                  / (P["active_tvl"][earning] + lp_value[earning]))
+
+            # SHORT hedge below range (STOP LIMIT), TP at lower bound
+            opening = (p <= lower * (1 - P["trigger_offset"])) & ~h_open
+            closing = (p >= lower) & h_open
+            if opening.any():
+                size = np.minimum(token_x * p * P["coverage"], P["max_size"])
+                opening = fits_margin(opening & (size > 0), size / P["leverage"], p)
+                h_entry[opening] = p[opening] * (1 - P["slippage"][opening])
+                h_size[opening] = size[opening]
+                h_margin[opening] = size[opening] / P["leverage"][opening]
+                h_open |= opening
+                trading_fees[opening] += size[opening] * P["commission"][opening]
+                hedge_acts += opening
+            if closing.any():
+                close_short(closing, p)
+
+            # LONG above range with trailing stop (avaro)
+            if is_avaro.any():
+                going_long = is_avaro & (p >= upper * (1 + P["long_trigger_offset"])) & ~l_open & ~h_open
+                if going_long.any():
+                    size = lp_value * P["long_size"]
+                    going_long = fits_margin(going_long & (size > 0), size / P["leverage"], p)
+                    fill = p * (1 + P["slippage"])
+                    l_entry[going_long] = fill[going_long]
+                    l_size[going_long] = size[going_long]
+                    l_margin[going_long] = size[going_long] / P["leverage"][going_long]
+                    l_max[going_long] = fill[going_long]
+                    l_stop[going_long] = fill[going_long] * (1 - P["initial_stop"][going_long])
+                    l_open |= going_long
+                    trading_fees[going_long] += size[going_long] * P["commission"][going_long]
+                    long_acts += going_long
+                if l_open.any():
+                    higher = l_open & (p > l_max)
+                    l_max[higher] = p[higher]
+                    l_stop = np.where(higher, np.maximum(l_stop, p * (1 - P["trailing_stop"])), l_stop)
+                    close_long(l_open & (p <= l_stop), p)
+                    l_liq = l_open & (l_size * (p - l_entry) / l_entry <= -0.9 * l_margin)
+                    long_pnl[l_liq] -= 0.9 * l_margin[l_liq]
+                    l_open &= ~l_liq
+                    liquidations += l_liq
+
+            # Funding on the perps book (short legs before their liquidation check,
+            # long legs after theirs — same order as the single-pool engines)
+            short_notional = np.where(h_open, h_size, 0.0)
+            long_notional = np.where(l_open, l_size, 0.0)
+            bars_hedged += h_open
+            if self.net_funding:
+                gross = short_notional + long_notional
+                coin_gross = np.bincount(sym, gross, len(symbols))
+                coin_net = np.abs(np.bincount(sym, long_notional - short_notional, len(symbols)))
+                coin_cost = coin_net * coin_rate * funding_factor
+                share = np.divide(gross, coin_gross[sym], out=np.zeros(n), where=gross > 0)
+                funding += share * coin_cost[sym]
+            else:
+                funding += (short_notional + long_notional) * P["funding_rate"] * funding_factor
+            net_notional[t] = np.bincount(sym, long_notional - short_notional, len(symbols))
+
+            unrealized_h = h_size * (h_entry - p) / h_entry
+            h_liq = h_open & (unrealized_h <= -0.9 * h_margin)
+            if h_liq.any():
+                hedge_pnl[h_liq] -= 0.9 * h_margin[h_liq]
+                h_open &= ~h_liq
+                liquidations += h_liq
+
+            # Rebalance after too long out of range
+            rebalancing = P["rebalance"].astype(bool)
+            oor_hours = np.where(in_range | ~rebalancing, 0.0, oor_hours + candle_hours)
+            due = oor_hours >= P["oor_hours"]
+            if due.any():
+                distance = np.where(p < lower, (lower - p) / lower, (p - upper) / upper)
+                moving = due & (distance >= P["min_rebalance_dist"])
+                if moving.any():
+                    close_short(moving & h_open, p)
+                    close_long(moving & l_open, p)
+                    half_width = p * P["range_width"] / 2
+                    lower = np.where(moving, np.round(p - half_width, 2), lower)
+                    upper = np.where(moving, np.round(p + half_width, 2), upper)
+                    liquidity = np.where(moving, liquidity_for_capital(lp_value + cum_fees, lower, upper, p),
+                                         liquidity)
+                    oor_hours[moving] = 0.0
+                    rebalances += moving
+                    gas[moving] += P["gas_rebalance"][moving]
+
+            unrealized = (np.where(h_open, h_size * (h_entry - p) / h_entry, 0.0)
+                          + np.where(l_open, l_size * (p - l_entry) / l_entry, 0.0))
+            equity = lp_value + cum_fees + hedge_pnl + long_pnl + unrealized - funding
+            np.maximum(peak, equity, out=peak)
+            np.maximum(max_dd_usd, peak - equity, out=max_dd_usd)
+
+            rec["total_equity"][t] = equity.sum()
+            rec["lp_value"][t] = lp_value.sum()
+            rec["fees_earned"][t] = cum_fees.sum()
+            rec["hedge_pnl"][t] = hedge_pnl.sum() + unrealized_h[h_open].sum()
+            rec["long_pnl"][t] = long_pnl.sum() + (l_size * (p - l_entry) / l_entry)[l_open].sum()
+            rec["funding_cost"][t] = funding.sum()
+            rec["margin_used"][t] = (h_margin * h_open).sum() + (l_margin * l_open).sum()
+            rec["hedges_open"][t] = h_open.sum()
+            rec["longs_open"][t] = l_open.sum()
+            group_equity[t] = np.bincount(group, equity, len(groups))
+
+        # Close any remaining legs at the last price
+        last = closes[-1, sym]
+        close_short(h_open.copy(), last)
+        close_long(l_open.copy(), last)
+
+        equity_df = pd.DataFrame({"timestamp": timestamps, **rec})
+        for j, s in enumerate(symbols):
+            equity_df[f"net_notional_{s}"] = net_notional[:, j]
+
+        initial = capital.sum()
+        positions_df = pd.DataFrame({
+            "id": [p.get("id", i) for i, p in enumerate(self.positions)],
+            "symbol": [p["symbol"] for p in self.positions],
+            "mode": [p.get("mode", "aragan") for p in self.positions],
+            "initial_capital": capital,
+            "final_equity": equity,
+            "return_pct": (equity / capital - 1) * 100,
+            "max_drawdown_usd": max_dd_usd,
+            "lp_fees_earned": cum_fees,
+            "hedge_pnl": hedge_pnl,
+            "long_pnl": long_pnl,
+            "funding_paid": funding,
+            "total_costs": trading_fees + funding + gas,
+            "hedge_activations": hedge_acts,
+            "long_activations": long_acts,
+            "liquidations": liquidations,
+            "margin_skips": margin_skips,
+            "rebalance_count": rebalances,
+            "pct_time_in_range": bars_in_range / n_bars * 100,
+            "pct_time_hedged": bars_hedged / n_bars * 100,
+        })
+
+        total = rec["total_equity"]
+        running_peak = np.maximum.accumulate(total)
+        portfolio_dd_usd = float((running_peak - total).max())
+        standalone_dd_usd = float(max_dd_usd.sum())
+        group_returns = pd.DataFrame(group_equity, columns=[f"{s}:{m}" for s, m in groups]).pct_change().iloc[1:]
+
+        elapsed = time.perf_counter() - started
+        logger.info(f"Portfolio backtest done in {elapsed:.1f}s | final ${total[-1]:,.0f} "
+                    f"({(total[-1] / initial - 1) * 100:+.2f}%)")
+        return {
+            "strategy": "Portfolio",
+            "equity_curve": equity_df,
+            "positions": positions_df,
+            "initial_capital": float(initial),
+            "final_equity": float(total[-1]),
+            "total_return_pct": float((total[-1] / initial - 1) * 100),
+            "max_drawdown_pct": float(((running_peak - total) / running_peak).max() * 100),
+            "max_drawdown_usd": portfolio_dd_usd,
+            "sum_position_drawdowns_usd": standalone_dd_usd,
+            # >1: positions' drawdowns did not coincide (diversification); 1: perfectly correlated
+            "drawdown_diversification": standalone_dd_usd / portfolio_dd_usd if portfolio_dd_usd > 0 else None,
+            "group_return_correlation": group_returns.corr().round(3).to_dict(),
+            "lp_fees_earned": float(cum_fees.sum()),
+            "hedge_pnl": float(hedge_pnl.sum()),
+            "long_pnl": float(long_pnl.sum()),
+            "funding_paid": float(funding.sum()),
+            "total_costs": float((trading_fees + funding + gas).sum()),
+            "hedge_book": {
+                "peak_margin_used": float(rec["margin_used"].max()),
+                "peak_hedges_open": int(rec["hedges_open"].max()),
+                "peak_net_short_notional": {s: float(max(-net_notional[:, j].min(), 0.0))
+                                            for j, s in enumerate(symbols)},
+                "margin_skips": int(margin_skips.sum()),
+            },
+            "positions_count": n,
+            "candle_hours": candle_hours,
+            "total_hours": n_bars * candle_hours,
+            "seconds": round(elapsed, 2),
+        }
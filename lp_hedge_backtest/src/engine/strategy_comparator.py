@@ -12,8 +12,9 @@ logger = logging.getLogger(__name__)
 class StrategyComparator:
     """Runs and compares Bot Aragan (hedge) vs Bot Avaro (hedge+long) vs LP Only vs HODL."""
 
-    def __init__(self, config):
+    def __init__(self, config, minute_bars=None):
         self.config = config
+        self.minute_bars = minute_bars  # 1m MinuteBars for backtest.intrabar = "minute"
         self.results = {}
 
     def run_all(self, df):
@@ -27,19 +28,19 @@ class StrategyComparator:
         logger.info("=" * 60)
         logger.info("Running Strategy 2/4: LP Only (no hedge)")
         logger.info("=" * 60)
-        lp_only = LPOnlyEngine(self.config)
+        lp_only = LPOnlyEngine(self.config, self.minute_bars)
         self.results["lp_only"] = lp_only.run(df)
 
         logger.info("=" * 60)
         logger.info("Running Strategy 3/4: Bot Aragan (LP + Hedge)")
         logger.info("=" * 60)
-        lp_hedge = LPHedgeBacktestEngine(self.config)
+        lp_hedge = LPHedgeBacktestEngine(self.config, self.minute_bars)
         self.results["lp_hedge"] = lp_hedge.run(df)
 
         logger.info("=" * 60)
         logger.info("Running Strategy 4/4: Bot Avaro (LP + Hedge + Long)")
         logger.info("=" * 60)
-        avaro = BotAvaroEngine(self.config)
+        avaro = BotAvaroEngine(self.config, self.minute_bars)
         self.results["avaro"] = avaro.run(df)
 
         return self.results
@@ -98,6 +98,12 @@ class PerpsSimulator:
         unrealized = self.get_unrealized_pnl(current_price)
         return unrealized <= -max_loss
 
+    def liquidation_price(self):
+        """Price at which is_liquidated() turns true (None when flat)."""
+        if not self.is_open:
+            return None
+        return self.entry_price * (1 + 0.9 / self.leverage)
+
     def get_summary(self):
         return {
             "total_trades": self.trade_count,
@@ -226,6 +232,11 @@ class LongTrailingSimulator:
         unrealized = self.get_unrealized_pnl(current_price)
         return unrealized <= -max_loss
 
+    def liquidation_price(self):
+        if not self.is_open:
+            return None
+        return self.entry_price * (1 - 0.9 / self.leverage)
+
     def get_summary(self):
         return {
             "total_trades": self.trade_count,
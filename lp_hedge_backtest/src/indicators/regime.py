@@ -0,0 +1,262 @@
+"""Incremental market regime detection: ADX, volatility and regime per symbol.
+
+One closed candle in → O(1) state update out. The ADX recurrence is the same
+Wilder smoothing as technical.calculate_adx, so feeding a series bar by bar
+gives the same values as the batch function on the same bars.
+
+  - IncrementalADX     — streaming Wilder ADX
+  - RollingVolatility  — std of close-to-close % returns over a fixed window
+  - RegimeDetector     — both of the above for one symbol + regime rules
+  - RegimeService      — detectors keyed by symbol; publishes a JSON snapshot
+                         (data_cache/regime_state.json) for other processes
+                         (supervisor, scalping bot) to read
+
+The backtest LP engines keep calculate_adx: they need the ADX at every past
+bar, not the latest live value this service publishes. Both produce the
+same numbers on the same candles.
+
+Stdlib only, so it can be imported from outside the backtest package.
+"""
+
+import json
+import math
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+
+DEFAULT_STATE_PATH = os.getenv(
+    "REGIME_STATE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                 "data_cache", "regime_state.json"),
+)
+
+# Regime rules — same thresholds the supervisor market check has always used
+ADX_TREND_THRESHOLD = 25.0   # ADX above → trending
+RANGING_VOL_PCT = 0.5        # otherwise, return std below (in %) → ranging, else choppy
+
+
+class IncrementalADX:
+    """Streaming Wilder ADX, bar-for-bar equal to technical.calculate_adx.
+
+    value is NaN until 2 * period + 1 bars have been seen.
+    """
+
+    def __init__(self, period=14):
+        self.period = period
+        self.n = 0
+        self.prev = None            # (high, low, close) of previous bar
+        self.atr = 0.0
+        self.smooth_plus = 0.0
+        self.smooth_minus = 0.0
+        self.dx_seed = 0.0          # sum of DX over bars period..2*period
+        self.value = math.nan
+
+    def update(self, high, low, close):
+        """Add one closed bar and return the current ADX (NaN while warming up)."""
+        p = self.period
+        i = self.n
+        self.n += 1
+
+        if self.prev is None:
+            self.prev = (high, low, close)
+            return self.value
+
+        prev_high, prev_low, prev_close = self.prev
+        self.prev = (high, low, close)
+
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        up_move = high - prev_high
+        down_move = prev_low - low
+        plus_dm = up_move if (up_move > down_move and up_move > 0) else 0.0
+        minus_dm = down_move if (down_move > up_move and down_move > 0) else 0.0
+
+        if i <= p:
+            # Seed window: plain sums of bars 1..period
+            self.atr += tr
+            self.smooth_plus += plus_dm
+            self.smooth_minus += minus_dm
+            if i < p:
+                return self.value
+        else:
+            self.atr = self.atr - (self.atr / p) + tr
+            self.smooth_plus = self.smooth_plus - (self.smooth_plus / p) + plus_dm
+            self.smooth_minus = self.smooth_minus - (self.smooth_minus / p) + minus_dm
+
+        plus_di = minus_di = 0.0
+        if self.atr > 0:
+            plus_di = 100 * self.smooth_plus / self.atr
+            minus_di = 100 * self.smooth_minus / self.atr
+        di_sum = plus_di + minus_di
+        dx = 100 * abs(plus_di - minus_di) / di_sum if di_sum > 0 else 0.0
+
+        if i < 2 * p:
+            self.dx_seed += dx
+        elif i == 2 * p:
+            self.value = (self.dx_seed + dx) / (p + 1)
+        else:
+            self.value = (self.value * (p - 1) + dx) / p
+
+        return self.value
+
+
+class RollingVolatility:
+    """Sample std (ddof=1) of close-to-close % returns over the last `window` returns."""
+
+    def __init__(self, window=99):
+        self.window = window
+        self.returns = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.prev_close = None
+        self._since_resum = 0
+
+    def update(self, close):
+        if self.prev_close:
+            r = (close - self.prev_close) / self.prev_close * 100
+            self.returns.append(r)
+            self.total += r
+            self.total_sq += r * r
+            if len(self.returns) > self.window:
+                old = self.returns.popleft()
+                self.total -= old
+                self.total_sq -= old * old
+            self._since_resum += 1
+            if self._since_resum >= 10 * self.window:
+                # Re-sum occasionally so float drift in the running sums can't build up
+                self.total = sum(self.returns)
+                self.total_sq = sum(x * x for x in self.returns)
+                self._since_resum = 0
+        self.prev_close = close
+        return self.value
+
+    @property
+    def value(self):
+        k = len(self.returns)
+        if k < 2:
+            return math.nan
+        var = (self.total_sq - self.total * self.total / k) / (k - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+def classify_regime(adx, volatility):
+    """Return (regime, tradeable) using the supervisor's rules."""
+    if adx > ADX_TREND_THRESHOLD:
+        return "trending", True
+    if volatility < RANGING_VOL_PCT:
+        return "ranging", False
+    return "choppy", True
+
+
+@dataclass
+class RegimeState:
+    symbol: str
+    ts: int                 # open time (ms) of the last closed candle applied
+    price: float
+    adx: float
+    volatility: float
+    regime: str
+    tradeable: bool
+    bars: int
+
+
+class RegimeDetector:
+    """Rolling regime state for one symbol, updated once per closed candle."""
+
+    def __init__(self, symbol, adx_period=14, vol_window=99):
+        self.symbol = symbol
+        self.adx = IncrementalADX(adx_period)
+        self.vol = RollingVolatility(vol_window)
+        self.last_ts = None
+        self.last_close = math.nan
+
+    def update(self, ts, high, low, close):
+        """Apply one closed candle. Candles at or before the last applied ts are ignored."""
+        if self.last_ts is not None and ts <= self.last_ts:
+            return False
+        self.adx.update(float(high), float(low), float(close))
+        self.vol.update(float(close))
+        self.last_ts = ts
+        self.last_close = float(close)
+        return True
+
+    def update_many(self, candles):
+        """Apply an iterable of candle dicts (timestamp/high/low/close) in order."""
+        return sum(self.update(c["timestamp"], c["high"], c["low"], c["close"]) for c in candles)
+
+    def state(self, price=None):
+        """Current regime; `price` overrides the last close (e.g. live ticker)."""
+        adx = self.adx.value
+        vol = self.vol.value
+        regime, tradeable = classify_regime(
+            0.0 if math.isnan(adx) else adx,
+            0.0 if math.isnan(vol) else vol,
+        )
+        if math.isnan(adx):
+            regime, tradeable = "unknown", False
+        return RegimeState(
+            symbol=self.symbol,
+            ts=self.last_ts or 0,
+            price=float(price if price is not None else self.last_close),
+            adx=adx,
+            volatility=vol,
+            regime=regime,
+            tradeable=tradeable,
+            bars=self.adx.n,
+        )
+
+
+class RegimeService:
+    """Regime detectors keyed by symbol, with a shared on-disk snapshot."""
+
+    def __init__(self, adx_period=14, vol_window=99, state_path=DEFAULT_STATE_PATH):
+        self.adx_period = adx_period
+        self.vol_window = vol_window
+        self.state_path = state_path
+        self.detectors = {}
+
+    def detector(self, symbol):
+        if symbol not in self.detectors:
+            self.detectors[symbol] = RegimeDetector(symbol, self.adx_period, self.vol_window)
+        return self.detectors[symbol]
+
+    def update(self, symbol, candles):
+        """Apply closed candles for a symbol; returns how many were new."""
+        return self.detector(symbol).update_many(candles)
+
+    def get(self, symbol, price=None):
+        det = self.detectors.get(symbol)
+        return det.state(price) if det else None
+
+    def publish(self, states=None):
+        """Atomically merge the current states (or the given ones) into state_path.
+
+        Symbols published by other processes are kept.
+        """
+        states = states or [d.state() for d in self.detectors.values()]
+        try:
+            with open(self.state_path) as f:
+                symbols = json.load(f).get("symbols", {})
+        except (OSError, ValueError):
+            symbols = {}
+        for s in states:
+            symbols[s.symbol] = {k: (None if isinstance(v, float) and math.isnan(v) else v)
+                                 for k, v in asdict(s).items()}
+
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp = f"{self.state_path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"saved_at": time.time(), "symbols": symbols}, f)
+        os.replace(tmp, self.state_path)
+
+
+def read_published_regime(symbol, max_age=1800, path=DEFAULT_STATE_PATH):
+    """Read a symbol's regime published by another process, or None if missing/stale."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - data.get("saved_at", 0) > max_age:
+        return None
+    return data.get("symbols", {}).get(symbol)
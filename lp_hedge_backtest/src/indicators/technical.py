@@ -21,6 +21,8 @@ def calculate_adx(df, period=14):
     ADX < 20 = lateral/ranging market (good for LP)
     ADX 20-30 = developing trend (caution)
     ADX > 30 = strong trend (avoid LP, or hedge aggressively)
+
+    regime.IncrementalADX is the streaming equivalent (same values bar for bar).
     """
     high = df["high"].values.astype(float)
     low = df["low"].values.astype(float)
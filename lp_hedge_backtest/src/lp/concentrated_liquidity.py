@@ -3,6 +3,8 @@
 import math
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -99,3 +101,21 @@ class ConcentratedLPPosition:
     def get_btc_exposure_usd(self, current_price):
         """Returns USD value of BTC exposure in the LP."""
         return self.get_btc_exposure(current_price) * current_price
+
+
+# ── Vectorized (one array element per position / path) ────────────────────────
+
+def liquidity_for_capital(capital, lower, upper, price):
+    """ConcentratedLPPosition._calculate_liquidity for arrays."""
+    sqrt_lower, sqrt_upper = np.sqrt(lower), np.sqrt(upper)
+    sqrt_price = np.sqrt(np.clip(price, lower, upper))
+    cost_per_l = price * (1.0 / sqrt_price - 1.0 / sqrt_upper) + (sqrt_price - sqrt_lower)
+    return np.divide(capital, cost_per_l, out=np.zeros_like(cost_per_l), where=cost_per_l > 0)
+
+
+def token_amounts(liquidity, lower, upper, price):
+    """ConcentratedLPPosition._get_token_amounts for arrays (below/in/above range)."""
+    sqrt_price = np.sqrt(np.clip(price, lower, upper))
+    token_x = liquidity * (1.0 / sqrt_price - 1.0 / np.sqrt(upper))
+    token_y = liquidity * (sqrt_price - np.sqrt(lower))
+    return np.maximum(token_x, 0.0), np.maximum(token_y, 0.0)
@@ -0,0 +1,176 @@
+"""Non-blocking outbound email for the live bots and the scalping trader.
+
+The trading thread only calls send(), which drops the message on an
+in-memory queue and returns. One daemon worker drains the queue:
+
+  - a single SMTP session (STARTTLS + login once) is reused across messages
+    and closed after IDLE_CLOSE seconds without mail
+  - messages arriving within DIGEST_WINDOW of each other go out as one
+    digest email (at most MAX_DIGEST per email)
+  - failed deliveries reconnect and retry with backoff (2s → 60s) up to
+    MAX_RETRIES times, then the batch is dropped and logged
+  - at interpreter exit pending mail gets up to EXIT_FLUSH seconds
+
+Config is the usual email_config.json dict (smtp_server, smtp_port,
+smtp_username, smtp_password, sender_email, optional smtp_use_tls).
+"""
+
+import time
+import queue
+import atexit
+import logging
+import smtplib
+import threading
+from datetime import datetime
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+logger = logging.getLogger(__name__)
+
+DIGEST_WINDOW = 2.0    # seconds to wait for more mail before sending
+MAX_DIGEST    = 20     # messages folded into one digest email
+IDLE_CLOSE    = 60.0   # close the pooled SMTP session after this much idle time
+MAX_RETRIES   = 5
+SMTP_TIMEOUT  = 20
+EXIT_FLUSH    = 10.0
+
+
+class EmailOutbox:
+    """Queue of outbound emails delivered by one background worker."""
+
+    def __init__(self, config, recipients, subject_prefix="", digest_window=DIGEST_WINDOW,
+                 max_retries=MAX_RETRIES, idle_close=IDLE_CLOSE, maxsize=1000):
+        self.config         = config
+        self.recipients     = [r for r in recipients if r]
+        self.subject_prefix = subject_prefix
+        self.digest_window  = digest_window
+        self.max_retries    = max_retries
+        self.idle_close     = idle_close
+
+        self._queue   = queue.Queue(maxsize=maxsize)
+        self._smtp    = None
+        self._thread  = None
+        self._lock    = threading.Lock()
+        self._done    = threading.Condition()
+        self._queued  = 0      # messages accepted by send()
+        self._settled = 0      # messages delivered or dropped by the worker
+        self.stats = {"queued": 0, "sent": 0, "emails": 0, "digests": 0, "retries": 0,
+                      "dropped": 0, "rejected": 0, "connects": 0}
+        atexit.register(self.flush, EXIT_FLUSH)
+
+    # ── Producer side ──────────────────────────────────────────────────────
+
+    def send(self, subject, body):
+        """Enqueue one email; never blocks. False if the queue is full."""
+        with self._lock:
+            try:
+                self._queue.put_nowait((time.time(), self.subject_prefix + subject, body))
+            except queue.Full:
+                self.stats["rejected"] += 1
+                logger.error(f"EmailOutbox: queue full — dropped '{subject}'")
+                return False
+            self._queued += 1
+            self.stats["queued"] += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="email-outbox", daemon=True)
+                self._thread.start()
+        return True
+
+    def flush(self, timeout=None):
+        """Wait until everything queued so far is delivered or dropped.
+        True if it all settled in time and nothing was dropped meanwhile."""
+        target, dropped = self._queued, self.stats["dropped"]
+        with self._done:
+            settled = self._done.wait_for(lambda: self._settled >= target, timeout=timeout)
+        return settled and self.stats["dropped"] == dropped
+
+    def pending(self):
+        return self._queued - self._settled
+
+    # ── Worker ─────────────────────────────────────────────────────────────
+
+    def _worker(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.idle_close)
+            except queue.Empty:
+                self._close_session()
+                continue
+            batch = [first]
+            deadline = time.time() + self.digest_window
+            while len(batch) < MAX_DIGEST:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.time(), 0)))
+                except queue.Empty:
+                    break
+            self._deliver(batch)
+            with self._done:
+                self._settled += len(batch)
+                self._done.notify_all()
+
+    def _deliver(self, batch):
+        subject, body = self._compose(batch)
+        delay = 2
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._send_message(subject, body)
+                self.stats["sent"]    += len(batch)
+                self.stats["emails"]  += 1
+                self.stats["digests"] += int(len(batch) > 1)
+                return
+            except Exception as e:
+                self._close_session()
+                if attempt == self.max_retries:
+                    break
+                self.stats["retries"] += 1
+                logger.warning(f"EmailOutbox: send failed ({e}) — retry {attempt + 1}/{self.max_retries} "
+                               f"in {delay}s")
+                time.sleep(delay)
+                delay = min(delay * 2, 60)
+        self.stats["dropped"] += len(batch)
+        logger.error(f"EmailOutbox: gave up on '{subject}' after {self.max_retries} retries")
+
+    @staticmethod
+    def _compose(batch):
+        if len(batch) == 1:
+            return batch[0][1], batch[0][2]
+        subject = f"[{len(batch)} alerts] {batch[0][1]}"
+        parts = [f"{len(batch)} notifications batched into one email.\n"]
+        for ts, subj, body in batch:
+            parts.append(f"{'─' * 60}\n{datetime.fromtimestamp(ts):%Y-%m-%d %H:%M:%S}  {subj}\n\n{body}\n")
+        return subject, "\n".join(parts)
+
+    # ── SMTP session ───────────────────────────────────────────────────────
+
+    def _session(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.noop()
+                return self._smtp
+            except Exception:
+                self._close_session()
+        cfg = self.config
+        smtp = smtplib.SMTP(cfg["smtp_server"], cfg["smtp_port"], timeout=SMTP_TIMEOUT)
+        if cfg.get("smtp_use_tls", True):
+            smtp.starttls()
+        if cfg.get("smtp_username") and cfg.get("smtp_password"):
+            smtp.login(cfg["smtp_username"], cfg["smtp_password"])
+        self.stats["connects"] += 1
+        self._smtp = smtp
+        return smtp
+
+    def _close_session(self):
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None:
+            try:
+                smtp.quit()
+            except Exception:
+                pass
+
+    def _send_message(self, subject, body):
+        msg = MIMEMultipart()
+        msg["From"]    = self.config["sender_email"]
+        msg["To"]      = ", ".join(self.recipients)
+        msg["Subject"] = subject
+        msg.attach(MIMEText(body, "plain"))
+        self._session().send_message(msg, to_addrs=self.recipients)
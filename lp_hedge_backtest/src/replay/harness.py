@@ -0,0 +1,476 @@
+"""Deterministic, accelerated replay of the live bots.
+
+The bot scripts (live_hedge_bot_v2.py, live_fury_bot.py, live_whale_bot.py)
+are imported unmodified against a MockVenue (see venue.py) and run their
+own main loops. What changes is only what they import or read from
+module globals:
+
+  - web3 / eth_account / hyperliquid     → MockWeb3 / MockAccount / MockInfo / MockExchange
+  - time, datetime, date                 → VirtualClock: sleep() jumps the clock and the
+                                           venue forward instead of waiting
+  - threading.Thread                     → SyncThread (background work runs inline, so the
+                                           order of exchange calls is reproducible)
+  - PriceStream (v2 ws feed)             → ReplayStream, one wake-up per recorded tick
+  - PriceFetcher (fury candles)          → ReplayFetcher, candles built from the ticks
+  - whale_tracker._hl_post / _hl_get     → the venue's scripted whale accounts
+  - log_event / emit / send_email        → recorded with the virtual timestamp
+
+The replay stops (StopReplay, a BaseException so the bots' own
+`except Exception` guards don't swallow it) when the clock passes the last
+tick. Same ticks + env → identical event and order log on every run.
+Bot stdout goes to log_path (default: discarded).
+"""
+
+import os
+import sys
+import time as _time
+import types
+import threading as _threading
+import importlib.util
+import datetime as _dt
+from collections import Counter
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from src.benchmark import synthetic
+from src.replay.venue import (
+    INTERVAL_SECONDS, MockInfo, MockVenue, install_sdk_modules, position_ticks, v3_liquidity,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Always applied on top of the caller's env: dummy credentials, no SMTP, no latency events
+REPLAY_ENV = {
+    "HYPERLIQUID_SECRET_KEY":      "0x" + "1" * 64,
+    "HYPERLIQUID_ACCOUNT_ADDRESS": "0x" + "2" * 40,
+    "EMAIL_CONFIG_PATH":           "/nonexistent/email_config.json",
+    "LATENCY_EMIT_SECS":           "1e18",
+    "CONFIG_ID":                   "replay",
+    "PAPER_TRADE":                 "0",
+}
+
+
+class StopReplay(BaseException):
+    """Raised by the virtual clock once it passes the end of the tick data."""
+
+
+# ── Tick sources ──────────────────────────────────────────────────────────────
+
+def _epoch_seconds(col):
+    if pd.api.types.is_numeric_dtype(col):
+        values = col.to_numpy(dtype=float)
+        return values / 1000 if values.max() > 1e11 else values   # ms or s
+    return pd.to_datetime(col).to_numpy().astype("datetime64[ms]").astype("int64") / 1000
+
+
+def ticks_from_candles(df, interval=None):
+    """Expand OHLCV candles into an open → low/high → high/low → close path (4 ticks/bar).
+
+    Up bars visit the low first, down bars the high first — the usual
+    worst-case-for-stops ordering. Candle volume is split over its ticks, so
+    candles rebuilt by the venue reproduce the input OHLCV exactly.
+    """
+    ts = _epoch_seconds(df["timestamp"])
+    step = INTERVAL_SECONDS[interval] if interval else float(np.median(np.diff(ts)))
+    o, h, l, c = (df[k].to_numpy(dtype=float) for k in ("open", "high", "low", "close"))
+    up = c >= o
+    t = np.column_stack([ts, ts + step * 0.25, ts + step * 0.5, ts + step * 0.75]).ravel()
+    p = np.column_stack([o, np.where(up, l, h), np.where(up, h, l), c]).ravel()
+    if "volume" in df:
+        return t, p, np.repeat(df["volume"].to_numpy(dtype=float) / 4, 4)
+    return t, p
+
+
+def load_ticks(path):
+    """Ticks from a CSV/parquet file: either (timestamp, price) rows or OHLCV candles."""
+    df = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+    df.columns = [c.lower() for c in df.columns]
+    ts_col = next((c for c in ("timestamp", "time", "ts", "t") if c in df), None)
+    if ts_col is None:
+        raise ValueError(f"{path}: no timestamp/time/ts column")
+    df = df.rename(columns={ts_col: "timestamp"}).sort_values("timestamp", kind="stable")
+    if {"open", "high", "low", "close"} <= set(df.columns):
+        return ticks_from_candles(df)
+    px_col = next((c for c in ("price", "px", "mid", "close") if c in df), None)
+    if px_col is None:
+        raise ValueError(f"{path}: no price/px/mid column")
+    return _epoch_seconds(df["timestamp"]), df[px_col].to_numpy(dtype=float)
+
+
+def synthetic_ticks(scenario="gbm", days=90, interval="1m", seed=0):
+    bars = int(days * 86400 / INTERVAL_SECONDS[interval])
+    return ticks_from_candles(synthetic.generate(scenario, bars, interval=interval, seed=seed), interval)
+
+
+def synthetic_whales(ticks, coin="ETH", n_whales=20, seed=0, mean_hold_h=36.0,
+                     notional=(100_000, 5_000_000)):
+    """Random whale open/add/close script along a tick path (for script_whales)."""
+    rng = np.random.default_rng(seed)
+    t, p = ticks[0], ticks[1]
+    events = []
+    for k in range(n_whales):
+        address = f"0x{k + 1:040x}"
+        now = t[0] + rng.exponential(mean_hold_h * 3600)
+        while now < t[-1]:
+            px  = float(p[min(np.searchsorted(t, now), len(p) - 1)])
+            szi = float(rng.uniform(*notional) / px * rng.choice([-1, 1]))
+            lev = int(rng.choice([3, 5, 10, 20, 25]))
+            events.append((float(now), address, coin, szi, px, lev))
+            hold = rng.exponential(mean_hold_h * 3600)
+            if rng.random() < 0.3:   # scale in halfway
+                mid = now + hold / 2
+                events.append((float(mid), address, coin, szi * 1.5, px, lev))
+            now += hold
+            events.append((float(now), address, coin, 0.0, px, lev))
+            now += rng.exponential(mean_hold_h * 3600)
+    return sorted(events, key=lambda e: e[0])
+
+
+# ── Virtual clock and module shims ────────────────────────────────────────────
+
+class VirtualClock:
+    """Replay time: sleep() advances the clock (and the venue) instead of waiting."""
+
+    def __init__(self, venue, end):
+        self.venue = venue
+        self.end   = end
+        self.now   = venue.now
+        self.time_module = self._time_module()
+        self.datetime, self.date = self._datetime_classes()
+        self.threading = types.SimpleNamespace(**{k: getattr(_threading, k) for k in dir(_threading)
+                                                  if not k.startswith("__")})
+        self.threading.Thread = SyncThread
+
+    def time(self):
+        return self.now
+
+    def sleep(self, secs):
+        self.advance(self.now + max(float(secs), 0.0))
+
+    def advance(self, ts):
+        if ts > self.end:
+            self.venue.advance_to(self.end)
+            self.now = self.end
+            raise StopReplay()
+        self.now = max(self.now, ts)
+        self.venue.advance_to(self.now)
+
+    def _time_module(self):
+        shim = types.SimpleNamespace(**{k: getattr(_time, k) for k in dir(_time) if not k.startswith("__")})
+        shim.time      = self.time
+        shim.sleep     = self.sleep
+        shim.monotonic = self.time
+        shim.time_ns   = lambda: int(self.now * 1e9)
+        shim.gmtime    = lambda secs=None: _time.gmtime(self.now if secs is None else secs)
+        shim.localtime = shim.gmtime     # replays run in UTC
+        shim.strftime  = lambda fmt, t=None: _time.strftime(fmt, shim.gmtime() if t is None else t)
+        return shim
+
+    def _datetime_classes(self):
+        clock = self
+
+        class VirtualDatetime(_dt.datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return _dt.datetime.fromtimestamp(clock.now, tz or _dt.timezone.utc).replace(
+                    tzinfo=tz)
+
+            @classmethod
+            def utcnow(cls):
+                return cls.now()
+
+        class VirtualDate(_dt.date):
+            @classmethod
+            def today(cls):
+                return _dt.datetime.fromtimestamp(clock.now, _dt.timezone.utc).date()
+
+        return VirtualDatetime, VirtualDate
+
+
+class SyncThread:
+    """threading.Thread stand-in that runs its target inline on start()."""
+
+    def __init__(self, group=None, target=None, name=None, args=(), kwargs=None, daemon=None):
+        self._target, self._args, self._kwargs = target, args, kwargs or {}
+        self.name, self.daemon = name, daemon
+
+    def start(self):
+        if self._target:
+            self._target(*self._args, **self._kwargs)
+
+    def is_alive(self):
+        return False
+
+    def join(self, timeout=None):
+        pass
+
+
+class ReplayStream:
+    """PriceStream stand-in: next_price() wakes on the next recorded tick."""
+
+    def __init__(self, clock, coin="ETH", **kwargs):
+        self.clock  = clock
+        self.coin   = coin
+        self._price = None
+        self.stats  = {"ws_ticks": 0, "rest_polls": 0}
+
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+    def latest(self):
+        return self._price
+
+    def ws_age(self):
+        return self.clock.now - self._price[1] if self._price else None
+
+    def next_price(self, timeout):
+        venue = self.clock.venue
+        t, p = venue.ticks[self.coin]
+        i = venue._cursor[self.coin]
+        if i < len(t) and t[i] <= self.clock.now + timeout:
+            self.clock.advance(float(t[i]))
+            self._price = (venue.mids[self.coin], float(t[i]), "ws")
+            self.stats["ws_ticks"] += 1
+            return self._price
+        # No tick within the timeout: the real stream falls back to a REST poll
+        self.clock.advance(self.clock.now + timeout)
+        self.stats["rest_polls"] += 1
+        return (venue.mids[self.coin], self.clock.now, "rest")
+
+
+class ReplayFetcher:
+    """PriceFetcher stand-in: fetch_ohlcv() from the venue's tick-built candles."""
+
+    def __init__(self, venue):
+        self.venue = venue
+
+    def fetch_ohlcv(self, symbol, interval="15m", limit=100):
+        coin = symbol.upper().replace("USDT", "").replace("USDC", "")
+        step = INTERVAL_SECONDS[interval]
+        arr = self.venue.candle_arrays(coin, step, self.venue.now - step * limit, self.venue.now)
+        if arr is None:
+            return None
+        out = pd.DataFrame({
+            "timestamp": pd.to_datetime(arr["t"][-limit:].astype("int64"), unit="ms"),
+            **{name: arr[k][-limit:] for name, k in
+               (("open", "o"), ("high", "h"), ("low", "l"), ("close", "c"), ("volume", "v"))},
+        })
+        out["quote_volume"] = out["volume"] * out["close"]
+        return out
+
+
+class Recorder:
+    """Collects the bots' events and emails, stamped with virtual time."""
+
+    def __init__(self, clock):
+        self.clock  = clock
+        self.events = []
+        self.emails = []
+
+    def event(self, event_type, price=None, pnl=None, details=None):
+        self.events.append({"ts": self.clock.now, "event": event_type, "price": price,
+                            "pnl": pnl, "details": details})
+
+    def email(self, subject, body):
+        self.emails.append({"ts": self.clock.now, "subject": subject, "body": body})
+
+
+# ── Result ────────────────────────────────────────────────────────────────────
+
+@dataclass
+class ReplayResult:
+    bot: str
+    start: float
+    end: float
+    ticks: int
+    wall_s: float
+    exit_reason: str
+    start_equity: float
+    final_equity: float
+    events: list = field(default_factory=list)
+    emails: list = field(default_factory=list)
+    actions: list = field(default_factory=list)
+    fills: list = field(default_factory=list)
+    funding: list = field(default_factory=list)
+
+    def summary(self):
+        span = self.end - self.start
+        orders = [a for a in self.actions if a["action"] in ("market_open", "market_close", "bulk_orders")]
+        return {
+            "bot":            self.bot,
+            "start":          _dt.datetime.fromtimestamp(self.start, _dt.timezone.utc).isoformat(),
+            "end":            _dt.datetime.fromtimestamp(self.end, _dt.timezone.utc).isoformat(),
+            "days":           round(span / 86400, 2),
+            "ticks":          self.ticks,
+            "wall_s":         round(self.wall_s, 2),
+            "speedup":        round(span / self.wall_s) if self.wall_s else None,
+            "exit_reason":    self.exit_reason,
+            "events":         dict(Counter(e["event"] for e in self.events)),
+            "emails":         len(self.emails),
+            "orders":         len(orders),
+            "cancels":        sum(a["action"] == "cancel" for a in self.actions),
+            "fills":          len(self.fills),
+            "triggers_fired": sum(a["action"] == "trigger_fired" for a in self.actions),
+            "fees":           round(sum(f["fee"] for f in self.fills), 2),
+            "funding":        round(sum(float(f["delta"]["usdc"]) for f in self.funding), 2),
+            "start_equity":   round(self.start_equity, 2),
+            "final_equity":   round(self.final_equity, 2),
+            "pnl":            round(self.final_equity - self.start_equity, 2),
+        }
+
+    def to_dict(self):
+        return {"summary": self.summary(), "events": self.events, "emails": self.emails,
+                "actions": self.actions, "fills": self.fills}
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+
+@contextmanager
+def _environ(overrides):
+    saved = {k: os.environ.get(k) for k in overrides}
+    os.environ.update({k: str(v) for k, v in overrides.items()})
+    try:
+        yield
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+@contextmanager
+def _patched(obj, **attrs):
+    saved = {k: getattr(obj, k) for k in attrs}
+    for k, v in attrs.items():
+        setattr(obj, k, v)
+    try:
+        yield
+    finally:
+        for k, v in saved.items():
+            setattr(obj, k, v)
+
+
+def _load_bot(filename):
+    alias = f"_replay_{os.path.splitext(filename)[0]}"
+    spec = importlib.util.spec_from_file_location(alias, os.path.join(ROOT, filename))
+    mod = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(mod)
+    except SystemExit as e:
+        raise RuntimeError(f"{filename} exited during import (code {e.code}) — check the replay env")
+    return mod
+
+
+def _use_clock(mod, clock):
+    mod.time = clock.time_module
+    if isinstance(getattr(mod, "datetime", None), type):
+        mod.datetime = clock.datetime
+    if isinstance(getattr(mod, "date", None), type):
+        mod.date = clock.date
+
+
+def _run(bot, filename, venue, env, prepare, entry, end=None, log_path=None):
+    clock = VirtualClock(venue, venue.last_tick_time() if end is None else end)
+    rec   = Recorder(clock)
+    start, start_equity = venue.now, venue.equity()
+    exit_reason = "end_of_data"
+    wall0 = _time.perf_counter()
+    with open(log_path or os.devnull, "w") as sink, redirect_stdout(sink), \
+            install_sdk_modules(venue), _environ({**(env or {}), **REPLAY_ENV}):
+        mod = _load_bot(filename)
+        _use_clock(mod, clock)
+        with prepare(mod, clock, rec):
+            try:
+                entry(mod)
+            except StopReplay:
+                pass
+            except SystemExit as e:
+                exit_reason = f"exit({e.code})"
+    return ReplayResult(
+        bot=bot, start=start, end=clock.now, wall_s=_time.perf_counter() - wall0,
+        ticks=sum(int(np.searchsorted(t, clock.now, side="right")) for t, _ in venue.ticks.values()),
+        exit_reason=exit_reason, start_equity=start_equity, final_equity=venue.equity(),
+        events=rec.events, emails=rec.emails, actions=venue.actions, fills=venue.fills,
+        funding=venue.user_funding,
+    )
+
+
+def replay_hedge_v2(ticks, price_lower=None, price_upper=None, lp_capital=10_000.0, balance=2_000.0,
+                    feed="ws", nft_id=5364087, env=None, venue_kwargs=None, end=None, log_path=None):
+    """LiveHedgeBotV2 over ETH ticks with one LP NFT (default range ±10% around the first tick)."""
+    venue = MockVenue({"ETH": ticks}, balance=balance, **(venue_kwargs or {}))
+    px0 = float(ticks[1][0])
+    tick_lower, tick_upper = position_ticks(price_lower or px0 * 0.9, price_upper or px0 * 1.1)
+    venue.set_lp_position(nft_id, tick_lower, tick_upper, v3_liquidity(lp_capital, px0, tick_lower, tick_upper))
+    env = {**(env or {}), "UNISWAP_NFT_ID": nft_id, "PRICE_FEED": feed}
+
+    @contextmanager
+    def prepare(mod, clock, rec):
+        mod.threading   = clock.threading
+        mod.log_event   = rec.event
+        mod.PriceStream = lambda coin="ETH", **kw: ReplayStream(clock, coin)
+        mod.LiveHedgeBotV2.send_email = lambda self, subject, body: rec.email(subject, body)
+        yield
+
+    return _run("v2", "live_hedge_bot_v2.py", venue, env, prepare,
+                lambda mod: mod.LiveHedgeBotV2().run(), end=end, log_path=log_path)
+
+
+def replay_fury(ticks, symbol="ETH", balance=1_000.0, env=None, venue_kwargs=None, end=None, log_path=None):
+    """FURY RSI trader over one symbol's ticks (candles are rebuilt from the ticks)."""
+    venue = MockVenue({symbol: ticks}, balance=balance, **(venue_kwargs or {}))
+    env = {**(env or {}), "FURY_SYMBOL": symbol}
+
+    @contextmanager
+    def prepare(mod, clock, rec):
+        mod.fetcher = ReplayFetcher(venue)
+        mod.emit    = rec.event
+        yield
+
+    return _run("fury", "live_fury_bot.py", venue, env, prepare, lambda mod: mod.main(),
+                end=end, log_path=log_path)
+
+
+def replay_whale(ticks, whales, coin="ETH", base_oi=100_000.0, env=None, venue_kwargs=None,
+                 end=None, log_path=None):
+    """Whale tracker (poll mode) against scripted whale accounts — see synthetic_whales()."""
+    venue = MockVenue({coin: ticks}, **(venue_kwargs or {}))
+    venue.base_oi[coin] = base_oi
+    venue.script_whales(whales)
+    env = {**(env or {}), "USE_WEBSOCKET": "0"}
+
+    def hl_post(payload, timeout=12):
+        kind = payload.get("type")
+        if kind == "allMids":
+            return MockInfo().all_mids()
+        if kind == "metaAndAssetCtxs":
+            return MockInfo().meta_and_asset_ctxs()
+        if kind == "clearinghouseState":
+            return venue.clearinghouse_state(payload["user"])
+        raise ValueError(f"replay: unsupported info request {kind!r}")
+
+    def hl_get(path, timeout=20):
+        if path == "/leaderboard":
+            return venue.leaderboard()
+        raise ValueError(f"replay: unsupported stats request {path!r}")
+
+    @contextmanager
+    def prepare(mod, clock, rec):
+        tracker = sys.modules["src.whale.whale_tracker"]
+        mod.emit = rec.event
+        with _patched(tracker, _hl_post=hl_post, _hl_get=hl_get, time=clock.time_module,
+                      datetime=clock.datetime, HL_MIDS_SNAPSHOT="/nonexistent/hl_mids.json"):
+            yield
+
+    return _run("whale", "live_whale_bot.py", venue, env, prepare, lambda mod: mod.main(),
+                end=end, log_path=log_path)
+
+
+BOTS = {"v2": replay_hedge_v2, "fury": replay_fury, "whale": replay_whale}
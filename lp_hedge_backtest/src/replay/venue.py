@@ -0,0 +1,563 @@
+"""Simulated Hyperliquid account + Uniswap position manager for bot replays.
+
+MockVenue holds the tick history, one HL perp account (cash, positions,
+resting trigger/limit orders, hourly funding) and the on-chain LP NFTs.
+It only moves forward through advance_to(ts), driven by the replay clock:
+every tick updates the mid, fires trigger orders that it crosses and
+grows the candle history that candles_snapshot() serves.
+
+MockInfo / MockExchange / MockWeb3 / MockAccount mirror the parts of the
+hyperliquid-python-sdk, web3 and eth_account APIs the live bots use and
+return payloads in HL's wire shapes (strings for numbers, "statuses"
+lists, ...). install_sdk_modules() puts them in sys.modules so a bot
+script can be imported unmodified.
+"""
+
+import sys
+import math
+import heapq
+import types
+from contextlib import contextmanager
+
+import numpy as np
+
+HOUR_MS = 3_600_000
+
+INTERVAL_SECONDS = {"1m": 60, "3m": 180, "5m": 300, "15m": 900, "30m": 1800,
+                    "1h": 3600, "2h": 7200, "4h": 14400, "8h": 28800, "12h": 43200, "1d": 86400}
+
+
+def _s(x):
+    return f"{x:.8g}" if isinstance(x, float) else str(x)
+
+
+class MockVenue:
+    """One simulated HL account trading against recorded/synthetic ticks."""
+
+    def __init__(self, ticks, balance=10_000.0, taker_fee=0.00045, spread=0.0001,
+                 funding_rate=0.0000125, max_leverage=25, start=None):
+        # ticks: {coin: (ts seconds, prices[, volumes])} — each sorted by time
+        self.ticks, self.volumes = {}, {}
+        for coin, series in ticks.items():
+            self.ticks[coin] = (np.asarray(series[0], dtype=float), np.asarray(series[1], dtype=float))
+            if len(series) > 2:
+                self.volumes[coin] = np.asarray(series[2], dtype=float)
+        self.taker_fee    = taker_fee
+        self.spread       = spread          # half-spread paid by market/trigger fills
+        self.funding_rate = funding_rate    # hourly; + = longs pay shorts
+        self.max_leverage = max_leverage
+        self.balance      = float(balance)
+
+        first = min(t[0] for t, _ in self.ticks.values())
+        self.now       = first if start is None else start
+        self._cursor   = {c: 0 for c in self.ticks}
+        self.mids      = {}
+        self.positions = {}                 # coin → {"szi", "entry", "funding"}
+        self.leverage  = {}                 # coin → (value, is_cross)
+        self.orders    = {}                 # oid → resting order
+        self._oid      = 1000
+        self._next_funding = (int(self.now // 3600) + 1) * 3600
+
+        self.fills         = []
+        self.funding_log   = []             # HL funding_history rows (market)
+        self.user_funding  = []             # payments on our positions
+        self.actions       = []             # every exchange call, in order
+        self.chain         = {}             # nft_id → positions() tuple
+        self.whales        = {}             # address → {coin: position dict}
+        self.base_oi       = {}
+        self._scheduled    = []             # heap of (ts, seq, fn) — scripted chain/whale changes
+        self._seq          = 0
+        self.advance_to(self.now)
+
+    # ── Time ───────────────────────────────────────────────────────────────
+
+    def advance_to(self, ts):
+        """Replay every tick up to ts (inclusive), with hourly funding in between."""
+        while self._next_funding <= ts:
+            self._play_ticks(self._next_funding)
+            self._apply_funding(self._next_funding)
+            self._next_funding += 3600
+        self._play_ticks(ts)
+        while self._scheduled and self._scheduled[0][0] <= ts:
+            _, _, fn = heapq.heappop(self._scheduled)
+            fn()
+        self.now = max(self.now, ts)
+
+    def schedule(self, ts, fn):
+        """Run fn() once the replay reaches ts (after that instant's ticks)."""
+        self._seq += 1
+        heapq.heappush(self._scheduled, (ts, self._seq, fn))
+
+    def _play_ticks(self, ts):
+        for coin, (t, p) in self.ticks.items():
+            i   = self._cursor[coin]
+            end = int(np.searchsorted(t, ts, side="right"))
+            if end <= i:
+                continue
+            if not any(o["coin"] == coin for o in self.orders.values()):
+                self.mids[coin] = float(p[end - 1])     # nothing can fire — jump
+            else:
+                for k in range(i, end):
+                    self.mids[coin] = float(p[k])
+                    self._check_orders(coin, float(p[k]), float(t[k]))
+            self._cursor[coin] = end
+
+    def last_tick_time(self):
+        return max(float(t[-1]) for t, _ in self.ticks.values())
+
+    # ── Account mechanics ──────────────────────────────────────────────────
+
+    def _new_oid(self):
+        self._oid += 1
+        return self._oid
+
+    def _fill(self, coin, is_buy, sz, px, reduce_only=False, kind="market", oid=None):
+        pos = self.positions.get(coin)
+        szi = pos["szi"] if pos else 0.0
+        if reduce_only:
+            if szi == 0 or (szi > 0) == is_buy:
+                return None
+            sz = min(sz, abs(szi))
+        signed  = sz if is_buy else -sz
+        realized = 0.0
+        if szi and (szi > 0) != is_buy:
+            closed   = min(abs(signed), abs(szi))
+            realized = closed * (px - pos["entry"]) * (1 if szi > 0 else -1)
+        new_szi = szi + signed
+        if abs(new_szi) < 1e-12:
+            self.positions.pop(coin, None)
+        elif szi == 0 or (szi > 0) != (new_szi > 0):
+            self.positions[coin] = {"szi": new_szi, "entry": px, "funding": 0.0}
+        elif abs(new_szi) > abs(szi):
+            pos["entry"] = (pos["entry"] * abs(szi) + px * sz) / abs(new_szi)
+            pos["szi"]   = new_szi
+        else:
+            pos["szi"] = new_szi
+        fee = sz * px * self.taker_fee
+        self.balance += realized - fee
+        oid = oid or self._new_oid()
+        fill = {"time": int(self.now * 1000), "coin": coin, "side": "B" if is_buy else "A",
+                "px": px, "sz": sz, "oid": oid, "kind": kind, "fee": fee, "closedPnl": realized}
+        self.fills.append(fill)
+        return fill
+
+    def _market_px(self, coin, is_buy):
+        mid = self.mids[coin]
+        return mid * (1 + self.spread) if is_buy else mid * (1 - self.spread)
+
+    def _check_orders(self, coin, px, ts):
+        for oid in [o for o, order in self.orders.items() if order["coin"] == coin]:
+            order = self.orders[oid]
+            if "trigger" in order:
+                trig, is_buy = order["trigger"], order["is_buy"]
+                # Stops buy on the way up / sell on the way down; take-profits the reverse
+                up = (trig["tpsl"] == "sl") == is_buy
+                if (px >= trig["triggerPx"]) if up else (px <= trig["triggerPx"]):
+                    del self.orders[oid]
+                    self.now = ts
+                    fill = self._fill(coin, is_buy, order["sz"], self._market_px(coin, is_buy),
+                                      order["reduce_only"], kind=f"trigger_{trig['tpsl']}", oid=oid)
+                    self.actions.append({"ts": ts, "action": "trigger_fired", "oid": oid,
+                                         "tpsl": trig["tpsl"], "px": px, "filled": fill is not None})
+            else:
+                if (px <= order["limit_px"]) if order["is_buy"] else (px >= order["limit_px"]):
+                    del self.orders[oid]
+                    self.now = ts
+                    self._fill(coin, order["is_buy"], order["sz"], order["limit_px"],
+                               order["reduce_only"], kind="limit", oid=oid)
+
+    def _apply_funding(self, ts):
+        for coin in self.ticks:
+            if coin not in self.mids:
+                continue
+            self.funding_log.append({"coin": coin, "fundingRate": _s(self.funding_rate),
+                                     "premium": "0.0", "time": int(ts * 1000)})
+            pos = self.positions.get(coin)
+            if pos:
+                usdc = -pos["szi"] * self.mids[coin] * self.funding_rate
+                pos["funding"] += usdc
+                self.balance   += usdc
+                self.user_funding.append({"time": int(ts * 1000), "hash": "0x0", "delta": {
+                    "type": "funding", "coin": coin, "usdc": _s(usdc), "szi": _s(pos["szi"]),
+                    "fundingRate": _s(self.funding_rate), "nSamples": None}})
+
+    def equity(self):
+        upnl = sum(p["szi"] * (self.mids[c] - p["entry"]) for c, p in self.positions.items())
+        return self.balance + upnl
+
+    # ── Candles ────────────────────────────────────────────────────────────
+
+    def candle_arrays(self, coin, interval, start_s, end_s):
+        """OHLCV arrays of `interval`-second buckets from ticks seen so far (last may be open)."""
+        t, p = self.ticks[coin]
+        end_s = min(end_s, self.now)
+        lo = int(np.searchsorted(t, start_s - start_s % interval, side="left"))
+        hi = int(np.searchsorted(t, end_s, side="right"))
+        if hi <= lo:
+            return None
+        ts, px  = t[lo:hi], p[lo:hi]
+        bucket  = (ts // interval) * interval
+        starts  = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        ends    = np.r_[starts[1:], len(ts)]
+        vol     = self.volumes.get(coin)
+        return {
+            "t": bucket[starts] * 1000, "o": px[starts], "c": px[ends - 1],
+            "h": np.maximum.reduceat(px, starts), "l": np.minimum.reduceat(px, starts),
+            "v": np.add.reduceat(vol[lo:hi], starts) if vol is not None else (ends - starts).astype(float),
+            "n": ends - starts,
+        }
+
+    def candles(self, coin, interval, start_s, end_s):
+        """candles_snapshot rows (numbers still floats) for candle_arrays()."""
+        arr = self.candle_arrays(coin, interval, start_s, end_s)
+        if arr is None:
+            return []
+        return [{"t": int(t), "T": int(t + interval * 1000 - 1), "o": float(o), "h": float(h),
+                 "l": float(l), "c": float(c), "v": float(v), "n": int(n)}
+                for t, o, h, l, c, v, n in zip(*(arr[k] for k in "tohlcvn"))]
+
+    # ── Whales / open interest ─────────────────────────────────────────────
+
+    def script_whales(self, events):
+        """events: [(ts, address, coin, szi, entry_px, leverage)] — szi=0 closes."""
+        for ts, address, coin, szi, entry, lev in events:
+            book = self.whales.setdefault(address.lower(), {})
+            def apply(book=book, coin=coin, szi=szi, entry=entry, lev=lev):
+                if szi == 0:
+                    book.pop(coin, None)
+                else:
+                    book[coin] = {"szi": szi, "entry": entry, "leverage": lev}
+            self.schedule(ts, apply)
+
+    def set_lp_position(self, nft_id, tick_lower, tick_upper, liquidity, at=None):
+        """Mint/resize the LP NFT now, or at `at` (e.g. liquidity=0 to simulate a withdrawal)."""
+        apply = lambda: self.chain.__setitem__(int(nft_id), v3_position(tick_lower, tick_upper, liquidity))
+        if at is None:
+            apply()
+        else:
+            self.schedule(at, apply)
+
+    def leaderboard(self):
+        """stats-data /leaderboard rows for the scripted whales, ranked by their current uPnL."""
+        rows = []
+        for address, book in self.whales.items():
+            pnl = sum(w["szi"] * (self.mids.get(c, w["entry"]) - w["entry"]) for c, w in book.items())
+            perf = {"pnl": _s(pnl), "roi": "0.0", "vlm": "0.0"}
+            rows.append({"ethAddress": address, "accountValue": "0.0", "displayName": None,
+                         "windowPerformances": [["day", perf], ["week", perf], ["month", perf],
+                                                ["allTime", perf]]})
+        return {"leaderboardRows": rows}
+
+    def open_interest(self, coin):
+        whale_oi = sum(abs(book[coin]["szi"]) for book in self.whales.values() if coin in book)
+        return self.base_oi.get(coin, 0.0) + whale_oi
+
+    # ── HL payload builders ────────────────────────────────────────────────
+
+    def clearinghouse_state(self, address=None):
+        book = self.whales.get(address.lower()) if address and address.lower() in self.whales else None
+        if book is not None:
+            positions = {c: {"szi": w["szi"], "entry": w["entry"], "funding": 0.0, "lev": w["leverage"]}
+                         for c, w in book.items()}
+            account_value = sum(abs(w["szi"]) * w["entry"] / w["leverage"] for w in book.values())
+        else:
+            positions = {c: dict(p, lev=self.leverage.get(c, (20, True))[0]) for c, p in self.positions.items()}
+            account_value = self.equity()
+        asset_positions, ntl, used = [], 0.0, 0.0
+        for coin, pos in positions.items():
+            mark = self.mids.get(coin, pos["entry"])
+            value = abs(pos["szi"]) * mark
+            upnl  = pos["szi"] * (mark - pos["entry"])
+            margin = value / pos["lev"]
+            ntl += value
+            used += margin
+            asset_positions.append({"type": "oneWay", "position": {
+                "coin": coin, "szi": _s(pos["szi"]), "entryPx": _s(pos["entry"]),
+                "positionValue": _s(value), "unrealizedPnl": _s(upnl),
+                "returnOnEquity": _s(upnl / margin if margin else 0.0),
+                "leverage": {"type": "cross", "value": pos["lev"]}, "liquidationPx": None,
+                "marginUsed": _s(margin), "maxLeverage": self.max_leverage,
+                "cumFunding": {"allTime": _s(pos["funding"]), "sinceOpen": _s(pos["funding"]),
+                               "sinceChange": _s(pos["funding"])}}})
+        summary = {"accountValue": _s(account_value), "totalNtlPos": _s(ntl),
+                   "totalRawUsd": _s(account_value), "totalMarginUsed": _s(used)}
+        return {"marginSummary": summary, "crossMarginSummary": summary,
+                "withdrawable": _s(max(account_value - used, 0.0)),
+                "assetPositions": asset_positions, "time": int(self.now * 1000)}
+
+    def meta(self):
+        return {"universe": [{"name": c, "szDecimals": 4, "maxLeverage": self.max_leverage}
+                             for c in self.ticks]}
+
+
+# ── SDK stand-ins ─────────────────────────────────────────────────────────────
+
+_ACTIVE = {"venue": None}
+
+
+def _venue():
+    if _ACTIVE["venue"] is None:
+        raise RuntimeError("No MockVenue is active — use replay.venue.activate(venue)")
+    return _ACTIVE["venue"]
+
+
+def _ok(data_type, statuses=None):
+    response = {"type": data_type}
+    if statuses is not None:
+        response["data"] = {"statuses": statuses}
+    return {"status": "ok", "response": response}
+
+
+class MockInfo:
+    def __init__(self, base_url=None, skip_ws=False, *args, **kwargs):
+        self.venue = _venue()
+
+    def all_mids(self, dex=""):
+        return {c: _s(px) for c, px in self.venue.mids.items()}
+
+    def user_state(self, address, dex=""):
+        return self.venue.clearinghouse_state(address)
+
+    def spot_user_state(self, address):
+        return {"balances": []}
+
+    def open_orders(self, address, dex=""):
+        return [{"coin": o["coin"], "side": "B" if o["is_buy"] else "A", "limitPx": _s(o["limit_px"]),
+                 "sz": _s(o["sz"]), "oid": oid, "timestamp": o["time"], "origSz": _s(o["sz"])}
+                for oid, o in self.venue.orders.items()]
+
+    def frontend_open_orders(self, address, dex=""):
+        rows = []
+        for row, (oid, o) in zip(self.open_orders(address), self.venue.orders.items()):
+            trig = o.get("trigger")
+            row.update({"isTrigger": trig is not None, "reduceOnly": o["reduce_only"],
+                        "triggerPx": _s(trig["triggerPx"]) if trig else "0.0",
+                        "orderType": ("Stop Market" if trig["tpsl"] == "sl" else "Take Profit Market")
+                                     if trig else "Limit"})
+            rows.append(row)
+        return rows
+
+    def user_fills(self, address):
+        return [dict(f, px=_s(f["px"]), sz=_s(f["sz"]), fee=_s(f["fee"]), closedPnl=_s(f["closedPnl"]))
+                for f in self.venue.fills]
+
+    def candles_snapshot(self, name, interval, startTime, endTime):
+        rows = self.venue.candles(name, INTERVAL_SECONDS[interval], startTime / 1000, endTime / 1000)
+        return [dict(r, s=name, i=interval, o=_s(r["o"]), h=_s(r["h"]), l=_s(r["l"]),
+                     c=_s(r["c"]), v=_s(r["v"])) for r in rows]
+
+    def funding_history(self, name, startTime, endTime=None):
+        end = endTime if endTime is not None else float("inf")
+        return [r for r in self.venue.funding_log if r["coin"] == name and startTime <= r["time"] <= end]
+
+    def user_funding_history(self, user, startTime, endTime=None):
+        end = endTime if endTime is not None else float("inf")
+        return [r for r in self.venue.user_funding if startTime <= r["time"] <= end]
+
+    def meta(self, dex=""):
+        return self.venue.meta()
+
+    def meta_and_asset_ctxs(self):
+        v = self.venue
+        return [v.meta(), [{"openInterest": _s(v.open_interest(c)), "markPx": _s(v.mids.get(c, 0.0)),
+                            "funding": _s(v.funding_rate)} for c in v.ticks]]
+
+
+class MockExchange:
+    def __init__(self, wallet, base_url=None, meta=None, vault_address=None,
+                 account_address=None, *args, **kwargs):
+        self.venue           = _venue()
+        self.wallet          = wallet
+        self.account_address = account_address
+
+    def _log(self, action, **details):
+        self.venue.actions.append({"ts": self.venue.now, "action": action, **details})
+
+    def update_leverage(self, leverage, name, is_cross=True):
+        self.venue.leverage[name] = (int(leverage), is_cross)
+        self._log("update_leverage", coin=name, leverage=int(leverage))
+        return _ok("default")
+
+    def market_open(self, name, is_buy, sz, px=None, slippage=0.05, cloid=None, builder=None):
+        v = self.venue
+        fill = v._fill(name, is_buy, float(sz), v._market_px(name, is_buy))
+        self._log("market_open", coin=name, is_buy=is_buy, sz=float(sz), px=fill["px"], oid=fill["oid"])
+        return _ok("order", [{"filled": {"totalSz": _s(fill["sz"]), "avgPx": _s(fill["px"]),
+                                         "oid": fill["oid"]}}])
+
+    def market_close(self, coin, sz=None, px=None, slippage=0.05, cloid=None, builder=None):
+        v = self.venue
+        pos = v.positions.get(coin)
+        if not pos:
+            return None     # SDK behaviour: nothing to close
+        is_buy = pos["szi"] < 0
+        size   = abs(pos["szi"]) if sz is None else min(float(sz), abs(pos["szi"]))
+        fill   = v._fill(coin, is_buy, size, v._market_px(coin, is_buy), reduce_only=True)
+        self._log("market_close", coin=coin, sz=size, px=fill["px"], oid=fill["oid"])
+        return _ok("order", [{"filled": {"totalSz": _s(fill["sz"]), "avgPx": _s(fill["px"]),
+                                         "oid": fill["oid"]}}])
+
+    def order(self, name, is_buy, sz, limit_px, order_type, reduce_only=False, cloid=None, builder=None):
+        return self.bulk_orders([{"coin": name, "is_buy": is_buy, "sz": sz, "limit_px": limit_px,
+                                  "order_type": order_type, "reduce_only": reduce_only}])
+
+    def bulk_orders(self, order_requests, builder=None, grouping="na"):
+        v = self.venue
+        statuses = []
+        for req in order_requests:
+            coin, is_buy, sz = req["coin"], req["is_buy"], float(req["sz"])
+            otype = req["order_type"]
+            if coin not in v.mids:
+                statuses.append({"error": f"Unknown asset {coin}"})
+                continue
+            order = {"coin": coin, "is_buy": is_buy, "sz": sz, "limit_px": float(req["limit_px"]),
+                     "reduce_only": bool(req.get("reduce_only")), "time": int(v.now * 1000)}
+            if "trigger" in otype:
+                trig = otype["trigger"]
+                order["trigger"] = {"triggerPx": float(trig["triggerPx"]), "tpsl": trig["tpsl"],
+                                    "isMarket": trig.get("isMarket", True)}
+                oid = v._new_oid()
+                v.orders[oid] = order
+                statuses.append({"resting": {"oid": oid}})
+            else:
+                tif = otype.get("limit", {}).get("tif", "Gtc")
+                mkt = v._market_px(coin, is_buy)
+                crosses = order["limit_px"] >= mkt if is_buy else order["limit_px"] <= mkt
+                if crosses:
+                    fill = v._fill(coin, is_buy, sz, mkt, order["reduce_only"], kind="limit")
+                    statuses.append({"filled": {"totalSz": _s(fill["sz"]), "avgPx": _s(fill["px"]),
+                                                "oid": fill["oid"]}} if fill else
+                                    {"error": "Reduce only order would increase position."})
+                elif tif == "Ioc":
+                    statuses.append({"error": "Order could not immediately match against any resting orders."})
+                else:
+                    oid = v._new_oid()
+                    v.orders[oid] = order
+                    statuses.append({"resting": {"oid": oid}})
+        self._log("bulk_orders", orders=order_requests, statuses=statuses)
+        return _ok("order", statuses)
+
+    def cancel(self, name, oid):
+        v = self.venue
+        found = v.orders.pop(oid, None)
+        self._log("cancel", coin=name, oid=oid, found=found is not None)
+        if found is None:
+            return _ok("cancel", [{"error": "Order was never placed, already canceled, or filled."}])
+        return _ok("cancel", ["success"])
+
+
+class MockAccount:
+    def __init__(self, key):
+        self.key     = key
+        self.address = "0x" + (str(key).removeprefix("0x") * 40)[:40]
+
+    @classmethod
+    def from_key(cls, key):
+        return cls(key)
+
+
+class _MockFunction:
+    def __init__(self, fn, args):
+        self.fn, self.args = fn, args
+
+    def call(self, *args, **kwargs):
+        return self.fn(*self.args)
+
+
+class _MockFunctions:
+    def __init__(self, venue):
+        self.venue = venue
+
+    def positions(self, nft_id):
+        return _MockFunction(lambda i: self.venue.chain[int(i)], (nft_id,))
+
+
+class _MockContract:
+    def __init__(self, venue, address):
+        self.address   = address
+        self.functions = _MockFunctions(venue)
+
+
+class MockWeb3:
+    """Web3 stand-in: eth.contract(...).functions.positions(id).call() reads venue.chain."""
+
+    class HTTPProvider:
+        def __init__(self, url, *args, **kwargs):
+            self.url = url
+
+    def __init__(self, provider=None, *args, **kwargs):
+        venue = _venue()
+        self.eth = types.SimpleNamespace(
+            contract=lambda address=None, abi=None: _MockContract(venue, address),
+            block_number=0,
+        )
+
+    @staticmethod
+    def to_checksum_address(address):
+        return address
+
+    def is_connected(self):
+        return True
+
+
+def activate(venue):
+    _ACTIVE["venue"] = venue
+
+
+def _module(name, **attrs):
+    mod = types.ModuleType(name)
+    mod.__dict__.update(attrs)
+    return mod
+
+
+@contextmanager
+def install_sdk_modules(venue):
+    """Temporarily replace web3 / eth_account / hyperliquid in sys.modules."""
+    constants = _module("hyperliquid.utils.constants", MAINNET_API_URL="mock://hyperliquid",
+                        TESTNET_API_URL="mock://hyperliquid-testnet", LOCAL_API_URL="mock://local")
+    mocks = {
+        "web3":                        _module("web3", Web3=MockWeb3),
+        "eth_account":                 _module("eth_account", Account=MockAccount),
+        "hyperliquid":                 _module("hyperliquid"),
+        "hyperliquid.info":            _module("hyperliquid.info", Info=MockInfo),
+        "hyperliquid.exchange":        _module("hyperliquid.exchange", Exchange=MockExchange),
+        "hyperliquid.utils":           _module("hyperliquid.utils", constants=constants),
+        "hyperliquid.utils.constants": constants,
+    }
+    saved = {name: sys.modules.get(name) for name in mocks}
+    sys.modules.update(mocks)
+    activate(venue)
+    try:
+        yield
+    finally:
+        activate(None)
+        for name, mod in saved.items():
+            if mod is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = mod
+
+
+def position_ticks(price_lower, price_upper):
+    """Uniswap V3 ticks for an ETH/USDC range as the bots decode them (price = 1.0001^tick · 1e12)."""
+    to_tick = lambda px: int(round(math.log(px / 1e12) / math.log(1.0001)))
+    return to_tick(price_lower), to_tick(price_upper)
+
+
+def v3_liquidity(capital_usdc, price, tick_lower, tick_upper):
+    """Liquidity L worth capital_usdc at `price` (ETH=token0 1e18, USDC=token1 1e6)."""
+    sqrt_pa = math.sqrt(1.0001 ** tick_lower)
+    sqrt_pb = math.sqrt(1.0001 ** tick_upper)
+    sqrt_p  = min(max(math.sqrt(price / 1e12), sqrt_pa), sqrt_pb)
+    per_l   = (1 / sqrt_p - 1 / sqrt_pb) / 1e18 * price + (sqrt_p - sqrt_pa) / 1e6
+    return int(capital_usdc / per_l)
+
+
+def v3_position(tick_lower, tick_upper, liquidity):
+    """positions() return tuple: (nonce, operator, token0, token1, fee, tickLower, tickUpper, liquidity, ...)."""
+    return (0, "0x0", "WETH", "USDC", 500, tick_lower, tick_upper, int(liquidity), 0, 0, 0, 0)
+
+
+__all__ = ["MockVenue", "MockInfo", "MockExchange", "MockWeb3", "MockAccount",
+           "install_sdk_modules", "activate", "position_ticks", "v3_position", "v3_liquidity",
+           "INTERVAL_SECONDS"]
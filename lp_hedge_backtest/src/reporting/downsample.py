@@ -0,0 +1,84 @@
+"""Downsampling for long equity/price/indicator series.
+
+A chart can only show about one point per horizontal pixel, so multi-year 1m
+runs are reduced before plotting or sending to the dashboard:
+
+  - minmax_indices — per bucket keep the first, min, max and last point.
+                     Preserves every spike and drawdown visible at that width;
+                     several columns can share one x by taking the union.
+  - lttb_indices   — Largest-Triangle-Three-Buckets; smoother single-series
+                     reduction to an exact point count.
+  - decimate       — DataFrame helper (union of minmax picks over columns)
+  - zoom_levels    — the same frame at several resolutions (dashboard pyramid)
+
+All index selection is vectorized except LTTB's bucket walk, which is one
+numpy step per output point.
+"""
+
+import numpy as np
+
+ZOOM_LEVELS = (500, 2000, 8000)
+
+
+def _bucket_edges(n, n_buckets):
+    return np.linspace(0, n, n_buckets + 1).astype(np.int64)
+
+
+def minmax_indices(y, n_buckets):
+    """Sorted row indices keeping first/min/max/last of each of n_buckets buckets."""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= 4 * n_buckets:
+        return np.arange(n)
+
+    edges = _bucket_edges(n, n_buckets)
+    starts, ends = edges[:-1], edges[1:]
+    width = int((ends - starts).max())
+
+    idx = starts[:, None] + np.arange(width)[None, :]
+    valid = idx < ends[:, None]
+    idx = np.minimum(idx, n - 1)
+    vals = y[idx]
+    nan = np.isnan(vals)
+
+    lo = np.where(valid & ~nan, vals, np.inf).argmin(axis=1)
+    hi = np.where(valid & ~nan, vals, -np.inf).argmax(axis=1)
+    picks = np.concatenate([starts, ends - 1, starts + lo, starts + hi])
+    return np.unique(picks)
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: n_out row indices (first and last included)."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)   # n_out - 2 inner buckets
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()          # next bucket's centroid
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.nanargmax(area)) if hi > lo else lo
+        out[i + 1] = a
+    return out
+
+
+def decimate(df, columns, n_buckets):
+    """Rows of df kept by min/max bucketing of each column in `columns` (union)."""
+    if len(df) <= 4 * n_buckets:
+        return df
+    keep = np.unique(np.concatenate([
+        minmax_indices(df[c].to_numpy(dtype=float, na_value=np.nan), n_buckets) for c in columns
+    ]))
+    return df.iloc[keep]
+
+
+def zoom_levels(df, columns, levels=ZOOM_LEVELS):
+    """{points: decimated frame} for each level; levels above len(df) are the raw frame."""
+    return {points: decimate(df, columns, max(points // 4, 1)) for points in levels}
@@ -0,0 +1,151 @@
+"""Latency histograms for the live hot path.
+
+Spans (price fetch, decision, market_open, fill confirmation, SL placement,
+on-chain RPCs, DB writes) are timed with span() / @timed into log-bucketed
+histograms: BUCKETS_PER_OCTAVE buckets per doubling above BASE_MS, so any
+percentile read back is within ~5% of the true value and histograms from
+different processes merge exactly by adding bucket counts.
+
+A bot calls maybe_emit(log_event) from its loop; every emit_every seconds
+the current window goes out as one `latency` event, which the API merges
+into per-bot p50/p99 (see api/bot_manager.py).
+"""
+
+import math
+import time
+import functools
+import threading
+from contextlib import contextmanager
+
+BASE_MS            = 0.01
+BUCKETS_PER_OCTAVE = 8
+PERCENTILES        = (50, 90, 99)
+
+
+def bucket_of(ms):
+    """Histogram bucket for a duration; bucket b holds (BASE·2^((b-1)/k), BASE·2^(b/k)]."""
+    if ms <= BASE_MS:
+        return 0
+    return int(math.ceil(math.log2(ms / BASE_MS) * BUCKETS_PER_OCTAVE))
+
+
+def bucket_value(b):
+    """Representative duration (geometric midpoint) of bucket b."""
+    return BASE_MS * 2 ** ((b - 0.5) / BUCKETS_PER_OCTAVE) if b > 0 else BASE_MS
+
+
+class Histogram:
+    """Sparse log-bucket histogram of durations in milliseconds."""
+
+    __slots__ = ("counts", "n", "sum_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = {}
+        self.n      = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        b = bucket_of(ms)
+        self.counts[b] = self.counts.get(b, 0) + 1
+        self.n      += 1
+        self.sum_ms += ms
+        self.max_ms  = max(self.max_ms, ms)
+
+    def merge(self, data):
+        """Add a to_dict() payload (e.g. from a latency event) into this histogram."""
+        for b, c in data.get("hist", {}).items():
+            b = int(b)
+            self.counts[b] = self.counts.get(b, 0) + int(c)
+        self.n      += int(data.get("n", 0))
+        self.sum_ms += float(data.get("sum_ms", 0.0))
+        self.max_ms  = max(self.max_ms, float(data.get("max_ms", 0.0)))
+
+    def percentile(self, q):
+        if not self.n:
+            return None
+        rank, seen = q / 100 * self.n, 0
+        for b in sorted(self.counts):
+            seen += self.counts[b]
+            if seen >= rank:
+                return min(bucket_value(b), self.max_ms)
+        return self.max_ms
+
+    def summary(self):
+        out = {"n": self.n, "mean_ms": round(self.sum_ms / self.n, 3) if self.n else None}
+        for q in PERCENTILES:
+            p = self.percentile(q)
+            out[f"p{q}_ms"] = round(p, 3) if p is not None else None
+        out["max_ms"] = round(self.max_ms, 3)
+        return out
+
+    def to_dict(self):
+        return {"n": self.n, "sum_ms": round(self.sum_ms, 3), "max_ms": round(self.max_ms, 3),
+                "hist": {str(b): c for b, c in sorted(self.counts.items())}}
+
+
+class LatencyRecorder:
+    """Named span histograms: a running total plus the window since the last emit."""
+
+    def __init__(self, emit_every=60.0):
+        self.emit_every = emit_every
+        self._lock      = threading.Lock()
+        self._total     = {}
+        self._window    = {}
+        self._last_emit = time.time()
+
+    def record(self, name, ms):
+        with self._lock:
+            for book in (self._total, self._window):
+                hist = book.get(name)
+                if hist is None:
+                    hist = book[name] = Histogram()
+                hist.add(ms)
+
+    @contextmanager
+    def span(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - t0) * 1000)
+
+    def timed(self, name):
+        """Decorator form of span()."""
+        def deco(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return deco
+
+    def merge(self, spans):
+        """Merge a window payload ({name: Histogram.to_dict()}) into the totals."""
+        window = {}
+        with self._lock:
+            for name, data in spans.items():
+                self._total.setdefault(name, Histogram()).merge(data)
+                window[name] = Histogram()
+                window[name].merge(data)
+            self._window = window
+
+    def take_window(self):
+        with self._lock:
+            window, self._window = self._window, {}
+            self._last_emit = time.time()
+        return {name: hist.to_dict() for name, hist in window.items()}
+
+    def maybe_emit(self, emit):
+        """Call emit("latency", details=...) once per emit_every seconds with the window."""
+        if time.time() - self._last_emit < self.emit_every:
+            return
+        window_s = round(time.time() - self._last_emit, 1)
+        spans = self.take_window()
+        if spans:
+            emit("latency", details={"window_s": window_s, "spans": spans})
+
+    def summary(self, window=False):
+        with self._lock:
+            book = self._window if window else self._total
+            return {name: hist.summary() for name, hist in sorted(book.items())}
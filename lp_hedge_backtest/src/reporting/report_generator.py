@@ -6,6 +6,7 @@ import logging
 from datetime import datetime
 
 from src.reporting.metrics import calculate_metrics
+from src.reporting.downsample import decimate
 
 logger = logging.getLogger(__name__)
 
@@ -168,8 +169,12 @@ def print_comparison_report(results, config):
     print()
 
 
-def save_results(results, metrics, config, output_dir="results"):
-    """Save results to JSON file."""
+def save_results(results, metrics, config, output_dir="results", run_key=None):
+    """Save summary results to JSON file.
+
+    Equity curves are not included; when the run is in the ResultsStore its
+    key is recorded so the full curves can be loaded from there.
+    """
     os.makedirs(output_dir, exist_ok=True)
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -178,6 +183,7 @@ def save_results(results, metrics, config, output_dir="results"):
     output = {
         "config": config,
         "run_date": timestamp,
+        "run_key": run_key,
         "results": {},
     }
 
@@ -208,13 +214,17 @@ def plot_equity_curves(results, config, output_dir="results"):
 
     os.makedirs(output_dir, exist_ok=True)
 
-    fig, axes = plt.subplots(4, 1, figsize=(14, 16), sharex=True)
+    figsize, dpi = (14, 16), 150
+    # ~2 px per min/max bucket: every visible extreme survives, long runs render in constant time
+    buckets = int(figsize[0] * dpi / 2)
+
+    fig, axes = plt.subplots(4, 1, figsize=figsize, sharex=True)
 
     # Plot 1: Equity curves (all 4 strategies)
     ax1 = axes[0]
     colors = {"hodl": "gray", "lp_only": "blue", "lp_hedge": "green", "avaro": "gold"}
     for key, result in results.items():
-        eq = result["equity_curve"]
+        eq = decimate(result["equity_curve"], ["total_equity"], buckets)
         ax1.plot(eq["timestamp"], eq["total_equity"],
                  label=result["strategy"],
                  color=colors.get(key, "black"),
@@ -223,7 +233,7 @@ def plot_equity_curves(results, config, output_dir="results"):
     ax1.set_ylabel("Portfolio Value (USD)")
     ax1.set_title(f"Bot Aragan vs Bot Avaro | {config['backtest']['symbol']} | "
                   f"{config['backtest']['start_date']} to {config['backtest']['end_date']}")
-    ax1.legend()
+    ax1.legend(loc="upper left")   # fixed loc: "best" scans every plotted point
     ax1.grid(True, alpha=0.3)
 
     # Plot 2: Price with dynamic LP range
@@ -231,9 +241,12 @@ def plot_equity_curves(results, config, output_dir="results"):
     # Use avaro equity curve for price/range data
     eq_main = results.get("avaro", results.get("lp_hedge", {})).get("equity_curve")
     if eq_main is not None:
+        eq_main = decimate(eq_main, ["price"], buckets)
         ax2.plot(eq_main["timestamp"], eq_main["price"], color="orange", linewidth=1, label="Price")
 
     eq_hedge = results["lp_hedge"]["equity_curve"]
+    eq_hedge = decimate(eq_hedge, [c for c in ("range_lower", "range_upper", "adx", "il_pct")
+                                   if c in eq_hedge.columns], buckets)
     if "range_lower" in eq_hedge.columns:
         ax2.plot(eq_hedge["timestamp"], eq_hedge["range_lower"], color="red",
                  linestyle="--", alpha=0.7, linewidth=0.8, label="LP Range")
@@ -243,7 +256,7 @@ def plot_equity_curves(results, config, output_dir="results"):
                          eq_hedge["range_upper"], alpha=0.05, color="green")
 
     ax2.set_ylabel("Price (USD)")
-    ax2.legend(fontsize=8)
+    ax2.legend(fontsize=8, loc="upper left")
     ax2.grid(True, alpha=0.3)
 
     # Plot 3: ADX
@@ -259,7 +272,7 @@ def plot_equity_curves(results, config, output_dir="results"):
         ax3.fill_between(eq_hedge["timestamp"], 0, eq_hedge["adx"],
                          where=eq_hedge["adx"] > 30, alpha=0.1, color="red")
     ax3.set_ylabel("ADX")
-    ax3.legend(fontsize=8)
+    ax3.legend(fontsize=8, loc="upper left")
     ax3.grid(True, alpha=0.3)
 
     # Plot 4: IL + hedge/long PnL
@@ -268,7 +281,7 @@ def plot_equity_curves(results, config, output_dir="results"):
     ax4.fill_between(eq_hedge["timestamp"], eq_hedge["il_pct"], 0, alpha=0.1, color="red")
     ax4.set_ylabel("IL %")
     ax4.set_xlabel("Date")
-    ax4.legend()
+    ax4.legend(loc="upper left")
     ax4.grid(True, alpha=0.3)
 
     ax4.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m"))
@@ -276,7 +289,7 @@ def plot_equity_curves(results, config, output_dir="results"):
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     plot_path = os.path.join(output_dir, f"aragan_vs_avaro_{timestamp}.png")
-    plt.savefig(plot_path, dpi=150)
+    plt.savefig(plot_path, dpi=dpi)
     plt.close()
 
     print(f"  Chart saved to: {plot_path}")
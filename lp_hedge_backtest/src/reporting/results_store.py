@@ -0,0 +1,281 @@
+"""Columnar on-disk store for full backtest runs.
+
+One directory per run, keyed by <config hash>-<data fingerprint>-<code version>,
+so the same config on the same candles with the same engine code maps to the
+same run and can be served from disk instead of re-simulated.
+
+    <root>/<key>/
+        meta.json                           config, run date, summaries, metrics, column index
+        <strategy>/<table>/<column>.npy     one array per column (equity_curve, trades)
+        <strategy>/<table>/<column>.json.gz  columns that are not plain numbers/strings
+        <strategy>/equity_curve/_zoom/<column>_<points>.npy
+                                            row indices of the min/max decimation of
+                                            that column at each dashboard zoom level
+
+Numeric, bool, datetime and string columns are raw .npy so load_frame can
+memory-map just the columns a chart asks for; everything that is not
+array-shaped (summaries, metrics, mixed-type columns) is stored compressed.
+load_series serves chart-sized series: precomputed zoom levels for the full
+run, or an on-the-fly decimation of a time window.
+"""
+
+import os
+import json
+import gzip
+import shutil
+import hashlib
+import logging
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.reporting.downsample import ZOOM_LEVELS, decimate, minmax_indices
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "results", "store",
+)
+TABLES = ("equity_curve", "trades")
+IGNORED_CONFIG_KEYS = ("output",)   # where/how results are written does not change them
+
+
+def config_hash(config):
+    """Stable hash of everything in the config that can change the simulation."""
+    relevant = {k: v for k, v in config.items() if k not in IGNORED_CONFIG_KEYS}
+    blob = json.dumps(relevant, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+
+def data_fingerprint(df):
+    """Hash of the candle data itself (timestamps + OHLCV), independent of index."""
+    cols = [c for c in ("timestamp", "open", "high", "low", "close", "volume") if c in df.columns]
+    row_hashes = pd.util.hash_pandas_object(df[cols], index=False).values
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()[:16]
+
+
+# Packages whose code decides simulation output; any edit to them changes run keys
+ENGINE_PACKAGES = ("engine", "hedge", "lp", "costs", "indicators")
+_code_version = None
+
+
+def code_version():
+    """Hash of the simulation source (src/<ENGINE_PACKAGES>/*.py), computed once per process."""
+    global _code_version
+    if _code_version is None:
+        src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        h = hashlib.sha256()
+        for pkg in ENGINE_PACKAGES:
+            pkg_dir = os.path.join(src_dir, pkg)
+            if not os.path.isdir(pkg_dir):
+                continue
+            for name in sorted(os.listdir(pkg_dir)):
+                if name.endswith(".py"):
+                    h.update(f"{pkg}/{name}".encode())
+                    with open(os.path.join(pkg_dir, name), "rb") as f:
+                        h.update(f.read())
+        _code_version = h.hexdigest()[:8]
+    return _code_version
+
+
+def run_key(config, df):
+    return f"{config_hash(config)}-{data_fingerprint(df)}-{code_version()}"
+
+
+def _to_frame(value):
+    if isinstance(value, pd.DataFrame):
+        return value
+    if isinstance(value, list) and (not value or isinstance(value[0], dict)):
+        return pd.DataFrame(value)
+    return None
+
+
+def _write_column(path, name, series):
+    """Write one column; returns its index entry for meta.json."""
+    entry = {"dtype": str(series.dtype)}
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        entry["tz"] = str(series.dt.tz)
+        values = series.dt.tz_convert(None).to_numpy()
+    elif series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+        if not series.map(lambda v: isinstance(v, str)).all():
+            entry["format"] = "json"
+            with gzip.open(os.path.join(path, f"{name}.json.gz"), "wt") as f:
+                json.dump(series.tolist(), f, default=str)
+            return entry
+        values = series.to_numpy().astype(str)
+    else:
+        values = series.to_numpy()
+    entry["format"] = "npy"
+    np.save(os.path.join(path, f"{name}.npy"), values, allow_pickle=False)
+    return entry
+
+
+def _json_default(value):
+    if isinstance(value, (np.integer, np.floating, np.bool_)):
+        return value.item()
+    return str(value)
+
+
+class ResultsStore:
+    """Save, list and load full backtest runs (equity curves, trades, config)."""
+
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.root, key)
+
+    def has(self, key):
+        return os.path.exists(os.path.join(self.path(key), "meta.json"))
+
+    # ── Write ──────────────────────────────────────────────────────────────
+
+    def save(self, key, results, metrics, config):
+        """Write a run atomically (temp dir + rename). Returns the run key."""
+        tmp = self.path(f".{key}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+
+        meta = {
+            "key": key,
+            "run_date": datetime.now().strftime("%Y%m%d_%H%M%S"),
+            "config": config,
+            "metrics": metrics,
+            "strategies": {},
+        }
+        for strategy, result in results.items():
+            summary, tables = {}, {}
+            for field, value in result.items():
+                frame = _to_frame(value) if field in TABLES else None
+                if frame is None:
+                    summary[field] = value
+                    continue
+                table_dir = os.path.join(tmp, strategy, field)
+                os.makedirs(table_dir, exist_ok=True)
+                tables[field] = {
+                    "rows": len(frame),
+                    "kind": "frame" if isinstance(value, pd.DataFrame) else "records",
+                    "columns": {str(c): _write_column(table_dir, str(c), frame[c]) for c in frame.columns},
+                }
+                if field == "equity_curve":
+                    tables[field]["zoom"] = self._write_zoom(table_dir, frame)
+            meta["strategies"][strategy] = {"summary": summary, "tables": tables}
+
+        os.makedirs(tmp, exist_ok=True)
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(meta, f, default=_json_default, separators=(",", ":"))
+
+        final = self.path(key)
+        shutil.rmtree(final, ignore_errors=True)
+        os.replace(tmp, final)
+        logger.info(f"Run stored: {final}")
+        return key
+
+    @staticmethod
+    def _write_zoom(table_dir, frame):
+        """Per-column decimation indices for each zoom level smaller than the run."""
+        levels = [p for p in ZOOM_LEVELS if len(frame) > p]
+        if not levels:
+            return []
+        zoom_dir = os.path.join(table_dir, "_zoom")
+        os.makedirs(zoom_dir, exist_ok=True)
+        for col in frame.columns:
+            if not (pd.api.types.is_numeric_dtype(frame[col]) and not pd.api.types.is_bool_dtype(frame[col])):
+                continue
+            y = frame[col].to_numpy(dtype=float, na_value=np.nan)
+            for points in levels:
+                np.save(os.path.join(zoom_dir, f"{col}_{points}.npy"), minmax_indices(y, points // 4))
+        return levels
+
+    # ── Query ──────────────────────────────────────────────────────────────
+
+    def load_meta(self, key):
+        with open(os.path.join(self.path(key), "meta.json")) as f:
+            return json.load(f)
+
+    def list_runs(self):
+        """One summary row per stored run, newest first."""
+        runs = []
+        for key in os.listdir(self.root):
+            if key.startswith(".") or not self.has(key):
+                continue
+            meta = self.load_meta(key)
+            bt = meta["config"].get("backtest", {})
+            runs.append({
+                "key": key,
+                "run_date": meta["run_date"],
+                "symbol": bt.get("symbol"),
+                "start_date": bt.get("start_date"),
+                "end_date": bt.get("end_date"),
+                "strategies": {
+                    name: {
+                        "total_return_pct": s["summary"].get("total_return_pct"),
+                        "rows": s["tables"].get("equity_curve", {}).get("rows", 0),
+                    }
+                    for name, s in meta["strategies"].items()
+                },
+            })
+        return sorted(runs, key=lambda r: r["run_date"], reverse=True)
+
+    def load_frame(self, key, strategy, table="equity_curve", columns=None, mmap=True, meta=None):
+        """Load one table as a DataFrame. Only the requested columns are read;
+        with mmap=True numeric columns are memory-mapped, not copied into RAM."""
+        meta = meta or self.load_meta(key)
+        index = meta["strategies"][strategy]["tables"][table]
+        table_dir = os.path.join(self.path(key), strategy, table)
+
+        data = {}
+        for name in (columns or index["columns"]):
+            entry = index["columns"][name]
+            if entry["format"] == "json":
+                with gzip.open(os.path.join(table_dir, f"{name}.json.gz"), "rt") as f:
+                    data[name] = pd.Series(json.load(f), dtype=object)
+                continue
+            values = np.load(os.path.join(table_dir, f"{name}.npy"),
+                             mmap_mode="r" if mmap else None, allow_pickle=False)
+            if "tz" in entry:
+                data[name] = pd.Series(values).dt.tz_localize("UTC").dt.tz_convert(entry["tz"])
+            else:
+                data[name] = values
+        return pd.DataFrame(data, copy=False)
+
+    def load_results(self, key, mmap=True):
+        """Rebuild the StrategyComparator results dict for a stored run."""
+        meta = self.load_meta(key)
+        results = {}
+        for strategy, s in meta["strategies"].items():
+            result = dict(s["summary"])
+            for table, index in s["tables"].items():
+                frame = self.load_frame(key, strategy, table, mmap=mmap, meta=meta)
+                result[table] = frame if index["kind"] == "frame" else frame.to_dict("records")
+            results[strategy] = result
+        return results
+
+    def load_series(self, key, strategy, columns, points=2000, start=None, end=None, x="timestamp"):
+        """Chart-ready equity_curve columns: about `points` rows per column.
+
+        Full range at a stored zoom level reads only the precomputed rows;
+        a start/end window is cut from the memory-mapped columns and decimated.
+        """
+        meta = self.load_meta(key)
+        index = meta["strategies"][strategy]["tables"]["equity_curve"]
+        frame = self.load_frame(key, strategy, columns=[x, *columns], meta=meta)
+        y_cols = [c for c in columns
+                  if pd.api.types.is_numeric_dtype(frame[c]) and not pd.api.types.is_bool_dtype(frame[c])]
+
+        if start is None and end is None:
+            zoom_dir = os.path.join(self.path(key), strategy, "equity_curve", "_zoom")
+            if points in index.get("zoom", []) and y_cols:
+                keep = np.unique(np.concatenate([
+                    np.load(os.path.join(zoom_dir, f"{c}_{points}.npy")) for c in y_cols
+                ]))
+                return frame.iloc[keep].reset_index(drop=True)
+        else:
+            ts = frame[x].to_numpy()
+            lo = 0 if start is None else int(np.searchsorted(ts, np.datetime64(start), side="left"))
+            hi = len(ts) if end is None else int(np.searchsorted(ts, np.datetime64(end), side="right"))
+            frame = frame.iloc[lo:hi]
+
+        return decimate(frame, y_cols, max(points // 4, 1)).reset_index(drop=True)
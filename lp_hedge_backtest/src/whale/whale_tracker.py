@@ -14,6 +14,7 @@ These are all the fields a copy-trader needs to size and place a mirrored positi
 """
 
 import json
+import os
 import time
 import urllib.request
 import urllib.error
@@ -26,6 +27,14 @@ from hyperliquid.utils import constants
 
 HL_INFO_URL = "https://api.hyperliquid.xyz/info"
 
+# allMids published by the API's price feed (api/price_feed.py) — read instead of polling HL
+HL_MIDS_SNAPSHOT = os.getenv(
+    "HL_MIDS_SNAPSHOT",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                 "data_cache", "hl_mids.json"),
+)
+MIDS_MAX_AGE = 10
+
 # ── Config defaults ────────────────────────────────────────────────────────────
 DEFAULT_LEADERBOARD_TOP_N  = 50
 DEFAULT_MIN_NOTIONAL_USD   = 50_000
@@ -199,6 +208,7 @@ class WhaleTracker:
         self._oi_snapshot:   dict[str, float] = {}
         self._mids_cache:    dict[str, float] = {}
         self._mids_ts:       float = 0.0
+        self._mids_file_mtime: float = 0.0
 
         if custom_addresses:
             for addr in custom_addresses:
@@ -218,10 +228,30 @@ class WhaleTracker:
     def watched_addresses(self) -> list[str]:
         return list(self._address_ranks.keys())
 
-    # ── Mark prices (cached 10s) ───────────────────────────────────────────
+    # ── Mark prices (shared API feed, else REST cached 10s) ────────────────
+
+    def _read_shared_mids(self, now: float) -> bool:
+        """Load the API feed's snapshot if it is fresh; parse only when the file changed."""
+        try:
+            mtime = os.stat(HL_MIDS_SNAPSHOT).st_mtime
+        except OSError:
+            return False
+        if now - mtime > MIDS_MAX_AGE:
+            return False
+        if mtime != self._mids_file_mtime:
+            try:
+                with open(HL_MIDS_SNAPSHOT) as f:
+                    self._mids_cache = json.load(f)["mids"]
+            except (OSError, ValueError, KeyError):
+                return False
+            self._mids_file_mtime = mtime
+            self._mids_ts = now
+        return True
 
     def _get_mids(self) -> dict[str, float]:
         now = time.time()
+        if self._read_shared_mids(now):
+            return self._mids_cache
         if now - self._mids_ts > 10:
             try:
                 raw = _hl_post({"type": "allMids"})
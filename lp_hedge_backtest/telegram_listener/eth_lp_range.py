@@ -19,6 +19,8 @@ from telethon import TelegramClient
 from telethon.tl.types import PeerChannel
 import anthropic
 
+from scan_cache import load_checkpoint, save_checkpoint
+
 # load both .env files using absolute paths so script works from any cwd
 _HERE = os.path.dirname(os.path.abspath(__file__))
 load_dotenv(os.path.join(_HERE, ".env"))
@@ -163,28 +165,42 @@ def print_report(analysis: dict, ranges: dict, msg_id: int, msg_date: datetime,
     print(f"{'='*62}\n")
 
 
-async def find_latest_eth_chart(client, entity):
-    """Scan Short-Term thread (7) for the most recent ETH chart message."""
-    eth_keywords = re.compile(r'\bETH\b', re.IGNORECASE)
+async def _find_latest_chart(client, entity, scope: str, thread_id: int, limit: int, keywords):
+    """
+    Return the newest chart message in a thread matching `keywords`.
+
+    Only messages after the scan checkpoint are pulled; if none of them is a
+    chart, the previously found chart id (also checkpointed) is re-fetched by id.
+    """
     skip = re.compile(r'JUST IN|ETF|Deribit|options will expire', re.IGNORECASE)
+    scan_scope, chart_scope = f"{scope}_chart_scan", f"{scope}_chart"
+    last_id = load_checkpoint(scan_scope, thread_id)
 
-    async for msg in client.iter_messages(entity, limit=500, reply_to=SHORT_TERM_THREAD):
+    newest_id = 0
+    async for msg in client.iter_messages(entity, limit=limit, reply_to=thread_id, min_id=last_id):
+        newest_id = max(newest_id, msg.id)
         text = msg.message or ""
-        if msg.media and eth_keywords.search(text) and not skip.search(text):
+        if msg.media and keywords.search(text) and not skip.search(text):
+            save_checkpoint(chart_scope, thread_id, msg.id)
+            save_checkpoint(scan_scope, thread_id, newest_id)
             return msg
-    return None
+    if newest_id:
+        save_checkpoint(scan_scope, thread_id, newest_id)
+
+    chart_id = load_checkpoint(chart_scope, thread_id)
+    return await client.get_messages(entity, ids=chart_id) if chart_id else None
+
+
+async def find_latest_eth_chart(client, entity):
+    """Scan Short-Term thread (7) for the most recent ETH chart message."""
+    eth_keywords = re.compile(r'\bETH\b', re.IGNORECASE)
+    return await _find_latest_chart(client, entity, "eth", SHORT_TERM_THREAD, 500, eth_keywords)
 
 
 async def find_latest_btc_chart(client, entity):
     """Scan Bitcoin Daily thread (22) for the most recent BTC chart (macro context)."""
     btc_keywords = re.compile(r'\bBTC\b|\bBitcoin\b', re.IGNORECASE)
-    skip = re.compile(r'JUST IN|ETF|Deribit|options will expire', re.IGNORECASE)
-
-    async for msg in client.iter_messages(entity, limit=100, reply_to=BITCOIN_DAILY_THREAD):
-        text = msg.message or ""
-        if msg.media and btc_keywords.search(text) and not skip.search(text):
-            return msg
-    return None
+    return await _find_latest_chart(client, entity, "btc", BITCOIN_DAILY_THREAD, 100, btc_keywords)
 
 
 def save_cache(analysis: dict, ranges: dict, msg_id: int, msg_date: datetime):
@@ -28,6 +28,7 @@ load_dotenv(os.path.join(os.path.dirname(__file__), ".env"))
 load_dotenv(os.path.join(os.path.dirname(__file__), "../api/.env"), override=False)
 
 from signal_parser import parse_signal, parse_update
+from scan_cache import HL_ASSETS_TTL, load_hl_assets, save_hl_assets, load_checkpoint, save_checkpoint
 
 from sqlalchemy import select, update as sql_update
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
@@ -60,15 +61,19 @@ SOURCE_ID_MAP = {
     GOLD_SIGNALS_THREAD: 4,
 }
 
+_SOURCE_THREAD = {source_id: thread_id for thread_id, source_id in SOURCE_ID_MAP.items()}
+
 SOURCE_NAMES = {1: "Short-Term", 2: "Bitcoin Daily Signals", 3: "Mid Term", 4: "Gold Signals"}
 
 engine       = create_async_engine(DB_URL, pool_pre_ping=True, pool_recycle=3600, echo=False)
 AsyncSession_ = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
-# HL perpetual asset whitelist — refreshed every hour
+# HL perpetual asset whitelist — refreshed every hour, shared on disk with scan_24h
 _HL_ASSETS: set[str] = set()
 _HL_ASSETS_TS: float = 0.0
-_HL_ASSETS_TTL: float = 3600.0
+_HL_ASSETS_TTL: float = HL_ASSETS_TTL
+CHECKPOINT_SCOPE = "listener"
+BACKFILL_MAX_AGE = timedelta(hours=4)   # missed messages older than this are skipped on restart
 
 
 def _fetch_hl_assets_sync() -> set[str]:
@@ -80,7 +85,10 @@ async def _get_hl_assets() -> set[str]:
     global _HL_ASSETS, _HL_ASSETS_TS
     if _HL_ASSETS and (time.monotonic() - _HL_ASSETS_TS) < _HL_ASSETS_TTL:
         return _HL_ASSETS
-    assets = await asyncio.to_thread(_fetch_hl_assets_sync)
+    assets = load_hl_assets(_HL_ASSETS_TTL)
+    if assets is None:
+        assets = await asyncio.to_thread(_fetch_hl_assets_sync)
+        save_hl_assets(assets)
     _HL_ASSETS = assets
     _HL_ASSETS_TS = time.monotonic()
     return assets
@@ -771,6 +779,84 @@ async def _reconcile_orphans():
     print("[Signal Lab] Startup reconciliation complete.", flush=True)
 
 
+async def handle_message(msg):
+    """Process one channel message, then advance its thread's checkpoint."""
+    source_id = _signal_source(msg)
+    if source_id is None:
+        return  # ignore messages from other threads
+    await _process_message(msg, source_id)
+    save_checkpoint(CHECKPOINT_SCOPE, _SOURCE_THREAD[source_id], msg.id)
+
+
+async def _process_message(msg, source_id: int):
+    text = msg.text or ""
+    if not text.strip():
+        return
+
+    sig = parse_signal(text)
+    if sig:
+        base      = sig.pair.split("/")[0].upper()
+        hl_assets = await _get_hl_assets()
+        if base not in hl_assets:
+            print(
+                f"[{msg.date:%H:%M:%S}] SKIP {sig.pair} — not listed on HL ({len(hl_assets)} assets loaded)",
+                flush=True,
+            )
+            return
+        ev_id = await save_signal(msg, sig, source_id)
+        print(
+            f"[{msg.date:%H:%M:%S}] NEW SIGNAL saved (id={ev_id}, src={source_id}): "
+            f"{sig.pair} {sig.direction.upper()} {sig.leverage}x @ ${sig.entry}",
+            flush=True,
+        )
+        return
+
+    update = parse_update(text)
+    if update:
+        info = await apply_update_to_db(msg, update, source_id)
+        label = info["id"] if info else "no match"
+        print(
+            f"[{msg.date:%H:%M:%S}] UPDATE ({update}) → signal id={label}",
+            flush=True,
+        )
+        # Auto-close HL position if channel signals exit on an executed trade
+        if info and info["prev_status"] == "executed" and update in ("target_hit", "stopped", "tp_hit"):
+            asyncio.create_task(_auto_close_signal(info, update))
+
+
+async def _fetch_missed(client, entity) -> list:
+    """Messages posted after each thread's checkpoint while the listener was down, oldest first."""
+    missed = []
+    for thread_id in SOURCE_ID_MAP:
+        last_id = load_checkpoint(CHECKPOINT_SCOPE, thread_id)
+        if not last_id:
+            continue   # first run: start from live messages
+        async for msg in client.iter_messages(entity, reply_to=thread_id, min_id=last_id, reverse=True):
+            missed.append(msg)
+    return sorted(missed, key=lambda m: m.id)
+
+
+async def _backfill(missed: list):
+    """Replay missed messages; ones older than BACKFILL_MAX_AGE only advance the checkpoint."""
+    cutoff = datetime.now(timezone.utc) - BACKFILL_MAX_AGE
+    replayed = stale = 0
+    for msg in missed:
+        if msg.date < cutoff:
+            source_id = _signal_source(msg)
+            if source_id is not None:
+                save_checkpoint(CHECKPOINT_SCOPE, _SOURCE_THREAD[source_id], msg.id)
+            stale += 1
+            continue
+        try:
+            await handle_message(msg)
+            replayed += 1
+        except Exception as e:
+            print(f"[Signal Lab Listener] Backfill error on msg #{msg.id}: {e}", flush=True)
+    if missed:
+        print(f"[Signal Lab Listener] Backfill: {replayed} missed message(s) replayed, "
+              f"{stale} older than {BACKFILL_MAX_AGE} skipped", flush=True)
+
+
 async def main():
     session_path = os.path.join(os.path.dirname(__file__), SESSION)
 
@@ -778,6 +864,10 @@ async def main():
 
     hl_assets = await _get_hl_assets()
     print(f"[Signal Lab Listener] HL assets loaded: {len(hl_assets)} perpetuals", flush=True)
+    for thread_id in SOURCE_ID_MAP:
+        last_id = load_checkpoint(CHECKPOINT_SCOPE, thread_id)
+        if last_id:
+            print(f"[Signal Lab Listener] Thread {thread_id}: last processed msg #{last_id}", flush=True)
 
     async with TelegramClient(session_path, API_ID, API_HASH) as client:
         me = await client.get_me()
@@ -786,47 +876,15 @@ async def main():
 
         entity = await client.get_entity(PeerChannel(CHANNEL_ID))
 
+        # Fetch what was missed before registering the handler, replay it after:
+        # live messages from here on reach the handler, older ones the backfill
+        missed = await _fetch_missed(client, entity)
+
         @client.on(events.NewMessage(chats=entity))
         async def on_message(event):
-            msg = event.message
-            source_id = _signal_source(msg)
-            if source_id is None:
-                return  # ignore messages from other threads
-
-            text = msg.text or ""
-            if not text.strip():
-                return
-
-            sig = parse_signal(text)
-            if sig:
-                base      = sig.pair.split("/")[0].upper()
-                hl_assets = await _get_hl_assets()
-                if base not in hl_assets:
-                    print(
-                        f"[{msg.date:%H:%M:%S}] SKIP {sig.pair} — not listed on HL ({len(hl_assets)} assets loaded)",
-                        flush=True,
-                    )
-                    return
-                ev_id = await save_signal(msg, sig, source_id)
-                print(
-                    f"[{msg.date:%H:%M:%S}] NEW SIGNAL saved (id={ev_id}, src={source_id}): "
-                    f"{sig.pair} {sig.direction.upper()} {sig.leverage}x @ ${sig.entry}",
-                    flush=True,
-                )
-                return
-
-            update = parse_update(text)
-            if update:
-                info = await apply_update_to_db(msg, update, source_id)
-                label = info["id"] if info else "no match"
-                print(
-                    f"[{msg.date:%H:%M:%S}] UPDATE ({update}) → signal id={label}",
-                    flush=True,
-                )
-                # Auto-close HL position if channel signals exit on an executed trade
-                if info and info["prev_status"] == "executed" and update in ("target_hit", "stopped", "tp_hit"):
-                    asyncio.create_task(_auto_close_signal(info, update))
+            await handle_message(event.message)
 
+        await _backfill(missed)
         asyncio.create_task(_breakeven_monitor())
         print("[Signal Lab Listener] Ready. Waiting for messages...", flush=True)
         await client.run_until_disconnected()
@@ -5,10 +5,20 @@ Scan last 48h of channel messages:
      (Swallow Trade posts updates as standalone msgs, not Telegram replies)
   3. Validate pairs against live HL supported assets
   4. Classify: TRADABLE / CLOSED / EXPIRED / UNSUPPORTED
+
+Incremental: the 48h window and the last scanned message id are cached in
+data_cache/ (see scan_cache.py), so reruns only pull messages newer than the
+checkpoint. The HL universe is cached with a 1h TTL.
+
+Usage:
+    python scan_24h.py             # print the report
+    python scan_24h.py --persist   # also batch-insert new signals into signal_events
 """
 
 import os
+import sys
 import asyncio
+import argparse
 import httpx
 from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
@@ -16,7 +26,9 @@ from telethon import TelegramClient
 from telethon.tl.types import PeerChannel
 
 load_dotenv()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 from signal_parser import parse_signal, parse_update
+from scan_cache import fetch_new_messages, load_hl_assets, save_hl_assets
 
 API_ID   = int(os.getenv("TG_API_ID"))
 API_HASH = os.getenv("TG_API_HASH")
@@ -27,33 +39,85 @@ SHORT_TERM_THREAD = 7     # Short-Term signals thread
 NOW               = datetime.now(timezone.utc)
 SINCE             = NOW - timedelta(hours=48)
 EXPIRY_H          = 4    # short-term signals: expire after 4h if no update
+SCAN_SCOPE        = "scan_48h"
+SOURCE_ID         = 1    # signal_sources.id for the Short-Term thread
+
+# classification status → signal_events.status ENUM
+_DB_STATUS = {"open": "pending", "target_hit": "tp_hit", "partial": "tp_hit"}
 
 
 async def fetch_hl_assets() -> set:
+    cached = load_hl_assets()
+    if cached is not None:
+        return cached
     async with httpx.AsyncClient(timeout=10) as client:
         r = await client.post(
             "https://api.hyperliquid.xyz/info",
             json={"type": "meta"},
             headers={"Content-Type": "application/json"},
         )
-        return {a["name"].upper() for a in r.json().get("universe", [])}
-
+        assets = {a["name"].upper() for a in r.json().get("universe", [])}
+    save_hl_assets(assets)
+    return assets
+
+
+async def persist_signals(entries: list) -> int:
+    """
+    Batch-insert parsed signals into signal_events in one transaction.
+    Rows whose msg_id is already stored for this source are skipped, so
+    repeated scans are idempotent. Returns the number of rows inserted.
+    """
+    from sqlalchemy import select
+    from api.database import AsyncSessionLocal
+    from api.models import SignalEvent
+
+    if not entries:
+        return 0
+
+    async with AsyncSessionLocal() as db:
+        res = await db.execute(
+            select(SignalEvent.msg_id).where(
+                SignalEvent.source_id == SOURCE_ID,
+                SignalEvent.msg_id.in_([e["msg"].id for e in entries]),
+            )
+        )
+        known = {row[0] for row in res.all()}
 
-async def main():
+        rows = []
+        for e in entries:
+            if e["msg"].id in known:
+                continue
+            sig, msg = e["signal"], e["msg"]
+            status = "expired" if e["reason"].startswith("EXPIRED") else e["status"]
+            rows.append(SignalEvent(
+                source_id   = SOURCE_ID,
+                pair        = sig.pair,
+                direction   = sig.direction,
+                leverage    = sig.leverage,
+                entry       = sig.entry,
+                stoploss    = sig.stoploss,
+                targets     = sig.targets,
+                size_pct    = sig.size_pct,
+                raw_text    = msg.text,
+                status      = _DB_STATUS.get(status, status),
+                msg_id      = msg.id,
+                received_at = msg.date,
+            ))
+        db.add_all(rows)
+        await db.commit()
+    return len(rows)
+
+
+async def main(persist: bool = False):
     hl_assets = await fetch_hl_assets()
 
     async with TelegramClient(SESSION, API_ID, API_HASH) as client:
         entity = await client.get_entity(PeerChannel(CHANNEL_ID))
 
-        # collect msgs from Short-Term thread only, newest→oldest, stop at SINCE
-        all_msgs = []
-        async for msg in client.iter_messages(entity, offset_date=NOW, reply_to=SHORT_TERM_THREAD):
-            if msg.date < SINCE:
-                break
-            all_msgs.append(msg)
-
-        # reverse to chronological order for easier processing
-        all_msgs.sort(key=lambda m: m.date)
+        # Short-Term thread only, chronological; only msgs after the checkpoint hit Telegram
+        all_msgs, pulled = await fetch_new_messages(
+            client, entity, SCAN_SCOPE, SHORT_TERM_THREAD, SINCE
+        )
 
         # --- separate signals from updates ---
         signals = []   # list of {signal, msg, status, update_text}
@@ -79,7 +143,7 @@ async def main():
                 continue
 
             # check if it's a formal Telegram reply to a known signal
-            parent_id = getattr(msg.reply_to, "reply_to_msg_id", None) if msg.reply_to else None
+            parent_id = msg.parent_id
             if parent_id:
                 for entry in signals:
                     if entry["msg"].id == parent_id and entry["status"] == "open":
@@ -129,6 +193,7 @@ async def main():
         print(f"  Swallow Trade - Premium  |  48h scan")
         print(f"  {SINCE.strftime('%Y-%m-%d %H:%M')} → {NOW.strftime('%Y-%m-%d %H:%M')} UTC")
         print(f"  {total} signals  |  {len(hl_assets)} HL assets loaded")
+        print(f"  {len(all_msgs)} msgs in window  |  {pulled} new from Telegram")
         print(f"{'='*62}\n")
 
         print(f"✅ TRADABLE ({len(tradable)})")
@@ -138,7 +203,7 @@ async def main():
                 s   = r["signal"]
                 lev = f"{s.leverage}x" if s.leverage else "?"
                 tgts = " | ".join(f"${t:,.5g}" for t in s.targets)
-                print(f"  [#{r['msg']['id'] if isinstance(r['msg'], dict) else r['msg'].id}]"
+                print(f"  [#{r['msg'].id}]"
                       f"  {r['msg'].date.strftime('%m-%d %H:%M UTC')}")
                 print(f"  {s.pair}  {s.direction.upper()}  {lev}")
                 print(f"  Entry ${s.entry:,.5g}  SL ${s.stoploss:,.5g}  TP {tgts}")
@@ -159,4 +224,13 @@ async def main():
                 print(f"    ↳ \"{r['update_text'][:80]}\"")
         print()
 
-asyncio.run(main())
+        if persist:
+            inserted = await persist_signals(tradable + not_tradable)
+            print(f"💾 {inserted} new signal(s) inserted into signal_events\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--persist", action="store_true", help="Batch-insert new signals into signal_events")
+    args = parser.parse_args()
+    asyncio.run(main(persist=args.persist))
@@ -0,0 +1,146 @@
+"""
+Persistent scan state shared by the Telegram listener scripts.
+
+  1. Per-thread message-id checkpoints — the last message each scanner has
+     processed, so reruns pass min_id to iter_messages and only pull new ones.
+  2. Rolling message window — the lightweight fields of recently scanned
+     messages, so rescans rebuild their view without re-reading the history.
+  3. HL perp universe cached on disk with a TTL, so cold starts skip the
+     /info meta call.
+
+Everything is stored as JSON under data_cache/ (gitignored), next to
+lp_range_latest.json. Writes go through a temp file + os.replace so a crash
+mid-write never leaves a truncated checkpoint behind.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+CACHE_DIR        = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data_cache")
+CHECKPOINTS_PATH = os.path.join(CACHE_DIR, "tg_checkpoints.json")
+HL_ASSETS_PATH   = os.path.join(CACHE_DIR, "hl_assets.json")
+
+HL_ASSETS_TTL = 3600.0   # seconds — HL lists new perps rarely
+
+
+def _read_json(path: str):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: str, payload) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(payload, f)
+    os.replace(tmp, path)
+
+
+# ── Message-id checkpoints ───────────────────────────────────────────────────
+
+def _checkpoint_key(scope: str, thread_id: int) -> str:
+    return f"{scope}:{thread_id}"
+
+
+def load_checkpoint(scope: str, thread_id: int) -> int:
+    """Return the last processed message id for (scope, thread), or 0 if none."""
+    data = _read_json(CHECKPOINTS_PATH) or {}
+    return int(data.get(_checkpoint_key(scope, thread_id), 0))
+
+
+def save_checkpoint(scope: str, thread_id: int, msg_id: int) -> None:
+    """Advance the checkpoint for (scope, thread). Never moves backwards."""
+    data = _read_json(CHECKPOINTS_PATH) or {}
+    key  = _checkpoint_key(scope, thread_id)
+    if msg_id <= int(data.get(key, 0)):
+        return
+    data[key] = int(msg_id)
+    _write_json(CHECKPOINTS_PATH, data)
+
+
+# ── Rolling message window ───────────────────────────────────────────────────
+
+@dataclass
+class CachedMsg:
+    """The subset of a Telethon Message the scanners actually read."""
+    id: int
+    date: datetime
+    text: str
+    parent_id: int | None = None   # reply_to_msg_id for formal replies
+
+    @classmethod
+    def from_message(cls, msg) -> "CachedMsg":
+        parent_id = getattr(msg.reply_to, "reply_to_msg_id", None) if msg.reply_to else None
+        return cls(id=msg.id, date=msg.date, text=msg.text or "", parent_id=parent_id)
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "date": self.date.isoformat(),
+                "text": self.text, "parent_id": self.parent_id}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "CachedMsg":
+        return cls(id=d["id"], date=datetime.fromisoformat(d["date"]),
+                   text=d["text"], parent_id=d.get("parent_id"))
+
+
+def _window_path(scope: str, thread_id: int) -> str:
+    return os.path.join(CACHE_DIR, f"tg_window_{scope}_{thread_id}.json")
+
+
+def load_window(scope: str, thread_id: int, since: datetime) -> list[CachedMsg]:
+    """Return cached messages for (scope, thread) newer than `since`, oldest first."""
+    rows = _read_json(_window_path(scope, thread_id)) or []
+    msgs = [CachedMsg.from_dict(r) for r in rows]
+    return sorted((m for m in msgs if m.date >= since), key=lambda m: m.id)
+
+
+def save_window(scope: str, thread_id: int, msgs: list[CachedMsg]) -> None:
+    _write_json(_window_path(scope, thread_id), [m.to_dict() for m in msgs])
+
+
+async def fetch_new_messages(client, entity, scope: str, thread_id: int,
+                             since: datetime) -> tuple[list[CachedMsg], int]:
+    """
+    Incremental thread read: merge the cached window with messages posted after
+    the checkpoint, prune anything older than `since`, persist both.
+
+    Cold start (no checkpoint) walks back until `since` like the old full scan.
+    Returns (messages oldest→newest, number of messages pulled from Telegram).
+    """
+    last_id = load_checkpoint(scope, thread_id)
+    cached  = load_window(scope, thread_id, since) if last_id else []
+
+    fresh = []
+    async for msg in client.iter_messages(entity, reply_to=thread_id, min_id=last_id):
+        if msg.date < since:
+            break
+        fresh.append(CachedMsg.from_message(msg))
+
+    by_id = {m.id: m for m in cached}
+    by_id.update((m.id, m) for m in fresh)
+    msgs = sorted(by_id.values(), key=lambda m: m.id)
+
+    save_window(scope, thread_id, msgs)
+    if msgs:
+        save_checkpoint(scope, thread_id, msgs[-1].id)
+    return msgs, len(fresh)
+
+
+# ── HL asset universe ────────────────────────────────────────────────────────
+
+def load_hl_assets(ttl: float = HL_ASSETS_TTL) -> set[str] | None:
+    """Return the cached HL perp universe, or None if missing or older than ttl."""
+    data = _read_json(HL_ASSETS_PATH)
+    if not data or (time.time() - data.get("saved_at", 0)) >= ttl:
+        return None
+    return set(data.get("assets", []))
+
+
+def save_hl_assets(assets: set[str]) -> None:
+    _write_json(HL_ASSETS_PATH, {"saved_at": time.time(), "assets": sorted(assets)})
@@ -7,12 +7,14 @@ Run once to optimize query performance
 import sqlite3
 import sys
 
-DB_PATH = '/var/www/dev/trading/scalping_v2/data/trades.db'
+from dashboard_db import INDEXES, ensure_schema, resolve_db_path
+
+DB_PATH = resolve_db_path()
 
 def add_indexes():
     """Add indexes to improve query performance"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = sqlite3.connect(str(DB_PATH))
         cursor = conn.cursor()
 
         print("📊 Adding database indexes for performance optimization...\n")
@@ -51,6 +53,12 @@ def add_indexes():
         conn.commit()
         conn.close()
 
+        # Covering indexes, WAL mode and trade_stats aggregates used by the dashboard
+        if ensure_schema(DB_PATH):
+            for index_name, table_name, columns in INDEXES:
+                print(f"✅ Created covering index: {index_name} on {table_name}({columns})")
+            print("✅ WAL mode enabled, trade_stats aggregate + triggers installed")
+
         print("\n✅ All indexes created successfully!")
         print("\n📈 Query performance should be improved for:")
         print("  • Signal filtering by time")
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Read-side SQLite access for the Scalping v2 dashboard.
+
+- DB path comes from config_live.json ['database']['path'] (relative to this
+  directory), overridable with SCALPING_DB_PATH — no hardcoded paths.
+- A small pool of read-only connections (PRAGMA query_only) shared across
+  request threads instead of a fresh sqlite3.connect per request.
+- ensure_schema() switches the DB to WAL (so dashboard reads never block the
+  bot's writes), creates the covering indexes the dashboard queries need, and
+  installs the trade_stats aggregate row plus the triggers that keep it up to
+  date as trades close. Status/performance then read one row instead of
+  scanning the whole trades table on every poll.
+"""
+
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent
+CONFIG_PATH = BASE_DIR / 'config_live.json'
+
+POOL_SIZE = 4
+POOL_TIMEOUT_S = 10   # max wait for a free connection before the request fails
+BUSY_TIMEOUT_MS = 5000
+
+# Dashboard query shapes:
+#   trades:  WHERE exit_price IS NOT NULL ORDER BY closed_at DESC LIMIT n
+#   signals: WHERE timestamp >= ? [AND executed = 1] [AND confidence >= 0.65]
+#            ORDER BY timestamp DESC LIMIT n, plus executed/confidence stats
+INDEXES = [
+    # closed_at first so ORDER BY ... LIMIT walks the index backwards and stops
+    # early; exit_price alongside so the IS NOT NULL filter never touches the row
+    ("idx_trades_closed_exit", "trades", "closed_at, exit_price"),
+    # covers the time window filter and both stats columns (index-only scan)
+    ("idx_signals_time_exec_conf", "scalping_signals", "timestamp, executed, confidence"),
+]
+
+# One row of running totals over closed trades (exit_price IS NOT NULL)
+TRADE_STATS_DDL = """
+    CREATE TABLE IF NOT EXISTS trade_stats (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        closed_trades INTEGER NOT NULL DEFAULT 0,
+        wins INTEGER NOT NULL DEFAULT 0,
+        gross_profit REAL NOT NULL DEFAULT 0,
+        gross_loss REAL NOT NULL DEFAULT 0,
+        total_pnl REAL NOT NULL DEFAULT 0,
+        total_notional REAL NOT NULL DEFAULT 0,
+        best_trade REAL
+    )
+"""
+
+# Per-row contribution of a trade to each column, for NEW.* / OLD.*
+def _delta(row, sign):
+    return f"""
+        UPDATE trade_stats SET
+            closed_trades = closed_trades {sign} 1,
+            wins = wins {sign} (CASE WHEN COALESCE({row}.pnl, 0) > 0 THEN 1 ELSE 0 END),
+            gross_profit = gross_profit {sign} MAX(COALESCE({row}.pnl, 0), 0),
+            gross_loss = gross_loss {sign} -MIN(COALESCE({row}.pnl, 0), 0),
+            total_pnl = total_pnl {sign} COALESCE({row}.pnl, 0),
+            total_notional = total_notional {sign} {row}.entry_price * {row}.quantity
+        WHERE id = 1;"""
+
+
+_BEST_TRADE = """
+        UPDATE trade_stats SET best_trade = MAX(COALESCE(best_trade, NEW.pnl), COALESCE(NEW.pnl, 0))
+        WHERE id = 1;"""
+
+# best_trade only ratchets up: a deleted/edited best trade is not un-counted.
+# Rebuild with rebuild_trade_stats() if history is ever rewritten.
+TRADE_STATS_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_trade_stats_insert
+        AFTER INSERT ON trades WHEN NEW.exit_price IS NOT NULL
+        BEGIN {_delta('NEW', '+')} {_BEST_TRADE}
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_trade_stats_update_old
+        AFTER UPDATE OF exit_price, pnl, entry_price, quantity ON trades
+        WHEN OLD.exit_price IS NOT NULL
+        BEGIN {_delta('OLD', '-')}
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_trade_stats_update_new
+        AFTER UPDATE OF exit_price, pnl, entry_price, quantity ON trades
+        WHEN NEW.exit_price IS NOT NULL
+        BEGIN {_delta('NEW', '+')} {_BEST_TRADE}
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_trade_stats_delete
+        AFTER DELETE ON trades WHEN OLD.exit_price IS NOT NULL
+        BEGIN {_delta('OLD', '-')}
+        END""",
+]
+
+_STATS_SELECT = """
+    SELECT COUNT(*) AS closed_trades,
+           COALESCE(SUM(CASE WHEN COALESCE(pnl, 0) > 0 THEN 1 ELSE 0 END), 0) AS wins,
+           COALESCE(SUM(MAX(COALESCE(pnl, 0), 0)), 0) AS gross_profit,
+           COALESCE(SUM(-MIN(COALESCE(pnl, 0), 0)), 0) AS gross_loss,
+           COALESCE(SUM(COALESCE(pnl, 0)), 0) AS total_pnl,
+           COALESCE(SUM(entry_price * quantity), 0) AS total_notional,
+           MAX(pnl) AS best_trade
+    FROM trades
+    WHERE exit_price IS NOT NULL
+"""
+
+
+def resolve_db_path() -> Path:
+    """SCALPING_DB_PATH, else config_live.json database.path, else data/trades.db"""
+    env_path = os.getenv('SCALPING_DB_PATH')
+    if env_path:
+        return Path(env_path)
+
+    db_path = 'data/trades.db'
+    try:
+        with open(CONFIG_PATH) as f:
+            db_path = json.load(f).get('database', {}).get('path', db_path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read {CONFIG_PATH}: {e}")
+
+    path = Path(db_path)
+    return path if path.is_absolute() else BASE_DIR / path
+
+
+def _table_exists(conn, name) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def rebuild_trade_stats(conn):
+    """Recompute the aggregate row from the full trades table (one scan)"""
+    conn.execute(f"""
+        INSERT OR REPLACE INTO trade_stats
+            (id, closed_trades, wins, gross_profit, gross_loss, total_pnl, total_notional, best_trade)
+        SELECT 1, * FROM ({_STATS_SELECT})
+    """)
+
+
+def ensure_schema(db_path=None):
+    """
+    One-time writable setup: WAL mode, covering indexes, trade_stats + triggers.
+    Safe to rerun; the aggregate row is only backfilled when it doesn't exist.
+    """
+    db_path = Path(db_path or resolve_db_path())
+    if not db_path.exists():
+        logger.warning(f"Database not found at {db_path}; skipping schema setup")
+        return False
+
+    conn = sqlite3.connect(str(db_path), timeout=BUSY_TIMEOUT_MS / 1000)
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+
+        for index_name, table_name, columns in INDEXES:
+            if _table_exists(conn, table_name):
+                conn.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON {table_name}({columns})')
+
+        if _table_exists(conn, 'trades'):
+            # Triggers and backfill in one transaction so no close slips between them
+            with conn:
+                conn.execute('BEGIN IMMEDIATE')
+                conn.execute(TRADE_STATS_DDL)
+                for ddl in TRADE_STATS_TRIGGERS:
+                    conn.execute(ddl)
+                if conn.execute('SELECT 1 FROM trade_stats WHERE id = 1').fetchone() is None:
+                    rebuild_trade_stats(conn)
+
+        # Fresh stats so the planner prefers the covering indexes over the old
+        # single-column ones (e.g. idx_signals_executed); bounded sample per index
+        conn.execute('PRAGMA analysis_limit=1000')
+        conn.execute('ANALYZE')
+        return True
+    finally:
+        conn.close()
+
+
+class ReadOnlyPool:
+    """Fixed-size pool of query_only connections, safe to share across threads"""
+
+    def __init__(self, db_path=None, size=POOL_SIZE):
+        self.db_path = Path(db_path or resolve_db_path())
+        self.size = size
+        self._pool = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=BUSY_TIMEOUT_MS / 1000,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA query_only=ON')
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; waits up to POOL_TIMEOUT_S when all `size` are in use"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                try:
+                    conn = self._pool.get(timeout=POOL_TIMEOUT_S)
+                except queue.Empty:
+                    raise sqlite3.OperationalError(
+                        f'no free dashboard DB connection after {POOL_TIMEOUT_S}s '
+                        f'(pool size {self.size})') from None
+
+        broken = False
+        try:
+            yield conn
+        except sqlite3.DatabaseError:
+            # Don't hand a possibly broken connection to the next request
+            broken = True
+            raise
+        finally:
+            # Any other exception (a route bug) still returns the connection
+            if not broken:
+                try:
+                    if conn.in_transaction:
+                        conn.rollback()
+                except sqlite3.Error:
+                    broken = True
+            if broken:
+                conn.close()
+                with self._lock:
+                    self._created -= 1
+            else:
+                self._pool.put(conn)
+
+    def available(self) -> bool:
+        return self.db_path.exists()
+
+
+def get_trade_stats(pool: ReadOnlyPool) -> dict:
+    """Closed-trade aggregates; falls back to a full scan if trade_stats is missing"""
+    with pool.connection() as conn:
+        row = None
+        if _table_exists(conn, 'trade_stats'):
+            row = conn.execute(
+                'SELECT closed_trades, wins, gross_profit, gross_loss, total_pnl, '
+                'total_notional, best_trade FROM trade_stats WHERE id = 1'
+            ).fetchone()
+        if row is None:
+            row = conn.execute(_STATS_SELECT).fetchone()
+    return dict(row)
@@ -14,7 +14,8 @@ import json
 import os
 from datetime import datetime, timedelta
 import logging
-import sqlite3
+
+from dashboard_db import ReadOnlyPool, ensure_schema, get_trade_stats
 
 # Setup logging
 logging.basicConfig(
@@ -33,6 +34,13 @@ app.config['APPLICATION_ROOT'] = '/scalping'
 app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
 CORS(app)
 
+# Shared read-only connections; WAL, indexes and trade_stats aggregates set up once
+try:
+    ensure_schema()
+except Exception as e:
+    logger.error(f"Database schema setup failed: {e}")
+db_pool = ReadOnlyPool()
+
 
 def load_snapshot():
     """Load the latest bot snapshot"""
@@ -112,21 +120,13 @@ def api_status():
     # Calculate unrealized PnL from positions
     unrealized_pnl = sum(pos.get('unrealized_pnl', 0) for pos in positions)
 
-    # Calculate fees from completed trades
+    # Calculate fees from completed trades (trade_stats aggregate row, no table scan)
     try:
-        import sqlite3
-        conn = sqlite3.connect('/var/www/dev/trading/scalping_v2/data/trades.db')
-        cursor = conn.cursor()
-
-        # Count completed trades
-        cursor.execute('SELECT COUNT(*) FROM trades WHERE exit_price IS NOT NULL')
-        total_trades = cursor.fetchone()[0] or 0
+        trade_stats = get_trade_stats(db_pool)
+        total_trades = trade_stats['closed_trades'] or 0
 
         # Get average position size for fee estimation
-        cursor.execute('SELECT AVG(entry_price * quantity) FROM trades WHERE exit_price IS NOT NULL')
-        avg_position_size = cursor.fetchone()[0] or 1000
-
-        conn.close()
+        avg_position_size = (trade_stats['total_notional'] / total_trades) if total_trades else 1000
 
         # BingX taker fees: 0.05% entry + 0.05% exit = 0.10% total per round trip
         # Estimate: 0.001 * average position size * number of trades
@@ -196,36 +196,29 @@ def api_trades():
     limit = int(request.args.get('limit', 10))
 
     try:
-        # Query database directly for completed trades
-        db_path = 'data/trades.db'
-        if not os.path.exists(db_path):
+        if not db_pool.available():
             return jsonify({'trades': []})
 
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        # Get completed trades (those with exit_price)
-        cursor.execute('''
-            SELECT
-                side,
-                entry_price,
-                exit_price,
-                quantity,
-                pnl,
-                pnl_percent,
-                timestamp,
-                closed_at,
-                exit_reason,
-                hold_duration,
-                trading_mode
-            FROM trades
-            WHERE exit_price IS NOT NULL
-            ORDER BY closed_at DESC
-            LIMIT ?
-        ''', [limit])
-
-        rows = cursor.fetchall()
+        # Get completed trades (those with exit_price) - reads idx_trades_closed_exit
+        with db_pool.connection() as conn:
+            rows = conn.execute('''
+                SELECT
+                    side,
+                    entry_price,
+                    exit_price,
+                    quantity,
+                    pnl,
+                    pnl_percent,
+                    timestamp,
+                    closed_at,
+                    exit_reason,
+                    hold_duration,
+                    trading_mode
+                FROM trades
+                WHERE exit_price IS NOT NULL
+                ORDER BY closed_at DESC
+                LIMIT ?
+            ''', [limit]).fetchall()
 
         # Convert to list of dictionaries
         trades = []
@@ -245,8 +238,6 @@ def api_trades():
             }
             trades.append(trade)
 
-        conn.close()
-
         return jsonify({'trades': trades})
 
     except Exception as e:
@@ -271,20 +262,26 @@ def api_performance():
         })
 
     account = snapshot.get('account', {})
-    trades = snapshot.get('recent_trades', [])
 
-    # Calculate performance metrics
-    total_trades = len(trades)
-    wins = sum(1 for t in trades if t.get('pnl', 0) > 0)
+    # Performance metrics over all closed trades, from the trigger-maintained
+    # trade_stats row (constant cost however long the history gets)
+    try:
+        trade_stats = get_trade_stats(db_pool)
+    except Exception as e:
+        logger.error(f"Error loading trade stats: {e}")
+        trade_stats = {}
+
+    total_trades = trade_stats.get('closed_trades') or 0
+    wins = trade_stats.get('wins') or 0
     losses = total_trades - wins
     win_rate = (wins / total_trades * 100) if total_trades > 0 else 0
 
-    winning_pnl = sum(t.get('pnl', 0) for t in trades if t.get('pnl', 0) > 0)
-    losing_pnl = abs(sum(t.get('pnl', 0) for t in trades if t.get('pnl', 0) < 0))
+    winning_pnl = trade_stats.get('gross_profit') or 0
+    losing_pnl = trade_stats.get('gross_loss') or 0
     profit_factor = (winning_pnl / losing_pnl) if losing_pnl > 0 else 0
 
-    avg_pnl = (sum(t.get('pnl', 0) for t in trades) / total_trades) if total_trades > 0 else 0
-    best_trade = max((t.get('pnl', 0) for t in trades), default=0)
+    avg_pnl = ((trade_stats.get('total_pnl') or 0) / total_trades) if total_trades > 0 else 0
+    best_trade = trade_stats.get('best_trade') or 0
 
     stats = {
         'total_trades': total_trades,
@@ -349,16 +346,10 @@ def api_signals():
         # Calculate time threshold
         time_threshold = (datetime.now() - timedelta(hours=hours)).isoformat()
 
-        # Connect to database
-        db_path = 'data/trades.db'
-        if not os.path.exists(db_path):
+        if not db_pool.available():
             return jsonify({'signals': [], 'count': 0})
 
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
-        cursor = conn.cursor()
-
-        # Build query
+        # Build query (both queries are served by idx_signals_time_exec_conf)
         query = '''
             SELECT
                 id, timestamp, side, confidence, entry_price, stop_loss, take_profit,
@@ -380,8 +371,22 @@ def api_signals():
         query += ' ORDER BY timestamp DESC LIMIT ?'
         params.append(limit)
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+        with db_pool.connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+            # Get statistics
+            stats_row = conn.execute('''
+                SELECT
+                    COUNT(*) as total,
+                    SUM(CASE WHEN executed = 1 THEN 1 ELSE 0 END) as executed,
+                    SUM(CASE WHEN executed = 0 THEN 1 ELSE 0 END) as rejected,
+                    SUM(CASE WHEN confidence >= 0.65 THEN 1 ELSE 0 END) as email_sent,
+                    SUM(CASE WHEN confidence < 0.65 THEN 1 ELSE 0 END) as no_email,
+                    AVG(CASE WHEN executed = 1 THEN confidence ELSE NULL END) * 100 as avg_executed_confidence,
+                    AVG(CASE WHEN executed = 0 THEN confidence ELSE NULL END) * 100 as avg_rejected_confidence
+                FROM scalping_signals
+                WHERE timestamp >= ?
+            ''', [time_threshold]).fetchone()
 
         # Convert to list of dictionaries
         signals = []
@@ -407,21 +412,6 @@ def api_signals():
             }
             signals.append(signal)
 
-        # Get statistics
-        cursor.execute('''
-            SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN executed = 1 THEN 1 ELSE 0 END) as executed,
-                SUM(CASE WHEN executed = 0 THEN 1 ELSE 0 END) as rejected,
-                SUM(CASE WHEN confidence >= 0.65 THEN 1 ELSE 0 END) as email_sent,
-                SUM(CASE WHEN confidence < 0.65 THEN 1 ELSE 0 END) as no_email,
-                AVG(CASE WHEN executed = 1 THEN confidence ELSE NULL END) * 100 as avg_executed_confidence,
-                AVG(CASE WHEN executed = 0 THEN confidence ELSE NULL END) * 100 as avg_rejected_confidence
-            FROM scalping_signals
-            WHERE timestamp >= ?
-        ''', [time_threshold])
-
-        stats_row = cursor.fetchone()
         stats = {
             'total': stats_row['total'] or 0,
             'executed': stats_row['executed'] or 0,
@@ -433,8 +423,6 @@ def api_signals():
             'avg_rejected_confidence': round(stats_row['avg_rejected_confidence'] or 0, 1)
         }
 
-        conn.close()
-
         return jsonify({
             'signals': signals,
             'count': len(signals),
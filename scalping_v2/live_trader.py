@@ -6,6 +6,8 @@ Runs the complete scalping trading system in real-time with live market data
 
 import sys
 import os
+import importlib.util
+from pathlib import Path
 sys.path.insert(0, '/var/www/dev/trading/scalping_v2')
 
 import time
@@ -16,7 +18,6 @@ from datetime import datetime, timedelta, timezone
 from typing import Dict, Optional
 import pandas as pd
 import logging
-import sqlite3
 from dotenv import load_dotenv
 
 # Load environment variables (use absolute path)
@@ -37,6 +38,7 @@ from src.monitoring.system_monitor import SystemMonitor
 # Import scalping-specific components
 from src.signals.scalping_signal_generator import ScalpingSignalGenerator
 from src.notifications.email_notifier import ScalpingEmailNotifier
+from persistence_worker import PersistenceWorker
 
 
 # Custom JSON Encoder to handle numpy types and other non-serializable objects
@@ -56,6 +58,26 @@ class NumpyEncoder(json.JSONEncoder):
         return super(NumpyEncoder, self).default(obj)
 
 
+SNAPSHOT_PATH = 'logs/final_snapshot.json'
+
+SIGNAL_INSERT_SQL = '''
+    INSERT INTO scalping_signals (
+        timestamp, side, confidence, entry_price, stop_loss, take_profit,
+        position_size_usd, margin_required, risk_amount, risk_percent,
+        conditions, executed, execution_status, rejection_reason, indicators_json
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+# Shared regime service (lp_hedge_backtest/src/indicators/regime.py). Loaded by path:
+# this bot's own `src` package would shadow the LP package's `src`.
+_regime_spec = importlib.util.spec_from_file_location(
+    'lp_regime', Path(__file__).resolve().parent.parent / 'lp_hedge_backtest' / 'src' / 'indicators' / 'regime.py')
+lp_regime = importlib.util.module_from_spec(_regime_spec)
+_regime_spec.loader.exec_module(lp_regime)
+REGIME_MAX_AGE = 1800  # seconds — older snapshots are treated as unavailable
+
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -308,6 +330,14 @@ class ScalpingTradingBot:
         self.system_monitor = SystemMonitor()
         logger.info("  ✅ System Monitor initialized")
 
+        # Persistence worker - DB inserts and snapshot writes off the trading loop
+        self.persistence = PersistenceWorker(
+            db_path=cfg.get('database', {}).get('path', 'data/trades.db'),
+            json_cls=NumpyEncoder
+        )
+        self.persistence.start()
+        logger.info("  ✅ Persistence Worker started")
+
     def _restore_previous_session(self):
         """Restore state from previous session if available"""
         try:
@@ -705,9 +735,6 @@ class ScalpingTradingBot:
             rejection_reason: Reason if trade was rejected
         """
         try:
-            db_path = self.config.get('database', {}).get('path', 'data/trades.db')
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
 
             # Extract signal data
             confidence = signal.get('confidence', 0)
@@ -738,14 +765,8 @@ class ScalpingTradingBot:
             else:
                 execution_status = 'PENDING'
 
-            # Insert signal into database
-            cursor.execute('''
-                INSERT INTO scalping_signals (
-                    timestamp, side, confidence, entry_price, stop_loss, take_profit,
-                    position_size_usd, margin_required, risk_amount, risk_percent,
-                    conditions, executed, execution_status, rejection_reason, indicators_json
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            # Queue the insert; the persistence worker commits it in the next batch
+            queued = self.persistence.submit(SIGNAL_INSERT_SQL, (
                 datetime.now().isoformat(),
                 side,
                 confidence,
@@ -763,16 +784,14 @@ class ScalpingTradingBot:
                 indicators_json
             ))
 
-            conn.commit()
-            conn.close()
-
-            logger.debug(f"📊 Signal stored to database: {side} {confidence*100:.1f}% - {execution_status}")
+            if queued:
+                logger.debug(f"📊 Signal queued for database: {side} {confidence*100:.1f}% - {execution_status}")
 
         except Exception as e:
             logger.warning(f"⚠️  Failed to store signal to database: {e}")
 
     def _export_snapshot(self):
-        """Export current state snapshot for web dashboard"""
+        """Export current state snapshot for web dashboard (written by the persistence worker)"""
         try:
             snapshot = {
                 'timestamp': datetime.now().isoformat(),
@@ -802,6 +821,9 @@ class ScalpingTradingBot:
                 snapshot['indicators'] = market_state.get('indicators', {})
                 snapshot['price_action'] = market_state.get('price_action', {})
 
+            # ADX regime shared with the supervisor
+            snapshot['shared_regime'] = self._read_shared_regime()
+
             # Add active filter status for dashboard visibility
             snapshot['active_filters'] = {
                 'signal_cooldown_active': self.config.get('signal_cooldown_seconds', 0) > 0,
@@ -815,13 +837,19 @@ class ScalpingTradingBot:
                 'stop_loss_pct': self.config.get('max_loss_pct', 0.0015) * 100
             }
 
-            # Write to file
-            with open('logs/final_snapshot.json', 'w') as f:
-                json.dump(snapshot, f, indent=2, cls=NumpyEncoder)
+            # Writer backlog, so a slow disk / locked DB shows up on the dashboard
+            snapshot['persistence'] = self.persistence.metrics()
+
+            # Serialized here; written and atomically replaced on the worker thread
+            self.persistence.write_snapshot(SNAPSHOT_PATH, snapshot)
 
         except Exception as e:
             logger.error(f"Error exporting snapshot: {e}")
 
+    def _read_shared_regime(self) -> Optional[Dict]:
+        """Read this symbol's regime from the shared regime snapshot (None if missing or stale)"""
+        return lp_regime.read_published_regime(self.config.get('symbol', 'BTC-USDT'), max_age=REGIME_MAX_AGE)
+
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals"""
         logger.info(f"\n⚠️  Received signal {signum}, shutting down...")
@@ -882,8 +910,9 @@ class ScalpingTradingBot:
             logger.info(f"Max Drawdown: {stats.get('max_drawdown', 0):.2f}%")
             logger.info("="*80)
 
-        # Export final snapshot
+        # Export final snapshot and flush pending writes
         self._export_snapshot()
+        self.persistence.stop()
 
         logger.info("✅ Shutdown complete")
 
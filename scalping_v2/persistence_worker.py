@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Background persistence for the Scalping v2 bot.
+
+The trading loop hands rows and snapshots to a PersistenceWorker and returns
+immediately; a single daemon thread owns the SQLite connection and the disk.
+
+- submit(sql, params): queued write, never blocks. Pending writes are drained
+  in batches and committed in one transaction per batch. A locked database is
+  retried with backoff without losing the batch.
+- write_snapshot(path, data): serialized on the caller's thread (the dict may
+  hold live objects the trading loop keeps mutating), then a latest-wins slot
+  per path written by the worker atomically (temp file + os.replace) so the
+  dashboard never reads a half-written file.
+- metrics(): queue depth, high-water mark, throughput and failure counters.
+"""
+
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+MAX_QUEUE = 10000
+BATCH_SIZE = 200
+FLUSH_INTERVAL = 0.5      # seconds to wait for more work before flushing
+LOCK_RETRIES = 5
+DEPTH_WARNING = 1000      # log once the backlog grows past this
+
+_STOP = object()
+
+
+class PersistenceWorker(threading.Thread):
+    """Single writer thread for SQLite inserts and JSON snapshots"""
+
+    def __init__(self, db_path: str, json_cls: Optional[type] = None,
+                 max_queue: int = MAX_QUEUE, batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL):
+        super().__init__(name='persistence-worker', daemon=True)
+        self.db_path = db_path
+        self.json_cls = json_cls
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._snapshots: Dict[str, str] = {}
+        self._snapshot_lock = threading.Lock()
+        self._conn = None
+
+        self._stats = {
+            'rows_written': 0,
+            'batches': 0,
+            'rows_dropped': 0,
+            'rows_failed': 0,
+            'snapshots_written': 0,
+            'snapshot_errors': 0,
+            'max_queue_depth': 0,
+            'last_batch_ms': 0.0,
+            'last_snapshot_ms': 0.0,
+        }
+
+    # ── Producer side (trading loop) ─────────────────────────────────────────
+
+    def submit(self, sql: str, params: Sequence) -> bool:
+        """Queue one write. Returns False (and counts a drop) if the queue is full."""
+        try:
+            self._queue.put_nowait((sql, tuple(params)))
+        except queue.Full:
+            self._stats['rows_dropped'] += 1
+            logger.warning(f"⚠️  Persistence queue full ({self._queue.maxsize}), dropping write")
+            return False
+
+        depth = self._queue.qsize()
+        if depth > self._stats['max_queue_depth']:
+            self._stats['max_queue_depth'] = depth
+            if depth == DEPTH_WARNING:
+                logger.warning(f"⚠️  Persistence backlog at {depth} writes - database slow or locked?")
+        return True
+
+    def write_snapshot(self, path: str, data: dict):
+        """Serialize `data` now and replace the pending snapshot for `path`; only the latest is written"""
+        try:
+            text = json.dumps(data, indent=2, cls=self.json_cls)
+        except Exception as e:
+            self._stats['snapshot_errors'] += 1
+            logger.error(f"Error serializing snapshot {path}: {e}")
+            return
+        with self._snapshot_lock:
+            self._snapshots[path] = text
+
+    def metrics(self) -> Dict:
+        with self._snapshot_lock:
+            pending_snapshots = len(self._snapshots)
+        return {
+            'queue_depth': self._queue.qsize(),
+            'pending_snapshots': pending_snapshots,
+            'alive': self.is_alive(),
+            **self._stats,
+        }
+
+    def stop(self, timeout: float = 10.0):
+        """Flush everything still queued, then stop the thread"""
+        if not self.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.error("❌ Persistence queue still full at shutdown")
+            return
+        self.join(timeout)
+        if self.is_alive():
+            logger.error(f"❌ Persistence worker did not finish within {timeout}s "
+                         f"({self._queue.qsize()} writes pending)")
+
+    # ── Worker thread ────────────────────────────────────────────────────────
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._collect_batch()
+            if batch:
+                self._write_batch(batch)
+            self._write_snapshots()
+
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _collect_batch(self):
+        """Wait for work, then take up to batch_size queued writes"""
+        batch = []
+        try:
+            item = self._queue.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return batch, False
+
+        while True:
+            if item is _STOP:
+                # Drain whatever was queued ahead of/behind the stop marker
+                while True:
+                    try:
+                        rest = self._queue.get_nowait()
+                    except queue.Empty:
+                        return batch, True
+                    if rest is not _STOP:
+                        batch.append(rest)
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                return batch, False
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return batch, False
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, timeout=5.0)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+        return self._conn
+
+    def _write_batch(self, batch):
+        start = time.monotonic()
+        for attempt in range(LOCK_RETRIES):
+            try:
+                conn = self._connect()
+                with conn:
+                    for sql, params in batch:
+                        conn.execute(sql, params)
+                self._stats['rows_written'] += len(batch)
+                self._stats['batches'] += 1
+                self._stats['last_batch_ms'] = round((time.monotonic() - start) * 1000, 2)
+                return
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) and 'busy' not in str(e):
+                    logger.error(f"❌ Persistence batch error, writing rows individually: {e}")
+                    self._write_rows(batch)
+                    return
+                # Locked by another writer: back off and retry the whole batch
+                logger.warning(f"⚠️  Persistence batch failed (attempt {attempt + 1}/{LOCK_RETRIES}): {e}")
+                time.sleep(min(0.5 * 2 ** attempt, 5.0))
+            except sqlite3.Error as e:
+                # A bad row poisons the transaction; retry row by row so the rest still land
+                logger.error(f"❌ Persistence batch error, writing rows individually: {e}")
+                self._write_rows(batch)
+                return
+
+        self._stats['rows_failed'] += len(batch)
+        logger.error(f"❌ Dropped {len(batch)} writes after {LOCK_RETRIES} attempts")
+
+    def _write_rows(self, batch):
+        conn = self._connect()
+        for sql, params in batch:
+            try:
+                with conn:
+                    conn.execute(sql, params)
+                self._stats['rows_written'] += 1
+            except sqlite3.Error as e:
+                self._stats['rows_failed'] += 1
+                logger.error(f"❌ Failed to persist row: {e}")
+
+    def _write_snapshots(self):
+        with self._snapshot_lock:
+            pending, self._snapshots = self._snapshots, {}
+
+        for path, text in pending.items():
+            start = time.monotonic()
+            tmp = f"{path}.tmp"
+            try:
+                with open(tmp, 'w') as f:
+                    f.write(text)
+                os.replace(tmp, path)
+                self._stats['snapshots_written'] += 1
+                self._stats['last_snapshot_ms'] = round((time.monotonic() - start) * 1000, 2)
+            except Exception as e:
+                self._stats['snapshot_errors'] += 1
+                logger.error(f"Error writing snapshot {path}: {e}")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Replay Backtest for Scalping Strategy v2.0
+Runs the live BitcoinScalpingEngine rules over historical candles offline
+
+Usage:
+    python3 replay_backtest.py --candles data/btc_1m_2024.csv
+    python3 replay_backtest.py --candles data/btc_5m.parquet --set min_confidence=0.75 --trades-out logs/replay_trades.csv
+"""
+
+import sys
+import os
+import json
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.backtest import ReplayBacktester, load_candles
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+def _parse_override(item: str):
+    """key=value from --set; value parsed as JSON when possible (numbers, bools, lists)"""
+    key, _, raw = item.partition('=')
+    try:
+        return key, json.loads(raw)
+    except ValueError:
+        return key, raw
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Scalping Strategy v2.0 - Historical Replay Backtest')
+    parser.add_argument('--candles', required=True,
+                       help='CSV/Parquet with timestamp, open, high, low, close, volume')
+    parser.add_argument('--config', default='config_live.json',
+                       help='Configuration file (default: config_live.json)')
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+                       help='Override a config value, e.g. --set min_confidence=0.75 (repeatable)')
+    parser.add_argument('--fee', type=float, default=None,
+                       help='Taker fee per side (default: 0.0005)')
+    parser.add_argument('--slippage', type=float, default=0.0,
+                       help='Slippage per market fill as a fraction (default: 0)')
+    parser.add_argument('--capital', type=float, default=None,
+                       help='Initial capital (default: config initial_capital)')
+    parser.add_argument('--trades-out', default=None,
+                       help='Write the trade list to this CSV')
+
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+    for item in args.set:
+        key, value = _parse_override(item)
+        config[key] = value
+
+    candles = load_candles(args.candles)
+    print(f"📊 Loaded {len(candles):,} candles from {args.candles}")
+
+    backtester = ReplayBacktester(config, fee_rate=args.fee, slippage_pct=args.slippage,
+                                  initial_capital=args.capital)
+    result = backtester.run(candles)
+
+    print("\n" + "="*80)
+    print("📈 REPLAY BACKTEST RESULTS")
+    print("="*80)
+    for key, value in result.stats.items():
+        print(f"  {key:32s} {value}")
+    print("="*80)
+
+    if args.trades_out and result.trades:
+        result.trades_df().to_csv(args.trades_out, index=False)
+        print(f"💾 Trades written to {args.trades_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Backtest module for Scalping Bot v2.0
+"""
+
+from .replay_engine import ReplayBacktester, ReplayResult, load_candles
+
+__all__ = ['ReplayBacktester', 'ReplayResult', 'load_candles']
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Historical Replay Backtester for the Bitcoin Scalping Engine
+
+Runs BitcoinScalpingEngine over a full candle history in one pass:
+  1. Indicators are computed once over the whole series with the engine's own
+     helpers (EMA/RSI/SMA/Stochastic/ATR), then post-processed exactly like
+     _calculate_indicators does for the last bar of a live window.
+  2. A vectorized pre-filter marks the bars where any long/short condition can
+     fire; only those bars go through the engine's per-bar rules
+     (_detect_market_regime, _generate_signals, _adjust_confidence).
+  3. The live bot's gating is applied per bar: trading hours, one position at
+     a time, per-side signal cooldown, daily loss / daily trade limits.
+  4. Fills: entry at the next bar's open (+ slippage), SL/TP checked against
+     each bar's high/low (SL first when both touch), time exit at
+     max_position_time, taker fees on both legs.
+
+EMA/RSI are seeded from the start of the history rather than from the start
+of a 100-candle live window; the difference decays below a cent within the
+window, so per-bar indicator values match the live engine to rounding.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..indicators.scalping_engine import BitcoinScalpingEngine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEE_RATE = 0.0005   # BingX taker fee per side (0.05%)
+
+
+@dataclass
+class ReplayResult:
+    """Output of a replay run"""
+    trades: List[Dict]
+    equity: pd.Series
+    stats: Dict = field(default_factory=dict)
+
+    def trades_df(self) -> pd.DataFrame:
+        return pd.DataFrame(self.trades)
+
+
+def load_candles(path: str) -> pd.DataFrame:
+    """
+    Load OHLCV candles from CSV or Parquet.
+
+    Needs columns timestamp, open, high, low, close, volume. timestamp may be
+    epoch seconds, epoch milliseconds or a date string; it is normalized to
+    epoch milliseconds and the frame is sorted and de-duplicated.
+    """
+    df = pd.read_parquet(path) if path.endswith('.parquet') else pd.read_csv(path)
+
+    missing = [c for c in ['timestamp', 'open', 'high', 'low', 'close', 'volume'] if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns in {path}: {missing}")
+
+    ts = df['timestamp']
+    if pd.api.types.is_numeric_dtype(ts):
+        ts = ts.astype('int64')
+        if ts.iloc[0] < 10**12:     # epoch seconds
+            ts = ts * 1000
+    else:
+        ts = (pd.to_datetime(ts, utc=True) - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(milliseconds=1)
+    df = df.assign(timestamp=ts)
+
+    df = df.sort_values('timestamp').drop_duplicates('timestamp', keep='last').reset_index(drop=True)
+    return df
+
+
+class ReplayBacktester:
+    """
+    Replay BitcoinScalpingEngine over historical candles
+
+    Usage:
+        bt = ReplayBacktester(config)
+        result = bt.run(load_candles('data/btc_1m.csv'))
+        print(result.stats)
+    """
+
+    def __init__(self, config: Dict, fee_rate: Optional[float] = None,
+                 slippage_pct: float = 0.0, initial_capital: Optional[float] = None):
+        self.config = config
+        self.fee_rate = fee_rate if fee_rate is not None else config.get('fee_rate', DEFAULT_FEE_RATE)
+        self.slippage_pct = slippage_pct
+        self.initial_capital = initial_capital or config.get('initial_capital', 1000.0)
+
+        self.leverage = config.get('leverage', 5)
+        self.risk_per_trade = config.get('risk_per_trade', 1.0)
+        self.daily_loss_limit = config.get('daily_loss_limit', 3.0)
+        self.max_daily_trades = config.get('max_daily_trades', 50)
+        self.cooldown_seconds = config.get('signal_cooldown_seconds', 120)
+        self.block_choppy = config.get('block_choppy_signals', False)
+        self.low_liquidity_hours = (set(config.get('low_liquidity_hours_utc', [0, 1, 2, 3]))
+                                    if config.get('avoid_low_liquidity_hours', False) else set())
+
+        self.engine = BitcoinScalpingEngine(config)
+
+    # ==================== Vectorized indicators ====================
+
+    def precompute(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """All indicators and price-action fields for every bar, same semantics as the live engine"""
+        eng = self.engine
+        closes = df['close'].to_numpy(dtype=float)
+        highs = df['high'].to_numpy(dtype=float)
+        lows = df['low'].to_numpy(dtype=float)
+        opens = df['open'].to_numpy(dtype=float)
+        volumes = df['volume'].to_numpy(dtype=float)
+
+        def ema_or_price(period):
+            ema = eng._calculate_ema(closes, period)
+            return np.where(~np.isnan(ema) & (ema > 0), ema, closes)
+
+        rsi = eng._calculate_rsi(closes, eng.rsi_period)
+        rsi = np.where(np.isnan(rsi), 50.0, np.clip(rsi, 0, 100))
+
+        stoch_k, stoch_d = eng._calculate_stochastic(highs, lows, closes, eng.stoch_period, eng.stoch_smooth)
+        stoch_k = np.where(np.isnan(stoch_k), 50.0, np.clip(stoch_k, 0, 100))
+        stoch_d = np.where(np.isnan(stoch_d), 50.0, np.clip(stoch_d, 0, 100))
+
+        volume_sma = eng._calculate_sma(volumes, eng.volume_ma_period)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = np.where(volume_sma > 0, volumes / volume_sma, 1.0)
+
+        atr = eng._calculate_atr(highs, lows, closes, eng.atr_period)
+        atr = np.where(~np.isnan(atr) & (atr > 0), atr, 0.0)
+
+        prev_close = np.concatenate([[np.nan], closes[:-1]])
+        close_5 = np.concatenate([np.full(5, np.nan), closes[:-5]])
+        roc_1 = np.nan_to_num((closes - prev_close) / prev_close * 100)
+        roc_5 = np.nan_to_num((closes - close_5) / close_5 * 100)
+
+        # Price action (_analyze_price_action): 10-bar support/resistance + 2-candle patterns
+        recent_high = pd.Series(highs).rolling(10, min_periods=1).max().to_numpy()
+        recent_low = pd.Series(lows).rolling(10, min_periods=1).min().to_numpy()
+        green = closes > opens
+        red = closes < opens
+        bullish = np.zeros(len(closes), dtype=bool)
+        bearish = np.zeros(len(closes), dtype=bool)
+        bullish[2:] = green[1:-1] & green[2:] & (lows[2:] > lows[1:-1])
+        bearish[2:] = red[1:-1] & red[2:] & (highs[2:] < highs[1:-1])
+
+        return {
+            'close': closes,
+            'ema_micro': ema_or_price(eng.ema_micro),
+            'ema_fast': ema_or_price(eng.ema_fast),
+            'ema_slow': ema_or_price(eng.ema_slow),
+            'rsi': rsi,
+            'stoch_k': stoch_k,
+            'stoch_d': stoch_d,
+            'volume_ratio': volume_ratio,
+            'atr': atr,
+            'atr_pct': np.where(closes > 0, atr / closes * 100, 0.0),
+            'roc_1': roc_1,
+            'roc_5': roc_5,
+            'price_change_pct': np.where(prev_close > 0, roc_1, 0.0),
+            'to_high_pct': (recent_high - closes) / closes * 100,
+            'to_low_pct': (closes - recent_low) / closes * 100,
+            'recent_high': recent_high,
+            'recent_low': recent_low,
+            'bullish_pattern': bullish,
+            'bearish_pattern': bearish,
+        }
+
+    def candidate_mask(self, ind: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Bars where at least one long/short condition in _generate_signals can be
+        true. Everything else can never produce a signal, so it is skipped.
+        """
+        eng = self.engine
+        r2 = lambda a: np.round(a, 2)
+        em, ef, es = r2(ind['ema_micro']), r2(ind['ema_fast']), r2(ind['ema_slow'])
+        rsi, k, d, vr = r2(ind['rsi']), r2(ind['stoch_k']), r2(ind['stoch_d']), r2(ind['volume_ratio'])
+        close = ind['close']
+
+        trend_strength = np.abs(em - es) / close > 0.001
+        volume_ok = vr > eng.min_volume_ratio
+        near_support = ind['to_low_pct'] < 0.2
+        near_resistance = ind['to_high_pct'] < 0.2
+
+        long_ok = (((em > ef) & (ef > es) & trend_strength & (k > d) & (k < 80) & volume_ok)
+                   | ((rsi < eng.rsi_oversold) & near_support)
+                   | ((em > ef) & (vr > 1.5)))
+        short_ok = (((em < ef) & (ef < es) & trend_strength & (k < d) & (k > 20) & volume_ok)
+                    | ((rsi > eng.rsi_overbought) & near_resistance)
+                    | ((em < ef) & (vr > 1.5)))
+        return long_ok | short_ok
+
+    def _bar_inputs(self, ind: Dict[str, np.ndarray], i: int):
+        """indicators / price_action dicts for bar i, rounded like the live engine"""
+        indicators = {
+            'ema_micro': round(float(ind['ema_micro'][i]), 2),
+            'ema_fast': round(float(ind['ema_fast'][i]), 2),
+            'ema_slow': round(float(ind['ema_slow'][i]), 2),
+            'rsi': round(float(ind['rsi'][i]), 2),
+            'stoch_k': round(float(ind['stoch_k'][i]), 2),
+            'stoch_d': round(float(ind['stoch_d'][i]), 2),
+            'volume_ratio': round(float(ind['volume_ratio'][i]), 2),
+            'volume_spike': bool(ind['volume_ratio'][i] > 2.0),
+            'atr': round(float(ind['atr'][i]), 2),
+            'atr_pct': round(float(ind['atr_pct'][i]), 3),
+            'roc_1': round(float(ind['roc_1'][i]), 3),
+            'roc_5': round(float(ind['roc_5'][i]), 3),
+        }
+        price_action = {
+            'price_change_pct': round(float(ind['price_change_pct'][i]), 3),
+            'near_resistance': bool(ind['to_high_pct'][i] < 0.2),
+            'near_support': bool(ind['to_low_pct'][i] < 0.2),
+            'bullish_pattern': bool(ind['bullish_pattern'][i]),
+            'bearish_pattern': bool(ind['bearish_pattern'][i]),
+            'recent_high': round(float(ind['recent_high'][i]), 2),
+            'recent_low': round(float(ind['recent_low'][i]), 2),
+        }
+        return indicators, price_action
+
+    def _signals_at(self, ind: Dict[str, np.ndarray], i: int) -> Dict:
+        """analyze_market() for the window ending at bar i (regime filter included)"""
+        eng = self.engine
+        indicators, price_action = self._bar_inputs(ind, i)
+        regime = eng._detect_market_regime(indicators, price_action)
+
+        if self.block_choppy and regime == 'choppy':
+            return {}
+
+        signals = eng._generate_signals(
+            current_price=float(ind['close'][i]),
+            indicators=indicators,
+            price_action=price_action
+        )
+        if regime == 'choppy':
+            for s in signals.values():
+                s['confidence'] *= 0.7
+        elif regime == 'ranging':
+            for s in signals.values():
+                s['confidence'] *= 0.9
+        for s in signals.values():
+            s['regime'] = regime
+        return signals
+
+    # ==================== Replay ====================
+
+    def run(self, df: pd.DataFrame) -> ReplayResult:
+        """Replay the full candle history. df: timestamp (ms), open, high, low, close, volume"""
+        started = time.monotonic()
+
+        # Fresh engine per run so the confidence-learning state starts empty
+        self.engine = BitcoinScalpingEngine(self.config)
+        eng = self.engine
+
+        n = len(df)
+        ts = df['timestamp'].to_numpy(dtype='int64')
+        opens = df['open'].to_numpy(dtype=float)
+        highs = df['high'].to_numpy(dtype=float)
+        lows = df['low'].to_numpy(dtype=float)
+        closes = df['close'].to_numpy(dtype=float)
+        bar_ms = int(np.median(np.diff(ts))) if n > 1 else 60_000
+
+        ind = self.precompute(df)
+
+        # analyze_market's minimum window, then the vectorized pre-filter
+        min_periods = max(eng.ema_slow, eng.rsi_period, eng.volume_ma_period, eng.stoch_period) + 10
+        mask = self.candidate_mask(ind)
+        mask[:min(min_periods - 1, n)] = False
+        mask[-1:] = False   # needs a next bar to fill
+        if self.low_liquidity_hours:
+            # Signals are checked at the bar close
+            hours = ((ts + bar_ms) // 3_600_000) % 24
+            mask &= ~np.isin(hours, list(self.low_liquidity_hours))
+        candidates = np.flatnonzero(mask)
+
+        balance = self.initial_capital
+        trades: List[Dict] = []
+        last_signal_ms = {}
+        day = None
+        day_start_balance = balance
+        day_trades = 0
+        evaluated = suppressed = 0
+        next_free = 0   # first bar at which we are flat again
+
+        for i in candidates:
+            if i < next_free:
+                continue
+
+            close_ms = int(ts[i]) + bar_ms
+            bar_day = close_ms // 86_400_000
+            if bar_day != day:
+                day, day_start_balance, day_trades = bar_day, balance, 0
+
+            # Risk limits (RiskManager / max_daily_trades)
+            if day_trades >= self.max_daily_trades:
+                continue
+            if balance - day_start_balance <= -day_start_balance * self.daily_loss_limit / 100:
+                continue
+
+            signals = self._signals_at(ind, i)
+            evaluated += 1
+            if not signals:
+                continue
+
+            # Per-side cooldown (ScalpingSignalGenerator._apply_cooldown_filter)
+            accepted = {}
+            for side in ('long', 'short'):
+                if side not in signals:
+                    continue
+                last = last_signal_ms.get(side)
+                if last is None or (close_ms - last) / 1000 >= self.cooldown_seconds:
+                    accepted[side] = signals[side]
+                    last_signal_ms[side] = close_ms
+                else:
+                    suppressed += 1
+            if not accepted:
+                continue
+
+            side = 'long' if 'long' in accepted else 'short'
+            signal = accepted[side]
+            trade = self._simulate_trade(i, side, signal, balance, ts, opens, highs, lows, closes, bar_ms)
+            if trade is None:
+                continue
+
+            balance += trade['pnl']
+            trade['balance'] = balance
+            trades.append(trade)
+            day_trades += 1
+            next_free = trade['exit_bar']
+
+            eng.record_trade({
+                'side': side,
+                'entry_price': trade['entry_price'],
+                'exit_price': trade['exit_price'],
+                'pnl': trade['pnl'],
+                'confidence': signal['confidence'],
+            })
+
+        equity = pd.Series(
+            [self.initial_capital] + [t['balance'] for t in trades],
+            index=pd.to_datetime([int(ts[0]) if n else 0] + [t['exit_time'] for t in trades], unit='ms', utc=True),
+            name='balance'
+        )
+
+        elapsed = time.monotonic() - started
+        stats = self._stats(trades, equity, n, elapsed)
+        stats.update({
+            'bars_with_candidate_conditions': int(len(candidates)),
+            'signals_evaluated': evaluated,
+            'signals_cooldown_suppressed': suppressed,
+        })
+        return ReplayResult(trades=trades, equity=equity, stats=stats)
+
+    def _simulate_trade(self, i, side, signal, balance, ts, opens, highs, lows, closes, bar_ms) -> Optional[Dict]:
+        """Enter at bar i+1 open, walk forward until SL, TP or time exit"""
+        n = len(closes)
+        e = i + 1
+        direction = 1 if side == 'long' else -1
+        entry = opens[e] * (1 + direction * self.slippage_pct)
+        sl, tp = signal['stop_loss'], signal['take_profit']
+
+        stop_distance = abs(entry - sl)
+        if stop_distance <= 0 or balance <= 0:
+            return None
+
+        # Risk-based size, margin capped at 90% of balance (live_trader's safety check)
+        quantity = (balance * self.risk_per_trade / 100) / stop_distance
+        max_notional = balance * 0.9 * self.leverage
+        quantity = min(quantity, max_notional / entry)
+
+        max_hold_ms = self.engine.max_position_time * 1000
+        entry_ms = int(ts[e])
+        exit_price = exit_reason = None
+
+        j = e
+        while j < n:
+            o, h, l = opens[j], highs[j], lows[j]
+            if direction == 1:
+                if l <= sl:
+                    exit_price, exit_reason = (o if o <= sl else sl), 'stop_loss'
+                elif h >= tp:
+                    exit_price, exit_reason = (o if o >= tp else tp), 'take_profit'
+            else:
+                if h >= sl:
+                    exit_price, exit_reason = (o if o >= sl else sl), 'stop_loss'
+                elif l <= tp:
+                    exit_price, exit_reason = (o if o <= tp else tp), 'take_profit'
+            if exit_price is not None:
+                break
+            if int(ts[j]) + bar_ms - entry_ms >= max_hold_ms:
+                exit_price, exit_reason = closes[j], 'time_exit'
+                break
+            j += 1
+
+        if exit_price is None:
+            j = n - 1
+            exit_price, exit_reason = closes[j], 'end_of_data'
+
+        if exit_reason != 'take_profit':
+            # Market exits slip against us; TP is a resting limit order
+            exit_price *= 1 - direction * self.slippage_pct
+        gross = (exit_price - entry) * quantity * direction
+        fees = (entry + exit_price) * quantity * self.fee_rate
+        exit_ms = int(ts[j]) + bar_ms
+
+        return {
+            'side': side.upper(),
+            'entry_time': entry_ms,
+            'exit_time': exit_ms,
+            'entry_price': round(entry, 2),
+            'exit_price': round(exit_price, 2),
+            'stop_loss': sl,
+            'take_profit': tp,
+            'quantity': quantity,
+            'confidence': signal['confidence'],
+            'conditions': ','.join(signal.get('conditions', [])),
+            'regime': signal.get('regime'),
+            'gross_pnl': gross,
+            'fees': fees,
+            'pnl': gross - fees,
+            'exit_reason': exit_reason,
+            'hold_seconds': (exit_ms - entry_ms) / 1000,
+            'exit_bar': j,
+        }
+
+    def _stats(self, trades: List[Dict], equity: pd.Series, bars: int, elapsed: float) -> Dict:
+        pnls = np.array([t['pnl'] for t in trades])
+        wins = pnls[pnls > 0]
+        losses = pnls[pnls <= 0]
+        peak = equity.cummax()
+        drawdown = ((peak - equity) / peak * 100).max() if len(equity) else 0.0
+        final = float(equity.iloc[-1]) if len(equity) else self.initial_capital
+
+        exit_reasons = {}
+        for t in trades:
+            exit_reasons[t['exit_reason']] = exit_reasons.get(t['exit_reason'], 0) + 1
+
+        return {
+            'bars': bars,
+            'elapsed_seconds': round(elapsed, 3),
+            'bars_per_second': round(bars / elapsed) if elapsed > 0 else 0,
+            'total_trades': len(trades),
+            'wins': int(len(wins)),
+            'losses': int(len(losses)),
+            'win_rate': round(len(wins) / len(trades) * 100, 2) if trades else 0.0,
+            'gross_pnl': round(float(sum(t['gross_pnl'] for t in trades)), 2),
+            'fees': round(float(sum(t['fees'] for t in trades)), 2),
+            'net_pnl': round(float(pnls.sum()), 2) if trades else 0.0,
+            'return_pct': round((final - self.initial_capital) / self.initial_capital * 100, 2),
+            'final_balance': round(final, 2),
+            'max_drawdown_pct': round(float(drawdown), 2),
+            'profit_factor': round(float(wins.sum() / abs(losses.sum())), 2) if losses.sum() < 0 else 0.0,
+            'avg_pnl': round(float(pnls.mean()), 4) if trades else 0.0,
+            'avg_hold_seconds': round(float(np.mean([t['hold_seconds'] for t in trades])), 1) if trades else 0.0,
+            'exit_reasons': exit_reasons,
+        }
@@ -6,6 +6,7 @@ Implements EMA, RSI, Stochastic, and Volume-based scalping signals
 
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import logging
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
@@ -541,18 +542,18 @@ class BitcoinScalpingEngine:
 
     def _calculate_stochastic(self, highs: np.ndarray, lows: np.ndarray,
                              closes: np.ndarray, period: int, smooth: int) -> Tuple[np.ndarray, np.ndarray]:
-        """Calculate Stochastic Oscillator"""
+        """Calculate Stochastic Oscillator (vectorized rolling high/low over sliding windows)"""
 
-        stoch_k = np.zeros_like(closes)
+        stoch_k = np.zeros_like(closes, dtype=float)
 
-        for i in range(period-1, len(closes)):
-            highest_high = np.max(highs[i-period+1:i+1])
-            lowest_low = np.min(lows[i-period+1:i+1])
+        if len(closes) >= period:
+            highest_high = sliding_window_view(highs, period).max(axis=1)
+            lowest_low = sliding_window_view(lows, period).min(axis=1)
+            price_range = highest_high - lowest_low
 
-            if highest_high - lowest_low != 0:
-                stoch_k[i] = 100 * (closes[i] - lowest_low) / (highest_high - lowest_low)
-            else:
-                stoch_k[i] = 50
+            with np.errstate(divide='ignore', invalid='ignore'):
+                k = 100 * (closes[period-1:] - lowest_low) / price_range
+            stoch_k[period-1:] = np.where(price_range != 0, k, 50)
 
         # Smooth %K to get %D
         stoch_d = self._calculate_sma(stoch_k, smooth)
@@ -563,15 +564,17 @@ class BitcoinScalpingEngine:
 
     def _calculate_atr(self, highs: np.ndarray, lows: np.ndarray,
                        closes: np.ndarray, period: int) -> np.ndarray:
-        """Calculate Average True Range"""
+        """Calculate Average True Range (vectorized true range)"""
 
         tr = np.zeros(len(closes))
 
-        for i in range(1, len(closes)):
-            hl = highs[i] - lows[i]
-            hc = abs(highs[i] - closes[i-1])
-            lc = abs(lows[i] - closes[i-1])
-            tr[i] = max(hl, hc, lc)
+        if len(closes) > 1:
+            prev_closes = closes[:-1]
+            tr[1:] = np.maximum.reduce([
+                highs[1:] - lows[1:],
+                np.abs(highs[1:] - prev_closes),
+                np.abs(lows[1:] - prev_closes)
+            ])
 
         atr = self._calculate_sma(tr, period)
         atr = np.nan_to_num(atr, nan=tr[period:].mean() if len(tr) > period else 0)
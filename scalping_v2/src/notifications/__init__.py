@@ -2,6 +2,6 @@
 Notification module for Scalping Bot v2.0
 """
 
-from .email_notifier import ScalpingEmailNotifier
+from .email_notifier import ScalpingEmailNotifier, EmailOutbox
 
-__all__ = ['ScalpingEmailNotifier']
+__all__ = ['ScalpingEmailNotifier', 'EmailOutbox']
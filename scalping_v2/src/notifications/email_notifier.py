@@ -4,14 +4,21 @@ Scalping Bot v2.0 Email Notification System
 Sends email alerts when high-confidence trading signals are detected
 """
 
-import smtplib
 import logging
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 import json
+import importlib.util
+from pathlib import Path
 from typing import Dict, Optional
 
+# Shared outbox (lp_hedge_backtest/src/notifications/outbox.py). Loaded by path:
+# this bot's own `src` package would shadow the LP package's `src`.
+_outbox_spec = importlib.util.spec_from_file_location(
+    'lp_outbox', Path(__file__).resolve().parents[3] / 'lp_hedge_backtest' / 'src' / 'notifications' / 'outbox.py')
+_lp_outbox = importlib.util.module_from_spec(_outbox_spec)
+_outbox_spec.loader.exec_module(_lp_outbox)
+EmailOutbox = _lp_outbox.EmailOutbox
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,6 +60,9 @@ class ScalpingEmailNotifier:
         self.send_on_trade_close = config.get('send_on_trade_close', True)
         self.send_on_error = config.get('send_on_error', False)
 
+        # Delivery happens on a background worker with a reused SMTP session
+        recipients = [r.strip() for r in self.recipient_email.split(',')]
+        self.outbox = EmailOutbox(config, recipients)
         self.enabled = True
 
     def should_send_email(self, email_type: str) -> bool:
@@ -107,7 +117,7 @@ class ScalpingEmailNotifier:
 
             if success:
                 self.last_email_time[f'signal_{side}'] = datetime.now().timestamp()
-                logger.info(f"✅ Signal notification sent: {side} {confidence:.1f}%")
+                logger.info(f"✅ Signal notification queued: {side} {confidence:.1f}%")
 
             return success
 
@@ -277,7 +287,7 @@ Bitcoin Scalping Bot v2.0
 
             if success:
                 self.last_email_time[f'trade_{trade_type}'] = datetime.now().timestamp()
-                logger.info(f"✅ Trade {trade_type} notification sent")
+                logger.info(f"✅ Trade {trade_type} notification queued")
 
             return success
 
@@ -286,38 +296,8 @@ Bitcoin Scalping Bot v2.0
             return False
 
     def _send_email(self, subject: str, body: str) -> bool:
-        """Send email via SMTP"""
-        try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = self.sender_email
-            msg['To'] = self.recipient_email
-            msg['Subject'] = subject
-
-            msg.attach(MIMEText(body, 'plain'))
-
-            # Create SMTP session
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-
-            if self.smtp_use_tls:
-                server.starttls()
-
-            # Login
-            if self.smtp_username and self.smtp_password:
-                server.login(self.smtp_username, self.smtp_password)
-
-            # Send email
-            server.sendmail(self.sender_email, self.recipient_email, msg.as_string())
-            server.quit()
-
-            return True
-
-        except smtplib.SMTPException as e:
-            logger.error(f"SMTP error: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"Email error: {e}")
-            return False
+        """Queue an email for the outbox worker; returns without waiting on SMTP"""
+        return self.outbox.send(subject, body)
 
     def send_test_email(self) -> bool:
         """Send test email to verify configuration"""
@@ -345,7 +325,8 @@ Bitcoin Scalping Bot v2.0
 Paper Trading Mode
 """
 
-        return self._send_email(subject, body)
+        # The test waits for actual delivery so configuration errors surface
+        return self._send_email(subject, body) and self.outbox.flush(timeout=120)
 
 
 # CLI interface for testing
@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """
 Bot Health Monitor - Checks bot health beyond just process running
+
+Importable: bot_supervisor calls get_all_bot_health() in-process. Service
+state for every bot comes from one `systemctl show` call, and the per-bot
+DB/log/circuit-breaker checks run concurrently in a thread pool.
 """
 
 import sys
@@ -8,43 +12,82 @@ import os
 import json
 import subprocess
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-
-
-def check_bot_health(bot_key):
-    """Check if bot is healthy"""
-
-    TRADING_ROOT = Path("/var/www/dev/trading")
-
-    bots_config = {
-        'scalping_v2': {
-            'service': 'scalping-trading-bot',
-            'db': TRADING_ROOT / 'scalping_v2' / 'data' / 'trades.db',
-            'log': TRADING_ROOT / 'scalping_v2' / 'logs' / 'live_trading.log'
-        },
-        'adx_v2': {
-            'service': 'adx-trading-bot.service',
-            'db': TRADING_ROOT / 'adx_strategy_v2' / 'data' / 'trades.db',
-            'log': TRADING_ROOT / 'adx_strategy_v2' / 'logs' / 'live_trading.log'
-        }
+from typing import Dict, List, Optional, Tuple
+
+from circuit_breaker_checker import check_circuit_breaker
+
+TRADING_ROOT = Path("/var/www/dev/trading")
+
+BOTS_CONFIG = {
+    'scalping_v2': {
+        'service': 'scalping-trading-bot',
+        'db': TRADING_ROOT / 'scalping_v2' / 'data' / 'trades.db',
+        'log': TRADING_ROOT / 'scalping_v2' / 'logs' / 'live_trading.log'
+    },
+    'adx_v2': {
+        'service': 'adx-trading-bot.service',
+        'db': TRADING_ROOT / 'adx_strategy_v2' / 'data' / 'trades.db',
+        'log': TRADING_ROOT / 'adx_strategy_v2' / 'logs' / 'live_trading.log'
     }
+}
 
-    if bot_key not in bots_config:
-        print(json.dumps({'error': f'Unknown bot: {bot_key}'}))
-        return 1
+LOG_TAIL_LINES = 100
+LOG_TAIL_BYTES = 64 * 1024   # enough for 100 log lines without reading the whole file
 
-    bot = bots_config[bot_key]
-    issues = []
 
+def get_service_states(services: List[str]) -> Dict[str, Tuple[bool, Optional[str]]]:
+    """
+    Query all services with a single `systemctl show` call.
+    Returns {service: (active, main_pid)}; main_pid is None when there is none.
+    """
+    states = {service: (False, None) for service in services}
     try:
-        # 1. Check if service is running
         result = subprocess.run(
-            ['systemctl', 'is-active', bot['service']],
+            ['systemctl', 'show', *services, '--property=ActiveState,MainPID'],
             capture_output=True,
-            text=True
+            text=True,
+            timeout=10
         )
-        running = result.stdout.strip() == 'active'
+    except Exception:
+        return states
+
+    # One block of KEY=VALUE lines per unit, in argument order, separated by blank lines
+    blocks = [b for b in result.stdout.strip().split('\n\n') if b.strip()]
+    for service, block in zip(services, blocks):
+        props = dict(line.split('=', 1) for line in block.splitlines() if '=' in line)
+        pid = props.get('MainPID')
+        states[service] = (props.get('ActiveState') == 'active', pid if pid and pid != '0' else None)
+    return states
+
+
+def _tail(path: Path, lines: int = LOG_TAIL_LINES) -> str:
+    """Return the last `lines` lines of a file without spawning tail"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - LOG_TAIL_BYTES))
+        data = f.read().decode('utf-8', errors='replace')
+    return '\n'.join(data.splitlines()[-lines:])
+
+
+def get_bot_health(bot_key: str, service_state: Tuple[bool, Optional[str]] = None) -> Dict:
+    """
+    Check if bot is healthy. `service_state` is (active, main_pid) from
+    get_service_states(); it is queried for this bot alone when omitted.
+    """
+    if bot_key not in BOTS_CONFIG:
+        return {'error': f'Unknown bot: {bot_key}'}
+
+    bot = BOTS_CONFIG[bot_key]
+    issues = []
+
+    try:
+        # 1. Check if service is running
+        if service_state is None:
+            service_state = get_service_states([bot['service']])[bot['service']]
+        running, pid = service_state
 
         if not running:
             issues.append("Service not active")
@@ -82,13 +125,7 @@ def check_bot_health(bot_key):
         # 3. Check for error patterns in recent logs
         if bot['log'].exists():
             try:
-                # Read last 100 lines
-                result = subprocess.run(
-                    ['tail', '-100', str(bot['log'])],
-                    capture_output=True,
-                    text=True
-                )
-                log_content = result.stdout.lower()
+                log_content = _tail(bot['log']).lower()
 
                 # Check for error indicators
                 if 'traceback' in log_content or 'exception' in log_content:
@@ -99,45 +136,20 @@ def check_bot_health(bot_key):
             except Exception as e:
                 issues.append(f"Log check error: {str(e)}")
 
-        # 4. Check if process is consuming CPU (not frozen)
+        # 4. Check if process exists (not frozen)
         if running:
-            try:
-                # Get service PID
-                result = subprocess.run(
-                    ['systemctl', 'show', bot['service'], '--property=MainPID'],
-                    capture_output=True,
-                    text=True
-                )
-                pid_line = result.stdout.strip()
-                pid = pid_line.split('=')[1]
-
-                if pid and pid != '0':
-                    # Check if process exists
-                    result = subprocess.run(
-                        ['ps', '-p', pid],
-                        capture_output=True
-                    )
-                    if result.returncode != 0:
-                        issues.append("Process PID not found")
-                else:
-                    issues.append("No valid PID")
-
-            except Exception as e:
-                issues.append(f"Process check error: {str(e)}")
+            if not pid:
+                issues.append("No valid PID")
+            elif not os.path.exists(f"/proc/{pid}"):
+                issues.append("Process PID not found")
 
         # 5. Check circuit breaker status
         circuit_breaker_info = None
         try:
-            # Call circuit breaker checker
-            result = subprocess.run(
-                [sys.executable, str(TRADING_ROOT / 'supervisor' / 'circuit_breaker_checker.py'), bot_key],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            cb = check_circuit_breaker(bot_key)
 
-            if result.returncode == 0:
-                circuit_breaker_info = json.loads(result.stdout)
+            if not cb.get('error'):
+                circuit_breaker_info = cb
 
                 # Add issue if circuit breaker is active
                 if circuit_breaker_info.get('circuit_breaker_active'):
@@ -151,7 +163,7 @@ def check_bot_health(bot_key):
         # Determine health
         healthy = len(issues) == 0
 
-        health_report = {
+        return {
             'timestamp': datetime.now().isoformat(),
             'bot_key': bot_key,
             'running': running,
@@ -161,11 +173,8 @@ def check_bot_health(bot_key):
             'circuit_breaker': circuit_breaker_info
         }
 
-        print(json.dumps(health_report))
-        return 0
-
     except Exception as e:
-        error_report = {
+        return {
             'timestamp': datetime.now().isoformat(),
             'bot_key': bot_key,
             'running': False,
@@ -173,8 +182,26 @@ def check_bot_health(bot_key):
             'last_update': None,
             'issues': [f"Health check failed: {str(e)}"]
         }
-        print(json.dumps(error_report))
-        return 1
+
+
+def get_all_bot_health(bot_keys: List[str]) -> Dict[str, Dict]:
+    """Health for several bots: one systemctl query, per-bot checks run concurrently"""
+    known = [k for k in bot_keys if k in BOTS_CONFIG]
+    states = get_service_states([BOTS_CONFIG[k]['service'] for k in known])
+
+    with ThreadPoolExecutor(max_workers=max(1, len(bot_keys))) as pool:
+        futures = {
+            k: pool.submit(get_bot_health, k, states.get(BOTS_CONFIG[k]['service']) if k in BOTS_CONFIG else None)
+            for k in bot_keys
+        }
+        return {k: f.result() for k, f in futures.items()}
+
+
+def check_bot_health(bot_key):
+    """CLI entry point: print health as JSON, exit 1 on failure"""
+    health = get_bot_health(bot_key)
+    print(json.dumps(health))
+    return 1 if 'error' in health or any(i.startswith('Health check failed') for i in health['issues']) else 0
 
 
 if __name__ == '__main__':
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 """
 Bot Supervisor - Master orchestrator for trading bots
-Runs via cron to check market conditions, bot health, and manage states
+Runs via cron to check market conditions, bot health, and manage states,
+or as one long-lived process with --daemon (checks run in-process, the
+HTTP session and candle history stay warm between cycles)
 
 Author: Trading System
 Created: 2025-11-10
@@ -12,6 +14,7 @@ import os
 import json
 import logging
 import subprocess
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
@@ -21,6 +24,13 @@ TRADING_ROOT = Path("/var/www/dev/trading")
 SUPERVISOR_LOG = TRADING_ROOT / "supervisor" / "logs" / "supervisor.log"
 SUPERVISOR_LOG.parent.mkdir(parents=True, exist_ok=True)
 
+SUPERVISE_INTERVAL = 15 * 60   # seconds between cycles in --daemon mode (matches cron)
+REPORT_HOUR = 8                # daily report hour in --daemon mode (matches cron)
+
+from market_condition_checker import CandleCache, get_market_conditions
+from bot_health_monitor import get_bot_health, get_all_bot_health
+from state_manager import cleanup_bot_state
+
 # Import email notifier
 try:
     from supervisor_email_notifier import SupervisorEmailNotifier
@@ -57,6 +67,9 @@ class BotSupervisor:
         else:
             self.email_notifier = None
 
+        # Candle history kept between cycles — only new candles are downloaded
+        self.candle_cache = CandleCache()
+
         self.bots = {
             'scalping_v2': {
                 'name': 'Scalping v2',
@@ -91,29 +104,16 @@ class BotSupervisor:
         """
         logger.info("🔍 Checking market conditions...")
 
-        try:
-            # Run market condition checker
-            result = subprocess.run(
-                [sys.executable, str(self.trading_root / 'supervisor' / 'market_condition_checker.py')],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            if result.returncode == 0:
-                conditions = json.loads(result.stdout)
-                logger.info(f"   Market Regime: {conditions['regime']}")
-                logger.info(f"   ADX: {conditions['adx']:.2f}")
-                logger.info(f"   BTC Price: ${conditions['btc_price']:,.2f}")
-                logger.info(f"   Tradeable: {conditions['tradeable']}")
-                return conditions
-            else:
-                logger.error(f"Market check failed: {result.stderr}")
-                return {'tradeable': False, 'regime': 'unknown', 'adx': 0, 'volatility': 0, 'btc_price': 0}
+        conditions = get_market_conditions(self.candle_cache)
 
-        except Exception as e:
-            logger.error(f"Error checking market conditions: {e}")
-            return {'tradeable': False, 'regime': 'unknown', 'adx': 0, 'volatility': 0, 'btc_price': 0}
+        if 'error' not in conditions:
+            logger.info(f"   Market Regime: {conditions['regime']}")
+            logger.info(f"   ADX: {conditions['adx']:.2f}")
+            logger.info(f"   BTC Price: ${conditions['btc_price']:,.2f}")
+            logger.info(f"   Tradeable: {conditions['tradeable']}")
+        else:
+            logger.error(f"Market check failed: {conditions['error']}")
+        return conditions
 
     def check_bot_health(self, bot_key: str) -> Dict:
         """
@@ -128,29 +128,21 @@ class BotSupervisor:
         bot = self.bots[bot_key]
         logger.info(f"🏥 Checking health: {bot['name']}...")
 
-        try:
-            # Run bot health monitor
-            result = subprocess.run(
-                [sys.executable, str(self.trading_root / 'supervisor' / 'bot_health_monitor.py'), bot_key],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            if result.returncode == 0:
-                health = json.loads(result.stdout)
-                logger.info(f"   Running: {health['running']}")
-                logger.info(f"   Healthy: {health['healthy']}")
-                if health['issues']:
-                    logger.warning(f"   Issues: {', '.join(health['issues'])}")
-                return health
-            else:
-                logger.error(f"Health check failed: {result.stderr}")
-                return {'running': False, 'healthy': False, 'last_update': None, 'issues': ['Health check failed']}
+        health = get_bot_health(bot_key)
+        self._log_health(health)
+        return health
 
-        except Exception as e:
-            logger.error(f"Error checking bot health: {e}")
-            return {'running': False, 'healthy': False, 'last_update': None, 'issues': [str(e)]}
+    def check_all_bots_health(self) -> Dict[str, Dict]:
+        """Health for every bot, checked concurrently"""
+        logger.info(f"🏥 Checking health: {', '.join(b['name'] for b in self.bots.values())}...")
+        return get_all_bot_health(list(self.bots.keys()))
+
+    @staticmethod
+    def _log_health(health: Dict):
+        logger.info(f"   Running: {health['running']}")
+        logger.info(f"   Healthy: {health['healthy']}")
+        if health['issues']:
+            logger.warning(f"   Issues: {', '.join(health['issues'])}")
 
     def restart_bot(self, bot_key: str, reason: str) -> bool:
         """Restart a bot service"""
@@ -206,18 +198,10 @@ class BotSupervisor:
         logger.info(f"🧹 Cleaning up state: {bot['name']}...")
 
         try:
-            # Run state manager
-            result = subprocess.run(
-                [sys.executable, str(self.trading_root / 'supervisor' / 'state_manager.py'), bot_key, '--cleanup'],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            if result.returncode == 0:
+            if cleanup_bot_state(bot_key) == 0:
                 logger.info(f"   State cleanup completed")
             else:
-                logger.warning(f"   State cleanup had issues: {result.stderr}")
+                logger.warning(f"   State cleanup had issues")
 
         except Exception as e:
             logger.error(f"Error cleaning up state: {e}")
@@ -298,7 +282,10 @@ class BotSupervisor:
         # 1. Check market conditions
         market_conditions = self.check_market_conditions()
 
-        # 2. Check each bot
+        # 2. Check all bots' health concurrently
+        all_health = self.check_all_bots_health()
+
+        # 3. Decide per bot
         for bot_key, bot in self.bots.items():
             logger.info(f"\n--- {bot['name']} ---")
 
@@ -306,8 +293,8 @@ class BotSupervisor:
             should_run, reason = self.should_bot_run(bot_key, market_conditions)
             logger.info(f"Should run: {should_run} - {reason}")
 
-            # Check bot health
-            health = self.check_bot_health(bot_key)
+            health = all_health[bot_key]
+            self._log_health(health)
 
             # Decision logic
             if should_run:
@@ -357,8 +344,7 @@ class BotSupervisor:
             'bots': {}
         }
 
-        for bot_key in self.bots.keys():
-            report['bots'][bot_key] = self.check_bot_health(bot_key)
+        report['bots'] = self.check_all_bots_health()
 
         # Save report
         report_file = self.trading_root / 'supervisor' / 'reports' / f"report_{datetime.now().strftime('%Y%m%d')}.json"
@@ -378,6 +364,25 @@ class BotSupervisor:
             except Exception as e:
                 logger.warning(f"   Failed to send email report: {e}")
 
+    def run_forever(self, interval: int = SUPERVISE_INTERVAL):
+        """Long-lived scheduler: supervise every `interval` seconds, report once a day"""
+        logger.info(f"🤖 Supervisor daemon started - cycle every {interval}s, report at {REPORT_HOUR:02d}:00")
+        last_report_day = None
+
+        while True:
+            started = time.monotonic()
+            try:
+                self.supervise()
+
+                now = datetime.now()
+                if now.hour >= REPORT_HOUR and last_report_day != now.date():
+                    self.generate_report()
+                    last_report_day = now.date()
+            except Exception as e:
+                logger.error(f"Supervision cycle failed: {e}")
+
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
 
 def main():
     """Main entry point"""
@@ -392,6 +397,9 @@ def main():
         elif command == '--check-market':
             conditions = supervisor.check_market_conditions()
             print(json.dumps(conditions, indent=2))
+        elif command == '--daemon':
+            interval = int(sys.argv[2]) if len(sys.argv) > 2 else SUPERVISE_INTERVAL
+            supervisor.run_forever(interval)
         elif command == '--restart':
             if len(sys.argv) > 2:
                 bot_key = sys.argv[2]
@@ -399,7 +407,7 @@ def main():
             else:
                 print("Usage: bot_supervisor.py --restart <bot_key>")
         else:
-            print("Unknown command. Use: --report, --check-market, or --restart <bot_key>")
+            print("Unknown command. Use: --report, --check-market, --daemon [interval], or --restart <bot_key>")
     else:
         # Default: run supervision cycle
         supervisor.supervise()
@@ -2,116 +2,128 @@
 """
 Market Condition Checker - Analyzes if market is tradeable
 Returns JSON with market conditions
+
+Importable: bot_supervisor calls get_market_conditions() in-process and keeps
+one CandleCache and regime detector alive between cycles; running this file
+prints the JSON.
 """
 
 import sys
 import os
+import math
+from pathlib import Path
 sys.path.insert(0, '/var/www/dev/trading/adx_strategy_v2')
+# Shared regime detector lives in the LP backtest package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'lp_hedge_backtest'))
 
 import json
 import requests
 from datetime import datetime
-import pandas as pd
-import numpy as np
 
+from src.indicators.regime import RegimeService
 
-def check_market_conditions():
-    """Check current market conditions"""
 
-    try:
-        # Fetch BTC-USDT data from BingX
-        url = "https://open-api.bingx.com/openApi/swap/v2/quote/klines"
-        params = {
-            'symbol': 'BTC-USDT',
-            'interval': '5m',
-            'limit': 100
-        }
+BINGX_KLINES_URL = "https://open-api.bingx.com/openApi/swap/v2/quote/klines"
+
+# Shared keep-alive session — the long-lived supervisor reuses one TLS connection
+_session = requests.Session()
+
+
+class CandleCache:
+    """
+    Rolling candle history for one symbol.
 
-        response = requests.get(url, params=params, timeout=10)
+    The first refresh() downloads `limit` candles; later calls only request
+    candles from the last cached open time onwards (the still-forming candle
+    plus anything that closed since), then trim back to `limit`.
+    """
+
+    def __init__(self, symbol: str = 'BTC-USDT', interval: str = '5m', limit: int = 100,
+                 session: requests.Session = None):
+        self.symbol = symbol
+        self.interval = interval
+        self.limit = limit
+        self.session = session or _session
+        self.candles = {}   # open time (ms) → candle dict
+
+    def _fetch(self, start_time: int = None) -> list:
+        params = {'symbol': self.symbol, 'interval': self.interval, 'limit': self.limit}
+        if start_time is not None:
+            params['startTime'] = start_time
+
+        response = self.session.get(BINGX_KLINES_URL, params=params, timeout=10)
         data = response.json()
 
         if data.get('code') != 0:
             raise Exception(f"API error: {data}")
 
-        # Parse candles
-        candles = []
-        for candle in data['data']:
-            candles.append({
-                'timestamp': candle['time'],
-                'open': float(candle['open']),
-                'high': float(candle['high']),
-                'low': float(candle['low']),
-                'close': float(candle['close']),
-                'volume': float(candle['volume'])
-            })
-
-        df = pd.DataFrame(candles)
-
-        # Calculate ADX (simplified)
-        def calculate_adx(df, period=14):
-            high = df['high']
-            low = df['low']
-            close = df['close']
-
-            # True Range
-            tr1 = high - low
-            tr2 = abs(high - close.shift())
-            tr3 = abs(low - close.shift())
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            atr = tr.rolling(period).mean()
-
-            # Directional Movement
-            up_move = high - high.shift()
-            down_move = low.shift() - low
-
-            plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0)
-            minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0)
-
-            plus_di = 100 * (pd.Series(plus_dm).rolling(period).mean() / atr)
-            minus_di = 100 * (pd.Series(minus_dm).rolling(period).mean() / atr)
-
-            # ADX
-            dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-            adx = dx.rolling(period).mean()
-
-            return adx.iloc[-1] if len(adx) > 0 else 0
-
-        adx_value = calculate_adx(df)
-
-        # Calculate volatility
-        returns = df['close'].pct_change()
-        volatility = returns.std() * 100  # as percentage
-
-        # Current price
-        current_price = df['close'].iloc[-1]
-
-        # Determine market regime
-        if adx_value > 25:
-            regime = 'trending'
-            tradeable = True
-        elif volatility < 0.5:
-            regime = 'ranging'
-            tradeable = False
-        else:
-            regime = 'choppy'
-            tradeable = True  # Scalping bot can handle this
-
-        # Return conditions
-        conditions = {
+        return [{
+            'timestamp': int(candle['time']),
+            'open': float(candle['open']),
+            'high': float(candle['high']),
+            'low': float(candle['low']),
+            'close': float(candle['close']),
+            'volume': float(candle['volume'])
+        } for candle in data['data']]
+
+    def refresh(self) -> list:
+        """Pull new candles and return the cached window in chronological order"""
+        start_time = max(self.candles) if self.candles else None
+        fetched = self._fetch(start_time)
+        if start_time is not None and len(fetched) >= self.limit:
+            # Gap longer than the window — the incremental page may not reach now
+            self.candles = {}
+            fetched = self._fetch()
+
+        for candle in fetched:
+            self.candles[candle['timestamp']] = candle
+
+        for ts in sorted(self.candles)[:-self.limit]:
+            del self.candles[ts]
+
+        return [self.candles[ts] for ts in sorted(self.candles)]
+
+
+# Module-level state so repeated in-process calls reuse candles and regime
+_default_cache = CandleCache()
+_regime = RegimeService()
+
+
+def get_market_conditions(cache: CandleCache = None, regime: RegimeService = None) -> dict:
+    """
+    Compute current market conditions in-process.
+
+    Closed candles are fed to the shared incremental regime detector (same
+    Wilder ADX as lp_hedge_backtest's technical.calculate_adx), so each cycle
+    only costs the candles that closed since the last one. The result is also
+    published to the shared regime snapshot for the other bots.
+    Never raises — on failure returns an untradeable result with an 'error' key.
+    """
+    cache = cache or _default_cache
+    regime = regime or _regime
+
+    try:
+        candles = cache.refresh()
+
+        # Last candle is still forming — only closed candles move the regime
+        regime.update(cache.symbol, candles[:-1])
+        state = regime.get(cache.symbol, price=candles[-1]['close'])
+        regime.publish([state])
+
+        if math.isnan(state.adx):
+            raise Exception(f"Not enough candles for ADX ({state.bars})")
+
+        return {
             'timestamp': datetime.now().isoformat(),
-            'tradeable': tradeable,
-            'regime': regime,
-            'adx': float(adx_value),
-            'volatility': float(volatility),
-            'btc_price': float(current_price)
+            'tradeable': state.tradeable,
+            'regime': state.regime,
+            'adx': float(state.adx),
+            'volatility': float(state.volatility),
+            'btc_price': float(state.price)
         }
 
-        # Output as JSON
-        print(json.dumps(conditions))
-        return 0
-
     except Exception as e:
-        error_result = {
+        return {
             'timestamp': datetime.now().isoformat(),
             'tradeable': False,
             'regime': 'unknown',
@@ -120,8 +132,13 @@ def check_market_conditions():
             'btc_price': 0,
             'error': str(e)
         }
-        print(json.dumps(error_result))
-        return 1
+
+
+def check_market_conditions():
+    """CLI entry point: print conditions as JSON, exit 1 on failure"""
+    conditions = get_market_conditions()
+    print(json.dumps(conditions))
+    return 1 if 'error' in conditions else 0
 
 
 if __name__ == '__main__':
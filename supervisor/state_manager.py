@@ -11,21 +11,16 @@ import json
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from circuit_breaker_checker import check_circuit_breaker
+
 
 def check_circuit_breaker_status(bot_key):
     """Check if circuit breaker is active and should be reset"""
-    import subprocess
-
     try:
-        result = subprocess.run(
-            [sys.executable, str(Path("/var/www/dev/trading/supervisor/circuit_breaker_checker.py")), bot_key],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-
-        if result.returncode == 0:
-            return json.loads(result.stdout)
+        result = check_circuit_breaker(bot_key)
+
+        if not result.get('error'):
+            return result
         else:
             return {'should_reset': False}
     except Exception as e: